@@ -0,0 +1,146 @@
+"""
+Run the xlManage benchmarks and check COM call counts against a baseline.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+
+Usage:
+    python benchmarks/run.py                      # scales 10 and 100
+    python benchmarks/run.py --scales 10,100,1000 --latency 0.0002
+    python benchmarks/run.py --only table.list --only table.delete
+    python benchmarks/run.py --update-baseline    # accept the new counts
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+from xlmanage.testing.benchmarks import (
+    SCENARIOS,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the xlManage managers on the FakeExcel backend."
+    )
+    parser.add_argument(
+        "--scales",
+        default="10,100",
+        help="Comma-separated numbers of workbooks/sheets/tables/modules",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Delay added to each COM call, in seconds (e.g. 0.0002)",
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Include the cost of building the session caches (no baseline check)",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Run only this scenario (repeatable)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.0,
+        help="Allowed increase of COM calls over the baseline (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the measured COM calls as the new baseline",
+    )
+    parser.add_argument("--json", type=Path, help="Write the results to a JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks; return 1 if a COM call count regressed."""
+    args = _parse_args(argv)
+    scales = [int(scale) for scale in args.scales.split(",")]
+    console = Console()
+
+    results = run_benchmarks(
+        scales=scales, names=args.only, latency=args.latency, warm=not args.cold
+    )
+    # The baseline holds the counts of warm sessions
+    baseline = {} if args.cold else load_baseline(args.baseline)
+
+    table = Table(title=f"Benchmarks (latence {args.latency * 1000:g} ms/appel)")
+    table.add_column("Scénario", style="cyan")
+    table.add_column("Échelle", justify="right")
+    table.add_column("Appels COM", justify="right", style="yellow")
+    table.add_column("Référence", justify="right")
+    table.add_column("Temps (ms)", justify="right", style="magenta")
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is None:
+            reference = "-"
+        elif result.calls > expected:
+            reference = f"[red]{expected}[/red]"
+        elif result.calls < expected:
+            reference = f"[green]{expected}[/green]"
+        else:
+            reference = str(expected)
+        table.add_row(
+            result.name,
+            str(result.scale),
+            str(result.calls),
+            reference,
+            f"{result.elapsed * 1000:.2f}",
+        )
+    console.print(table)
+
+    if args.json:
+        records = [
+            {"key": r.key, "calls": r.calls, "elapsed_ms": r.elapsed * 1000}
+            for r in results
+        ]
+        args.json.write_text(json.dumps(records, indent=2) + "\n", encoding="utf-8")
+
+    if args.update_baseline and not args.cold:
+        save_baseline(args.baseline, results)
+        console.print(f"Référence mise à jour : [cyan]{args.baseline}[/cyan]")
+        return 0
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for regression in regressions:
+        console.print(
+            f"[red]Régression[/red] {regression.key} : "
+            f"{regression.calls} appels COM (référence {regression.baseline})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -33,6 +33,12 @@ __all__ = [
     "WorksheetInfo",
     "TableManager",
     "TableInfo",
+    "TableExportResult",
+    "TableLoadResult",
+    "TableUpsertResult",
+    "RangeManager",
+    "RangeData",
+    "RangeWriteResult",
     "VBAManager",
     "VBAModuleInfo",
     "MacroRunner",
@@ -41,6 +47,16 @@ __all__ = [
     "ScreenOptimizer",
     "CalculationOptimizer",
     "OptimizationState",
+    "DaemonServer",
+    "DaemonClient",
+    "DaemonSession",
+    "execute_operation",
+    "BatchResult",
+    "run_batch",
+    "ComProfile",
+    "profiling",
+    "RetryPolicy",
+    "retrying",
     "ExcelConnectionError",
     "ExcelInstanceNotFoundError",
     "ExcelManageError",
@@ -56,6 +72,8 @@ __all__ = [
     "TableAlreadyExistsError",
     "TableRangeError",
     "TableNameError",
+    "TableColumnError",
+    "RangeError",
     "VBAProjectAccessError",
     "VBAModuleNotFoundError",
     "VBAModuleAlreadyExistsError",
@@ -63,18 +81,30 @@ __all__ = [
     "VBAExportError",
     "VBAMacroError",
     "VBAWorkbookFormatError",
+    "OperationError",
+    "DaemonConnectionError",
+    "DaemonAlreadyRunningError",
 ]
 
 # Import main classes
+from .batch import BatchResult, run_batch
 from .calculation_optimizer import CalculationOptimizer
+from .com_profiler import ComProfile, profiling
+from .com_retry import RetryPolicy, retrying
+from .daemon import DaemonClient, DaemonServer, DaemonSession
 from .excel_manager import ExcelManager, InstanceInfo
 from .excel_optimizer import ExcelOptimizer, OptimizationState
 from .exceptions import (
+    DaemonAlreadyRunningError,
+    DaemonConnectionError,
     ExcelConnectionError,
     ExcelInstanceNotFoundError,
     ExcelManageError,
     ExcelRPCError,
+    OperationError,
+    RangeError,
     TableAlreadyExistsError,
+    TableColumnError,
     TableNameError,
     TableNotFoundError,
     TableRangeError,
@@ -94,8 +124,16 @@ from .exceptions import (
     WorksheetNotFoundError,
 )
 from .macro_runner import MacroResult, MacroRunner
+from .operations import execute_operation
+from .range_manager import RangeData, RangeManager, RangeWriteResult
 from .screen_optimizer import ScreenOptimizer
-from .table_manager import TableInfo, TableManager
+from .table_manager import (
+    TableExportResult,
+    TableInfo,
+    TableLoadResult,
+    TableManager,
+    TableUpsertResult,
+)
 from .vba_manager import VBAManager, VBAModuleInfo
 from .workbook_manager import WorkbookInfo, WorkbookManager
 from .worksheet_manager import WorksheetInfo, WorksheetManager
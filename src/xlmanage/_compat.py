@@ -0,0 +1,61 @@
+"""
+pywin32 types with pure Python stand-ins when pywin32 is not installed.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    # Type checkers see the pywin32 names; the stand-ins below only exist
+    # at runtime, when pywin32 is missing
+    from pywintypes import Time, TimeType, com_error
+else:
+    try:
+        from pywintypes import Time, TimeType, com_error
+    except ImportError:
+        # Without pywin32 this module stands in for the pywintypes namespace:
+        # the managers catch, and FakeExcel raises, the com_error below.
+        TimeType = datetime
+
+        # Names are those of pywintypes
+        def Time(value: Any) -> Any:  # noqa: N802
+            """Return a date unchanged (pywintypes.Time stand-in)."""
+            return value
+
+        class com_error(Exception):  # noqa: N801, N818
+            """Stand-in for pywintypes.com_error when pywin32 is not installed.
+
+            Attributes:
+                hresult: COM error code (signed 32-bit)
+                strerror: Error message
+                excepinfo: (wCode, source, description, helpfile, helpcontext, scode)
+                argerror: Index of the faulty argument, if any
+            """
+
+            def __init__(
+                self,
+                hresult: int = 0,
+                strerror: str = "",
+                excepinfo: tuple[Any, ...] | None = None,
+                argerror: int | None = None,
+            ):
+                super().__init__(hresult, strerror, excepinfo, argerror)
+                self.hresult = hresult
+                self.strerror = strerror
+                self.excepinfo = excepinfo
+                self.argerror = argerror
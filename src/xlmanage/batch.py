@@ -0,0 +1,254 @@
+"""
+Batch execution of operations in a single process and COM session.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import OperationError
+from .operations import execute_operation, to_jsonable
+
+if TYPE_CHECKING:
+    from .excel_manager import ExcelManager
+
+# Signature of the callable running one operation: (op, args, kwargs) -> result
+Executor = Callable[[str, list[Any], dict[str, Any]], Any]
+
+
+@dataclass
+class BatchStep:
+    """One operation read from a batch file.
+
+    Attributes:
+        line: Line number in the batch file (1-based)
+        op: Operation name (e.g., "worksheet.create")
+        args: Positional arguments
+        kwargs: Keyword arguments
+        id: Optional caller-provided identifier echoed in the result
+    """
+
+    line: int
+    op: str
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    id: Any = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch step.
+
+    Attributes:
+        line: Line number of the step in the batch file
+        op: Operation name ("" if the line could not be parsed)
+        success: Whether the operation succeeded
+        result: JSON-compatible result of the operation
+        error_type: Exception class name if the step failed
+        error_message: Error message if the step failed
+        elapsed_ms: Execution time of the step in milliseconds
+        id: Identifier given in the batch file, if any
+    """
+
+    line: int
+    op: str
+    success: bool
+    result: Any = None
+    error_type: str | None = None
+    error_message: str | None = None
+    elapsed_ms: float = 0.0
+    id: Any = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the NDJSON record of this result (empty fields omitted)."""
+        record: dict[str, Any] = {"line": self.line}
+        if self.id is not None:
+            record["id"] = self.id
+        record["op"] = self.op
+        record["ok"] = self.success
+        if self.success:
+            record["result"] = self.result
+        else:
+            record["error"] = {"type": self.error_type, "message": self.error_message}
+        record["elapsed_ms"] = round(self.elapsed_ms, 3)
+        return record
+
+
+def parse_step(line_number: int, text: str) -> BatchStep | None:
+    """Parse one line of a batch file.
+
+    Each line is a JSON object such as
+    ``{"op": "worksheet.create", "kwargs": {"name": "Data"}}``.
+    Blank lines and lines starting with ``#`` are ignored.
+
+    Args:
+        line_number: Line number (1-based), used in error messages
+        text: Raw line content
+
+    Returns:
+        BatchStep, or None for blank and comment lines
+
+    Raises:
+        OperationError: If the line is not a valid operation object
+    """
+    text = text.strip()
+    if not text or text.startswith("#"):
+        return None
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise OperationError("?", f"line {line_number}: invalid JSON ({e.msg})") from e
+
+    if not isinstance(data, dict) or not isinstance(data.get("op"), str):
+        raise OperationError("?", f'line {line_number}: missing "op" field')
+
+    args = data.get("args", [])
+    kwargs = data.get("kwargs", {})
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        raise OperationError(
+            data["op"], f"line {line_number}: args must be a list, kwargs an object"
+        )
+
+    return BatchStep(line_number, data["op"], args, kwargs, data.get("id"))
+
+
+def run_batch(
+    lines: Iterable[str],
+    execute: Executor,
+    stop_on_error: bool = False,
+) -> Iterator[BatchResult]:
+    """Run the operations of a batch file one after the other.
+
+    Lines are parsed lazily, so results can be streamed while a long
+    batch (or stdin) is still being read.
+
+    Args:
+        lines: Lines of the batch file
+        execute: Callable running one operation, typically bound to a
+            single ExcelManager with execute_operation()
+        stop_on_error: Stop after the first failed step
+
+    Yields:
+        BatchResult: One result per operation, in order
+
+    Example:
+        >>> run = partial(execute_operation, mgr)
+        >>> for result in run_batch(open("ops.jsonl"), run):
+        ...     print(result.to_dict())
+    """
+    for line_number, text in enumerate(lines, start=1):
+        started = time.perf_counter()
+        op = ""
+        step_id = None
+        try:
+            step = parse_step(line_number, text)
+            if step is None:
+                continue
+            op, step_id = step.op, step.id
+            value = execute(step.op, step.args, step.kwargs)
+        except Exception as e:
+            yield BatchResult(
+                line=line_number,
+                op=op,
+                success=False,
+                error_type=type(e).__name__,
+                error_message=str(e),
+                elapsed_ms=(time.perf_counter() - started) * 1000,
+                id=step_id,
+            )
+            if stop_on_error:
+                return
+            continue
+
+        yield BatchResult(
+            line=line_number,
+            op=op,
+            success=True,
+            result=to_jsonable(value),
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            id=step_id,
+        )
+
+
+# Argument value replaced by the workbook of each job in workbook_job()
+WORKBOOK_PLACEHOLDER: str = "{workbook}"
+
+
+def _bind_workbook(value: Any, workbook: str) -> Any:
+    """Replace the workbook placeholder in arguments decoded from JSON."""
+    if value == WORKBOOK_PLACEHOLDER:
+        return workbook
+    if isinstance(value, list):
+        return [_bind_workbook(v, workbook) for v in value]
+    if isinstance(value, dict):
+        return {k: _bind_workbook(v, workbook) for k, v in value.items()}
+    return value
+
+
+def workbook_job(
+    steps: list[BatchStep], save: bool = True
+) -> Callable[["ExcelManager", Path], list[Any]]:
+    """Build a job running batch steps on one workbook, for ExcelPool.
+
+    The job opens the workbook, runs the steps in order with every
+    ``"{workbook}"`` argument replaced by the workbook path, then saves
+    it.  The first failing step fails the job.
+
+    Args:
+        steps: Parsed batch steps (see parse_step())
+        save: Save the workbook after the last step
+
+    Returns:
+        Job function (excel_manager, workbook) -> JSON-compatible results
+        of the steps
+
+    Example:
+        >>> steps = [parse_step(1, '{"op": "table.list", '
+        ...                        '"kwargs": {"workbook": "{workbook}"}}')]
+        >>> with ExcelPool(4) as pool:
+        ...     results = pool.map(workbook_job(steps), paths)
+    """
+
+    def job(excel_manager: "ExcelManager", workbook: Path) -> list[Any]:
+        path = str(workbook)
+        execute_operation(excel_manager, "workbook.open", kwargs={"path": path})
+        results = []
+        for step in steps:
+            try:
+                value = execute_operation(
+                    excel_manager,
+                    step.op,
+                    _bind_workbook(step.args, path),
+                    _bind_workbook(step.kwargs, path),
+                )
+            except OperationError:
+                raise
+            except Exception as e:
+                raise OperationError(
+                    step.op, f"line {step.line}: {type(e).__name__}: {e}"
+                ) from e
+            results.append(to_jsonable(value))
+        if save:
+            execute_operation(excel_manager, "workbook.save", kwargs={"path": path})
+        return results
+
+    return job
@@ -17,22 +17,36 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 import typer
-from rich.console import Console
+from rich.console import Console, JustifyMethod
 from rich.panel import Panel
 from rich.table import Table
 
 try:
+    from .com_profiler import ComProfile, profiling
+    from .com_retry import RetryPolicy, retrying
+    from .daemon import DaemonClient, DaemonServer, DaemonSession, default_address
     from .excel_manager import ExcelManager, InstanceInfo, Visibility
     from .exceptions import (
+        DaemonAlreadyRunningError,
+        DaemonConnectionError,
         ExcelConnectionError,
         ExcelInstanceNotFoundError,
         ExcelManageError,
         ExcelRPCError,
+        RangeError,
         TableAlreadyExistsError,
+        TableColumnError,
         TableNameError,
         TableNotFoundError,
         TableRangeError,
@@ -51,19 +65,46 @@ try:
         WorksheetNameError,
         WorksheetNotFoundError,
     )
-    from .macro_runner import MacroResult, MacroRunner, _format_return_value
-    from .table_manager import TableManager
+    from .instance_registry import InstanceRegistry, InstanceSnapshot
+    from .macro_runner import (
+        MacroBatchResult,
+        MacroResult,
+        MacroRunner,
+        _format_return_value,
+        read_args_file,
+    )
+    from .range_manager import (
+        RANGE_FORMATS,
+        RangeManager,
+        count_csv_rows,
+        iter_csv,
+        read_csv,
+        write_rows,
+    )
+    from .table_manager import EXPORT_CHUNK_ROWS, TableManager
     from .vba_manager import VBAManager
     from .workbook_manager import WorkbookManager
-    from .worksheet_manager import WorksheetManager
+    from .worksheet_manager import WORKSHEET_FIELDS, WorksheetManager
 except ImportError:
+    from xlmanage.com_profiler import ComProfile, profiling
+    from xlmanage.com_retry import RetryPolicy, retrying
+    from xlmanage.daemon import (
+        DaemonClient,
+        DaemonServer,
+        DaemonSession,
+        default_address,
+    )
     from xlmanage.excel_manager import ExcelManager, Visibility
     from xlmanage.exceptions import (
+        DaemonAlreadyRunningError,
+        DaemonConnectionError,
         ExcelConnectionError,
         ExcelInstanceNotFoundError,
         ExcelManageError,
         ExcelRPCError,
+        RangeError,
         TableAlreadyExistsError,
+        TableColumnError,
         TableNameError,
         TableNotFoundError,
         TableRangeError,
@@ -82,11 +123,26 @@ except ImportError:
         WorksheetNameError,
         WorksheetNotFoundError,
     )
-    from xlmanage.macro_runner import MacroResult, MacroRunner, _format_return_value
-    from xlmanage.table_manager import TableManager
+    from xlmanage.instance_registry import InstanceRegistry, InstanceSnapshot
+    from xlmanage.macro_runner import (
+        MacroBatchResult,
+        MacroResult,
+        MacroRunner,
+        _format_return_value,
+        read_args_file,
+    )
+    from xlmanage.range_manager import (
+        RANGE_FORMATS,
+        RangeManager,
+        count_csv_rows,
+        iter_csv,
+        read_csv,
+        write_rows,
+    )
+    from xlmanage.table_manager import EXPORT_CHUNK_ROWS, TableManager
     from xlmanage.vba_manager import VBAManager
     from xlmanage.workbook_manager import WorkbookManager
-    from xlmanage.worksheet_manager import WorksheetManager
+    from xlmanage.worksheet_manager import WORKSHEET_FIELDS, WorksheetManager
 
 app = typer.Typer(
     name="xlmanage",
@@ -95,6 +151,116 @@ app = typer.Typer(
 )
 console = Console()
 
+# Daemon address when the CLI runs in client mode (set by the main callback)
+_daemon_address: str | None = None
+
+
+def _print_profile(profile: ComProfile, top: int, output: Path) -> None:
+    """Print the most expensive COM members and write the JSON trace.
+
+    The report goes to stderr so that commands streaming data to stdout
+    (e.g. 'table export') stay usable while profiled.
+    """
+    err_console = Console(stderr=True)
+    table = Table(
+        title=(
+            f"Profil COM : {profile.total_calls} appel(s), "
+            f"{profile.total_time * 1000:.1f} ms"
+        )
+    )
+    table.add_column("Membre", style="cyan")
+    table.add_column("Type", style="magenta")
+    table.add_column("Appels", justify="right", style="yellow")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Moyenne (µs)", justify="right")
+    table.add_column("Max (µs)", justify="right")
+
+    for stats in profile.top(top):
+        table.add_row(
+            stats.member,
+            stats.kind,
+            str(stats.count),
+            f"{stats.total * 1000:.2f}",
+            f"{stats.mean * 1_000_000:.1f}",
+            f"{stats.max * 1_000_000:.1f}",
+        )
+    err_console.print(table)
+    if profile.total_retries:
+        err_console.print(
+            f"Excel occupé : {profile.total_retries} appel(s) refusé(s) et "
+            f"relancé(s), {profile.total_retry_wait * 1000:.1f} ms d'attente"
+        )
+
+    try:
+        profile.write(output, command=" ".join(sys.argv[1:]))
+    except OSError as e:
+        err_console.print(f"[red]Trace non écrite[/red] ({output}) : {e}")
+        return
+    err_console.print(f"Trace JSON écrite dans [cyan]{output}[/cyan]")
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    daemon: bool = typer.Option(
+        False,
+        "--daemon",
+        envvar="XLMANAGE_DAEMON",
+        help="Transmettre les commandes au démon xlmanage (voir 'xlmanage serve')",
+    ),
+    daemon_address: str | None = typer.Option(
+        None,
+        "--daemon-address",
+        help="Adresse du démon (named pipe ou socket, défaut par utilisateur)",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Compter et chronométrer les appels COM de la commande",
+    ),
+    profile_output: Path = typer.Option(
+        Path("xlmanage-profile.json"),
+        "--profile-output",
+        help="Fichier de la trace JSON écrite avec --profile",
+    ),
+    profile_top: int = typer.Option(
+        15,
+        "--profile-top",
+        min=1,
+        help="Nombre de membres COM affichés avec --profile",
+    ),
+    busy_timeout: float = typer.Option(
+        0.0,
+        "--busy-timeout",
+        min=0,
+        envvar="XLMANAGE_BUSY_TIMEOUT",
+        help=(
+            "Secondes pendant lesquelles un appel refusé par Excel occupé "
+            "est relancé (défaut: 0 = pas de nouvel essai)"
+        ),
+    ),
+) -> None:
+    """Excel automation CLI tool."""
+    global _daemon_address
+    _daemon_address = (daemon_address or default_address()) if daemon else None
+
+    if busy_timeout > 0:
+        # Excel busy (recalculation, modal dialog): retry with backoff
+        ctx.with_resource(retrying(RetryPolicy(deadline=busy_timeout)))
+
+    if profile:
+        if _daemon_address is not None:
+            # The COM calls run in the daemon process, out of reach
+            Console(stderr=True).print(
+                "[yellow]i[/yellow] --profile ignoré en mode démon "
+                "(les appels COM sont faits par le démon)"
+            )
+            return
+        com_profile = ctx.with_resource(profiling())
+        ctx.call_on_close(
+            partial(_print_profile, com_profile, profile_top, profile_output)
+        )
+
 
 @app.command()
 def version():
@@ -264,10 +430,59 @@ def _stop_all_instances(mgr: ExcelManager, save: bool, console: Console) -> None
         )
 
 
+def _stop_all_parallel(
+    mgr: ExcelManager, save: bool, deadline: float | None, console: Console
+) -> None:
+    """Stop all Excel instances concurrently, killing them after the deadline."""
+    delay = f" (délai : {deadline:g} s)" if deadline is not None else ""
+    console.print(f"[dim]Arrêt en parallèle des instances Excel{delay}...[/dim]")
+
+    reports = mgr.stop_all(save=save, parallel=True, deadline=deadline)
+
+    if not reports:
+        console.print("[yellow]Aucune instance Excel active[/yellow]")
+        return
+
+    statuses = {
+        "stopped": "[green]Arrêtée[/green]",
+        "killed": "[yellow]Terminée (délai dépassé)[/yellow]",
+        "failed": "[red]Échec[/red]",
+    }
+    table = Table(title="Instances arrêtées", show_header=True)
+    table.add_column("PID", justify="right", style="cyan")
+    table.add_column("Statut")
+    table.add_column("Durée (ms)", justify="right")
+    table.add_column("Erreur", style="dim")
+
+    for report in reports:
+        table.add_row(
+            str(report.pid),
+            statuses.get(report.status, report.status),
+            f"{report.elapsed_ms:.0f}",
+            report.error or "",
+        )
+
+    console.print(table)
+
+    stopped = sum(report.status == "stopped" for report in reports)
+    killed = sum(report.status == "killed" for report in reports)
+    failed = len(reports) - stopped - killed
+    console.print(f"\n[green]{stopped} instance(s) arrêtée(s) avec succès[/green]")
+    if killed:
+        console.print(
+            f"[yellow]{killed} instance(s) terminée(s) de force, processus "
+            f"tué (modifications non enregistrées perdues)[/yellow]"
+        )
+    if failed:
+        console.print(
+            f"[red]{failed} instance(s) en échec - utilisez --force si nécessaire[/red]"
+        )
+
+
 def _force_kill_instances(
     mgr: ExcelManager, instance_id: str | None, all_instances: bool, console: Console
 ) -> None:
-    """Force kill with taskkill."""
+    """Force kill by terminating the Excel processes."""
     # Warning
     console.print(
         "[red bold]ATTENTION : Force kill terminera brutalement Excel "
@@ -336,18 +551,34 @@ def stop(
         False, "--all", help="Arrêter toutes les instances Excel"
     ),
     force: bool = typer.Option(
-        False, "--force", help="Forcer l'arrêt avec taskkill (sans sauvegarde)"
+        False,
+        "--force",
+        help="Forcer l'arrêt en terminant le processus (sans sauvegarde)",
     ),
     no_save: bool = typer.Option(
         False, "--no-save", help="Ne pas sauvegarder les classeurs"
     ),
+    parallel: bool = typer.Option(
+        False, "--parallel", help="Avec --all : arrêter les instances en parallèle"
+    ),
+    deadline: float | None = typer.Option(
+        None,
+        "--deadline",
+        min=0,
+        help=(
+            "Avec --all : délai en secondes avant de terminer le processus "
+            "(implique --parallel)"
+        ),
+    ),
 ) -> None:
     """Arrête une ou plusieurs instances Excel.
 
     Sans argument : arrête l'instance active (ou celle gérée par xlManage).
     Avec PID : arrête l'instance spécifique.
     Avec --all : arrête toutes les instances Excel.
-    Avec --force : utilise taskkill (perte de données !).
+    Avec --all --deadline N : arrête les instances en parallèle et termine
+    le processus de celles qui ne sont pas arrêtées après N secondes.
+    Avec --force : termine le processus Excel (perte de données !).
 
     Exemples:
 
@@ -357,6 +588,8 @@ def stop(
 
         xlmanage stop --all --no-save
 
+        xlmanage stop --all --deadline 30
+
         xlmanage stop 12345 --force
     """
     # Validation: --all incompatible with instance_id
@@ -366,6 +599,13 @@ def stop(
         )
         raise typer.Exit(code=1)
 
+    if (parallel or deadline is not None) and not all_instances:
+        console.print(
+            "[red]Erreur :[/red] --parallel et --deadline nécessitent --all",
+            style="bold",
+        )
+        raise typer.Exit(code=1)
+
     # Determine save (inverse of no_save)
     save = not no_save
 
@@ -379,7 +619,10 @@ def stop(
 
         # --all: stop all instances
         if all_instances:
-            _stop_all_instances(mgr, save, console)
+            if parallel or deadline is not None:
+                _stop_all_parallel(mgr, save, deadline, console)
+            else:
+                _stop_all_instances(mgr, save, console)
             return
 
         # Specific PID
@@ -417,15 +660,42 @@ def stop(
 
 
 @app.command()
-def status():
+def status(
+    fast: bool = typer.Option(
+        False,
+        "--fast",
+        help="Only list PIDs and HWNDs from the windows, without COM",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Ignore the daemon's cached listing",
+    ),
+    timings: bool = typer.Option(
+        False,
+        "--timings",
+        help="Show the time spent in the ROT, property reads and fallback",
+    ),
+):
     """Display status of running Excel instances.
 
     Shows information about all currently running Excel instances including
     process ID, visibility, number of open workbooks, and window handle.
+
+    With --daemon, the listing comes from the daemon's cache, shared by
+    all clients and refreshed every few seconds: suited to monitoring
+    loops.  --fast skips the connection to each instance.
     """
     try:
-        manager = ExcelManager()
-        instances = manager.list_running_instances()
+        if _daemon_address is not None:
+            with DaemonClient(_daemon_address) as client:
+                snapshot = client.call(
+                    "daemon.instances", kwargs={"fast": fast, "refresh": refresh}
+                )
+        else:
+            registry = InstanceRegistry(manager=ExcelManager())
+            snapshot = registry.snapshot(fast=fast)
+        instances = snapshot.instances
 
         if not instances:
             console.print(
@@ -435,6 +705,8 @@ def status():
                     border_style="yellow",
                 )
             )
+            if timings:
+                _print_status_timings(snapshot)
             return
 
         # Create a table for instances
@@ -445,6 +717,11 @@ def status():
         table.add_column("Workbooks", style="yellow", justify="right")
 
         for info in instances:
+            if snapshot.fast:
+                # Not read in fast mode
+                table.add_row(str(info.pid), str(info.hwnd), "-", "-")
+                continue
+
             visible_text = "Yes" if info.visible else "No"
             visible_color = "green" if info.visible else "red"
 
@@ -456,6 +733,8 @@ def status():
             )
 
         console.print(table)
+        if timings:
+            _print_status_timings(snapshot)
 
     except ExcelConnectionError as e:
         console.print(
@@ -486,6 +765,23 @@ def status():
         raise typer.Exit(code=1)
 
 
+def _print_status_timings(snapshot: InstanceSnapshot) -> None:
+    """Print where the time of an instance listing went."""
+    t = snapshot.timings
+    if t.source == "windows":
+        detail = f"windows {t.windows_ms:.1f} ms"
+    else:
+        detail = (
+            f"ROT {t.rot_ms:.1f} ms, property reads {t.read_ms:.1f} ms, "
+            f"fallback {t.fallback_ms:.1f} ms"
+        )
+    origin = f"cached, {snapshot.age:.1f} s old" if snapshot.cached else "scanned"
+    console.print(
+        f"[dim]Listing via {t.source or '-'} in {t.total_ms:.1f} ms "
+        f"({detail}) - {origin}[/dim]"
+    )
+
+
 @app.command()
 def optimize(
     screen: bool = typer.Option(
@@ -812,6 +1108,129 @@ def _resolve_visibility(visible: bool, hidden: bool) -> Visibility:
     return Visibility.UNCHANGED
 
 
+def _excel_session(**kwargs: Any) -> ExcelManager | DaemonSession:
+    """Return the Excel connection used by manager-based commands.
+
+    In client mode (``--daemon``), commands are forwarded to the xlmanage
+    daemon, which owns the Excel instance; the visibility options are then
+    ignored.  Otherwise a local ExcelManager is created with *kwargs*.
+    """
+    if _daemon_address is not None:
+        return DaemonSession(_daemon_address)
+    return ExcelManager(**kwargs)
+
+
+def _manager(manager_cls: Any, excel_mgr: ExcelManager | DaemonSession) -> Any:
+    """Instantiate a manager, or its remote counterpart in client mode."""
+    if isinstance(excel_mgr, DaemonSession):
+        return excel_mgr.manager(manager_cls)
+    return manager_cls(excel_mgr)
+
+
+def _helper_option(helper: bool, helper_host: str | None) -> bool | str:
+    """Combine --helper and --helper-host into the managers' helper option."""
+    return helper_host or helper
+
+
+@app.command()
+def serve(
+    address: str | None = typer.Option(
+        None,
+        "--address",
+        help="Adresse d'écoute (named pipe ou socket, défaut par utilisateur)",
+    ),
+    visible: bool = typer.Option(False, "--visible", help="Rendre Excel visible"),
+    hidden: bool = typer.Option(False, "--hidden", help="Masquer la fenetre Excel"),
+    stop_daemon: bool = typer.Option(
+        False, "--stop", help="Arrêter le démon en cours d'exécution"
+    ),
+    ping: bool = typer.Option(
+        False, "--ping", help="Mesurer la latence aller-retour du démon"
+    ),
+) -> None:
+    """Lance le démon xlmanage qui garde une connexion COM active.
+
+    Les autres commandes l'utilisent avec l'option globale --daemon (ou la
+    variable XLMANAGE_DAEMON=1) : plus de démarrage Python ni de
+    reconnexion à Excel à chaque appel.
+
+    Exemples:
+
+        xlmanage serve --hidden
+
+        xlmanage --daemon workbook list
+
+        xlmanage serve --ping
+
+        xlmanage serve --stop
+    """
+    target = address or default_address()
+
+    if stop_daemon or ping:
+        try:
+            with DaemonClient(target) as client:
+                if ping:
+                    latency = client.ping()
+                    console.print(
+                        f"[green]OK[/green] Démon actif sur {target} "
+                        f"(aller-retour : {latency * 1000:.2f} ms)"
+                    )
+                if stop_daemon:
+                    client.shutdown()
+                    console.print(f"[green]OK[/green] Démon arrêté ({target})")
+        except DaemonConnectionError as e:
+            console.print(
+                Panel.fit(
+                    f"[red]X[/red] Démon injoignable\n\n[bold]Adresse :[/bold] "
+                    f"{e.address}",
+                    title="Erreur",
+                    border_style="red",
+                )
+            )
+            raise typer.Exit(code=1)
+        return
+
+    visibility = _resolve_visibility(visible, hidden)
+    server = DaemonServer(
+        target, manager_factory=lambda: ExcelManager(visibility=visibility)
+    )
+
+    console.print(
+        Panel.fit(
+            f"[green]OK[/green] Démon xlmanage en écoute\n\n"
+            f"[bold]Adresse :[/bold] {target}\n"
+            "[dim]Ctrl+C ou 'xlmanage serve --stop' pour arrêter[/dim]",
+            title="xlmanage serve",
+            border_style="green",
+        )
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+    except DaemonAlreadyRunningError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Un démon est déjà actif\n\n[bold]Adresse :[/bold] "
+                f"{e.address}\n[dim]'xlmanage serve --stop' pour l'arrêter[/dim]",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except OSError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Impossible d'écouter sur {target}\n\n"
+                f"[bold]Error:[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
 workbook_app = typer.Typer(help="Manage Excel workbooks")
 app.add_typer(workbook_app, name="workbook")
 
@@ -844,8 +1263,10 @@ def workbook_open(
     from firing).  Useful during development and test workflows.
     """
     try:
-        with ExcelManager(visibility=_resolve_visibility(visible, hidden)) as excel_mgr:
-            wb_mgr = WorkbookManager(excel_mgr)
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            wb_mgr = _manager(WorkbookManager, excel_mgr)
             info = wb_mgr.open(path, read_only=read_only, disable_events=dev)
 
             mode = "lecture seule" if info.read_only else "lecture/ecriture"
@@ -919,8 +1340,10 @@ def workbook_create(
     Optionally uses a template file as starting point.
     """
     try:
-        with ExcelManager(visibility=_resolve_visibility(visible, hidden)) as excel_mgr:
-            wb_mgr = WorkbookManager(excel_mgr)
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            wb_mgr = _manager(WorkbookManager, excel_mgr)
             info = wb_mgr.create(path, template=template)
 
             template_info = f"Basé sur : {template.name}" if template else "Vierge"
@@ -993,8 +1416,10 @@ def workbook_close(
     By default, saves changes before closing.
     """
     try:
-        with ExcelManager(visibility=_resolve_visibility(visible, hidden)) as excel_mgr:
-            wb_mgr = WorkbookManager(excel_mgr)
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            wb_mgr = _manager(WorkbookManager, excel_mgr)
             wb_mgr.close(path, save=save, force=force)
 
             save_info = "avec sauvegarde" if save else "sans sauvegarde"
@@ -1049,8 +1474,10 @@ def workbook_save(
     Use --as to save to a different file (SaveAs).
     """
     try:
-        with ExcelManager(visibility=_resolve_visibility(visible, hidden)) as excel_mgr:
-            wb_mgr = WorkbookManager(excel_mgr)
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            wb_mgr = _manager(WorkbookManager, excel_mgr)
             wb_mgr.save(path, output=output)
 
             if output:
@@ -1115,8 +1542,10 @@ def workbook_list(
     in the Excel instance.
     """
     try:
-        with ExcelManager(visibility=_resolve_visibility(visible, hidden)) as excel_mgr:
-            wb_mgr = WorkbookManager(excel_mgr)
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            wb_mgr = _manager(WorkbookManager, excel_mgr)
             workbooks = wb_mgr.list()
 
             if not workbooks:
@@ -1182,8 +1611,8 @@ def worksheet_create(
     If no workbook is specified, creates it in the active workbook.
     """
     try:
-        with ExcelManager() as excel_mgr:
-            ws_mgr = WorksheetManager(excel_mgr)
+        with _excel_session() as excel_mgr:
+            ws_mgr = _manager(WorksheetManager, excel_mgr)
             info = ws_mgr.create(name, workbook=workbook)
 
             workbook_info = (
@@ -1282,8 +1711,8 @@ def worksheet_delete(
                 console.print("[yellow]Opération annulée[/yellow]")
                 return
 
-        with ExcelManager() as excel_mgr:
-            ws_mgr = WorksheetManager(excel_mgr)
+        with _excel_session() as excel_mgr:
+            ws_mgr = _manager(WorksheetManager, excel_mgr)
             ws_mgr.delete(name, workbook=workbook)
 
             console.print(
@@ -1345,16 +1774,48 @@ def worksheet_list(
         "-w",
         help="Path to the target workbook (defaults to active workbook)",
     ),
+    helper: bool = typer.Option(
+        False,
+        "--helper",
+        help="Read the list in one call through an injected VBA helper module",
+    ),
+    helper_host: str = typer.Option(
+        None,
+        "--helper-host",
+        help="Open workbook or add-in keeping the VBA helper (e.g. PERSONAL.XLSB)",
+    ),
+    fields: str = typer.Option(
+        None,
+        "--fields",
+        help="Comma-separated columns to read: "
+        f"{','.join(WORKSHEET_FIELDS)} (default: all). "
+        "Without rows_used/columns_used, UsedRange is never computed",
+    ),
 ):
     """List all worksheets in a workbook.
 
     Displays information about all worksheets including position,
     visibility, and data dimensions.
     """
+    selected = list(WORKSHEET_FIELDS)
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected if field not in WORKSHEET_FIELDS]
+        if unknown:
+            console.print(
+                f"[red]X[/red] Champ(s) inconnu(s) : {', '.join(unknown)} "
+                f"(attendu : {', '.join(WORKSHEET_FIELDS)})"
+            )
+            raise typer.Exit(code=1)
+
     try:
-        with ExcelManager() as excel_mgr:
-            ws_mgr = WorksheetManager(excel_mgr)
-            worksheets = ws_mgr.list(workbook=workbook)
+        with _excel_session() as excel_mgr:
+            ws_mgr = _manager(WorksheetManager, excel_mgr)
+            worksheets = ws_mgr.list(
+                workbook=workbook,
+                helper=_helper_option(helper, helper_host),
+                fields=selected if fields else None,
+            )
 
             if not worksheets:
                 console.print(
@@ -1369,23 +1830,31 @@ def worksheet_list(
             workbook_info = f" - {workbook.name}" if workbook else " - Classeur actif"
             title = f"Feuilles du classeur ({len(worksheets)} trouvée(s))"
             table = Table(title=f"{title}{workbook_info}")
-            table.add_column("Position", justify="right", style="cyan")
-            table.add_column("Nom", style="yellow")
-            table.add_column("Visible", style="green")
-            table.add_column("Lignes", justify="right", style="magenta")
-            table.add_column("Colonnes", justify="right", style="magenta")
+            columns: dict[str, tuple[str, JustifyMethod, str]] = {
+                "index": ("Position", "right", "cyan"),
+                "name": ("Nom", "left", "yellow"),
+                "visible": ("Visible", "left", "green"),
+                "rows_used": ("Lignes", "right", "magenta"),
+                "columns_used": ("Colonnes", "right", "magenta"),
+            }
+            # Display order of the default listing, name always shown
+            shown = [field for field in columns if field in selected or field == "name"]
+            for field in shown:
+                header, justify, style = columns[field]
+                table.add_column(header, justify=justify, style=style)
 
             for info in worksheets:
                 visible_text = "Oui" if info.visible else "X"
                 visible_color = "green" if info.visible else "red"
+                cells = {
+                    "index": str(info.index),
+                    "name": info.name,
+                    "visible": f"[{visible_color}]{visible_text}[/{visible_color}]",
+                    "rows_used": str(info.rows_used),
+                    "columns_used": str(info.columns_used),
+                }
 
-                table.add_row(
-                    str(info.index),
-                    info.name,
-                    f"[{visible_color}]{visible_text}[/{visible_color}]",
-                    str(info.rows_used),
-                    str(info.columns_used),
-                )
+                table.add_row(*(cells[field] for field in shown))
 
             console.print(table)
 
@@ -1409,6 +1878,82 @@ def worksheet_list(
         raise typer.Exit(code=1)
 
 
+@worksheet_app.command("dimensions")
+def worksheet_dimensions(
+    name: str = typer.Argument(..., help="Name of the worksheet to measure"),
+    workbook: Path = typer.Option(
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
+    ),
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Measure again instead of reusing the counts kept by the session",
+    ),
+):
+    """Count the used rows and columns of one worksheet.
+
+    Uses a last-cell probe instead of UsedRange: only the cells holding a
+    value or a formula are counted.  Complements `worksheet list --fields`
+    without rows_used/columns_used.  With --daemon, the counts are kept
+    until cells are written through xlManage; --refresh measures again
+    after editing the sheet in Excel.
+    """
+    try:
+        with _excel_session() as excel_mgr:
+            ws_mgr = _manager(WorksheetManager, excel_mgr)
+            rows_used, columns_used = ws_mgr.dimensions(
+                name, workbook=workbook, refresh=refresh
+            )
+
+            workbook_info = (
+                f"Classeur : {workbook.name}" if workbook else "Classeur actif"
+            )
+
+            console.print(
+                Panel.fit(
+                    f"[bold]Feuille :[/bold] {name}\n"
+                    f"[bold]Lignes :[/bold] {rows_used}\n"
+                    f"[bold]Colonnes :[/bold] {columns_used}\n"
+                    f"[bold]{workbook_info}[/bold]",
+                    title="Dimensions",
+                    border_style="cyan",
+                )
+            )
+
+    except WorksheetNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Feuille introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Classeur :[/bold] {e.workbook_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
 @worksheet_app.command("copy")
 def worksheet_copy(
     source: str = typer.Argument(..., help="Name of the source worksheet"),
@@ -1426,8 +1971,8 @@ def worksheet_copy(
     The copy is placed immediately after the source worksheet.
     """
     try:
-        with ExcelManager() as excel_mgr:
-            ws_mgr = WorksheetManager(excel_mgr)
+        with _excel_session() as excel_mgr:
+            ws_mgr = _manager(WorksheetManager, excel_mgr)
             info = ws_mgr.copy(source, destination, workbook=workbook)
 
             workbook_info = (
@@ -1526,8 +2071,8 @@ def table_create(
     The table must have a valid name and range reference.
     """
     try:
-        with ExcelManager() as excel_mgr:
-            table_mgr = TableManager(excel_mgr)
+        with _excel_session() as excel_mgr:
+            table_mgr = _manager(TableManager, excel_mgr)
             info = table_mgr.create(
                 name, range_ref, worksheet=worksheet, workbook=workbook
             )
@@ -1662,8 +2207,8 @@ def table_delete(
                 console.print("[yellow]Opération annulée[/yellow]")
                 return
 
-        with ExcelManager() as excel_mgr:
-            table_mgr = TableManager(excel_mgr)
+        with _excel_session() as excel_mgr:
+            table_mgr = _manager(TableManager, excel_mgr)
             table_mgr.delete(name, worksheet=worksheet, workbook=workbook)
 
             console.print(
@@ -1720,6 +2265,16 @@ def table_list(
         "-w",
         help="Path to the target workbook (defaults to active workbook)",
     ),
+    helper: bool = typer.Option(
+        False,
+        "--helper",
+        help="Read the list in one call through an injected VBA helper module",
+    ),
+    helper_host: str = typer.Option(
+        None,
+        "--helper-host",
+        help="Open workbook or add-in keeping the VBA helper (e.g. PERSONAL.XLSB)",
+    ),
 ):
     """List all tables.
 
@@ -1727,9 +2282,13 @@ def table_list(
     If no worksheet is specified, lists tables from all worksheets.
     """
     try:
-        with ExcelManager() as excel_mgr:
-            table_mgr = TableManager(excel_mgr)
-            tables = table_mgr.list(worksheet=worksheet, workbook=workbook)
+        with _excel_session() as excel_mgr:
+            table_mgr = _manager(TableManager, excel_mgr)
+            tables = table_mgr.list(
+                worksheet=worksheet,
+                workbook=workbook,
+                helper=_helper_option(helper, helper_host),
+            )
 
             if not tables:
                 console.print(
@@ -1780,47 +2339,633 @@ def table_list(
         raise typer.Exit(code=1)
 
 
-# ============================================================================
-# VBA Commands
-# ============================================================================
-
-vba_app = typer.Typer(help="Manage VBA modules")
-app.add_typer(vba_app, name="vba")
-
-
-@vba_app.command("import")
-def vba_import(
-    module_file: Path = typer.Argument(
-        ..., help="Chemin du fichier module (.bas, .cls, .frm)"
+@table_app.command("export")
+def table_export(
+    name: str = typer.Argument(..., help="Name of the table to export"),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Output file (defaults to stdout)"
     ),
-    module_type: str = typer.Option(
-        None,
-        "--type",
-        "-t",
-        help="Type de module (standard|class|userform). Auto-détecté si omis",
+    fmt: str = typer.Option("csv", "--format", "-f", help="Output format: csv, ndjson"),
+    chunk_rows: int = typer.Option(
+        EXPORT_CHUNK_ROWS, "--chunk-rows", min=1, help="Rows per COM transfer"
     ),
     workbook: Path = typer.Option(
-        None, "--workbook", "-w", help="Classeur cible (actif si omis)"
-    ),
-    overwrite: bool = typer.Option(
-        False, "--overwrite", help="Remplacer le module s'il existe déjà"
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
     ),
-    visible: bool = typer.Option(False, "--visible", help="Rendre Excel visible"),
 ):
-    """Importe un module VBA depuis un fichier.
+    """Export the data of a table to CSV or NDJSON.
 
-    Exemples:
+    Rows are read in chunks and written as they arrive, so memory use
+    stays bounded whatever the size of the table.  The report (rows/s,
+    peak memory) goes to stderr when the data is written to stdout.
 
-        xlmanage vba import Module1.bas
+    Exemples:
 
-        xlmanage vba import MyClass.cls --workbook data.xlsm --overwrite
+        xlmanage table export tbl_Sales -o sales.csv
 
-        xlmanage vba import UserForm1.frm --type userform
+        xlmanage table export tbl_Sales -f ndjson --chunk-rows 50000 > sales.ndjson
     """
-    try:
-        with ExcelManager(visible=visible) as excel_mgr:
-            excel_mgr.start()
-            vba_mgr = VBAManager(excel_mgr)
+    if fmt not in RANGE_FORMATS:
+        console.print(
+            f"[red]X[/red] Format inconnu : {fmt} (attendu : csv, ndjson)",
+            style="red",
+        )
+        raise typer.Exit(code=1)
+
+    # Keep stdout clean when it carries the exported data
+    report_console = console if output is not None else Console(stderr=True)
+
+    tracemalloc.start()
+    try:
+        with _excel_session() as excel_mgr:
+            if output is None and isinstance(excel_mgr, DaemonSession):
+                report_console.print(
+                    "[red]X[/red] --output est requis avec --daemon", style="red"
+                )
+                raise typer.Exit(code=1)
+
+            table_mgr = _manager(TableManager, excel_mgr)
+            result = table_mgr.export(
+                name,
+                output if output is not None else sys.stdout,
+                fmt=fmt,
+                chunk_rows=chunk_rows,
+                workbook=workbook,
+            )
+
+        report_console.print(
+            Panel.fit(
+                f"[green]OK[/green] Table exportée\n\n"
+                f"[bold]Table :[/bold] {result.name}\n"
+                f"[bold]Fichier :[/bold] {result.output}\n"
+                f"[bold]Lignes :[/bold] {result.rows} "
+                f"({result.columns} colonnes, {result.chunks} transferts)\n"
+                f"[bold]Durée :[/bold] {result.elapsed:.3f} s\n"
+                f"[bold]Débit :[/bold] {result.rows_per_second:,.0f} lignes/s\n"
+                f"[bold]Mémoire max :[/bold] {result.peak_memory / 1_048_576:.1f} Mo",
+                title="Export de table",
+                border_style="green",
+            )
+        )
+
+    except TableNotFoundError as e:
+        report_console.print(
+            Panel.fit(
+                f"[red]X[/red] Table introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Feuille :[/bold] {e.worksheet_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        report_console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        report_console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    finally:
+        tracemalloc.stop()
+
+
+@table_app.command("load")
+def table_load(
+    name: str = typer.Argument(..., help="Name of the target table"),
+    source: Path = typer.Option(..., "--from", help="CSV file with a header row"),
+    truncate: bool = typer.Option(
+        False, "--truncate", help="Delete the existing rows before loading"
+    ),
+    delimiter: str = typer.Option(",", "--delimiter", help="CSV field delimiter"),
+    block_rows: int = typer.Option(
+        None,
+        "--block-rows",
+        min=1,
+        help="Rows per COM transfer (default: sized automatically)",
+    ),
+    workbook: Path = typer.Option(
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
+    ),
+):
+    """Append the rows of a CSV file to a table.
+
+    The CSV header row is matched against the table columns (case
+    insensitive); table columns missing from the file are left untouched.
+    The table is resized once and the rows are written in blocks while
+    the file is streamed.
+
+    Exemples:
+
+        xlmanage table load tbl_Sales --from sales.csv
+
+        xlmanage table load tbl_Sales --from sales.csv --truncate -w data.xlsx
+    """
+    if not source.exists():
+        console.print(f"[red]X[/red] Fichier introuvable : {source}", style="red")
+        raise typer.Exit(code=1)
+
+    csv_rows = iter_csv(source, delimiter=delimiter)
+    columns = next(csv_rows, None)
+    if not columns:
+        console.print(f"[red]X[/red] En-tête absent : {source}", style="red")
+        raise typer.Exit(code=1)
+    columns = ["" if c is None else str(c) for c in columns]
+    row_count = count_csv_rows(source, delimiter=delimiter) - 1
+
+    try:
+        with _excel_session() as excel_mgr:
+            rows: Iterable[list[Any]] = csv_rows
+            if isinstance(excel_mgr, DaemonSession):
+                # Generators cannot be sent to the daemon
+                rows = list(csv_rows)
+
+            table_mgr = _manager(TableManager, excel_mgr)
+            result = table_mgr.append_rows(
+                name,
+                rows,
+                columns=columns,
+                workbook=workbook,
+                truncate=truncate,
+                row_count=row_count,
+                block_rows=block_rows,
+            )
+
+        console.print(
+            Panel.fit(
+                f"[green]OK[/green] Table chargée\n\n"
+                f"[bold]Table :[/bold] {result.name}\n"
+                f"[bold]Lignes ajoutées :[/bold] {result.rows_added}\n"
+                f"[bold]Lignes totales :[/bold] {result.rows_count}\n"
+                f"[bold]Colonnes :[/bold] {', '.join(result.columns)}\n"
+                f"[bold]Transferts :[/bold] {result.blocks}\n"
+                f"[bold]Débit :[/bold] {result.rows_per_second:,.0f} lignes/s",
+                title="Chargement de table",
+                border_style="green",
+            )
+        )
+
+    except TableColumnError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Colonnes incompatibles\n\n"
+                f"[bold]Table :[/bold] {e.name}\n"
+                f"[bold]Colonnes :[/bold] {', '.join(e.columns)}\n"
+                f"[bold]Raison :[/bold] {e.reason}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except TableNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Table introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Feuille :[/bold] {e.worksheet_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
+@table_app.command("upsert")
+def table_upsert(
+    name: str = typer.Argument(..., help="Name of the target table"),
+    source: Path = typer.Option(..., "--from", help="CSV file with a header row"),
+    key: list[str] = typer.Option(
+        ..., "--key", "-k", help="Key column identifying a row (repeatable)"
+    ),
+    delimiter: str = typer.Option(",", "--delimiter", help="CSV field delimiter"),
+    block_rows: int = typer.Option(
+        None,
+        "--block-rows",
+        min=1,
+        help="Rows per COM transfer (default: sized automatically)",
+    ),
+    workbook: Path = typer.Option(
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
+    ),
+):
+    """Update or insert the rows of a CSV file into a table.
+
+    Rows are matched on the key columns: changed rows are updated in
+    place, unknown keys are appended.  The keys of the table are read in
+    chunks and indexed in memory, so no per-row lookup is made in Excel.
+
+    Exemples:
+
+        xlmanage table upsert tbl_Sales --from changes.csv --key Id
+
+        xlmanage table upsert tbl_Sales --from changes.csv -k Region -k Month
+    """
+    if not source.exists():
+        console.print(f"[red]X[/red] Fichier introuvable : {source}", style="red")
+        raise typer.Exit(code=1)
+
+    csv_rows = iter_csv(source, delimiter=delimiter)
+    columns = next(csv_rows, None)
+    if not columns:
+        console.print(f"[red]X[/red] En-tête absent : {source}", style="red")
+        raise typer.Exit(code=1)
+    columns = ["" if c is None else str(c) for c in columns]
+
+    try:
+        with _excel_session() as excel_mgr:
+            rows: Iterable[list[Any]] = csv_rows
+            if isinstance(excel_mgr, DaemonSession):
+                # Generators cannot be sent to the daemon
+                rows = list(csv_rows)
+
+            table_mgr = _manager(TableManager, excel_mgr)
+            result = table_mgr.upsert(
+                name,
+                rows,
+                key,
+                columns=columns,
+                workbook=workbook,
+                block_rows=block_rows,
+            )
+
+        console.print(
+            Panel.fit(
+                f"[green]OK[/green] Table mise à jour\n\n"
+                f"[bold]Table :[/bold] {result.name}\n"
+                f"[bold]Clé :[/bold] {', '.join(result.key_columns)}\n"
+                f"[bold]Lignes modifiées :[/bold] {result.rows_updated}\n"
+                f"[bold]Lignes ajoutées :[/bold] {result.rows_inserted}\n"
+                f"[bold]Lignes inchangées :[/bold] {result.rows_unchanged}\n"
+                f"[bold]Lignes totales :[/bold] {result.rows_count}\n"
+                f"[bold]Transferts :[/bold] {result.blocks}\n"
+                f"[bold]Débit :[/bold] {result.rows_per_second:,.0f} lignes/s",
+                title="Fusion de table",
+                border_style="green",
+            )
+        )
+
+    except TableColumnError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Colonnes incompatibles\n\n"
+                f"[bold]Table :[/bold] {e.name}\n"
+                f"[bold]Colonnes :[/bold] {', '.join(e.columns)}\n"
+                f"[bold]Raison :[/bold] {e.reason}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except TableNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Table introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Feuille :[/bold] {e.worksheet_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
+# ============================================================================
+# Range Commands
+# ============================================================================
+
+range_app = typer.Typer(help="Read and write cell ranges in bulk")
+app.add_typer(range_app, name="range")
+
+
+@range_app.command("read")
+def range_read(
+    range_ref: str = typer.Argument(
+        None, help="Range reference (e.g., 'A1:D100'), used range if omitted"
+    ),
+    worksheet: str = typer.Option(
+        None,
+        "--worksheet",
+        "-ws",
+        help="Worksheet name (defaults to active worksheet)",
+    ),
+    workbook: Path = typer.Option(
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
+    ),
+    fmt: str = typer.Option("csv", "--format", "-f", help="Output format: csv, ndjson"),
+    output: Path = typer.Option(
+        None, "--output", "-o", help="Output file (defaults to stdout)"
+    ),
+    header: bool = typer.Option(
+        False, "--header", help="Treat the first row as column names"
+    ),
+):
+    """Read the values of a range in a single transfer.
+
+    Writes the cells as CSV or NDJSON (one array per row, or one object
+    per row with --header).  Empty cells are empty/null, error cells
+    their Excel text (#N/A, #DIV/0!...) and dates Excel serial numbers.
+
+    Exemples:
+
+        xlmanage range read A1:D100 -ws Data
+
+        xlmanage range read -ws Data --format ndjson --header -o data.ndjson
+    """
+    if fmt not in RANGE_FORMATS:
+        console.print(
+            f"[red]X[/red] Format inconnu : {fmt} (attendu : csv, ndjson)",
+            style="red",
+        )
+        raise typer.Exit(code=1)
+
+    try:
+        with _excel_session() as excel_mgr:
+            range_mgr = _manager(RangeManager, excel_mgr)
+            data = range_mgr.read(range_ref, worksheet=worksheet, workbook=workbook)
+
+        rows = data.values
+        columns = None
+        if header and rows:
+            columns = ["" if v is None else str(v) for v in rows[0]]
+            rows = rows[1:]
+
+        if output is None:
+            write_rows(rows, sys.stdout, fmt, header=columns)
+            return
+
+        with output.open("w", encoding="utf-8", newline="") as stream:
+            count = write_rows(rows, stream, fmt, header=columns)
+
+        console.print(
+            Panel.fit(
+                f"[green]OK[/green] Plage exportée\n\n"
+                f"[bold]Plage :[/bold] {data.worksheet_name}!{data.address}\n"
+                f"[bold]Lignes :[/bold] {count}\n"
+                f"[bold]Colonnes :[/bold] {data.columns}\n"
+                f"[bold]Fichier :[/bold] {output}",
+                title="Lecture de plage",
+                border_style="green",
+            )
+        )
+
+    except RangeError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Plage invalide\n\n"
+                f"[bold]Plage :[/bold] {e.range_ref}\n"
+                f"[bold]Raison :[/bold] {e.reason}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorksheetNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Feuille introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Classeur :[/bold] {e.workbook_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
+@range_app.command("write")
+def range_write(
+    anchor: str = typer.Argument("A1", help="Top-left destination cell"),
+    source: Path = typer.Option(
+        ..., "--from", help="CSV file containing the values to write"
+    ),
+    worksheet: str = typer.Option(
+        None,
+        "--worksheet",
+        "-ws",
+        help="Worksheet name (defaults to active worksheet)",
+    ),
+    workbook: Path = typer.Option(
+        None,
+        "--workbook",
+        "-w",
+        help="Path to the target workbook (defaults to active workbook)",
+    ),
+    block_rows: int = typer.Option(
+        None,
+        "--block-rows",
+        min=1,
+        help="Rows per COM transfer (default: sized automatically)",
+    ),
+    delimiter: str = typer.Option(",", "--delimiter", help="CSV field delimiter"),
+    no_optimize: bool = typer.Option(
+        False, "--no-optimize", help="Keep screen updating and calculation on"
+    ),
+):
+    """Write the content of a CSV file to a range in bulk.
+
+    Values are sent in blocks of rows through Range.Value2 with screen
+    updating, events and automatic calculation disabled.  Empty fields
+    become empty cells and numeric fields numbers.
+
+    Exemples:
+
+        xlmanage range write B2 --from data.csv -ws Data
+
+        xlmanage range write --from data.csv --block-rows 5000
+    """
+    if not source.exists():
+        console.print(f"[red]X[/red] Fichier introuvable : {source}", style="red")
+        raise typer.Exit(code=1)
+
+    rows = read_csv(source, delimiter=delimiter)
+
+    try:
+        with _excel_session() as excel_mgr:
+            range_mgr = _manager(RangeManager, excel_mgr)
+            result = range_mgr.write(
+                rows,
+                anchor,
+                worksheet=worksheet,
+                workbook=workbook,
+                block_rows=block_rows,
+                optimize=not no_optimize,
+            )
+
+        console.print(
+            Panel.fit(
+                f"[green]OK[/green] Plage écrite\n\n"
+                f"[bold]Plage :[/bold] {result.worksheet_name}!{result.address}\n"
+                f"[bold]Cellules :[/bold] {result.rows * result.columns} "
+                f"({result.rows} x {result.columns})\n"
+                f"[bold]Transferts :[/bold] {result.blocks} "
+                f"(blocs de {result.block_rows} lignes)\n"
+                f"[bold]Durée :[/bold] {result.elapsed:.3f} s\n"
+                f"[bold]Débit :[/bold] {result.cells_per_second:,.0f} cellules/s",
+                title="Écriture de plage",
+                border_style="green",
+            )
+        )
+
+    except RangeError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Plage invalide\n\n"
+                f"[bold]Plage :[/bold] {e.range_ref}\n"
+                f"[bold]Raison :[/bold] {e.reason}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorksheetNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Feuille introuvable\n\n"
+                f"[bold]Nom :[/bold] {e.name}\n"
+                f"[bold]Classeur :[/bold] {e.workbook_name}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except WorkbookNotFoundError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Classeur non trouvé\n\n[bold]Chemin :[/bold] {e.path}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+    except ExcelManageError as e:
+        console.print(
+            Panel.fit(
+                f"[red]X[/red] Erreur\n\n[bold]Détails :[/bold] {e}",
+                title="Erreur",
+                border_style="red",
+            )
+        )
+        raise typer.Exit(code=1)
+
+
+# ============================================================================
+# VBA Commands
+# ============================================================================
+
+vba_app = typer.Typer(help="Manage VBA modules")
+app.add_typer(vba_app, name="vba")
+
+
+@vba_app.command("import")
+def vba_import(
+    module_file: Path = typer.Argument(
+        ..., help="Chemin du fichier module (.bas, .cls, .frm)"
+    ),
+    module_type: str = typer.Option(
+        None,
+        "--type",
+        "-t",
+        help="Type de module (standard|class|userform). Auto-détecté si omis",
+    ),
+    workbook: Path = typer.Option(
+        None, "--workbook", "-w", help="Classeur cible (actif si omis)"
+    ),
+    overwrite: bool = typer.Option(
+        False, "--overwrite", help="Remplacer le module s'il existe déjà"
+    ),
+    visible: bool = typer.Option(False, "--visible", help="Rendre Excel visible"),
+):
+    """Importe un module VBA depuis un fichier.
+
+    Exemples:
+
+        xlmanage vba import Module1.bas
+
+        xlmanage vba import MyClass.cls --workbook data.xlsm --overwrite
+
+        xlmanage vba import UserForm1.frm --type userform
+    """
+    try:
+        with _excel_session(visible=visible) as excel_mgr:
+            excel_mgr.start()
+            vba_mgr = _manager(VBAManager, excel_mgr)
 
             # Importer le module
             info = vba_mgr.import_module(
@@ -1938,9 +3083,9 @@ def vba_export(
         xlmanage vba export ThisWorkbook ThisWorkbook.cls --workbook data.xlsm
     """
     try:
-        with ExcelManager(visible=visible) as excel_mgr:
+        with _excel_session(visible=visible) as excel_mgr:
             excel_mgr.start()
-            vba_mgr = VBAManager(excel_mgr)
+            vba_mgr = _manager(VBAManager, excel_mgr)
 
             # Exporter le module
             exported_path = vba_mgr.export_module(
@@ -1995,6 +3140,17 @@ def vba_list(
         None, "--workbook", "-w", help="Classeur à analyser (actif si omis)"
     ),
     visible: bool = typer.Option(False, "--visible", help="Rendre Excel visible"),
+    helper: bool = typer.Option(
+        False,
+        "--helper",
+        help="Lire la liste en un appel via un module VBA d'inventaire injecté",
+    ),
+    helper_host: str = typer.Option(
+        None,
+        "--helper-host",
+        help="Classeur ou macro complémentaire ouvert gardant le module "
+        "d'inventaire (ex. PERSONAL.XLSB)",
+    ),
 ):
     """Liste tous les modules VBA d'un classeur.
 
@@ -2003,14 +3159,18 @@ def vba_list(
         xlmanage vba list
 
         xlmanage vba list --workbook data.xlsm
+
+        xlmanage vba list --workbook data.xlsm --helper-host PERSONAL.XLSB
     """
     try:
-        with ExcelManager(visible=visible) as excel_mgr:
+        with _excel_session(visible=visible) as excel_mgr:
             excel_mgr.start()
-            vba_mgr = VBAManager(excel_mgr)
+            vba_mgr = _manager(VBAManager, excel_mgr)
 
             # Lister les modules
-            modules = vba_mgr.list_modules(workbook=workbook)
+            modules = vba_mgr.list_modules(
+                workbook=workbook, helper=_helper_option(helper, helper_host)
+            )
 
             if not modules:
                 console.print(
@@ -2091,9 +3251,9 @@ def vba_delete(
         xlmanage vba delete MyClass --workbook data.xlsm
     """
     try:
-        with ExcelManager(visible=visible) as excel_mgr:
+        with _excel_session(visible=visible) as excel_mgr:
             excel_mgr.start()
-            vba_mgr = VBAManager(excel_mgr)
+            vba_mgr = _manager(VBAManager, excel_mgr)
 
             # Supprimer le module
             vba_mgr.delete_module(
@@ -2143,6 +3303,17 @@ def _display_macro_result(result: MacroResult, console_obj: Console) -> None:
         result: Résultat de MacroRunner.run()
         console_obj: Console Rich pour l'affichage
     """
+    if result.status == "timeout":
+        console_obj.print(
+            Panel(
+                f"[yellow]{result.error_message}[/yellow]\n"
+                f"[dim]Durée : {result.elapsed_ms / 1000:.1f} s[/dim]",
+                title=f"Délai dépassé pour {result.macro_name}",
+                border_style="yellow",
+            )
+        )
+        return
+
     if not result.success:
         # Affichage erreur
         console_obj.print(
@@ -2184,6 +3355,89 @@ def _display_macro_result(result: MacroResult, console_obj: Console) -> None:
         )
 
 
+# Exécutions détaillées au plus par run-macro --args-file
+MACRO_BATCH_ROWS = 50
+
+
+def _display_macro_batch(
+    batch: MacroBatchResult,
+    console_obj: Console,
+    args_list: list[str | None],
+    repeat: int,
+    detailed: bool,
+) -> None:
+    """Affiche les résultats et les latences d'une série d'exécutions.
+
+    Args:
+        batch: Résultat de MacroRunner.run_many()
+        console_obj: Console Rich pour l'affichage
+        args_list: Arguments CSV de chaque appel, dans l'ordre
+        repeat: Nombre d'exécutions de chaque appel
+        detailed: Afficher le résultat de chaque exécution (--args-file) ;
+            sinon seules les erreurs sont affichées
+    """
+    if detailed:
+        table = Table(title=f"Exécutions de {batch.macro_name}")
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Arguments", style="cyan")
+        table.add_column("Statut")
+        table.add_column("Résultat")
+        table.add_column("Durée (ms)", justify="right")
+        for index, result in enumerate(batch.results[:MACRO_BATCH_ROWS]):
+            if result.success:
+                status = "[green]OK[/green]"
+                value = _format_return_value(result.return_value)
+            else:
+                status = f"[red]{result.status}[/red]"
+                value = f"[red]{result.error_message}[/red]"
+            table.add_row(
+                str(index + 1),
+                args_list[index // repeat] or "",
+                status,
+                value,
+                f"{result.elapsed_ms:.2f}",
+            )
+        console_obj.print(table)
+        if len(batch.results) > MACRO_BATCH_ROWS:
+            console_obj.print(
+                f"[dim]... {len(batch.results) - MACRO_BATCH_ROWS} "
+                "exécution(s) non affichée(s)[/dim]"
+            )
+    else:
+        for index, result in enumerate(batch.results):
+            if not result.success:
+                console_obj.print(
+                    f"[red]X[/red] Exécution {index + 1} : {result.error_message}"
+                )
+
+    planned = len(args_list) * repeat
+    stats = Table(show_header=False, box=None, padding=(0, 2))
+    stats.add_row(
+        "[bold]Exécutions:[/bold]",
+        f"{len(batch.results)}"
+        + (f" / {planned} (série interrompue)" if len(batch.results) < planned else ""),
+    )
+    stats.add_row("[bold]Réussies:[/bold]", f"[green]{batch.succeeded}[/green]")
+    stats.add_row(
+        "[bold]Échecs:[/bold]",
+        f"[red]{batch.failed}[/red]" if batch.failed else "0",
+    )
+    stats.add_row(
+        "[bold]Latence (ms):[/bold]",
+        f"min {batch.min_ms:.2f} | médiane {batch.median_ms:.2f} | "
+        f"p95 {batch.p95_ms:.2f} | max {batch.max_ms:.2f}",
+    )
+    stats.add_row("[bold]Débit:[/bold]", f"{batch.throughput:.1f} exécution(s)/s")
+    stats.add_row("[bold]Durée totale:[/bold]", f"{batch.total_ms / 1000:.2f} s")
+    console_obj.print(
+        Panel(
+            stats,
+            title=f"Série {batch.macro_name}",
+            border_style="green" if batch.success else "red",
+        )
+    )
+
+
 @app.command()
 def run_macro(
     macro_name: str = typer.Argument(
@@ -2205,10 +3459,29 @@ def run_macro(
         help="Arguments CSV pour la macro (ex: '\"hello\",42,3.14,true')",
     ),
     timeout: int = typer.Option(
-        60,
+        0,
         "--timeout",
         "-t",
-        help="Timeout d'exécution en secondes (défaut: 60s)",
+        min=0,
+        help=(
+            "Timeout d'exécution en secondes (défaut: 0 = sans limite) ; "
+            "au-delà, la macro est interrompue, puis Excel est terminé"
+        ),
+    ),
+    args_file: Path | None = typer.Option(
+        None,
+        "--args-file",
+        help=(
+            "Fichier d'appels : une exécution par ligne, arguments au format "
+            "de --args (lignes vides et # ignorées)"
+        ),
+    ),
+    repeat: int = typer.Option(
+        1,
+        "--repeat",
+        "-r",
+        min=1,
+        help="Nombre d'exécutions de chaque appel (mesure des latences)",
     ),
 ) -> None:
     """Exécute une macro VBA (Sub ou Function) avec arguments optionnels.
@@ -2222,6 +3495,14 @@ def run_macro(
       xlmanage run-macro "Module1.GetSum" --args "10,20"
       xlmanage run-macro "Module1.Process" -w "data.xlsm" -a '"Report",true'
       xlmanage run-macro "Module1.LongTask" --timeout 120
+      xlmanage run-macro "Module1.Compute" --args "10,20" --repeat 100
+      xlmanage run-macro "Module1.Process" -w "data.xlsm" --args-file calls.csv
+
+    \b
+    Série d'exécutions (--repeat, --args-file):
+      La macro est résolue une seule fois puis exécutée plusieurs fois dans
+      la même session ; la commande affiche les latences min/médiane/p95/max
+      et le débit.
 
     \b
     Format des arguments (--args):
@@ -2243,8 +3524,27 @@ def run_macro(
                 )
                 raise typer.Exit(code=1)
 
+        # Appels de la série : une ligne du fichier par appel
+        args_list: list[str | None] = [args]
+        if args_file is not None:
+            if args:
+                console.print(
+                    "[red]X[/red] --args et --args-file sont incompatibles",
+                    style="red",
+                )
+                raise typer.Exit(code=1)
+            if not args_file.is_file():
+                console.print(
+                    f"[red]X[/red] Fichier introuvable: {args_file}", style="red"
+                )
+                raise typer.Exit(code=1)
+            args_list = list(read_args_file(args_file))
+            if not args_list:
+                console.print(f"[red]X[/red] Aucun appel dans {args_file}", style="red")
+                raise typer.Exit(code=1)
+
         # Se connecter à Excel (réutiliser instance active ou créer)
-        with ExcelManager() as mgr:
+        with _excel_session() as mgr:
             try:
                 # Essayer de se connecter à une instance active
                 existing = mgr.get_running_instance()
@@ -2268,15 +3568,35 @@ def run_macro(
                 raise typer.Exit(code=1)
 
             # Créer le runner et exécuter la macro
-            runner = MacroRunner(mgr)
+            runner = _manager(MacroRunner, mgr)
+
+            # Surveillance seulement sur demande : au-delà du délai, la
+            # macro est interrompue puis Excel est terminé
+            watch = {"timeout": timeout} if timeout else {}
+
+            if args_file is not None or repeat > 1:
+                console.print(
+                    f"[blue]>[/blue] Exécution de [bold]{macro_name}[/bold] "
+                    f"({len(args_list) * repeat} fois)..."
+                )
+                batch = runner.run_many(
+                    macro_name=macro_name,
+                    workbook=workbook_path,
+                    args_list=args_list,
+                    repeat=repeat,
+                    **watch,
+                )
+                _display_macro_batch(
+                    batch, console, args_list, repeat, detailed=args_file is not None
+                )
+                if not batch.success:
+                    raise typer.Exit(code=1)
+                return
 
             console.print(f"[blue]>[/blue] Exécution de [bold]{macro_name}[/bold]...")
 
-            # Exécuter avec timeout (via signal ou threading selon OS)
-            # Pour simplifier, on exécute directement ici
-            # TODO: Implémenter timeout réel dans une version ultérieure
             result = runner.run(
-                macro_name=macro_name, workbook=workbook_path, args=args
+                macro_name=macro_name, workbook=workbook_path, args=args, **watch
             )
 
             # Afficher le résultat
@@ -2311,6 +3631,259 @@ def run_macro(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def batch(
+    file: str = typer.Argument(
+        ..., help="Fichier JSONL des opérations ('-' pour lire stdin)"
+    ),
+    optimize: bool = typer.Option(
+        False, "--optimize", help="Optimiser Excel (écran + calcul) pendant le batch"
+    ),
+    stop_on_error: bool = typer.Option(
+        False, "--stop-on-error", help="Arrêter au premier échec"
+    ),
+    visible: bool = typer.Option(
+        False, "--visible", help="Rendre Excel visible (defaut)"
+    ),
+    hidden: bool = typer.Option(False, "--hidden", help="Masquer la fenetre Excel"),
+):
+    """Exécute une suite d'opérations dans une seule session Excel.
+
+    Chaque ligne du fichier est un objet JSON {"op", "args", "kwargs", "id"}
+    où "op" désigne une méthode de manager (workbook.open, worksheet.create,
+    table.create, vba.import_module, macro.run...).  Un résultat NDJSON est
+    écrit sur stdout par opération, avec son temps d'exécution, suivi d'une
+    ligne de synthèse.
+
+    Exemples:
+
+        xlmanage batch ops.jsonl --optimize
+
+        cat ops.jsonl | xlmanage batch - --stop-on-error
+
+    Exemple de ligne:
+
+        {"op": "worksheet.create", "kwargs": {"name": "Data"}}
+    """
+    try:
+        from .batch import run_batch
+        from .excel_optimizer import ExcelOptimizer
+        from .operations import execute_operation
+    except ImportError:
+        from xlmanage.batch import run_batch
+        from xlmanage.excel_optimizer import ExcelOptimizer
+        from xlmanage.operations import execute_operation
+
+    # Diagnostics go to stderr so that stdout stays valid NDJSON
+    err_console = Console(stderr=True)
+
+    if file == "-":
+        lines = sys.stdin
+    else:
+        batch_path = Path(file)
+        if not batch_path.exists():
+            err_console.print(f"[red]X[/red] Fichier introuvable : {batch_path}")
+            raise typer.Exit(code=1)
+        lines = batch_path.open(encoding="utf-8")
+
+    total = failed = 0
+    elapsed_ms = 0.0
+
+    try:
+        with _excel_session(
+            visibility=_resolve_visibility(visible, hidden)
+        ) as excel_mgr:
+            if isinstance(excel_mgr, DaemonSession):
+                if optimize:
+                    err_console.print(
+                        "[red]X[/red] --optimize n'est pas disponible avec --daemon"
+                    )
+                    raise typer.Exit(code=1)
+                execute = excel_mgr.client.call
+                scope: Any = nullcontext()
+            else:
+                execute = partial(execute_operation, excel_mgr)
+                scope = ExcelOptimizer(excel_mgr) if optimize else nullcontext()
+
+            with scope:
+                for result in run_batch(lines, execute, stop_on_error=stop_on_error):
+                    total += 1
+                    failed += not result.success
+                    elapsed_ms += result.elapsed_ms
+                    typer.echo(json.dumps(result.to_dict(), ensure_ascii=False))
+
+    except ExcelManageError as e:
+        err_console.print(f"[red]X[/red] Erreur : {e}")
+        raise typer.Exit(code=1)
+
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+
+    summary = {
+        "total": total,
+        "succeeded": total - failed,
+        "failed": failed,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
+    typer.echo(json.dumps({"summary": summary}))
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+pool_app = typer.Typer(help="Traiter des classeurs en parallèle")
+app.add_typer(pool_app, name="pool")
+
+
+@pool_app.command("run")
+def pool_run(
+    file: str = typer.Argument(..., help="Fichier JSONL des opérations"),
+    workbooks: list[Path] = typer.Argument(..., help="Classeurs à traiter"),
+    size: int = typer.Option(
+        None, "--size", "-n", help="Nombre d'instances Excel (defaut : min(4, CPU))"
+    ),
+    retries: int = typer.Option(
+        1, "--retries", help="Relances d'un classeur après un plantage d'Excel"
+    ),
+    no_save: bool = typer.Option(
+        False, "--no-save", help="Ne pas enregistrer les classeurs traités"
+    ),
+    standby: int = typer.Option(
+        0,
+        "--standby",
+        help="Instances Excel préparées d'avance pour remplacer celles qui plantent",
+    ),
+    max_jobs: int = typer.Option(
+        None, "--max-jobs", help="Remplacer une instance après N classeurs"
+    ),
+    max_age: float = typer.Option(
+        None, "--max-age", help="Remplacer une instance après N secondes"
+    ),
+    max_memory: int = typer.Option(
+        None, "--max-memory", help="Remplacer une instance au-delà de N Mo de mémoire"
+    ),
+):
+    """Exécute les mêmes opérations sur plusieurs classeurs en parallèle.
+
+    Lance un pool d'instances Excel isolées (invisibles, distinctes de
+    l'instance active) et répartit les classeurs entre elles.  Chaque
+    classeur est ouvert, traité par les opérations du fichier, enregistré
+    puis fermé.  Dans les opérations, la valeur "{workbook}" est remplacée
+    par le chemin du classeur.  Une instance qui plante est relancée et le
+    classeur est retraité.  Avec --standby K, K instances de remplacement
+    sont démarrées d'avance (profil d'optimisation appliqué), ce qui évite
+    d'attendre le démarrage d'Excel lors d'un remplacement.  --max-jobs,
+    --max-age et --max-memory remplacent entre deux classeurs les instances
+    qui ont trop servi, trop duré ou trop grossi (fuites mémoire d'Excel).
+
+    Un résultat NDJSON est écrit sur stdout par classeur, dans l'ordre de
+    fin de traitement, suivi d'une ligne de synthèse.
+
+    Exemples:
+
+        xlmanage pool run ops.jsonl a.xlsx b.xlsx c.xlsx -n 4
+
+        xlmanage pool run ops.jsonl data/*.xlsx --no-save
+
+        xlmanage pool run ops.jsonl data/*.xlsx --standby 2
+
+        xlmanage pool run ops.jsonl data/*.xlsx --max-jobs 200 --max-memory 1500
+
+    Exemple de ligne:
+
+        {"op": "table.list", "kwargs": {"workbook": "{workbook}"}}
+    """
+    try:
+        from .batch import parse_step, workbook_job
+        from .excel_pool import DEFAULT_POOL_SIZE, ExcelPool
+        from .excel_standby import WarmStandby
+        from .recycle_policy import RecyclePolicy
+    except ImportError:
+        from xlmanage.batch import parse_step, workbook_job
+        from xlmanage.excel_pool import DEFAULT_POOL_SIZE, ExcelPool
+        from xlmanage.excel_standby import WarmStandby
+        from xlmanage.recycle_policy import RecyclePolicy
+
+    # Diagnostics go to stderr so that stdout stays valid NDJSON
+    err_console = Console(stderr=True)
+
+    ops_path = Path(file)
+    if not ops_path.exists():
+        err_console.print(f"[red]X[/red] Fichier introuvable : {ops_path}")
+        raise typer.Exit(code=1)
+
+    # Parse every step before launching Excel: a typo fails fast
+    try:
+        with ops_path.open(encoding="utf-8") as lines:
+            steps = [
+                step
+                for line_number, text in enumerate(lines, start=1)
+                if (step := parse_step(line_number, text)) is not None
+            ]
+    except ExcelManageError as e:
+        err_console.print(f"[red]X[/red] Erreur : {e}")
+        raise typer.Exit(code=1)
+
+    paths = [workbook.resolve() for workbook in workbooks]
+    failed = 0
+    started = time.perf_counter()
+
+    try:
+        recycle = None
+        if max_jobs or max_age or max_memory:
+            recycle = RecyclePolicy(
+                max_jobs=max_jobs,
+                max_age=max_age,
+                max_working_set=max_memory * 1024 * 1024 if max_memory else None,
+            )
+        with ExcelPool(
+            size or DEFAULT_POOL_SIZE,
+            retries=retries,
+            standby=WarmStandby(standby) if standby else None,
+            recycle=recycle,
+        ) as pool:
+            job = workbook_job(steps, save=not no_save)
+            for result in pool.imap_unordered(job, paths):
+                failed += not result.success
+                record: dict[str, Any] = {
+                    "workbook": str(result.item),
+                    "ok": result.success,
+                    "attempts": result.attempts,
+                    "worker": result.worker,
+                }
+                if result.success:
+                    record["result"] = result.result
+                else:
+                    record["error"] = {
+                        "type": result.error_type,
+                        "message": result.error_message,
+                    }
+                record["elapsed_ms"] = round(result.elapsed_ms, 3)
+                typer.echo(json.dumps(record, ensure_ascii=False))
+            recycled, retired = pool.recycled, pool.retired
+            standby_stats = pool.standby_stats
+
+    except ValueError as e:
+        err_console.print(f"[red]X[/red] Erreur : {e}")
+        raise typer.Exit(code=1)
+
+    summary: dict[str, Any] = {
+        "total": len(paths),
+        "succeeded": len(paths) - failed,
+        "failed": failed,
+        "recycled": recycled,
+        "retired": retired,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+    if standby_stats is not None:
+        summary["standby"] = standby_stats.to_dict()
+    typer.echo(json.dumps({"summary": summary}))
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
 def main_entry():
     """Main entry point for xlmanage CLI."""
     app()
@@ -0,0 +1,373 @@
+"""
+COM call instrumentation: counts and latency of IDispatch round trips.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .com_proxy import DispatchProxy, is_com_object
+
+# Upper bounds of the latency histogram buckets, in microseconds
+HISTOGRAM_BOUNDS_US: tuple[float, ...] = (
+    10,
+    50,
+    100,
+    500,
+    1_000,
+    5_000,
+    10_000,
+    50_000,
+    100_000,
+    float("inf"),
+)
+
+# Maximum number of individual calls kept in the JSON trace
+DEFAULT_MAX_EVENTS = 100_000
+
+# Profile collecting the calls of ExcelManager.app, if profiling is enabled
+_active_profile: "ComProfile | None" = None
+
+
+def _histogram_label(bound: float) -> str:
+    return "inf" if bound == float("inf") else f"<={bound:g}us"
+
+
+@dataclass
+class MemberStats:
+    """Aggregated calls to one COM member.
+
+    Attributes:
+        member: Member name (e.g., "Name", "Worksheets")
+        kind: "get", "set", "call" (method or collection call) or "next"
+            (one item fetched while iterating a collection)
+        count: Number of calls
+        total: Cumulated time in seconds
+        max: Slowest call in seconds
+        histogram: Number of calls per latency bucket (HISTOGRAM_BOUNDS_US)
+    """
+
+    member: str
+    kind: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    histogram: list[int] = field(default_factory=lambda: [0] * len(HISTOGRAM_BOUNDS_US))
+
+    @property
+    def mean(self) -> float:
+        """Average call time in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Record one call of the given duration (seconds)."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        micros = elapsed * 1_000_000
+        for index, bound in enumerate(HISTOGRAM_BOUNDS_US):
+            if micros <= bound:
+                self.histogram[index] += 1
+                break
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON record of these statistics."""
+        return {
+            "member": self.member,
+            "kind": self.kind,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_us": round(self.mean * 1_000_000, 1),
+            "max_us": round(self.max * 1_000_000, 1),
+            "histogram": {
+                _histogram_label(bound): n
+                for bound, n in zip(HISTOGRAM_BOUNDS_US, self.histogram, strict=True)
+                if n
+            },
+        }
+
+
+class ComProfile:
+    """Recorder of the COM calls made through profiled objects.
+
+    Objects wrapped with wrap() report every property get, property set
+    and method call to this profile, along with its duration. Objects
+    returned by those calls are wrapped as well, so profiling the
+    Application object covers the whole object model reached from it.
+
+    Example:
+        >>> profile = ComProfile()
+        >>> with profiling(profile):
+        ...     WorksheetManager(mgr).list()
+        >>> for stats in profile.top(5):
+        ...     print(stats.member, stats.kind, stats.count)
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        """Initialize an empty profile.
+
+        Args:
+            max_events: Maximum number of individual calls kept for the
+                JSON trace. Aggregated statistics are always complete.
+        """
+        self.max_events = max_events
+        self.started = datetime.now()
+        self._origin = time.perf_counter()
+        self._stats: dict[tuple[str, str], MemberStats] = {}
+        self._events: list[tuple[float, str, str, float]] = []
+        self.events_dropped = 0
+        # Member -> [attempts made again, seconds waited] (com_retry)
+        self._retries: dict[str, list[float]] = {}
+
+    def wrap(self, obj: Any, member: str = "Application") -> Any:
+        """Return a profiled proxy of a COM object.
+
+        Args:
+            obj: COM object (CDispatch or in-memory equivalent)
+            member: Member name the object was obtained from
+
+        Returns:
+            ProfiledDispatch forwarding to obj, or obj itself if it is
+            already profiled
+        """
+        if isinstance(obj, ProfiledDispatch):
+            return obj
+        return ProfiledDispatch(obj, self, member)
+
+    def record(self, member: str, kind: str, started: float, elapsed: float) -> None:
+        """Record one COM call.
+
+        Args:
+            member: Member name
+            kind: "get", "set", "call" or "next"
+            started: time.perf_counter() value when the call started
+            elapsed: Duration of the call in seconds
+        """
+        key = (member, kind)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = MemberStats(member, kind)
+        stats.add(elapsed)
+        if len(self._events) < self.max_events:
+            self._events.append((started - self._origin, member, kind, elapsed))
+        else:
+            self.events_dropped += 1
+
+    def record_retry(self, member: str | None, wait: float) -> None:
+        """Record one call refused by a busy server and made again.
+
+        The wait is part of the duration recorded for the call itself.
+
+        Args:
+            member: Member name, or None for a retry made by the COM
+                message filter (member unknown)
+            wait: Seconds waited before the new attempt
+        """
+        entry = self._retries.setdefault(member or "(message filter)", [0, 0.0])
+        entry[0] += 1
+        entry[1] += wait
+
+    @property
+    def total_calls(self) -> int:
+        """Number of COM calls recorded."""
+        return sum(stats.count for stats in self._stats.values())
+
+    @property
+    def total_retries(self) -> int:
+        """Number of calls refused by a busy server and made again."""
+        return int(sum(count for count, _ in self._retries.values()))
+
+    @property
+    def total_retry_wait(self) -> float:
+        """Time spent waiting for a busy server, in seconds."""
+        return sum(wait for _, wait in self._retries.values())
+
+    def retries(self) -> dict[str, tuple[int, float]]:
+        """Return the retries per member: (attempts, seconds waited)."""
+        return {
+            member: (int(count), wait)
+            for member, (count, wait) in self._retries.items()
+        }
+
+    @property
+    def total_time(self) -> float:
+        """Time spent in COM calls, in seconds."""
+        return sum(stats.total for stats in self._stats.values())
+
+    def stats(self) -> list[MemberStats]:
+        """Return the statistics of every member, most expensive first."""
+        return sorted(
+            self._stats.values(), key=lambda s: (s.total, s.count), reverse=True
+        )
+
+    def count(self, member: str, kind: str | None = None) -> int:
+        """Return the number of calls to a member.
+
+        Args:
+            member: Member name
+            kind: Only count this kind of call (all kinds if None)
+        """
+        return sum(
+            stats.count
+            for (name, stats_kind), stats in self._stats.items()
+            if name == member and (kind is None or stats_kind == kind)
+        )
+
+    def top(self, n: int = 15, by: str = "time") -> list[MemberStats]:
+        """Return the n members with the highest cost.
+
+        Args:
+            n: Number of members to return
+            by: "time" (cumulated duration) or "count" (number of calls)
+
+        Raises:
+            ValueError: If by is neither "time" nor "count"
+        """
+        if by == "time":
+            return self.stats()[:n]
+        if by == "count":
+            return sorted(
+                self._stats.values(), key=lambda s: (s.count, s.total), reverse=True
+            )[:n]
+        raise ValueError(f"unknown sort key: {by!r}")
+
+    def to_dict(self, command: str | None = None) -> dict[str, Any]:
+        """Return the JSON trace of the profile.
+
+        Args:
+            command: Command line being profiled, stored in the trace
+
+        Returns:
+            Dict with the totals, per-member statistics and the list of
+            individual calls as [offset_ms, member, kind, duration_us]
+        """
+        return {
+            "command": command,
+            "started": self.started.isoformat(timespec="seconds"),
+            "elapsed_ms": round((time.perf_counter() - self._origin) * 1000, 3),
+            "total_calls": self.total_calls,
+            "com_time_ms": round(self.total_time * 1000, 3),
+            "members": [stats.to_dict() for stats in self.stats()],
+            "retries": self.total_retries,
+            "retry_wait_ms": round(self.total_retry_wait * 1000, 3),
+            "retried_members": {
+                member: {"count": count, "wait_ms": round(wait * 1000, 3)}
+                for member, (count, wait) in self.retries().items()
+            },
+            "events": [
+                [round(offset * 1000, 3), member, kind, round(elapsed * 1_000_000, 1)]
+                for offset, member, kind, elapsed in self._events
+            ],
+            "events_dropped": self.events_dropped,
+        }
+
+    def write(self, path: Path, command: str | None = None) -> None:
+        """Write the JSON trace of the profile to a file.
+
+        Args:
+            path: Output file
+            command: Command line being profiled, stored in the trace
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(command), f, indent=2)
+            f.write("\n")
+
+
+class ProfiledDispatch(DispatchProxy):
+    """Proxy recording the COM calls made on an object.
+
+    Attribute reads are recorded as "get" and attribute writes as "set".
+    Reading a method returns a callable recorded as "call" when invoked;
+    calling the proxy itself (``wb.Worksheets("Data")``) is recorded as a
+    "call" of the member the proxy was obtained from, and each item
+    fetched while iterating it as a "next". COM objects returned by any
+    of those are profiled proxies in turn, and proxies passed back as
+    arguments are unwrapped before reaching COM.
+    """
+
+    __slots__ = ("_profile",)
+
+    def __init__(self, target: Any, profile: ComProfile, member: str):
+        super().__init__(target, member)
+        object.__setattr__(self, "_profile", profile)
+
+    def _invoke(
+        self, kind: str, member: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            value = func(*args)
+        except StopIteration:
+            self._profile.record(member, kind, started, time.perf_counter() - started)
+            raise
+        if kind != "iter":
+            self._profile.record(member, kind, started, time.perf_counter() - started)
+        return value
+
+    def _get(self, name: str) -> Any:
+        started = time.perf_counter()
+        value = getattr(self._target, name)
+        elapsed = time.perf_counter() - started
+        # Reading a method is recorded when it is called
+        if is_com_object(value) or not callable(value):
+            self._profile.record(name, "get", started, elapsed)
+        return value
+
+    def _wrap(self, value: Any, member: str) -> Any:
+        return self._profile.wrap(value, member)
+
+
+def current_profile() -> ComProfile | None:
+    """Return the profile enabled with profiling(), if any."""
+    return _active_profile
+
+
+@contextmanager
+def profiling(profile: ComProfile | None = None) -> Iterator[ComProfile]:
+    """Profile the COM calls made through ExcelManager.app.
+
+    While the context is active, ExcelManager.app returns a profiled proxy
+    of the Application object, so every manager built on it is measured
+    without any change.
+
+    Args:
+        profile: Profile receiving the calls (a new one if None)
+
+    Yields:
+        ComProfile: The active profile
+
+    Example:
+        >>> with profiling() as profile:
+        ...     TableManager(mgr).list()
+        >>> profile.count("ListObjects")
+        3
+    """
+    global _active_profile
+    profile = profile if profile is not None else ComProfile()
+    previous = _active_profile
+    _active_profile = profile
+    try:
+        yield profile
+    finally:
+        _active_profile = previous
@@ -0,0 +1,157 @@
+"""
+Base of the proxies adding behaviour to every COM call of an object.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+
+def is_com_object(value: Any) -> bool:
+    """Tell whether a value is a COM object, bare or behind a proxy."""
+    return isinstance(value, DispatchProxy) or hasattr(value, "_oleobj_")
+
+
+class DispatchProxy:
+    """Proxy routing every COM round trip of an object through _invoke().
+
+    Attribute reads ("get"), attribute writes ("set"), method calls and
+    calls of the proxy itself (``wb.Worksheets("Data")``, "call"), and
+    each step of an iteration ("iter", then "next") are one round trip
+    each.  COM objects returned by any of those go through _wrap(), and
+    proxies of the same class passed back as arguments are unwrapped
+    before reaching COM.  Proxies of another class are left alone, so
+    that proxies can be stacked (e.g., profiled calls that are retried).
+
+    Subclasses implement _invoke() and _wrap(), and may override _get()
+    to time attribute reads differently from the other calls.
+    """
+
+    __slots__ = ("_target", "_member")
+    # COM object (or inner proxy) behind the proxy, and the member it was
+    # obtained from
+    _target: Any
+    _member: str
+
+    def __init__(self, target: Any, member: str):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_member", member)
+
+    def _invoke(
+        self, kind: str, member: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Make one COM round trip: return func(*args).
+
+        Args:
+            kind: "get", "set", "call", "iter" or "next"
+            member: COM member name the round trip belongs to
+            func: Function making the round trip
+            *args: Arguments of func
+        """
+        raise NotImplementedError
+
+    def _wrap(self, value: Any, member: str) -> Any:
+        """Return a proxy of a COM object obtained from member."""
+        raise NotImplementedError
+
+    def _get(self, name: str) -> Any:
+        """Read an attribute of the target (a "get" round trip)."""
+        return self._invoke("get", name, getattr, self._target, name)
+
+    @classmethod
+    def _unwrap(cls, value: Any) -> Any:
+        """Return the object behind a proxy of this class."""
+        if isinstance(value, cls):
+            return object.__getattribute__(value, "_target")
+        return value
+
+    def _wrap_result(self, value: Any, member: str) -> Any:
+        if is_com_object(value):
+            return self._wrap(self._unwrap(value), member)
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            return getattr(self._target, name)
+        value = self._get(name)
+        if is_com_object(value):
+            return self._wrap(self._unwrap(value), name)
+        if callable(value):
+            return ProxyMethod(self, value, name)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._invoke("set", name, setattr, self._target, name, self._unwrap(value))
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        args = tuple(self._unwrap(a) for a in args)
+        kwargs = {k: self._unwrap(v) for k, v in kwargs.items()}
+        target = self._target
+        value = self._invoke("call", self._member, lambda: target(*args, **kwargs))
+        return self._wrap_result(value, "Item")
+
+    def __iter__(self) -> Iterator[Any]:
+        iterator = self._invoke("iter", self._member, iter, self._target)
+        while True:
+            try:
+                item = self._invoke("next", self._member, next, iterator)
+            except StopIteration:
+                return
+            yield self._wrap_result(item, "Item")
+
+    def __len__(self) -> int:
+        count: int = self._invoke("get", "Count", len, self._target)
+        return count
+
+    def __getitem__(self, index: Any) -> Any:
+        value = self._invoke(
+            "call", self._member, self._target.__getitem__, self._unwrap(index)
+        )
+        return self._wrap_result(value, "Item")
+
+    def __bool__(self) -> bool:
+        # Like CDispatch: a COM object is always true, never ask for Count
+        return True
+
+    def __eq__(self, other: object) -> bool:
+        equal: bool = self._target == self._unwrap(other)
+        return equal
+
+    def __hash__(self) -> int:
+        return hash(self._target)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._member}: {self._target!r}>"
+
+
+class ProxyMethod:
+    """Bound COM method of a DispatchProxy, invoked as a "call"."""
+
+    __slots__ = ("_proxy", "_method", "_member")
+
+    def __init__(self, proxy: DispatchProxy, method: Any, member: str):
+        self._proxy = proxy
+        self._method = method
+        self._member = member
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        proxy = self._proxy
+        args = tuple(proxy._unwrap(a) for a in args)
+        kwargs = {k: proxy._unwrap(v) for k, v in kwargs.items()}
+        method = self._method
+        value = proxy._invoke("call", self._member, lambda: method(*args, **kwargs))
+        return proxy._wrap_result(value, self._member)
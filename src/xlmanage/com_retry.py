@@ -0,0 +1,454 @@
+"""
+COM retry policy: busy and rejected calls retried with backoff.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import pythoncom
+    import pywintypes
+    from win32com.server.util import wrap as _wrap_server
+except ImportError:
+    # Without pywin32, no message filter and a stand-in COM error type
+    from . import _compat as pywintypes
+
+    pythoncom = None
+    _wrap_server = None
+
+from .com_profiler import current_profile
+from .com_proxy import DispatchProxy
+
+logger = logging.getLogger(__name__)
+
+# Call rejected by the server, e.g. while a modal dialog is open (0x80010001)
+RPC_E_CALL_REJECTED: int = -2147418111
+# Server busy, call it again later (0x8001010A)
+RPC_E_SERVERCALL_RETRYLATER: int = -2147417846
+# Excel busy, e.g. a cell is being edited (0x800AC472)
+VBA_E_IGNORE: int = -2146777998
+
+# HRESULTs of calls that did not run and can be made again, unsigned
+RETRYABLE_HRESULTS: frozenset[int] = frozenset(
+    hresult & 0xFFFFFFFF
+    for hresult in (RPC_E_CALL_REJECTED, RPC_E_SERVERCALL_RETRYLATER, VBA_E_IGNORE)
+)
+
+# Default retry settings (seconds)
+DEFAULT_INITIAL_DELAY: float = 0.05
+DEFAULT_MAX_DELAY: float = 2.0
+DEFAULT_DEADLINE: float = 30.0
+
+# IMessageFilter return values
+_SERVERCALL_ISHANDLED = 0
+_PENDINGMSG_WAITDEFPROCESS = 2
+# RetryRejectedCall: below 100, COM retries at once instead of waiting
+_MIN_FILTER_DELAY_MS = 100
+
+# Policy applied to ExcelManager.app in each thread, if retrying is enabled
+_thread_policies = threading.local()
+
+# Message filter registered in each thread
+_thread_filters = threading.local()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tell whether a COM error means the call was refused by a busy server.
+
+    Such a call did not run: making it again is safe.
+    """
+    if not isinstance(error, pywintypes.com_error):
+        return False
+    return (error.hresult & 0xFFFFFFFF) in RETRYABLE_HRESULTS
+
+
+@dataclass
+class RetryStats:
+    """Retries made by a policy.
+
+    Attributes:
+        retries: Calls made again after a busy or rejected error
+        wait_time: Seconds slept between those attempts
+        gave_up: Calls that still failed at the deadline
+        filter_retries: Rejected calls retried by the message filter
+        filter_wait: Seconds the message filter asked COM to wait
+    """
+
+    retries: int = 0
+    wait_time: float = 0.0
+    gave_up: int = 0
+    filter_retries: int = 0
+    filter_wait: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON record of these statistics."""
+        return {
+            "retries": self.retries,
+            "wait_ms": round(self.wait_time * 1000, 3),
+            "gave_up": self.gave_up,
+            "filter_retries": self.filter_retries,
+            "filter_wait_ms": round(self.filter_wait * 1000, 3),
+        }
+
+
+class RetryPolicy:
+    """Retries COM calls refused by a busy Excel, with exponential backoff.
+
+    While Excel recalculates, runs a macro or shows a modal dialog, it
+    refuses incoming calls with RPC_E_CALL_REJECTED,
+    RPC_E_SERVERCALL_RETRYLATER or VBA_E_IGNORE.  Such a call did not
+    run: the policy makes it again after a delay doubling at each
+    attempt (``initial_delay``, 2 x ``initial_delay``...), capped at
+    ``max_delay`` and spread by ``jitter`` so that several clients do
+    not retry in step.  A call still refused ``deadline`` seconds after
+    its first refusal fails with the last error.
+
+    Two layers apply a policy:
+
+    - The message filter (message_filter()) is the IMessageFilter COM
+      consults in single-threaded apartments before failing a rejected
+      call; it waits and retries inside COM.
+    - RetryingDispatch retries the calls failing anyway (no filter in
+      the thread, VBA_E_IGNORE, which the filter never sees).
+
+    Inside a retrying() context, ExcelManager.app returns a
+    RetryingDispatch and ExcelManager.start() registers the message
+    filter, so every manager is covered without any change.
+
+    Example:
+        >>> with retrying(RetryPolicy(deadline=60)) as policy:
+        ...     WorkbookManager(mgr).open(path)
+        >>> policy.stats.retries
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = DEFAULT_INITIAL_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        deadline: float = DEFAULT_DEADLINE,
+        multiplier: float = 2.0,
+        jitter: float = 0.2,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        """Initialize a policy.
+
+        Args:
+            initial_delay: Wait before the first retry, in seconds
+            max_delay: Longest wait between two attempts, in seconds
+            deadline: Seconds after the first refusal at which a call
+                still refused fails
+            multiplier: Growth of the wait at each attempt
+            jitter: Relative spread of each wait (0.2: +/- 20 %)
+            sleep: Function waiting between attempts
+            clock: Monotonic clock measuring the deadline
+            rng: Random generator of the jitter
+
+        Raises:
+            ValueError: If a delay or the deadline is not positive, the
+                multiplier is below 1 or the jitter outside [0, 1)
+        """
+        for name, value in (
+            ("initial_delay", initial_delay),
+            ("max_delay", max_delay),
+            ("deadline", deadline),
+        ):
+            if value <= 0:
+                raise ValueError(f"{name} must be > 0 (got {value})")
+        if multiplier < 1:
+            raise ValueError(f"multiplier must be >= 1 (got {multiplier})")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"jitter must be in [0, 1) (got {jitter})")
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.stats = RetryStats()
+        self._sleep = sleep
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def delay(self, attempt: int) -> float:
+        """Return the wait before a retry.
+
+        Args:
+            attempt: Number of attempts already failed (1 for the first)
+
+        Returns:
+            Seconds to wait, jitter included
+        """
+        base = min(
+            self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1)
+        )
+        if self.jitter:
+            base *= 1 + self.jitter * (2 * self._rng.random() - 1)
+        return base
+
+    def call(self, func: Callable[..., Any], *args: Any, member: str = "") -> Any:
+        """Call a function, retrying while the COM server is busy.
+
+        Args:
+            func: COM call to make (e.g., a bound method or getattr)
+            *args: Arguments of func
+            member: COM member name, reported to the active profile
+
+        Returns:
+            The value returned by func
+
+        Raises:
+            pywintypes.com_error: The last error if the call is still
+                refused at the deadline, any other COM error at once
+        """
+        started = None
+        attempt = 0
+        while True:
+            try:
+                return func(*args)
+            except pywintypes.com_error as e:
+                if not is_retryable(e):
+                    raise
+                now = self._clock()
+                if started is None:
+                    started = now
+                attempt += 1
+                remaining = self.deadline - (now - started)
+                if remaining <= 0:
+                    with self._lock:
+                        self.stats.gave_up += 1
+                    logger.warning(
+                        "COM call %s still refused after %d attempts (%.1f s)",
+                        member or "?",
+                        attempt,
+                        now - started,
+                    )
+                    raise
+                wait = min(self.delay(attempt), remaining)
+            logger.debug(
+                "COM call %s refused (server busy), retry %d in %.3f s",
+                member or "?",
+                attempt,
+                wait,
+            )
+            self._sleep(wait)
+            with self._lock:
+                self.stats.retries += 1
+                self.stats.wait_time += wait
+            profile = current_profile()
+            if profile is not None:
+                profile.record_retry(member or None, wait)
+
+    def filter_delay(self, elapsed_ms: int) -> int:
+        """Return the answer of the message filter to a rejected call.
+
+        COM calls RetryRejectedCall each time the server refuses a call,
+        with the milliseconds elapsed since the first attempt; the wait
+        grows with them, like the backoff of call().
+
+        Args:
+            elapsed_ms: Milliseconds since the call was first made
+
+        Returns:
+            Milliseconds COM waits before retrying, or -1 to fail the
+            call (deadline reached)
+        """
+        elapsed = elapsed_ms / 1000
+        if elapsed >= self.deadline:
+            with self._lock:
+                self.stats.gave_up += 1
+            return -1
+        wait = max(self.initial_delay, elapsed * (self.multiplier - 1))
+        wait = min(wait, self.max_delay, self.deadline - elapsed)
+        wait_ms = max(_MIN_FILTER_DELAY_MS, int(wait * 1000))
+        with self._lock:
+            self.stats.filter_retries += 1
+            self.stats.filter_wait += wait_ms / 1000
+        profile = current_profile()
+        if profile is not None:
+            profile.record_retry(None, wait_ms / 1000)
+        return wait_ms
+
+    def wrap(self, obj: Any, member: str = "Application") -> Any:
+        """Return a proxy of a COM object retrying its calls with this policy.
+
+        Args:
+            obj: COM object (CDispatch or in-memory equivalent)
+            member: Member name the object was obtained from
+
+        Returns:
+            RetryingDispatch forwarding to obj, or obj itself if it is
+            already wrapped
+        """
+        if isinstance(obj, RetryingDispatch):
+            return obj
+        return RetryingDispatch(obj, self, member)
+
+
+class RetryingDispatch(DispatchProxy):
+    """Proxy retrying the COM calls refused by a busy server.
+
+    Attribute reads and writes, method calls, calls of the proxy itself
+    (``wb.Worksheets("Data")``), indexing and each step of an iteration
+    go through RetryPolicy.call().  COM objects returned by any of those
+    are proxies in turn, and proxies passed back as arguments are
+    unwrapped before reaching COM.
+    """
+
+    __slots__ = ("_policy",)
+
+    def __init__(self, target: Any, policy: RetryPolicy, member: str = "Application"):
+        super().__init__(target, member)
+        object.__setattr__(self, "_policy", policy)
+
+    def _invoke(
+        self, kind: str, member: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        return self._policy.call(func, *args, member=member)
+
+    def _wrap(self, value: Any, member: str) -> Any:
+        return self._policy.wrap(value, member)
+
+
+class MessageFilter:
+    """IMessageFilter answering rejected calls from a RetryPolicy.
+
+    Registered with CoRegisterMessageFilter in a single-threaded
+    apartment, it is asked by COM what to do each time Excel refuses a
+    call: wait and retry (RetryPolicy.filter_delay()) or fail.
+    """
+
+    _com_interfaces_ = [pythoncom.IID_IMessageFilter] if pythoncom else []
+    _public_methods_ = ["HandleInComingCall", "RetryRejectedCall", "MessagePending"]
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+
+    # Method names are those of the COM interface IMessageFilter
+    def HandleInComingCall(self, call_type, caller, tick_count, interface_info):  # noqa: N802
+        return _SERVERCALL_ISHANDLED
+
+    def RetryRejectedCall(self, callee, tick_count, reject_type):  # noqa: N802
+        return self.policy.filter_delay(tick_count)
+
+    def MessagePending(self, callee, tick_count, pending_type):  # noqa: N802
+        return _PENDINGMSG_WAITDEFPROCESS
+
+
+def ensure_message_filter(policy: RetryPolicy) -> bool:
+    """Register the message filter of a policy in the current thread.
+
+    The filter is registered once per thread; later calls only switch it
+    to the given policy.  COM must be initialized in the thread.
+
+    Args:
+        policy: Policy answering the rejected calls
+
+    Returns:
+        True if a filter is registered, False if not possible (no
+        pywin32, or a multithreaded apartment)
+    """
+    current = getattr(_thread_filters, "filter", None)
+    if current is not None:
+        current.policy = policy
+        return True
+    if pythoncom is None:
+        return False
+    message_filter = MessageFilter(policy)
+    try:
+        previous = pythoncom.CoRegisterMessageFilter(
+            _wrap_server(message_filter, pythoncom.IID_IMessageFilter)
+        )
+    except pywintypes.com_error:
+        logger.debug("Message filter not registered", exc_info=True)
+        return False
+    _thread_filters.filter = message_filter
+    _thread_filters.previous = previous
+    return True
+
+
+def revoke_message_filter() -> None:
+    """Restore the message filter the current thread had before."""
+    if getattr(_thread_filters, "filter", None) is None:
+        return
+    previous = _thread_filters.previous
+    _thread_filters.filter = _thread_filters.previous = None
+    if pythoncom is not None:
+        try:
+            pythoncom.CoRegisterMessageFilter(previous)
+        except pywintypes.com_error:
+            logger.debug("Message filter not revoked", exc_info=True)
+
+
+def current_retry_policy() -> RetryPolicy | None:
+    """Return the policy enabled with retrying() in this thread, if any."""
+    return getattr(_thread_policies, "policy", None)
+
+
+def retrying_dispatch(obj: Any) -> Any:
+    """Return obj retrying its calls with the thread's policy, if any."""
+    policy = current_retry_policy()
+    if policy is None:
+        return obj
+    return policy.wrap(obj)
+
+
+@contextmanager
+def retrying(policy: RetryPolicy | None = None) -> Iterator[RetryPolicy]:
+    """Retry the COM calls made through ExcelManager.app.
+
+    While the context is active, ExcelManager.app returns a
+    RetryingDispatch and ExcelManager.start() registers the message
+    filter in its thread; the filter is also registered in the current
+    thread for the duration of the context.  The policy only applies to
+    the current thread: threads started inside the context are not
+    affected unless they enter retrying() themselves.
+
+    Args:
+        policy: Policy to apply (a default RetryPolicy if None)
+
+    Yields:
+        RetryPolicy: The active policy, whose stats count the retries
+
+    Example:
+        >>> with retrying() as policy:
+        ...     RangeManager(mgr).write("Data", "A1", rows)
+        >>> print(policy.stats.retries, policy.stats.wait_time)
+    """
+    policy = policy if policy is not None else RetryPolicy()
+    previous = current_retry_policy()
+    had_filter = getattr(_thread_filters, "filter", None) is not None
+    previous_filter_policy = _thread_filters.filter.policy if had_filter else None
+    _thread_policies.policy = policy
+    ensure_message_filter(policy)
+    try:
+        yield policy
+    finally:
+        _thread_policies.policy = previous
+        if had_filter:
+            _thread_filters.filter.policy = previous_filter_policy
+        else:
+            revoke_message_filter()
@@ -0,0 +1,78 @@
+"""
+Hand-off of COM references between threads (apartments).
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from typing import Any
+
+try:
+    import pythoncom
+    import win32com.client
+    from win32com.client import CDispatch
+except ImportError:
+    # Without pywin32, only in-process objects such as FakeExcel are handed
+    # out, and they need no marshaling
+    CDispatch = Any
+    pythoncom = None
+
+
+class Marshaled:
+    """COM reference marshaled by a thread for use by another one.
+
+    The stream can be unmarshaled once: each receiving thread needs its
+    own marshal_dispatch() token.
+    """
+
+    def __init__(self, stream: Any):
+        self.stream = stream
+
+
+def marshal_dispatch(app: CDispatch) -> Any:
+    """Prepare a COM object for use from another thread.
+
+    A COM reference belongs to the apartment (thread) that created it;
+    another thread gets its own proxy through a marshaling stream.
+    Objects that are not COM references (FakeExcel) pass through.
+
+    Args:
+        app: COM object created or unmarshaled by the calling thread
+
+    Returns:
+        Token to hand to unmarshal_dispatch() in the receiving thread
+    """
+    oleobj = getattr(app, "_oleobj_", None)
+    if pythoncom is None or oleobj is None:
+        return app
+    return Marshaled(
+        pythoncom.CoMarshalInterThreadInterfaceInStream(pythoncom.IID_IDispatch, oleobj)
+    )
+
+
+def unmarshal_dispatch(token: Any) -> CDispatch:
+    """Get the COM object of a marshal_dispatch() token in this thread.
+
+    Args:
+        token: Value returned by marshal_dispatch() in another thread
+
+    Returns:
+        CDispatch: Proxy usable from the calling thread
+    """
+    if not isinstance(token, Marshaled):
+        return token
+    return win32com.client.Dispatch(
+        pythoncom.CoGetInterfaceAndReleaseStream(token.stream, pythoncom.IID_IDispatch)
+    )
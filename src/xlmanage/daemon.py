@@ -0,0 +1,756 @@
+"""
+Persistent xlmanage daemon keeping a warm COM connection across CLI calls.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import getpass
+import importlib
+import json
+import logging
+import os
+import secrets
+import stat
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+try:
+    import pythoncom
+except ImportError:
+    pythoncom = None
+
+if TYPE_CHECKING:
+    # On Windows, Client() may return a PipeConnection (named pipes)
+    if sys.platform == "win32":
+        from multiprocessing.connection import PipeConnection
+
+        ClientConnection = Connection | PipeConnection
+    else:
+        ClientConnection = Connection
+
+from .excel_manager import ExcelManager
+from .exceptions import (
+    DaemonAlreadyRunningError,
+    DaemonConnectionError,
+    ExcelManageError,
+    OperationError,
+)
+from .instance_registry import InstanceRegistry
+from .operations import MANAGER_KEYS, coerce_arguments, execute_operation
+
+logger = logging.getLogger(__name__)
+
+# Environment variables understood by the daemon and its clients
+DAEMON_ADDRESS_ENV: str = "XLMANAGE_DAEMON_ADDRESS"
+DAEMON_AUTHKEY_ENV: str = "XLMANAGE_DAEMON_AUTHKEY"
+
+DEFAULT_SESSION: str = "default"
+
+# File of the per-user daemon key, in _runtime_dir()
+AUTHKEY_FILE: str = "daemon.key"
+
+
+def _runtime_dir() -> Path:
+    """Return the private per-user directory of the daemon socket and key.
+
+    Windows uses ``%LOCALAPPDATA%\\xlmanage``, protected by the profile
+    ACLs.  Other platforms use ``$XDG_RUNTIME_DIR/xlmanage``, or
+    ``xlmanage-<user>`` in the temporary directory, created with mode 0700.
+
+    Returns:
+        Path: Existing directory only accessible to the current user
+
+    Raises:
+        PermissionError: If the directory is a symlink or belongs to
+            another user (e.g., planted in the shared temporary directory)
+    """
+    if sys.platform == "win32":
+        directory = Path(os.environ.get("LOCALAPPDATA") or Path.home()) / "xlmanage"
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        directory = Path(base) / "xlmanage"
+    else:
+        directory = Path(tempfile.gettempdir()) / f"xlmanage-{getpass.getuser()}"
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    info = directory.lstat()
+    if stat.S_ISLNK(info.st_mode) or info.st_uid != os.getuid():
+        raise PermissionError(f"{directory} is not owned by the current user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        directory.chmod(0o700)
+    return directory
+
+
+def default_address() -> str:
+    """Return the default daemon address for the current user.
+
+    Windows uses a named pipe, other platforms a Unix domain socket in the
+    private directory of the user.  ``XLMANAGE_DAEMON_ADDRESS`` overrides
+    both.
+
+    Returns:
+        str: Named pipe path or socket path
+    """
+    override = os.environ.get(DAEMON_ADDRESS_ENV)
+    if override:
+        return override
+
+    if sys.platform == "win32":
+        return rf"\\.\pipe\xlmanage-{getpass.getuser()}"
+    return str(_runtime_dir() / "daemon.sock")
+
+
+def _address_family(address: str) -> str:
+    """Return the multiprocessing.connection family for an address."""
+    if address.startswith("\\\\.\\pipe\\"):
+        return "AF_PIPE"
+    return "AF_UNIX"
+
+
+def _authkey() -> bytes:
+    """Return the shared secret used to authenticate daemon clients.
+
+    ``XLMANAGE_DAEMON_AUTHKEY`` takes precedence.  Otherwise the key is
+    read from AUTHKEY_FILE in the user's private directory; the first
+    caller (daemon or client) generates it, readable by its owner only.
+    """
+    override = os.environ.get(DAEMON_AUTHKEY_ENV)
+    if override:
+        return override.encode("utf-8")
+
+    path = _runtime_dir() / AUTHKEY_FILE
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Created by another process, maybe still being written
+        for _ in range(20):
+            key = path.read_bytes().strip()
+            if key:
+                return key
+            time.sleep(0.05)
+        raise PermissionError(f"Empty daemon key file: {path}") from None
+
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+# ---------------------------------------------------------------------------
+# Wire format: JSON with type tags for values JSON cannot represent
+# ---------------------------------------------------------------------------
+
+
+def encode(value: Any) -> Any:
+    """Encode a Python value into tagged JSON-compatible data.
+
+    Paths, datetimes, tuples and xlmanage dataclasses are tagged so that
+    decode() restores the exact types the CLI display code expects.
+
+    Args:
+        value: Value to encode (operation argument or result)
+
+    Returns:
+        JSON-compatible structure
+    """
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, Path):
+        return {"__path__": str(value)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, tuple):
+        return {"__tuple__": [encode(v) for v in value]}
+    if isinstance(value, list):
+        return [encode(v) for v in value]
+    if isinstance(value, dict):
+        return {"__dict__": [[encode(k), encode(v)] for k, v in value.items()]}
+    if is_dataclass(value) and not isinstance(value, type):
+        cls = type(value)
+        return {
+            "__dataclass__": f"{cls.__module__}:{cls.__qualname__}",
+            "fields": {f.name: encode(getattr(value, f.name)) for f in fields(value)},
+        }
+    if isinstance(value, BaseException):
+        return _encode_error(value)
+    return str(value)
+
+
+def resolve_paths(value: Any) -> Any:
+    """Make the paths of an operation argument absolute, client side.
+
+    The daemon runs in its own working directory: a relative path sent as
+    is would be resolved against it, not against the caller's.
+
+    Args:
+        value: Operation argument (paths may be nested in lists, tuples
+            and dicts)
+
+    Returns:
+        The same value with every Path resolved
+    """
+    if isinstance(value, Path):
+        return value.resolve()
+    if isinstance(value, tuple):
+        return tuple(resolve_paths(v) for v in value)
+    if isinstance(value, list):
+        return [resolve_paths(v) for v in value]
+    if isinstance(value, dict):
+        return {k: resolve_paths(v) for k, v in value.items()}
+    return value
+
+
+def decode(value: Any) -> Any:
+    """Decode data produced by encode().
+
+    Args:
+        value: JSON-compatible structure
+
+    Returns:
+        Restored Python value
+    """
+    if isinstance(value, list):
+        return [decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__tuple__" in value:
+        return tuple(decode(v) for v in value["__tuple__"])
+    if "__dict__" in value:
+        return {decode(k): decode(v) for k, v in value["__dict__"]}
+    if "__dataclass__" in value:
+        cls = _resolve_xlmanage_type(value["__dataclass__"])
+        kwargs = {k: decode(v) for k, v in value["fields"].items()}
+        if cls is None:
+            return kwargs
+        return cls(**kwargs)
+    if "__error__" in value:
+        return _decode_error(value)
+    return {k: decode(v) for k, v in value.items()}
+
+
+def _resolve_xlmanage_type(qualified: str) -> type | None:
+    """Resolve "module:QualName" to a class, restricted to xlmanage modules.
+
+    Args:
+        qualified: Qualified type name produced by encode()
+
+    Returns:
+        The class, or None if it is outside xlmanage or cannot be found
+    """
+    module_name, _, qualname = qualified.partition(":")
+    if module_name != "xlmanage" and not module_name.startswith("xlmanage."):
+        return None
+    try:
+        obj: Any = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            obj = getattr(obj, part)
+    except (ImportError, AttributeError):
+        return None
+    return obj if isinstance(obj, type) else None
+
+
+def _encode_error(exc: BaseException) -> dict[str, Any]:
+    """Encode an exception with its attributes so the client can re-raise it."""
+    cls = type(exc)
+    return {
+        "__error__": f"{cls.__module__}:{cls.__qualname__}",
+        "message": str(exc),
+        "attrs": {k: encode(v) for k, v in vars(exc).items()},
+    }
+
+
+def _decode_error(payload: dict[str, Any]) -> BaseException:
+    """Rebuild an exception encoded by _encode_error().
+
+    xlmanage exceptions are restored with their original class and
+    attributes (``e.path``, ``e.reason``...).  Any other exception is
+    wrapped in a plain ExcelManageError.
+    """
+    cls = _resolve_xlmanage_type(payload["__error__"])
+    message = payload.get("message", "")
+    if cls is None or not issubclass(cls, BaseException):
+        type_name = payload["__error__"].rpartition(":")[2]
+        return ExcelManageError(f"{type_name}: {message}")
+
+    exc = cls.__new__(cls)
+    exc.args = (message,)
+    for key, value in payload.get("attrs", {}).items():
+        setattr(exc, key, decode(value))
+    return exc
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+def _com_initialize() -> None:
+    """Initialize COM on the daemon worker thread (single-threaded apartment)."""
+    if pythoncom is not None:
+        pythoncom.CoInitialize()
+
+
+def _com_uninitialize() -> None:
+    """Release COM on the daemon worker thread."""
+    if pythoncom is not None:
+        pythoncom.CoUninitialize()
+
+
+class DaemonServer:
+    """Local server owning one or more ExcelManager connections.
+
+    All COM calls run on a single dedicated STA thread, so the Excel
+    connections created there stay valid for the lifetime of the daemon.
+    Client connections are served by lightweight threads that only move
+    requests to the STA thread and send the responses back.
+
+    Example:
+        >>> server = DaemonServer()
+        >>> server.serve_forever()  # blocks until a client sends shutdown
+    """
+
+    def __init__(
+        self,
+        address: str | None = None,
+        manager_factory: Callable[[], ExcelManager] | None = None,
+        registry: InstanceRegistry | None = None,
+    ) -> None:
+        """Initialize the daemon.
+
+        Args:
+            address: Named pipe or socket path (defaults to default_address())
+            manager_factory: Callable creating the ExcelManager of each
+                session.  Tests and benchmarks pass a factory bound to a
+                fake COM backend.
+            registry: Instance listing cache shared by the clients
+                ("daemon.instances"); default: a new InstanceRegistry
+        """
+        self.address = address or default_address()
+        self._manager_factory = manager_factory or ExcelManager
+        self._registry = registry or InstanceRegistry()
+        self._sessions: dict[str, ExcelManager] = {}
+        self._worker = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="xlmanage-sta",
+            initializer=_com_initialize,
+        )
+        self._listener: Listener | None = None
+        self._stopping = threading.Event()
+        self._ready = threading.Event()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until the daemon accepts connections.
+
+        Args:
+            timeout: Maximum wait in seconds (None = no limit)
+
+        Returns:
+            bool: True if the daemon is listening
+        """
+        return self._ready.wait(timeout)
+
+    def serve_forever(self) -> None:
+        """Accept client connections until shutdown() is called.
+
+        Raises:
+            DaemonAlreadyRunningError: If a daemon already answers on the
+                address
+        """
+        family = _address_family(self.address)
+        self._check_address_free(family)
+        if family == "AF_UNIX" and Path(self.address).exists():
+            # Stale socket left by a daemon that was killed
+            Path(self.address).unlink()
+
+        self._listener = Listener(self.address, family=family, authkey=_authkey())
+        self._ready.set()
+        logger.info("xlmanage daemon listening on %s", self.address)
+
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    if self._stopping.is_set():
+                        break
+                    logger.warning("Rejected daemon connection", exc_info=True)
+                    continue
+
+                threading.Thread(
+                    target=self._serve_connection,
+                    args=(conn,),
+                    name="xlmanage-client",
+                    daemon=True,
+                ).start()
+        finally:
+            self._close()
+
+    def _check_address_free(self, family: str) -> None:
+        """Refuse to take over an address another daemon listens on.
+
+        Args:
+            family: multiprocessing.connection family of the address
+
+        Raises:
+            DaemonAlreadyRunningError: If the address accepts connections
+        """
+        try:
+            Client(self.address, family=family, authkey=_authkey()).close()
+        except AuthenticationError:
+            # A listener answered, with another key
+            pass
+        except (OSError, EOFError):
+            # Nobody listens: free address or stale socket
+            return
+        raise DaemonAlreadyRunningError(self.address)
+
+    def shutdown(self) -> None:
+        """Stop the accept loop and release every Excel session."""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+
+        # Wake up the blocking accept() with a throwaway connection
+        try:
+            Client(
+                self.address, family=_address_family(self.address), authkey=_authkey()
+            ).close()
+        except (OSError, EOFError, AuthenticationError):
+            pass
+
+    def _close(self) -> None:
+        """Disconnect all sessions on the STA thread and stop the worker."""
+        try:
+            self._worker.submit(self._disconnect_all).result()
+        finally:
+            self._worker.shutdown(wait=True)
+            if self._listener is not None:
+                self._listener.close()
+                self._listener = None
+            logger.info("xlmanage daemon stopped")
+
+    def _disconnect_all(self) -> None:
+        """Release the COM references of every session (STA thread)."""
+        for mgr in self._sessions.values():
+            try:
+                mgr.disconnect()
+            except Exception:
+                continue
+        self._sessions.clear()
+        _com_uninitialize()
+
+    def _serve_connection(self, conn: Connection) -> None:
+        """Handle requests from a single client until it disconnects."""
+        with conn:
+            while True:
+                try:
+                    raw = conn.recv_bytes()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    request = json.loads(raw)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError:
+                    request = {}
+                    response: dict[str, Any] = {
+                        "ok": False,
+                        "error": _encode_error(
+                            OperationError("?", "malformed request")
+                        ),
+                    }
+                else:
+                    response = self._worker.submit(self.handle, request).result()
+
+                try:
+                    conn.send_bytes(json.dumps(response).encode("utf-8"))
+                except (EOFError, OSError):
+                    return
+
+                if request.get("op") == "daemon.shutdown":
+                    self.shutdown()
+                    return
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Execute one request and build its response (STA thread).
+
+        Args:
+            request: Decoded request with keys "op", "args", "kwargs" and
+                optionally "session"
+
+        Returns:
+            dict: {"ok": True, "result": ..., "elapsed": seconds} or
+                {"ok": False, "error": ..., "elapsed": seconds}
+        """
+        started = time.perf_counter()
+        try:
+            result = self._dispatch(request)
+            response = {"ok": True, "result": encode(result)}
+        except Exception as e:
+            response = {"ok": False, "error": _encode_error(e)}
+        response["elapsed"] = time.perf_counter() - started
+        return response
+
+    def _dispatch(self, request: dict[str, Any]) -> Any:
+        """Route a request to a daemon command or a registered operation."""
+        op = request.get("op", "")
+        session_name = request.get("session") or DEFAULT_SESSION
+
+        if op == "daemon.ping":
+            return "pong"
+        if op == "daemon.sessions":
+            return sorted(self._sessions)
+        if op == "daemon.instances":
+            kwargs = decode(request.get("kwargs", {}))
+            return self._registry.snapshot(
+                fast=bool(kwargs.get("fast")), refresh=bool(kwargs.get("refresh"))
+            )
+        if op == "daemon.shutdown":
+            return None
+        if op == "daemon.close_session":
+            mgr = self._sessions.pop(session_name, None)
+            if mgr is not None:
+                mgr.disconnect()
+            return None
+
+        args = decode(request.get("args", []))
+        kwargs = decode(request.get("kwargs", {}))
+        return execute_operation(self._session(session_name), op, args, kwargs)
+
+    def _session(self, name: str) -> ExcelManager:
+        """Return the started ExcelManager of a session, creating it if needed."""
+        mgr = self._sessions.get(name)
+        if mgr is None:
+            mgr = self._manager_factory()
+            mgr.start()
+            self._sessions[name] = mgr
+        return mgr
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class DaemonClient:
+    """Client sending operations to a running xlmanage daemon.
+
+    Example:
+        >>> with DaemonClient() as client:
+        ...     workbooks = client.call("workbook.list")
+    """
+
+    def __init__(self, address: str | None = None, session: str | None = None):
+        """Initialize the client (does not connect yet).
+
+        Args:
+            address: Daemon address (defaults to default_address())
+            session: Daemon session to target (defaults to "default")
+        """
+        self.address = address or default_address()
+        self.session = session or DEFAULT_SESSION
+        self._conn: "ClientConnection | None" = None
+        self.last_elapsed: float = 0.0
+
+    def __enter__(self) -> "DaemonClient":
+        """Connect to the daemon."""
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Close the connection."""
+        self.close()
+
+    def connect(self) -> None:
+        """Open the connection to the daemon.
+
+        Raises:
+            DaemonConnectionError: If no daemon listens on the address, or
+                if it rejects the key
+        """
+        if self._conn is not None:
+            return
+        try:
+            self._conn = Client(
+                self.address, family=_address_family(self.address), authkey=_authkey()
+            )
+        except AuthenticationError as e:
+            raise DaemonConnectionError(
+                self.address, "xlmanage daemon rejected the authentication key"
+            ) from e
+        except (OSError, EOFError) as e:
+            raise DaemonConnectionError(self.address) from e
+
+    def close(self) -> None:
+        """Close the connection (the daemon keeps running)."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def call(
+        self,
+        op: str,
+        args: list[Any] | tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+    ) -> Any:
+        """Send one operation and return its decoded result.
+
+        Path arguments, given as ``Path`` objects or as strings (e.g., read
+        from a batch file), are resolved against the caller's working
+        directory before they are sent.
+
+        Args:
+            op: Operation name (see operations.OPERATIONS) or daemon command
+            args: Positional arguments for the manager method
+            kwargs: Keyword arguments for the manager method
+
+        Returns:
+            The operation result with its original Python types
+
+        Raises:
+            DaemonConnectionError: If the daemon is unreachable
+            ExcelManageError: The error raised by the manager on the daemon side
+        """
+        self.connect()
+        assert self._conn is not None
+
+        args, kwargs = coerce_arguments(op, args, kwargs or {})
+        request = {
+            "op": op,
+            "session": self.session,
+            "args": encode(resolve_paths(args)),
+            "kwargs": encode(resolve_paths(kwargs)),
+        }
+        try:
+            self._conn.send_bytes(json.dumps(request).encode("utf-8"))
+            response = json.loads(self._conn.recv_bytes())
+        except (OSError, EOFError) as e:
+            self.close()
+            raise DaemonConnectionError(
+                self.address, "Connection to xlmanage daemon lost"
+            ) from e
+
+        self.last_elapsed = response.get("elapsed", 0.0)
+        if not response.get("ok"):
+            raise _decode_error(response["error"])
+        return decode(response.get("result"))
+
+    def ping(self) -> float:
+        """Measure the client-side round-trip latency of a no-op request.
+
+        Returns:
+            float: Round-trip time in seconds
+        """
+        started = time.perf_counter()
+        self.call("daemon.ping")
+        return time.perf_counter() - started
+
+    def shutdown(self) -> None:
+        """Ask the daemon to release its Excel sessions and exit."""
+        self.call("daemon.shutdown")
+        self.close()
+
+
+class RemoteManager:
+    """Client-side stand-in for a manager whose methods run in the daemon.
+
+    Attribute access returns a callable forwarding to the operation
+    "<key>.<method>", so CLI code can use it exactly like the real manager.
+    """
+
+    def __init__(self, client: DaemonClient, key: str) -> None:
+        """Initialize the remote manager.
+
+        Args:
+            client: Connected daemon client
+            key: Manager key (e.g., "workbook", "table")
+        """
+        self._client = client
+        self._key = key
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        """Return a callable forwarding the method call to the daemon."""
+        if method.startswith("_"):
+            raise AttributeError(method)
+
+        def _remote_call(*args: Any, **kwargs: Any) -> Any:
+            return self._client.call(f"{self._key}.{method}", args, kwargs)
+
+        return _remote_call
+
+
+class DaemonSession:
+    """Client-side replacement for ExcelManager in CLI client mode.
+
+    Supports the subset of the ExcelManager API used by the CLI commands
+    (context manager, start(), get_running_instance()) and hands out
+    RemoteManager objects instead of real managers.
+    """
+
+    def __init__(self, address: str | None = None, session: str | None = None):
+        """Initialize the session.
+
+        Args:
+            address: Daemon address (defaults to default_address())
+            session: Daemon session to target
+        """
+        self.client = DaemonClient(address, session)
+
+    def __enter__(self) -> "DaemonSession":
+        """Connect to the daemon."""
+        self.client.connect()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Close the connection without touching Excel."""
+        self.client.close()
+
+    def start(self, new: bool = False) -> None:
+        """No-op: the daemon owns and starts the Excel instance."""
+        return None
+
+    def get_running_instance(self) -> Any:
+        """Return the InstanceInfo of the daemon's Excel instance."""
+        return self.client.call("excel.get_running_instance")
+
+    def manager(self, manager_cls: type) -> RemoteManager:
+        """Return the remote counterpart of a manager class.
+
+        Args:
+            manager_cls: Manager class (e.g., WorkbookManager)
+
+        Returns:
+            RemoteManager forwarding its calls to the daemon
+        """
+        return RemoteManager(self.client, MANAGER_KEYS[manager_cls.__name__])
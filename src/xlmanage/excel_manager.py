@@ -19,10 +19,12 @@ along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 
 import gc
 import logging
-import re
+import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from typing import Any, Literal, overload
 
 try:
     import pythoncom
@@ -34,15 +36,20 @@ except ImportError:
     # This is useful for testing and documentation purposes
     CDispatch = Any
     pythoncom = None
-    pywintypes = None
+    # Stand-in COM error, also raised by the in-memory backend
+    from . import _compat as pywintypes
 
-# Import subprocess for process management
 import ctypes
 import ctypes.wintypes
 import shutil
-import subprocess
 
+from .com_profiler import current_profile
+from .com_retry import current_retry_policy, ensure_message_filter, retrying_dispatch
 from .exceptions import ExcelConnectionError, ExcelInstanceNotFoundError, ExcelRPCError
+from .metadata_index import MetadataIndex
+from .process_backend import EXCEL_IMAGE, ProcessBackend, process_backend
+from .window_enum import WindowEnumerator
+from .workbook_index import WorkbookIndex
 
 # Configure module logger
 logger = logging.getLogger(__name__)
@@ -97,6 +104,53 @@ class InstanceInfo:
     hwnd: int
 
 
+@dataclass
+class StopReport:
+    """Outcome of the shutdown of one instance by stop_all(parallel=True).
+
+    Attributes:
+        pid: Process ID of the instance
+        status: "stopped" (workbooks closed, reference released),
+            "killed" (force_kill() after the deadline) or "failed"
+        elapsed_ms: Time from the start of the shutdown to its outcome
+        error: Error message if the shutdown or the kill failed
+    """
+
+    pid: int
+    status: str
+    elapsed_ms: float
+    error: str | None = None
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the instance no longer runs (stopped or killed)."""
+        return self.status in ("stopped", "killed")
+
+
+@dataclass
+class ScanTimings:
+    """Where the time of an instance listing went.
+
+    Attributes:
+        source: How the instances were found: "rot", "tasklist"
+            (fallback) or "windows" (window enumeration only)
+        rot_ms: Walking the ROT, binding the monikers and querying
+            IDispatch
+        read_ms: Reading Hwnd, Visible and Workbooks.Count of each instance
+        fallback_ms: tasklist, window enumeration and HWND connections
+            of the fallback
+        windows_ms: Enumerating the top-level windows (fast listing)
+        total_ms: Whole listing
+    """
+
+    source: str = ""
+    rot_ms: float = 0.0
+    read_ms: float = 0.0
+    fallback_ms: float = 0.0
+    windows_ms: float = 0.0
+    total_ms: float = 0.0
+
+
 class ExcelManager:
     """Manager for Excel application lifecycle.
 
@@ -109,6 +163,8 @@ class ExcelManager:
         visibility: Visibility = Visibility.UNCHANGED,
         *,
         visible: bool | None = None,
+        app_factory: Callable[[], CDispatch] | None = None,
+        process_backend: ProcessBackend | None = None,
     ):
         """Initialize Excel manager.
 
@@ -123,11 +179,22 @@ class ExcelManager:
                      ``False`` maps to ``Visibility.UNCHANGED`` (do not
                      hide an already-visible instance).
                      When provided, *visible* takes precedence over *visibility*.
+            app_factory: Callable returning the Application object to
+                     connect to, instead of ``Dispatch("Excel.Application")``.
+                     Used to run against xlmanage.testing.FakeExcel.
+            process_backend: Backend listing and killing the Excel
+                     processes (default: process_backend()).  Pass a
+                     xlmanage.testing.FakeProcessBackend to run without
+                     Windows.
         """
         if visible is not None:
             visibility = Visibility.SHOW if visible else Visibility.UNCHANGED
         self._app: CDispatch | None = None
         self._visibility: Visibility = visibility
+        self._app_factory = app_factory
+        self._process_backend = process_backend
+        self._workbook_index = WorkbookIndex()
+        self._metadata_index = MetadataIndex()
 
     def __enter__(self) -> ExcelManager:
         """Enter context manager - start Excel instance."""
@@ -147,6 +214,11 @@ class ExcelManager:
     def app(self) -> CDispatch:
         """Return the COM Application object.
 
+        Inside a com_retry.retrying() context, the object is wrapped in a
+        proxy retrying the calls refused by a busy Excel; inside a
+        com_profiler.profiling() context, in a proxy recording every COM
+        call made through it.
+
         Returns:
             The Excel Application COM object.
 
@@ -157,7 +229,29 @@ class ExcelManager:
             raise ExcelConnectionError(
                 0x80080005, "Excel application not started. Call start() first."
             )
-        return self._app
+        app = retrying_dispatch(self._app)
+        profile = current_profile()
+        if profile is not None:
+            return profile.wrap(app)
+        return app
+
+    @property
+    def workbook_index(self) -> WorkbookIndex:
+        """Return the index of the workbooks open in the instance.
+
+        Shared by the managers built on this ExcelManager to resolve
+        workbooks by path without scanning every open workbook.
+        """
+        return self._workbook_index
+
+    @property
+    def metadata_index(self) -> MetadataIndex:
+        """Return the worksheet and table metadata of the open workbooks.
+
+        Shared by the managers built on this ExcelManager to find
+        worksheets and tables by name without scanning every worksheet.
+        """
+        return self._metadata_index
 
     def start(self, new: bool = False) -> InstanceInfo:
         """Start or connect to an Excel instance.
@@ -176,28 +270,40 @@ class ExcelManager:
         Raises:
             ExcelConnectionError: If Excel is not installed or COM is unavailable.
         """
+        self._workbook_index = WorkbookIndex()
+        self._metadata_index = MetadataIndex()
+        policy = current_retry_policy()
+        if policy is not None:
+            # COM retries the calls Excel rejects from this thread
+            ensure_message_filter(policy)
         try:
             # Always use Dispatch() so the instance is registered in the ROT
             # and reconnectable from any subsequent script.
-            self._app = self._dispatch_with_cache_retry()
+            if self._app_factory is not None:
+                self._app = self._app_factory()
+            else:
+                self._app = self._dispatch_with_cache_retry()
+
+            # Calls retried while Excel is busy, inside retrying()
+            app = retrying_dispatch(self._app)
 
             # Apply visibility only if explicitly requested
             if self._visibility == Visibility.SHOW:
                 try:
-                    self._app.Visible = True
+                    app.Visible = True
                 except AttributeError:
                     # Ignore if property cannot be set (Excel in certain states)
                     pass
             elif self._visibility == Visibility.HIDE:
                 try:
-                    self._app.Visible = False
+                    app.Visible = False
                 except AttributeError:
                     # Ignore if property cannot be set
                     pass
             # Visibility.UNCHANGED : do not touch app.Visible
 
             # Get instance information
-            return self.get_instance_info(self._app)
+            return self.get_instance_info(app)
 
         except Exception as e:
             # Handle COM errors
@@ -289,6 +395,8 @@ class ExcelManager:
         because forcing garbage collection would destroy the only COM
         reference and may cause the Excel process to terminate.
         """
+        self._workbook_index = WorkbookIndex()
+        self._metadata_index = MetadataIndex()
         self._app = None
 
     def stop(self, save: bool = True) -> None:
@@ -351,17 +459,31 @@ class ExcelManager:
             gc.collect()
 
             # 5. Mark as stopped
+            self._workbook_index = WorkbookIndex()
+            self._metadata_index = MetadataIndex()
             self._app = None
 
-    def stop_instance(self, pid: int, save: bool = True) -> None:
+    def stop_instance(
+        self,
+        pid: int,
+        save: bool = True,
+        *,
+        hwnd_map: dict[int, int] | None = None,
+    ) -> None:
         """Stop an Excel instance identified by its PID.
 
-        Connects to the instance via ROT or HWND, then applies
-        the stop() protocol.
+        Connects to this instance only, via ROT or HWND, then applies
+        the stop() protocol.  The ROT walk stops at the PID and never
+        reads the properties of the other instances.
 
         Args:
             pid: Process ID of the target Excel instance
             save: If True, save before closing
+            hwnd_map: PID -> HWND map (WindowEnumerator.xlmain_hwnds())
+                shared by callers stopping several instances.  If given,
+                the instance is reached through its window first, and the
+                ROT is only walked when the map misses the PID; if None,
+                the windows are enumerated when the ROT misses the PID.
 
         Raises:
             ExcelInstanceNotFoundError: If PID doesn't exist or is not Excel
@@ -371,23 +493,20 @@ class ExcelManager:
             >>> mgr = ExcelManager()
             >>> mgr.stop_instance(12345, save=False)
         """
-        # Enumerate all instances
-        instances = enumerate_excel_instances()
-
-        # Find instance with the right PID
-        target_app = None
-        for app, info in instances:
-            if info.pid == pid:
-                target_app = app
-                break
-
-        if target_app is None:
-            # Fallback: try connecting via PID → HWND → COM
-            target_app = connect_by_pid(pid)
+        if hwnd_map is not None:
+            # PID → HWND → COM: no other instance is bound
+            target_app = connect_by_pid(pid, hwnd_map=hwnd_map)
+            if target_app is None:
+                target_app = find_excel_instance(pid)
+        else:
+            target_app = find_excel_instance(pid)
+            if target_app is None:
+                # Fallback: try connecting via PID → HWND → COM
+                target_app = connect_by_pid(pid)
 
         if target_app is None:
-            # Last resort: check via tasklist if PID exists at all
-            all_pids = enumerate_excel_pids()
+            # Last resort: check the process list if PID exists at all
+            all_pids = enumerate_excel_pids(self._process_backend)
             if pid not in all_pids:
                 raise ExcelInstanceNotFoundError(
                     str(pid), "Process ID not found or not an Excel instance"
@@ -424,22 +543,67 @@ class ExcelManager:
         finally:
             gc.collect()
 
-    def stop_all(self, save: bool = True) -> list[int]:
+    @overload
+    def stop_all(
+        self, save: bool = True, *, parallel: Literal[False] = False
+    ) -> list[int]: ...
+
+    @overload
+    def stop_all(
+        self,
+        save: bool = True,
+        *,
+        parallel: Literal[True],
+        deadline: float | None = None,
+    ) -> list[StopReport]: ...
+
+    def stop_all(
+        self,
+        save: bool = True,
+        *,
+        parallel: bool = False,
+        deadline: float | None = None,
+    ) -> list[int] | list[StopReport]:
         """Stop all active Excel instances.
 
         Enumerates via ROT and applies stop_instance() for each.
 
+        Sequentially, an instance slow to close its workbooks delays all
+        the others.  With ``parallel=True``, every instance is stopped at
+        the same time from its own COM-initialized thread, and those not
+        stopped within ``deadline`` seconds are terminated with
+        force_kill() (their unsaved changes are lost).
+
         Args:
             save: If True, save before closing
+            parallel: Stop the instances concurrently and return a report
+            deadline: Seconds given to the concurrent shutdown before
+                force-killing the remaining instances (None: no limit).
+                Requires parallel=True.
 
         Returns:
-            list[int]: List of PIDs stopped successfully
+            list[int]: PIDs stopped successfully (sequential), or
+            list[StopReport]: one report per PID (parallel)
+
+        Raises:
+            ValueError: If deadline is given without parallel, or negative
 
         Example:
             >>> mgr = ExcelManager()
             >>> stopped = mgr.stop_all(save=True)
             >>> print(f"{len(stopped)} instances stopped")
+
+            >>> for report in mgr.stop_all(parallel=True, deadline=30):
+            ...     print(report.pid, report.status, report.elapsed_ms)
         """
+        if deadline is not None:
+            if not parallel:
+                raise ValueError("deadline requires parallel=True")
+            if deadline < 0:
+                raise ValueError(f"deadline must be >= 0 (got {deadline})")
+        if parallel:
+            return self._stop_all_parallel(save, deadline)
+
         # Enumerate all instances
         instances = enumerate_excel_instances()
 
@@ -474,21 +638,88 @@ class ExcelManager:
 
         return stopped_pids
 
+    def _stop_all_parallel(
+        self, save: bool, deadline: float | None
+    ) -> list[StopReport]:
+        """Stop every instance from its own thread, killing the late ones."""
+        # COM references belong to this thread: pass PIDs, each thread
+        # connects to its own instance only, through its window, so that
+        # a hung instance only blocks its own thread
+        instances = enumerate_excel_instances()
+        pids = [info.pid for _, info in instances]
+        del instances
+        gc.collect()
+        # Instances missing from the ROT later on share one enumeration
+        hwnd_map = _xlmain_hwnds()
+
+        started = time.perf_counter()
+        reports: dict[int, StopReport] = {}
+        lock = threading.Lock()
+
+        def stop(pid: int) -> None:
+            if pythoncom is not None:
+                pythoncom.CoInitialize()
+            try:
+                self.stop_instance(pid, save=save, hwnd_map=hwnd_map)
+                report = StopReport(pid, "stopped", _elapsed_ms(started))
+            except Exception as e:
+                report = StopReport(pid, "failed", _elapsed_ms(started), str(e))
+            finally:
+                if pythoncom is not None:
+                    pythoncom.CoUninitialize()
+            with lock:
+                # A late result after force_kill() does not override it
+                reports.setdefault(pid, report)
+
+        threads = {
+            pid: threading.Thread(
+                target=stop, args=(pid,), name=f"xlmanage-stop-{pid}", daemon=True
+            )
+            for pid in pids
+        }
+        for thread in threads.values():
+            thread.start()
+        for thread in threads.values():
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - (time.perf_counter() - started))
+            thread.join(remaining)
+
+        for pid, thread in threads.items():
+            if not thread.is_alive():
+                continue
+            with lock:
+                if pid in reports:
+                    continue
+                # Claim the PID before killing: the thread may end meanwhile
+                reports[pid] = StopReport(pid, "killed", 0.0)
+            logger.warning(
+                "Excel PID %d not stopped within %ss, killing it", pid, deadline
+            )
+            try:
+                self.force_kill(pid)
+                reports[pid].elapsed_ms = _elapsed_ms(started)
+            except Exception as e:
+                reports[pid] = StopReport(pid, "failed", _elapsed_ms(started), str(e))
+
+        return [reports[pid] for pid in pids]
+
     def force_kill(self, pid: int) -> None:
-        """Force-kill an Excel instance via taskkill.
+        """Force-kill an Excel instance.
 
         **WARNING**: This method brutally terminates the process without
         saving workbooks. Use ONLY when clean shutdown has failed and the
         instance is zombie.
 
-        Uses: taskkill /f /pid <pid>
+        Uses the process backend: TerminateProcess on Windows, or
+        taskkill /f /pid <pid> with the subprocess backend.
 
         Args:
             pid: Process ID of the instance to terminate
 
         Raises:
             ExcelInstanceNotFoundError: If PID doesn't exist
-            RuntimeError: If taskkill command fails
+            RuntimeError: If the process cannot be terminated
 
         Example:
             >>> mgr = ExcelManager()
@@ -504,40 +735,9 @@ class ExcelManager:
             "This will terminate the process without saving workbooks."
         )
 
-        try:
-            # Execute taskkill /f /pid
-            result = subprocess.run(
-                ["taskkill", "/f", "/pid", str(pid)],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=10,
-            )
-
-            # Verify success in stdout
-            if "SUCCESS" not in result.stdout:
-                raise RuntimeError(f"taskkill failed: {result.stdout}")
-
-            logger.info(f"Successfully force-killed Excel instance PID {pid}")
-
-        except subprocess.CalledProcessError as e:
-            # taskkill failed (PID not found, permissions, etc.)
-            if "not found" in e.stdout or "not found" in e.stderr:
-                raise ExcelInstanceNotFoundError(
-                    str(pid), "Process not found or not running"
-                ) from e
-            else:
-                raise RuntimeError(
-                    f"Failed to kill process {pid}: {e.stderr or e.stdout}"
-                ) from e
-
-        except subprocess.TimeoutExpired:
-            raise RuntimeError(f"Timeout while trying to kill process {pid}")
-
-        except FileNotFoundError:
-            raise RuntimeError(
-                "taskkill command not found. This feature requires Windows."
-            )
+        backend = self._process_backend or process_backend()
+        backend.terminate(pid)
+        logger.info(f"Successfully force-killed Excel instance PID {pid}")
 
     def get_running_instance(self) -> InstanceInfo | None:
         """Get the active Excel instance.
@@ -549,7 +749,10 @@ class ExcelManager:
             ExcelConnectionError: If COM connection fails.
         """
         try:
-            app = win32com.client.Dispatch("Excel.Application")
+            if self._app_factory is not None:
+                app = self._app_factory()
+            else:
+                app = win32com.client.Dispatch("Excel.Application")
             return self.get_instance_info(app)
         except Exception as e:
             if hasattr(e, "hresult"):
@@ -561,11 +764,17 @@ class ExcelManager:
                     0x80080005, f"Failed to get running instance: {str(e)}"
                 ) from e
 
-    def list_running_instances(self) -> list[InstanceInfo]:
+    def list_running_instances(
+        self, *, timings: ScanTimings | None = None
+    ) -> list[InstanceInfo]:
         """Enumerate all running Excel instances.
 
         Uses ROT as priority, then fallback to tasklist if ROT fails.
 
+        Args:
+            timings: Filled with the time spent in the ROT, in the
+                property reads and in the fallback, if given
+
         Returns:
             list[InstanceInfo]: List of instances with their information
 
@@ -580,21 +789,39 @@ class ExcelManager:
             1. Running Object Table (ROT) enumeration
             2. Fallback to tasklist PID enumeration
         """
+        started = time.perf_counter()
+        try:
+            return self._list_running_instances(timings)
+        finally:
+            if timings is not None:
+                timings.total_ms = _elapsed_ms(started)
+
+    def _list_running_instances(
+        self, timings: ScanTimings | None
+    ) -> list[InstanceInfo]:
+        """list_running_instances() without the total time."""
         # Try via ROT
-        rot_instances = enumerate_excel_instances()
+        rot_instances = enumerate_excel_instances(timings=timings)
 
         if rot_instances:
+            if timings is not None:
+                timings.source = "rot"
             # Extract just the InstanceInfo
             return [info for app, info in rot_instances]
 
         # Fallback: tasklist to get PIDs, then connect via HWND
+        if timings is not None:
+            timings.source = "tasklist"
+        started = time.perf_counter()
         try:
-            pids = enumerate_excel_pids()
+            pids = enumerate_excel_pids(self._process_backend)
+            # One window enumeration for all PIDs
+            hwnd_map = _xlmain_hwnds()
 
             instances = []
             for pid in pids:
                 # Try to get full info via connect_by_pid
-                app = connect_by_pid(pid)
+                app = connect_by_pid(pid, hwnd_map=hwnd_map)
                 if app is not None:
                     try:
                         info = _get_instance_info_from_app(app)
@@ -618,13 +845,37 @@ class ExcelManager:
             # Fallback also failed, return empty list
             return []
 
+        finally:
+            if timings is not None:
+                timings.fallback_ms = _elapsed_ms(started)
+
 
-def enumerate_excel_instances() -> list[tuple[CDispatch, InstanceInfo]]:
+def _xlmain_hwnds() -> dict[int, int]:
+    """PID -> XLMAIN window map, empty if the windows cannot be enumerated."""
+    try:
+        return WindowEnumerator().xlmain_hwnds()
+    except Exception:
+        # Not Windows, or user32 unavailable
+        return {}
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since a time.perf_counter() value."""
+    return (time.perf_counter() - started) * 1000
+
+
+def enumerate_excel_instances(
+    timings: ScanTimings | None = None,
+) -> list[tuple[CDispatch, InstanceInfo]]:
     """Enumerate Excel instances via Running Object Table (ROT).
 
     The Windows ROT contains all active COM objects. We filter for
     Excel.Application instances.
 
+    Args:
+        timings: Filled with the time spent walking the ROT (rot_ms)
+            and reading each instance's properties (read_ms), if given
+
     Returns:
         list[tuple[CDispatch, InstanceInfo]]: List of (app, info) for each instance
 
@@ -633,6 +884,8 @@ def enumerate_excel_instances() -> list[tuple[CDispatch, InstanceInfo]]:
         enumerate_excel_pids() as fallback.
     """
     instances: list[tuple[CDispatch, InstanceInfo]] = []
+    started = time.perf_counter()
+    read_ms = 0.0
 
     try:
         # Get Running Object Table
@@ -660,7 +913,11 @@ def enumerate_excel_instances() -> list[tuple[CDispatch, InstanceInfo]]:
                 )
 
                 # Extract instance info
-                info = _get_instance_info_from_app(app)
+                read_started = time.perf_counter()
+                try:
+                    info = _get_instance_info_from_app(app)
+                finally:
+                    read_ms += _elapsed_ms(read_started)
 
                 instances.append((app, info))
 
@@ -672,9 +929,52 @@ def enumerate_excel_instances() -> list[tuple[CDispatch, InstanceInfo]]:
         # ROT inaccessible, return empty list (fallback needed)
         return []
 
+    finally:
+        if timings is not None:
+            timings.read_ms = read_ms
+            timings.rot_ms = _elapsed_ms(started) - read_ms
+
     return instances
 
 
+def find_excel_instance(pid: int) -> CDispatch | None:
+    """Find one Excel instance in the Running Object Table by its PID.
+
+    Unlike enumerate_excel_instances(), only reads the window handle of
+    the instances met before the PID, and stops at the PID.
+
+    Args:
+        pid: Process ID of the target Excel instance
+
+    Returns:
+        CDispatch | None: Excel Application COM object, or None if the
+        PID is not in the ROT (or the ROT is not accessible)
+    """
+    try:
+        rot = pythoncom.GetRunningObjectTable()
+        for moniker in rot.EnumRunning():
+            try:
+                ctx = pythoncom.CreateBindCtx(0)
+                if "Excel.Application" not in moniker.GetDisplayName(ctx, None):
+                    continue
+                app = win32com.client.Dispatch(
+                    rot.GetObject(moniker).QueryInterface(pythoncom.IID_IDispatch)
+                )
+                process_id = ctypes.c_ulong()
+                ctypes.windll.user32.GetWindowThreadProcessId(
+                    app.Hwnd, ctypes.byref(process_id)
+                )
+                if process_id.value == pid:
+                    return app
+            except (pywintypes.com_error, Exception):
+                # Instance inaccessible or disconnected, skip
+                continue
+    except (pywintypes.com_error, Exception):
+        # ROT inaccessible
+        return None
+    return None
+
+
 def _get_instance_info_from_app(app: CDispatch) -> InstanceInfo:
     """Extract InstanceInfo from an Application object.
 
@@ -701,61 +1001,33 @@ def _get_instance_info_from_app(app: CDispatch) -> InstanceInfo:
     )
 
 
-def enumerate_excel_pids() -> list[int]:
-    """Fallback: Enumerate Excel PIDs via tasklist command.
+def enumerate_excel_pids(backend: ProcessBackend | None = None) -> list[int]:
+    """Fallback: Enumerate Excel PIDs from the process list.
 
     Used when ROT is not accessible. Returns only PIDs, not COM objects.
 
+    Args:
+        backend: Process backend (default: process_backend(), a Toolhelp
+            snapshot on Windows, tasklist where the Win32 API is missing)
+
     Returns:
         list[int]: List of EXCEL.EXE process IDs
 
     Raises:
-        RuntimeError: If tasklist fails (command not found)
+        RuntimeError: If the processes cannot be listed (tasklist missing)
 
     Note:
         This is a fallback method when ROT enumeration fails.
-        Uses Windows tasklist command to find EXCEL.EXE processes.
     """
-    try:
-        # Call tasklist with filter for EXCEL.EXE
-        result = subprocess.run(
-            ["tasklist", "/fi", "imagename eq EXCEL.EXE", "/fo", "csv", "/nh"],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=10,
-        )
-
-        pids: list[int] = []
-
-        # Parse CSV output
-        # Format: "EXCEL.EXE","12345","Console","1","123,456 K"
-        for line in result.stdout.strip().split("\n"):
-            if not line or "INFO:" in line:
-                continue
-
-            # Extract PID (2nd column)
-            match = re.search(r'"EXCEL\.EXE","(\d+)"', line)
-            if match:
-                pid = int(match.group(1))
-                pids.append(pid)
-
-        return pids
-
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("Timeout lors de l'énumération des processus Excel")
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Échec de tasklist: {e}")
-    except FileNotFoundError:
-        raise RuntimeError("Commande tasklist introuvable (Windows requis)")
+    return (backend or process_backend()).list_pids(EXCEL_IMAGE)
 
 
 def _find_hwnd_for_pid(pid: int) -> int | None:
     """Find the main Excel window handle (HWND) for a given Process ID.
 
-    Iterates all top-level windows via EnumWindows, filtering for:
-    1. Window class name == "XLMAIN" (Excel's main window class)
-    2. Window's owning PID matches the requested PID
+    Walks all top-level windows once (WindowEnumerator), keeping those of
+    class "XLMAIN" (Excel's main window class). To resolve several PIDs,
+    build the map once with WindowEnumerator().xlmain_hwnds() instead.
 
     Args:
         pid: Process ID of the target Excel instance
@@ -763,40 +1035,12 @@ def _find_hwnd_for_pid(pid: int) -> int | None:
     Returns:
         int | None: Window handle if found, None otherwise
     """
-    user32 = ctypes.windll.user32
-
-    found_hwnd = None
-
-    @ctypes.WINFUNCTYPE(
-        ctypes.wintypes.BOOL,
-        ctypes.wintypes.HWND,
-        ctypes.wintypes.LPARAM,
-    )
-    def _enum_callback(hwnd, _lparam):
-        nonlocal found_hwnd
-
-        # Get PID for this window
-        process_id = ctypes.c_ulong()
-        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
-
-        if process_id.value != pid:
-            return True  # Continue enumeration
-
-        # Check window class name
-        class_name = ctypes.create_unicode_buffer(256)
-        user32.GetClassNameW(hwnd, class_name, 256)
-
-        if class_name.value == "XLMAIN":
-            found_hwnd = hwnd
-            return False  # Stop enumeration
-
-        return True  # Continue
-
-    user32.EnumWindows(_enum_callback, 0)
-    return found_hwnd
+    return WindowEnumerator().find(pid)
 
 
-def connect_by_pid(pid: int) -> CDispatch | None:
+def connect_by_pid(
+    pid: int, *, hwnd_map: dict[int, int] | None = None
+) -> CDispatch | None:
     """Connect to an Excel instance by its Process ID.
 
     Finds the main Excel window (class XLMAIN) belonging to the given PID
@@ -804,6 +1048,9 @@ def connect_by_pid(pid: int) -> CDispatch | None:
 
     Args:
         pid: Process ID of the target Excel instance
+        hwnd_map: PID -> HWND map built by WindowEnumerator.xlmain_hwnds(),
+            to resolve several PIDs with a single window enumeration.
+            If None, the windows are enumerated for this PID.
 
     Returns:
         CDispatch | None: Excel Application COM object, or None if failed
@@ -813,7 +1060,10 @@ def connect_by_pid(pid: int) -> CDispatch | None:
         to obtain the COM Application object.
     """
     try:
-        hwnd = _find_hwnd_for_pid(pid)
+        if hwnd_map is not None:
+            hwnd = hwnd_map.get(pid)
+        else:
+            hwnd = _find_hwnd_for_pid(pid)
 
         if hwnd is None:
             return None
@@ -25,6 +25,23 @@ if TYPE_CHECKING:
     from .excel_manager import ExcelManager
 
 
+# Réglages appliqués par ExcelOptimizer, dans l'ordre
+OPTIMIZED_SETTINGS: dict[str, object] = {
+    # Désactiver l'affichage
+    "ScreenUpdating": False,
+    "DisplayStatusBar": False,
+    "EnableAnimations": False,
+    # Passer en calcul manuel
+    "Calculation": -4135,  # xlCalculationManual
+    # Désactiver les événements
+    "EnableEvents": False,
+    "DisplayAlerts": False,
+    "AskToUpdateLinks": False,
+    # Désactiver l'itération
+    "Iteration": False,
+}
+
+
 @dataclass
 class OptimizationState:
     """État des optimisations Excel pour tracking et restauration.
@@ -188,26 +205,18 @@ class ExcelOptimizer:
             self._original_settings = {}
 
     def _apply_optimizations(self) -> None:
-        """Applique les optimisations de performance."""
-        try:
-            # Désactiver l'affichage
-            self._app.ScreenUpdating = False
-            self._app.DisplayStatusBar = False
-            self._app.EnableAnimations = False
-
-            # Passer en calcul manuel
-            self._app.Calculation = -4135  # xlCalculationManual
-
-            # Désactiver les événements
-            self._app.EnableEvents = False
-            self._app.DisplayAlerts = False
-            self._app.AskToUpdateLinks = False
+        """Applique les optimisations de performance.
 
-            # Désactiver l'itération
-            self._app.Iteration = False
-        except Exception:
-            # Ignorer les erreurs d'application
-            pass
+        Chaque propriété est appliquée séparément : Excel refuse par exemple
+        de changer Calculation tant qu'aucun classeur n'est ouvert, ce qui
+        ne doit pas empêcher les autres réglages.
+        """
+        for prop, value in OPTIMIZED_SETTINGS.items():
+            try:
+                setattr(self._app, prop, value)
+            except Exception:
+                # Ignorer les erreurs d'application
+                pass
 
     def _restore_original_settings(self) -> None:
         """Restaure les paramètres originaux d'Excel."""
@@ -0,0 +1,417 @@
+"""
+Pool of isolated Excel instances processing jobs in parallel.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import pythoncom
+    from win32com.client import CDispatch
+except ImportError:
+    # Without pywin32, pools run on an app_factory such as FakeExcel
+    CDispatch = Any
+    pythoncom = None
+
+from .excel_manager import ExcelManager, Visibility
+from .excel_standby import StandbyStats, WarmStandby, _dispatch_isolated
+from .recycle_policy import RecyclePolicy
+
+logger = logging.getLogger(__name__)
+
+# Instances launched by default: Excel is memory-hungry, more rarely pays off
+DEFAULT_POOL_SIZE: int = min(4, os.cpu_count() or 1)
+
+# Job function: (ExcelManager of the worker, item) -> result
+Job = Callable[[ExcelManager, Any], Any]
+
+
+@dataclass
+class PoolResult:
+    """Outcome of one job run by an ExcelPool.
+
+    Attributes:
+        index: Position of the item in the input of map()
+        item: The item the job ran on (e.g., a workbook path)
+        success: Whether the job succeeded
+        result: Value returned by the job function
+        error_type: Exception class name if the job failed
+        error_message: Error message if the job failed
+        attempts: Number of runs, more than 1 after an instance failure
+        worker: Number of the worker (0-based) that ran the last attempt
+        elapsed_ms: Time spent on the job, retries included
+    """
+
+    index: int
+    item: Any
+    success: bool
+    result: Any = None
+    error_type: str | None = None
+    error_message: str | None = None
+    attempts: int = 1
+    worker: int = 0
+    elapsed_ms: float = 0.0
+
+
+class _Worker:
+    """Thread of a pool and the Excel instance it owns."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.mgr: ExcelManager | None = None
+        self.pid = -1
+        self.thread: threading.Thread | None = None
+        # Jobs run by the current instance and its launch time
+        self.jobs = 0
+        self.started = 0.0
+
+
+class ExcelPool:
+    """Runs jobs on N isolated Excel instances, one per worker thread.
+
+    ExcelManager drives the single Excel instance registered in the ROT,
+    so work on many workbooks is serial in one EXCEL.EXE.  A pool launches
+    its own instances instead (DispatchEx: hidden, invisible to other
+    scripts) and spreads the jobs of map() over them.  Each worker thread
+    is a COM single-threaded apartment that creates, uses and releases its
+    instance itself, as COM objects cannot be shared between apartments.
+    The Excel processes run in parallel while the threads wait on COM
+    calls.
+
+    After each job, the workbooks left open in the instance are closed
+    without saving: jobs save what they change.
+
+    When a job fails, the pool probes its instance.  A healthy instance
+    means the job itself failed: the error is reported and the job is
+    not retried.  A dead or unresponsive instance (crash, RPC error) is
+    recycled, that is released, killed if its PID is known and replaced
+    by a new one, then the job is retried up to ``retries`` times.
+
+    With a WarmStandby, replacements are taken from instances started
+    ahead of time, so a recycled worker does not wait for a cold start.
+    With a RecyclePolicy, instances that ran too many jobs, for too
+    long or grew too big are retired between two jobs and replaced.
+
+    Example:
+        >>> def row_count(mgr, path):
+        ...     WorkbookManager(mgr).open(path, read_only=True)
+        ...     return len(RangeManager(mgr).read("A:A", workbook=path))
+        >>> with ExcelPool(size=4) as pool:
+        ...     for result in pool.map(row_count, paths):
+        ...         print(result.item, result.result)
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        *,
+        retries: int = 1,
+        app_factory: Callable[[], CDispatch] | None = None,
+        standby: WarmStandby | None = None,
+        recycle: RecyclePolicy | None = None,
+    ):
+        """Initialize a pool (instances are launched by start()).
+
+        Args:
+            size: Number of Excel instances and worker threads
+            retries: Runs of a job added after instance failures
+            app_factory: Callable returning a new Application object,
+                called once per instance from its worker thread
+                (default: DispatchEx).  Pass FakeExcel to run without
+                Excel.
+            standby: Standby the instances are taken from instead of
+                app_factory; the pool starts and closes it
+            recycle: Policy retiring instances between jobs
+
+        Raises:
+            ValueError: If size is lower than 1 or retries negative
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1 (got {size})")
+        if retries < 0:
+            raise ValueError(f"retries must be >= 0 (got {retries})")
+        self._size = size
+        self._retries = retries
+        self._app_factory = app_factory or _dispatch_isolated
+        self._standby = standby
+        self._recycle_policy = recycle
+        self._workers: list[_Worker] = []
+        self._jobs: queue.Queue[tuple[int, Any, Job, queue.Queue] | None] = (
+            queue.Queue()
+        )
+        self._lock = threading.Lock()
+        self._recycled = 0
+        self._retired = 0
+
+    def __enter__(self) -> "ExcelPool":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Number of Excel instances of the pool."""
+        return self._size
+
+    @property
+    def recycled(self) -> int:
+        """Number of instances replaced after a failure."""
+        return self._recycled
+
+    @property
+    def retired(self) -> int:
+        """Number of instances replaced by the recycle policy."""
+        return self._retired
+
+    @property
+    def standby_stats(self) -> StandbyStats | None:
+        """Counters of the standby, None without standby."""
+        return self._standby.stats if self._standby else None
+
+    def start(self) -> None:
+        """Start the worker threads, each launching its Excel instance.
+
+        An instance that fails to launch is launched again by the first
+        job of its worker.
+        """
+        if self._workers:
+            return
+        if self._standby is not None:
+            self._standby.start()
+        for number in range(self._size):
+            worker = _Worker(number)
+            worker.thread = threading.Thread(
+                target=self._serve,
+                args=(worker,),
+                name=f"xlmanage-pool-{number}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.thread.start()
+
+    def close(self) -> None:
+        """Stop the workers and release their instances (without saving)."""
+        if not self._workers:
+            return
+        for _ in self._workers:
+            self._jobs.put(None)
+        for worker in self._workers:
+            if worker.thread is not None:
+                worker.thread.join()
+        self._workers = []
+        if self._standby is not None:
+            self._standby.close()
+
+    def imap_unordered(self, func: Job, items: Iterable[Any]) -> Iterator[PoolResult]:
+        """Run func(excel_manager, item) for each item, yielding as jobs end.
+
+        Args:
+            func: Job function; it receives the started ExcelManager of
+                the worker running it
+            items: Job inputs (e.g., workbook paths)
+
+        Yields:
+            PoolResult: One result per item, in completion order
+        """
+        self.start()
+        results: queue.Queue[PoolResult] = queue.Queue()
+        count = 0
+        for index, item in enumerate(items):
+            self._jobs.put((index, item, func, results))
+            count += 1
+        for _ in range(count):
+            yield results.get()
+
+    def map(self, func: Job, items: Iterable[Any]) -> list[PoolResult]:
+        """Run func(excel_manager, item) for each item on the pool.
+
+        Args:
+            func: Job function; it receives the started ExcelManager of
+                the worker running it
+            items: Job inputs (e.g., workbook paths)
+
+        Returns:
+            One PoolResult per item, in the order of items
+        """
+        return sorted(self.imap_unordered(func, items), key=lambda r: r.index)
+
+    # ------------------------------------------------------------------
+    # Worker side (runs in the worker threads)
+    # ------------------------------------------------------------------
+
+    def _serve(self, worker: _Worker) -> None:
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            try:
+                self._launch(worker)
+            except Exception:
+                logger.warning(
+                    "Pool worker %d could not launch Excel",
+                    worker.number,
+                    exc_info=True,
+                )
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                index, item, func, results = job
+                try:
+                    result = self._run(worker, index, item, func)
+                except Exception as e:
+                    # Never leave map() waiting for a result
+                    logger.exception("Pool worker %d failed", worker.number)
+                    result = PoolResult(
+                        index=index,
+                        item=item,
+                        success=False,
+                        error_type=type(e).__name__,
+                        error_message=str(e),
+                        worker=worker.number,
+                    )
+                results.put(result)
+        finally:
+            self._release(worker)
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def _launch(self, worker: _Worker) -> ExcelManager:
+        factory = self._standby.acquire if self._standby else self._app_factory
+        mgr = ExcelManager(Visibility.HIDE, app_factory=factory)
+        info = mgr.start()
+        mgr.app.DisplayAlerts = False
+        worker.mgr, worker.pid = mgr, info.pid
+        worker.jobs, worker.started = 0, time.monotonic()
+        return mgr
+
+    def _run(self, worker: _Worker, index: int, item: Any, func: Job) -> PoolResult:
+        started = time.perf_counter()
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                mgr = worker.mgr or self._launch(worker)
+                value = func(mgr, item)
+            except Exception as e:
+                if worker.mgr is not None and self._alive(worker.mgr):
+                    # The instance is fine: the job itself failed
+                    self._reset(worker)
+                    self._apply_policy(worker)
+                elif attempts <= self._retries:
+                    logger.warning(
+                        "Excel instance of pool worker %d failed on item %d, "
+                        "recycling it and retrying",
+                        worker.number,
+                        index,
+                    )
+                    self._recycle(worker)
+                    continue
+                else:
+                    self._recycle(worker)
+                return PoolResult(
+                    index=index,
+                    item=item,
+                    success=False,
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    attempts=attempts,
+                    worker=worker.number,
+                    elapsed_ms=(time.perf_counter() - started) * 1000,
+                )
+
+            self._reset(worker)
+            self._apply_policy(worker)
+            return PoolResult(
+                index=index,
+                item=item,
+                success=True,
+                result=value,
+                attempts=attempts,
+                worker=worker.number,
+                elapsed_ms=(time.perf_counter() - started) * 1000,
+            )
+
+    @staticmethod
+    def _alive(mgr: ExcelManager) -> bool:
+        """Probe an instance with one cheap call."""
+        try:
+            mgr.app.Workbooks.Count
+            return True
+        except Exception:
+            return False
+
+    def _reset(self, worker: _Worker) -> None:
+        """Close the workbooks a job left open; recycle on failure."""
+        mgr = worker.mgr
+        if mgr is None:
+            return
+        try:
+            for wb in list(mgr.app.Workbooks):
+                wb.Close(SaveChanges=False)
+        except Exception:
+            self._recycle(worker)
+            return
+        mgr.workbook_index.invalidate()
+        mgr.metadata_index.invalidate()
+
+    def _apply_policy(self, worker: _Worker) -> None:
+        """Count the job and retire the instance if the policy says so."""
+        if worker.mgr is None:
+            return
+        worker.jobs += 1
+        if self._recycle_policy is None:
+            return
+        event = self._recycle_policy.evaluate(
+            worker.jobs, worker.started, worker.pid, worker=worker.number
+        )
+        if event is not None:
+            with self._lock:
+                self._retired += 1
+            # Healthy instance: no kill, releasing it lets Excel exit
+            self._release(worker)
+
+    def _recycle(self, worker: _Worker) -> None:
+        """Drop the instance of a worker; the next job launches a new one."""
+        with self._lock:
+            self._recycled += 1
+        pid = worker.pid
+        self._release(worker)
+        if pid > 0:
+            try:
+                ExcelManager().force_kill(pid)
+            except Exception:
+                # Already gone
+                pass
+
+    @staticmethod
+    def _release(worker: _Worker) -> None:
+        mgr, worker.mgr, worker.pid = worker.mgr, None, -1
+        if mgr is None:
+            return
+        try:
+            mgr.stop(save=False)
+        except Exception:
+            pass
@@ -0,0 +1,341 @@
+"""
+Warm standby Excel instances, started ahead of time and handed out on demand.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import gc
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+try:
+    import pythoncom
+    import win32com.client
+    from win32com.client import CDispatch
+except ImportError:
+    # Without pywin32, standby instances come from a launcher such as FakeExcel
+    CDispatch = Any
+    pythoncom = None
+
+from .com_threading import marshal_dispatch, unmarshal_dispatch
+from .excel_manager import ExcelManager, Visibility
+from .excel_optimizer import ExcelOptimizer
+
+logger = logging.getLogger(__name__)
+
+# Delay before launching again after a failed launch, in seconds
+LAUNCH_RETRY_DELAY: float = 1.0
+
+
+@dataclass
+class StandbyStats:
+    """Counters of a WarmStandby.
+
+    Attributes:
+        hits: Acquisitions served by a ready instance
+        misses: Acquisitions that had to launch an instance
+        launched: Instances launched and prepared (standby and misses)
+        failed_launches: Launches that raised an error
+        discarded: Ready instances found dead when handed out
+        ready_ms_total: Launch-to-ready time of all launched instances
+        ready_ms_max: Longest launch-to-ready time
+        acquire_ms_total: Time spent in acquire() by the callers
+    """
+
+    hits: int = 0
+    misses: int = 0
+    launched: int = 0
+    failed_launches: int = 0
+    discarded: int = 0
+    ready_ms_total: float = 0.0
+    ready_ms_max: float = 0.0
+    acquire_ms_total: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of acquisitions served by a ready instance (0.0 to 1.0)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def mean_ready_ms(self) -> float:
+        """Mean launch-to-ready time of an instance (cold start)."""
+        return self.ready_ms_total / self.launched if self.launched else 0.0
+
+    @property
+    def mean_acquire_ms(self) -> float:
+        """Mean time callers waited for an instance."""
+        total = self.hits + self.misses
+        return self.acquire_ms_total / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the counters and derived metrics, rounded for display."""
+        record = asdict(self)
+        record["hit_rate"] = self.hit_rate
+        record["mean_ready_ms"] = self.mean_ready_ms
+        record["mean_acquire_ms"] = self.mean_acquire_ms
+        return {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in record.items()
+        }
+
+
+def _dispatch_isolated() -> CDispatch:
+    """Launch a new EXCEL.EXE, not shared through the ROT (DispatchEx)."""
+    return win32com.client.DispatchEx("Excel.Application")
+
+
+class WarmStandby:
+    """Keeps K hidden Excel instances started, ready to be handed out.
+
+    Starting EXCEL.EXE takes seconds, which dominates short jobs.  A
+    standby launches instances ahead of time from a background thread,
+    prepares them (hidden, ExcelOptimizer profile, COM add-ins
+    disconnected if asked) and hands one out on each acquire().  The
+    handed out instance is replaced in the background.  When no
+    instance is ready, acquire() launches one in the calling thread
+    (a miss), prepared the same way.
+
+    acquire() has the signature of an ``app_factory``, so a standby
+    plugs into ExcelManager and ExcelPool:
+
+    Example:
+        >>> with WarmStandby(2) as standby:
+        ...     mgr = ExcelManager(Visibility.HIDE, app_factory=standby.acquire)
+        ...     mgr.start()  # no cold start
+        ...     ...
+        ...     print(standby.stats.hit_rate, standby.stats.mean_ready_ms)
+
+    Instances are launched one at a time, so that K cold starts do not
+    compete for the disk and CPU.  Those left in standby by close() are
+    released and exit, as Excel does once an automation instance has no
+    more references.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        *,
+        launcher: Callable[[], CDispatch] | None = None,
+        optimize: bool = True,
+        disable_addins: bool = False,
+    ):
+        """Initialize a standby (instances are launched by start()).
+
+        Args:
+            size: Number of instances to keep ready
+            launcher: Callable returning a new Application object
+                (default: DispatchEx).  Pass FakeExcel, or a slower
+                wrapper around it, to run without Excel.
+            optimize: Apply the ExcelOptimizer profile (screen updating,
+                events, alerts and calculation off) before handing out
+            disable_addins: Disconnect the COM add-ins loaded at startup.
+                Excel stores this choice for the user: use it on
+                dedicated automation accounts.
+
+        Raises:
+            ValueError: If size is lower than 1
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1 (got {size})")
+        self._size = size
+        self._launcher = launcher or _dispatch_isolated
+        self._optimize = optimize
+        self._disable_addins = disable_addins
+        self._ready: deque[Any] = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = StandbyStats()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "WarmStandby":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Number of instances kept ready."""
+        return self._size
+
+    @property
+    def ready(self) -> int:
+        """Number of instances ready to be handed out."""
+        with self._cond:
+            return len(self._ready)
+
+    @property
+    def stats(self) -> StandbyStats:
+        """Snapshot of the counters."""
+        with self._cond:
+            return replace(self._stats)
+
+    def start(self) -> None:
+        """Start the background thread filling the standby."""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._closed = False
+            self._thread = threading.Thread(
+                target=self._replenish, name="xlmanage-standby", daemon=True
+            )
+        self._thread.start()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        """Block until every standby instance is ready.
+
+        Args:
+            timeout: Maximum wait in seconds, None to wait as long as needed
+
+        Returns:
+            True if the standby is full, False on timeout or once closed
+        """
+        with self._cond:
+            return (
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._ready) >= self._size, timeout
+                )
+                and not self._closed
+            )
+
+    def acquire(self) -> CDispatch:
+        """Hand out a ready instance, or launch one if none is ready.
+
+        The caller owns the instance from then on and a replacement is
+        launched in the background.
+
+        Returns:
+            Application object, usable from the calling thread
+
+        Raises:
+            Exception: Whatever the launcher raises on a miss
+        """
+        started = time.perf_counter()
+        while True:
+            with self._cond:
+                token = self._ready.popleft() if self._ready else None
+                self._cond.notify_all()
+            if token is None:
+                break
+            try:
+                app = unmarshal_dispatch(token)
+                # Still alive after waiting in standby?
+                app.Workbooks.Count
+            except Exception:
+                logger.info("Discarding a dead standby Excel instance", exc_info=True)
+                with self._cond:
+                    self._stats.discarded += 1
+                continue
+            with self._cond:
+                self._stats.hits += 1
+                self._stats.acquire_ms_total += (time.perf_counter() - started) * 1000
+            return app
+
+        app = self._launch()
+        with self._cond:
+            self._stats.misses += 1
+            self._stats.acquire_ms_total += (time.perf_counter() - started) * 1000
+        return app
+
+    def close(self) -> None:
+        """Stop launching and release the instances still in standby."""
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._closed = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+        with self._cond:
+            tokens = list(self._ready)
+            self._ready.clear()
+        for token in tokens:
+            try:
+                # Releases the marshaling stream; the proxy is dropped at once
+                unmarshal_dispatch(token)
+            except Exception:
+                # Already gone
+                pass
+        gc.collect()
+
+    def _launch(self) -> CDispatch:
+        """Launch and prepare one instance in the calling thread."""
+        started = time.perf_counter()
+        mgr = ExcelManager(Visibility.HIDE, app_factory=self._launcher)
+        try:
+            mgr.start()
+        except Exception:
+            with self._cond:
+                self._stats.failed_launches += 1
+            raise
+        app = mgr.app
+        if self._optimize:
+            ExcelOptimizer(mgr).apply()
+        if self._disable_addins:
+            _disconnect_com_addins(app)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._cond:
+            self._stats.launched += 1
+            self._stats.ready_ms_total += elapsed_ms
+            self._stats.ready_ms_max = max(self._stats.ready_ms_max, elapsed_ms)
+        return app
+
+    def _replenish(self) -> None:
+        """Background thread: launch instances while the standby is not full."""
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._closed or len(self._ready) < self._size
+                    )
+                    if self._closed:
+                        return
+                try:
+                    token = marshal_dispatch(self._launch())
+                except Exception:
+                    logger.warning(
+                        "Standby Excel instance failed to launch", exc_info=True
+                    )
+                    with self._cond:
+                        self._cond.wait_for(lambda: self._closed, LAUNCH_RETRY_DELAY)
+                    continue
+                with self._cond:
+                    self._ready.append(token)
+                    self._cond.notify_all()
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+
+def _disconnect_com_addins(app: CDispatch) -> None:
+    """Disconnect the COM add-ins of an instance, ignoring failures."""
+    try:
+        for addin in app.COMAddIns:
+            try:
+                if addin.Connect:
+                    addin.Connect = False
+            except Exception:
+                logger.info("Could not disconnect a COM add-in", exc_info=True)
+    except Exception:
+        logger.info("COM add-ins not available", exc_info=True)
@@ -288,6 +288,48 @@ class TableNameError(ExcelManageError):
         super().__init__(f"Invalid table name '{name}': {reason}")
 
 
+class TableColumnError(ExcelManageError):
+    """Colonnes incompatibles avec la table.
+
+    Raised when the columns of the data to load do not match the columns
+    of the target table (unknown or duplicated names).
+    """
+
+    def __init__(self, name: str, columns: list[str], reason: str):
+        """Initialize table column error.
+
+        Args:
+            name: Name of the target table
+            columns: Offending column names
+            reason: Explanation of the mismatch
+        """
+        self.name = name
+        self.columns = columns
+        self.reason = reason
+        super().__init__(
+            f"Invalid columns for table '{name}': {reason} ({', '.join(columns)})"
+        )
+
+
+class RangeError(ExcelManageError):
+    """Plage de cellules invalide.
+
+    Raised when a range reference cannot be resolved or its data cannot be
+    transferred.
+    """
+
+    def __init__(self, range_ref: str, reason: str):
+        """Initialize range error.
+
+        Args:
+            range_ref: The range reference (e.g., "A1:D10")
+            reason: Explanation of why the range is invalid
+        """
+        self.range_ref = range_ref
+        self.reason = reason
+        super().__init__(f"Invalid range '{range_ref}': {reason}")
+
+
 class VBAProjectAccessError(ExcelManageError):
     """Accès au projet VBA refusé par le Trust Center.
 
@@ -444,3 +486,58 @@ class VBAWorkbookFormatError(ExcelManageError):
             f"Workbook '{workbook_name}' is in .xlsx format which doesn't support VBA. "
             "Convert to .xlsm format to use macros."
         )
+
+
+class OperationError(ExcelManageError):
+    """Opération inconnue ou paramètres invalides.
+
+    Raised when a batch or daemon request names an operation that is not
+    registered, or passes arguments the target method does not accept.
+    """
+
+    def __init__(self, operation: str, reason: str):
+        """Initialize operation error.
+
+        Args:
+            operation: Name of the requested operation (e.g., "workbook.open")
+            reason: Explanation of why the operation was rejected
+        """
+        self.operation = operation
+        self.reason = reason
+        super().__init__(f"Invalid operation '{operation}': {reason}")
+
+
+class DaemonConnectionError(ExcelManageError):
+    """Démon xlmanage injoignable.
+
+    Raised when the CLI runs in client mode but no daemon answers on the
+    configured address, or when the connection drops mid-request.
+    """
+
+    def __init__(self, address: str, message: str = "xlmanage daemon unreachable"):
+        """Initialize daemon connection error.
+
+        Args:
+            address: Socket path or named pipe the client tried to reach
+            message: Human-readable error message
+        """
+        self.address = address
+        self.message = message
+        super().__init__(f"{message}: {address}")
+
+
+class DaemonAlreadyRunningError(ExcelManageError):
+    """Démon xlmanage déjà actif.
+
+    Raised when a daemon is started on an address where another daemon
+    already accepts connections.
+    """
+
+    def __init__(self, address: str):
+        """Initialize daemon already running error.
+
+        Args:
+            address: Socket path or named pipe already in use
+        """
+        self.address = address
+        super().__init__(f"xlmanage daemon already running: {address}")
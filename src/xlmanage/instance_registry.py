@@ -0,0 +1,194 @@
+"""
+Cached listing of the running Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+
+from .excel_manager import ExcelManager, InstanceInfo, ScanTimings
+from .window_enum import WindowEnumerator, WindowSource
+
+logger = logging.getLogger(__name__)
+
+# Seconds a listing is served from the cache
+DEFAULT_TTL: float = 2.0
+
+
+@dataclass
+class InstanceSnapshot:
+    """Running Excel instances at one point in time.
+
+    Attributes:
+        instances: Instances found.  Fast listings only know the PID and
+            HWND: visible is False and workbooks_count 0 (unknown).
+        fast: True if listed from the windows only, without COM
+        timings: Time spent by the scan that produced the listing
+        taken_at: time.time() when the scan ended
+        cached: True if served from the cache rather than scanned
+    """
+
+    instances: list[InstanceInfo]
+    fast: bool
+    timings: ScanTimings = field(default_factory=ScanTimings)
+    taken_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def age(self) -> float:
+        """Seconds since the scan."""
+        return max(0.0, time.time() - self.taken_at)
+
+
+class InstanceRegistry:
+    """Lists the running Excel instances, caching each listing for a TTL.
+
+    A full listing walks the Running Object Table, binds every moniker
+    and reads Hwnd, Visible and Workbooks.Count of each instance, or
+    falls back to tasklist: too slow to repeat every few seconds.  The
+    registry keeps the last listing for ``ttl`` seconds.  A fast listing
+    only enumerates the top-level windows (one pass, no COM) and returns
+    the PID and HWND of each instance; a cached full listing also
+    answers fast requests.
+
+    One registry lives as long as its process: a monitoring script keeps
+    its own, and the daemon (``xlmanage serve``) keeps one shared by all
+    its clients (``xlmanage --daemon status``).
+
+    Example:
+        >>> registry = InstanceRegistry(ttl=5)
+        >>> snapshot = registry.snapshot(fast=True)
+        >>> [info.pid for info in snapshot.instances]
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        *,
+        manager: ExcelManager | None = None,
+        window_source: WindowSource | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty registry.
+
+        Args:
+            ttl: Seconds a listing is served from the cache (0 disables it)
+            manager: ExcelManager whose list_running_instances() makes the
+                full listings (default: a new ExcelManager)
+            window_source: Window source of the fast listings (default:
+                Win32WindowSource).  Pass a xlmanage.testing.FakeWindowSource
+                to run without Windows.
+            clock: Monotonic clock deciding when a listing expires
+
+        Raises:
+            ValueError: If ttl is negative
+        """
+        if ttl < 0:
+            raise ValueError(f"ttl must be >= 0 (got {ttl})")
+        self.ttl = ttl
+        self._manager = manager or ExcelManager()
+        self._window_source = window_source
+        self._clock = clock
+        self._lock = threading.Lock()
+        # fast -> (clock() at the scan, snapshot)
+        self._cache: dict[bool, tuple[float, InstanceSnapshot]] = {}
+
+    def snapshot(self, fast: bool = False, refresh: bool = False) -> InstanceSnapshot:
+        """Return the running instances, from the cache if still fresh.
+
+        Args:
+            fast: List the PID and HWND of each instance from the windows
+                only, without connecting to the instances
+            refresh: Scan even if the cache is fresh
+
+        Returns:
+            InstanceSnapshot, with cached=True if served from the cache
+
+        Raises:
+            ExcelConnectionError: If the full listing fails
+        """
+        with self._lock:
+            if not refresh:
+                cached = self._cached(fast)
+                if cached is not None:
+                    return cached
+            snapshot = self._scan_windows() if fast else self._scan()
+            self._cache[fast] = (self._clock(), snapshot)
+            return _copy(snapshot)
+
+    def invalidate(self) -> None:
+        """Drop the cached listings, e.g. after starting or stopping Excel."""
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, fast: bool) -> InstanceSnapshot | None:
+        """Freshest cached listing able to answer, or None."""
+        now = self._clock()
+        # A full listing also answers a fast request
+        for kind in (False, True) if fast else (False,):
+            entry = self._cache.get(kind)
+            if entry is not None and now - entry[0] < self.ttl:
+                return _copy(entry[1], cached=True)
+        return None
+
+    def _scan(self) -> InstanceSnapshot:
+        """Full listing through the ROT, or the tasklist fallback."""
+        timings = ScanTimings()
+        instances = self._manager.list_running_instances(timings=timings)
+        logger.debug(
+            "Listed %d Excel instances via %s in %.1f ms "
+            "(ROT %.1f ms, reads %.1f ms, fallback %.1f ms)",
+            len(instances),
+            timings.source,
+            timings.total_ms,
+            timings.rot_ms,
+            timings.read_ms,
+            timings.fallback_ms,
+        )
+        return InstanceSnapshot(instances, False, timings, time.time())
+
+    def _scan_windows(self) -> InstanceSnapshot:
+        """Fast listing: one pass over the top-level windows, no COM."""
+        started = time.perf_counter()
+        try:
+            hwnds = WindowEnumerator(self._window_source).xlmain_hwnds()
+        except Exception:
+            # Not Windows, or user32 unavailable
+            logger.debug("Top-level windows not available", exc_info=True)
+            hwnds = {}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        instances = [
+            InstanceInfo(pid=pid, visible=False, workbooks_count=0, hwnd=hwnd)
+            for pid, hwnd in sorted(hwnds.items())
+        ]
+        timings = ScanTimings(
+            source="windows", windows_ms=elapsed_ms, total_ms=elapsed_ms
+        )
+        return InstanceSnapshot(instances, True, timings, time.time())
+
+
+def _copy(snapshot: InstanceSnapshot, cached: bool = False) -> InstanceSnapshot:
+    """Copy of a cached snapshot that callers may modify."""
+    return replace(
+        snapshot,
+        instances=list(snapshot.instances),
+        timings=replace(snapshot.timings),
+        cached=cached,
+    )
@@ -17,22 +17,54 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import ctypes
+import logging
+import math
+import queue
 import re
-from dataclasses import dataclass
+import statistics
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import pywintypes
-from win32com.client import CDispatch
+try:
+    import pythoncom
+    import pywintypes
+    from win32com.client import CDispatch
+except ImportError:
+    # Without pywin32 (e.g., Linux CI), use the stand-in COM error and date
+    # types, also used by the in-memory backend of xlmanage.testing
+    CDispatch = Any
+    from xlmanage import _compat as pywintypes
 
+    pythoncom = None
+
+from xlmanage.com_retry import current_retry_policy, ensure_message_filter
+from xlmanage.com_threading import marshal_dispatch, unmarshal_dispatch
 from xlmanage.exceptions import VBAMacroError, WorkbookNotFoundError
+from xlmanage.metadata_index import MetadataIndex
+from xlmanage.workbook_index import WorkbookIndex, workbook_index
 
 if TYPE_CHECKING:
     from xlmanage.excel_manager import ExcelManager
 
+logger = logging.getLogger(__name__)
+
 # Limite COM pour le nombre d'arguments
 MAX_MACRO_ARGS = 30
 
+# Délai laissé à la macro pour s'arrêter après l'interruption (secondes),
+# avant de terminer le processus Excel
+INTERRUPT_GRACE: float = 5.0
+
+# Messages Win32 de l'interruption (Ctrl+Attn)
+_WM_KEYDOWN = 0x0100
+_WM_KEYUP = 0x0101
+_VK_CANCEL = 0x03
+
 
 def _parse_macro_args(args_str: str) -> list[str | int | float | bool]:
     """Parse une chaîne CSV en liste d'arguments typés pour VBA.
@@ -141,6 +173,12 @@ class MacroResult:
         return_type: Type Python du retour ("str", "int", "float", "NoneType", etc.)
         success: True si exécution sans erreur VBA
         error_message: Message d'erreur VBA si échec (None si succès)
+        status: "ok", "error" (erreur VBA) ou "timeout" (délai dépassé) ;
+            déduit de success s'il n'est pas fourni
+        elapsed_ms: Durée d'exécution en millisecondes
+        timeout_action: Après un dépassement de délai, "interrupted" (la
+            macro s'est arrêtée après l'interruption), "killed" (processus
+            Excel terminé) ou "abandoned" (macro toujours en cours)
 
     Example:
         >>> result = MacroResult(
@@ -157,6 +195,13 @@ class MacroResult:
     return_type: str
     success: bool
     error_message: str | None
+    status: str = ""
+    elapsed_ms: float = 0.0
+    timeout_action: str | None = None
+
+    def __post_init__(self) -> None:
+        if not self.status:
+            self.status = "ok" if self.success else "error"
 
     def __str__(self) -> str:
         """Représentation textuelle du résultat."""
@@ -171,7 +216,10 @@ class MacroResult:
 
 
 def _build_macro_reference(
-    macro_name: str, workbook: Path | None, app: CDispatch
+    macro_name: str,
+    workbook: Path | None,
+    app: CDispatch,
+    index: WorkbookIndex | None = None,
 ) -> str:
     """Construit la référence complète d'une macro VBA.
 
@@ -186,6 +234,8 @@ def _build_macro_reference(
         macro_name: Nom de la macro (ex: "Module1.MySub" ou "MySub")
         workbook: Chemin du classeur contenant la macro (optionnel)
         app: Objet COM Excel.Application
+        index: Index des classeurs de l'ExcelManager, utilisé à la place
+            du parcours des classeurs ouverts s'il est fourni
 
     Returns:
         str: Référence complète de la macro (ex: "'data.xlsm'!Module1.MySub")
@@ -208,11 +258,17 @@ def _build_macro_reference(
     workbook_name = workbook.name
     found = False
 
-    for wb in app.Workbooks:
-        if wb.Name.lower() == workbook_name.lower():
+    if index is not None:
+        wb = index.find(app, workbook)
+        if wb is not None:
             found = True
             workbook_name = wb.Name  # Utiliser le nom exact (casse)
-            break
+    else:
+        for wb in app.Workbooks:
+            if wb.Name.lower() == workbook_name.lower():
+                found = True
+                workbook_name = wb.Name  # Utiliser le nom exact (casse)
+                break
 
     if not found:
         raise WorkbookNotFoundError(
@@ -273,6 +329,87 @@ def _format_return_value(value: Any) -> str:
     return str(value)
 
 
+@dataclass
+class MacroBatchResult:
+    """Résultat d'une série d'exécutions d'une même macro (run_many).
+
+    Les statistiques de latence portent sur la durée (elapsed_ms) de
+    toutes les exécutions, réussies ou non.
+
+    Attributes:
+        macro_name: Référence complète de la macro exécutée
+        results: Résultat de chaque exécution, dans l'ordre
+        total_ms: Durée totale de la série en millisecondes
+        succeeded: Nombre d'exécutions réussies
+        failed: Nombre d'exécutions en erreur ou hors délai
+        min_ms: Latence minimale en millisecondes
+        median_ms: Latence médiane en millisecondes
+        p95_ms: 95e centile de la latence en millisecondes
+        max_ms: Latence maximale en millisecondes
+        throughput: Exécutions par seconde sur la série
+
+    Example:
+        >>> batch = runner.run_many("Module1.GetSum", args_list=["1,2", "3,4"])
+        >>> print(batch.succeeded, batch.median_ms, batch.throughput)
+    """
+
+    macro_name: str
+    results: list[MacroResult]
+    total_ms: float
+    succeeded: int = field(init=False)
+    failed: int = field(init=False)
+    min_ms: float = field(init=False)
+    median_ms: float = field(init=False)
+    p95_ms: float = field(init=False)
+    max_ms: float = field(init=False)
+    throughput: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.succeeded = sum(1 for result in self.results if result.success)
+        self.failed = len(self.results) - self.succeeded
+        latencies = sorted(result.elapsed_ms for result in self.results)
+        if latencies:
+            self.min_ms = latencies[0]
+            self.median_ms = statistics.median(latencies)
+            # 95e centile au rang le plus proche
+            self.p95_ms = latencies[math.ceil(0.95 * len(latencies)) - 1]
+            self.max_ms = latencies[-1]
+        else:
+            self.min_ms = self.median_ms = self.p95_ms = self.max_ms = 0.0
+        self.throughput = (
+            len(self.results) * 1000 / self.total_ms if self.total_ms > 0 else 0.0
+        )
+
+    @property
+    def success(self) -> bool:
+        """True si toutes les exécutions ont réussi."""
+        return self.failed == 0
+
+
+def read_args_file(path: Path) -> list[str]:
+    """Lit un fichier d'arguments : une exécution par ligne.
+
+    Chaque ligne a le format CSV de l'option --args (ex: '"Report",42').
+    Les lignes vides et celles commençant par # sont ignorées.
+
+    Args:
+        path: Fichier à lire (UTF-8, avec ou sans BOM)
+
+    Returns:
+        list[str]: Arguments CSV de chaque exécution
+
+    Example:
+        >>> read_args_file(Path("calls.csv"))
+        ['"Nord",2024', '"Sud",2024']
+    """
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    return [
+        line.strip()
+        for line in lines
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
 class MacroRunner:
     """Exécuteur de macros VBA.
 
@@ -300,15 +437,28 @@ class MacroRunner:
         self._mgr = excel_manager
 
     def run(
-        self, macro_name: str, workbook: Path | None = None, args: str | None = None
+        self,
+        macro_name: str,
+        workbook: Path | None = None,
+        args: str | None = None,
+        timeout: float | None = None,
     ) -> MacroResult:
         """Exécute une macro VBA avec arguments optionnels.
 
+        Sans timeout, Application.Run est appelé dans le thread courant et
+        bloque jusqu'à la fin de la macro.  Avec un timeout, il est appelé
+        depuis un thread dédié (STA) surveillé : à l'expiration du délai,
+        la macro est interrompue (Ctrl+Attn envoyé à la fenêtre Excel),
+        puis, si elle tourne encore après INTERRUPT_GRACE secondes, le
+        processus Excel est terminé avec force_kill().  Le résultat a
+        alors le statut "timeout".
+
         Args:
             macro_name: Nom de la macro (ex: "Module1.MySub" ou "MySub")
             workbook: Classeur contenant la macro
                 (None = classeur actif ou PERSONAL.XLSB)
             args: Arguments CSV (ex: '"hello",42,3.14,true')
+            timeout: Durée maximale d'exécution en secondes (None = sans limite)
 
         Returns:
             MacroResult: Résultat d'exécution avec valeur de retour et statut
@@ -316,6 +466,7 @@ class MacroRunner:
         Raises:
             VBAMacroError: Si parsing des arguments échoue ou macro introuvable
             WorkbookNotFoundError: Si le classeur n'est pas ouvert
+            ValueError: Si timeout n'est pas positif
 
         Example:
             >>> runner.run("Module1.GetSum", args="10,20")
@@ -323,9 +474,19 @@ class MacroRunner:
 
             >>> runner.run("Module1.SayHello", args='"World"')
             MacroResult(macro_name="Module1.SayHello", return_value=None, ...)
+
+            >>> runner.run("Module1.LongTask", timeout=120).status
+            'timeout'
         """
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be > 0 (got {timeout})")
+
+        app = self._mgr.app
+
         # 1. Construire la référence complète
-        full_ref = _build_macro_reference(macro_name, workbook, self._mgr.app)
+        full_ref = _build_macro_reference(
+            macro_name, workbook, app, workbook_index(self._mgr)
+        )
 
         # 2. Parser les arguments
         parsed_args: list[Any] = []
@@ -333,42 +494,313 @@ class MacroRunner:
             parsed_args = _parse_macro_args(args)
 
         # 3. Exécuter la macro
+        _forget_dimensions(self._mgr)
+        if timeout is None:
+            return _run_direct(app, full_ref, parsed_args)
+        watchdog = _MacroWatchdog(self._mgr, app, timeout)
+        try:
+            return watchdog.run(full_ref, parsed_args)
+        finally:
+            watchdog.close()
+
+    def run_many(
+        self,
+        macro_name: str,
+        workbook: Path | None = None,
+        args_list: Iterable[str | None] | None = None,
+        repeat: int = 1,
+        timeout: float | None = None,
+        stop_on_error: bool = False,
+    ) -> MacroBatchResult:
+        """Exécute une macro plusieurs fois dans la même session.
+
+        La référence de la macro est construite une seule fois et chaque
+        jeu d'arguments est parsé une seule fois, avant la première
+        exécution : une erreur de format est signalée sans rien exécuter.
+        Chaque jeu d'arguments est exécuté ``repeat`` fois de suite.
+
+        Sert aux traitements en masse (un jeu d'arguments par ligne d'un
+        fichier, voir read_args_file()) et à la mesure des performances
+        d'une macro (latences min/médiane/p95/max et débit).
+
+        Avec un timeout, un seul thread surveillé sert toute la série :
+        l'instance est marshalée et son PID lu une fois, puis le délai
+        est réarmé à chaque exécution.
+
+        La série s'arrête après un dépassement de délai dont la macro n'a
+        pas pu être interrompue (instance terminée ou toujours occupée),
+        et à la première erreur si stop_on_error est vrai.
+
+        Args:
+            macro_name: Nom de la macro (ex: "Module1.MySub" ou "MySub")
+            workbook: Classeur contenant la macro
+                (None = classeur actif ou PERSONAL.XLSB)
+            args_list: Arguments CSV de chaque exécution (None ou chaîne
+                vide = sans argument) ; None = une exécution sans argument
+            repeat: Nombre d'exécutions de chaque jeu d'arguments
+            timeout: Durée maximale de chaque exécution en secondes
+                (None = sans limite)
+            stop_on_error: Arrêter la série à la première erreur VBA
+
+        Returns:
+            MacroBatchResult: Résultats et statistiques de latence
+
+        Raises:
+            VBAMacroError: Si parsing des arguments échoue ou macro introuvable
+            WorkbookNotFoundError: Si le classeur n'est pas ouvert
+            ValueError: Si repeat ou timeout n'est pas positif
+
+        Example:
+            >>> batch = runner.run_many("Module1.Compute", repeat=100)
+            >>> print(f"{batch.p95_ms:.1f} ms, {batch.throughput:.0f}/s")
+        """
+        if repeat < 1:
+            raise ValueError(f"repeat must be >= 1 (got {repeat})")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be > 0 (got {timeout})")
+
+        app = self._mgr.app
+        full_ref = _build_macro_reference(
+            macro_name, workbook, app, workbook_index(self._mgr)
+        )
+        calls = [
+            _parse_macro_args(args) if args else []
+            for args in (args_list if args_list is not None else [None])
+        ]
+
+        _forget_dimensions(self._mgr)
+        results: list[MacroResult] = []
+        started = time.perf_counter()
+        watchdog = (
+            _MacroWatchdog(self._mgr, app, timeout) if timeout is not None else None
+        )
         try:
-            return_value = self._mgr.app.Run(full_ref, *parsed_args)
-
-            # Succès : construire le résultat
-            return MacroResult(
-                macro_name=full_ref,
-                return_value=return_value,
-                return_type=type(return_value).__name__,
-                success=True,
-                error_message=None,
+            for parsed_args in (args for args in calls for _ in range(repeat)):
+                if watchdog is None:
+                    result = _run_direct(app, full_ref, parsed_args)
+                else:
+                    result = watchdog.run(full_ref, parsed_args)
+                results.append(result)
+                if result.timeout_action in ("killed", "abandoned"):
+                    # Instance terminée ou toujours occupée par la macro
+                    break
+                if stop_on_error and not result.success:
+                    break
+        finally:
+            if watchdog is not None:
+                watchdog.close()
+        return MacroBatchResult(full_ref, results, _elapsed_ms(started))
+
+
+class _MacroWatchdog:
+    """Thread d'exécution surveillé des macros d'une session.
+
+    Application.Run est appelé depuis un thread dédié (STA) pendant que
+    l'appelant attend avec un délai.  Le PID et la fenêtre de l'instance
+    sont lus, et l'instance marshalée, une seule fois : une série
+    d'exécutions (run_many) ne paie que le réarmement du délai.
+    """
+
+    def __init__(
+        self, excel_manager: "ExcelManager", app: CDispatch, timeout: float
+    ) -> None:
+        """Démarre le thread d'exécution.
+
+        Args:
+            excel_manager: ExcelManager de l'instance (PID, force_kill)
+            app: Application Excel du thread appelant
+            timeout: Durée maximale de chaque exécution en secondes
+        """
+        self._mgr = excel_manager
+        self._timeout = timeout
+        # PID et fenêtre lus avant que la macro n'occupe l'instance
+        self._info = excel_manager.get_instance_info(app)
+        self._jobs: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        threading.Thread(
+            target=self._work,
+            args=(marshal_dispatch(app), current_retry_policy()),
+            name="xlmanage-macro",
+            daemon=True,
+        ).start()
+
+    def run(self, full_ref: str, parsed_args: list[Any]) -> MacroResult:
+        """Une exécution de la macro, interrompue au-delà du délai."""
+        outcome: dict[str, Any] = {}
+        done = threading.Event()
+        started = time.perf_counter()
+        self._jobs.put((full_ref, parsed_args, outcome, done))
+
+        timeout = self._timeout
+        if done.wait(timeout):
+            error = outcome.get("error")
+            if isinstance(error, pywintypes.com_error):
+                return _error_result(full_ref, error, _elapsed_ms(started))
+            if error is not None:
+                raise error
+            return _success_result(full_ref, outcome["value"], _elapsed_ms(started))
+
+        # Délai dépassé : interruption, puis arrêt du processus
+        logger.warning(
+            "Macro %s still running after %ss, interrupting it", full_ref, timeout
+        )
+        try:
+            _send_break(self._info.hwnd)
+        except Exception:
+            logger.info("Could not interrupt macro %s", full_ref, exc_info=True)
+
+        pid = self._info.pid
+        if done.wait(INTERRUPT_GRACE):
+            action = "interrupted"
+            message = f"Délai de {timeout} s dépassé : macro interrompue"
+        elif pid > 0 and self._kill(pid):
+            action = "killed"
+            message = (
+                f"Délai de {timeout} s dépassé : instance Excel (PID {pid}) terminée"
             )
+        else:
+            action = "abandoned"
+            message = (
+                f"Délai de {timeout} s dépassé : la macro n'a pas pu être "
+                "arrêtée et continue de s'exécuter"
+            )
+
+        return MacroResult(
+            macro_name=full_ref,
+            return_value=None,
+            return_type="NoneType",
+            success=False,
+            error_message=message,
+            status="timeout",
+            elapsed_ms=_elapsed_ms(started),
+            timeout_action=action,
+        )
+
+    def close(self) -> None:
+        """Arrête le thread d'exécution une fois la macro en cours finie."""
+        self._jobs.put(None)
+
+    def _work(self, token: Any, policy: Any) -> None:
+        """Boucle du thread d'exécution : un Application.Run par tâche."""
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        if policy is not None:
+            ensure_message_filter(policy)
+        target = None
+        try:
+            while (job := self._jobs.get()) is not None:
+                full_ref, parsed_args, outcome, done = job
+                try:
+                    if target is None:
+                        # Policy of the caller's thread, not of this one
+                        target = unmarshal_dispatch(token)
+                        if policy is not None:
+                            target = policy.wrap(target)
+                    outcome["value"] = target.Run(full_ref, *parsed_args)
+                except BaseException as e:
+                    outcome["error"] = e
+                finally:
+                    done.set()
+        finally:
+            target = None
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def _kill(self, pid: int) -> bool:
+        """Termine le processus Excel d'une macro qui ne s'arrête pas."""
+        try:
+            self._mgr.force_kill(pid)
+        except Exception:
+            logger.warning("Could not kill Excel PID %d", pid, exc_info=True)
+            return False
+        return True
+
+
+def _run_direct(app: CDispatch, full_ref: str, parsed_args: list[Any]) -> MacroResult:
+    """Une exécution de la macro dans le thread courant, sans limite."""
+    started = time.perf_counter()
+    try:
+        return_value = app.Run(full_ref, *parsed_args)
+    except pywintypes.com_error as e:
+        return _error_result(full_ref, e, _elapsed_ms(started))
+    return _success_result(full_ref, return_value, _elapsed_ms(started))
+
+
+def _forget_dimensions(excel_manager: Any) -> None:
+    """Oublie les dimensions de feuilles mémorisées par l'ExcelManager.
+
+    Une macro peut écrire dans n'importe quel classeur ouvert : les
+    dimensions lues par WorksheetManager.dimensions() seront mesurées à
+    nouveau.
+    """
+    index = getattr(excel_manager, "metadata_index", None)
+    if isinstance(index, MetadataIndex):
+        index.forget_dimensions()
+
+
+def _elapsed_ms(started: float) -> float:
+    """Millisecondes écoulées depuis une valeur de time.perf_counter()."""
+    return (time.perf_counter() - started) * 1000
+
+
+def _send_break(hwnd: int) -> None:
+    """Envoie Ctrl+Attn à la fenêtre Excel pour interrompre la macro.
+
+    Excel arrête la macro (EnableCancelKey = xlInterrupt, par défaut),
+    sauf si elle a désactivé la touche d'annulation ou ne rend jamais
+    la main.
+    """
+    if hwnd <= 0:
+        return
+    user32 = ctypes.windll.user32
+    user32.PostMessageW(hwnd, _WM_KEYDOWN, _VK_CANCEL, 0)
+    user32.PostMessageW(hwnd, _WM_KEYUP, _VK_CANCEL, 0)
+
+
+def _success_result(full_ref: str, return_value: Any, elapsed_ms: float) -> MacroResult:
+    """Résultat d'une macro terminée sans erreur."""
+    return MacroResult(
+        macro_name=full_ref,
+        return_value=return_value,
+        return_type=type(return_value).__name__,
+        success=True,
+        error_message=None,
+        elapsed_ms=elapsed_ms,
+    )
+
+
+def _error_result(
+    full_ref: str, e: "pywintypes.com_error", elapsed_ms: float
+) -> MacroResult:
+    """Résultat d'une macro en erreur VBA.
+
+    Raises:
+        VBAMacroError: Pour les autres erreurs COM (macro introuvable, etc.)
+    """
+    # Erreur COM : extraire le message VBA
+    # (pywin32 fournit un HRESULT signé, ex: -2147352567 pour 0x80020009)
+    hresult = e.hresult & 0xFFFFFFFF
+    error_msg = "Erreur VBA inconnue"
+
+    # Le message d'erreur VBA est dans excepinfo[2]
+    if e.excepinfo and len(e.excepinfo) > 2 and e.excepinfo[2]:
+        error_msg = e.excepinfo[2]
+
+    # HRESULT courants :
+    # 0x800A03EC : Erreur générique Excel/VBA runtime
+    # 0x80020009 : Exception avec excepinfo
+    if hresult in (0x800A03EC, 0x80020009):
+        # Erreur VBA runtime
+        return MacroResult(
+            macro_name=full_ref,
+            return_value=None,
+            return_type="NoneType",
+            success=False,
+            error_message=error_msg,
+            elapsed_ms=elapsed_ms,
+        )
 
-        except pywintypes.com_error as e:
-            # Erreur COM : extraire le message VBA
-            hresult = e.hresult
-            error_msg = "Erreur VBA inconnue"
-
-            # Le message d'erreur VBA est dans excepinfo[2]
-            if e.excepinfo and len(e.excepinfo) > 2 and e.excepinfo[2]:
-                error_msg = e.excepinfo[2]
-
-            # HRESULT courants :
-            # 0x800A03EC : Erreur générique Excel/VBA runtime
-            # 0x80020009 : Exception avec excepinfo
-            if hresult in (0x800A03EC, 0x80020009):
-                # Erreur VBA runtime
-                return MacroResult(
-                    macro_name=full_ref,
-                    return_value=None,
-                    return_type="NoneType",
-                    success=False,
-                    error_message=error_msg,
-                )
-            else:
-                # Autre erreur COM (macro introuvable, etc.)
-                raise VBAMacroError(
-                    macro_name=full_ref,
-                    reason=f"Erreur COM (0x{hresult:08X}): {error_msg}",
-                )
+    # Autre erreur COM (macro introuvable, etc.)
+    raise VBAMacroError(
+        macro_name=full_ref,
+        reason=f"Erreur COM (0x{hresult:08X}): {error_msg}",
+    )
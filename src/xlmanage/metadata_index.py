@@ -0,0 +1,409 @@
+"""
+Name-indexed lookup of the worksheets and tables of open workbooks.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from typing import Any
+
+try:
+    from win32com.client import CDispatch
+except ImportError:
+    CDispatch = Any
+
+from .range_algebra import Rect, parse_address
+
+
+class WorkbookMetadata:
+    """Worksheet and table lookup tables of one workbook.
+
+    Worksheets are indexed by lower-cased name (Excel compares sheet names
+    case-insensitively), tables by exact name (table names are unique in
+    a workbook and case-sensitive).  Each table is built in a single pass
+    on first use, then kept up to date by WorksheetManager and
+    TableManager.  Changes made behind xlManage's back are detected by
+    cheap probes:
+
+    * ``Worksheets.Count`` must match the number of indexed worksheets,
+    * the Name of the worksheet or table found must still be readable
+      and unchanged,
+    * a name missing from the index triggers one rescan before being
+      reported as missing, unless the caller only checks that the name
+      is free (``rescan_on_miss=False``).
+
+    The cell rectangles of the tables (their extents) are read on demand
+    by table_extents(), along with the table index, to check locally
+    that a new table does not overlap an existing one.
+
+    The dimensions of the worksheets, measured by
+    WorksheetManager.dimensions(), are kept per worksheet until cells are
+    written through xlManage or the worksheets are reindexed.  No cheap
+    probe detects cells edited in Excel: callers ask for a new
+    measurement instead.
+    """
+
+    def __init__(self) -> None:
+        self._sheets: dict[str, CDispatch] | None = None
+        self._sheet_count: int | None = None
+        self._tables: dict[str, tuple[CDispatch, CDispatch]] | None = None
+        # Table name -> (lower-cased worksheet name, cells of the table)
+        self._extents: dict[str, tuple[str, Rect]] | None = None
+        # Lower-cased worksheet name -> (rows, columns)
+        self._dimensions: dict[str, tuple[int, int]] = {}
+
+    def invalidate(self) -> None:
+        """Forget every worksheet and table; the next lookup rebuilds."""
+        self._sheets = None
+        self._sheet_count = None
+        self._tables = None
+        self._extents = None
+        self._dimensions = {}
+
+    def rebuild(self, wb: CDispatch) -> None:
+        """Index the worksheets, the tables and their extents.
+
+        Args:
+            wb: Workbook COM object the metadata belongs to
+        """
+        self._build_sheets(wb)
+        self._build_tables(wb, extents=True)
+
+    def _build_sheets(self, wb: CDispatch) -> dict[str, CDispatch]:
+        sheets: dict[str, CDispatch] = {}
+        count = 0
+        for ws in wb.Worksheets:
+            count += 1
+            try:
+                sheets.setdefault(ws.Name.lower(), ws)
+            except Exception:
+                # Skip worksheets that can't be read, like _find_worksheet()
+                continue
+        self._sheets = sheets
+        self._sheet_count = count
+        # Worksheets may have been renamed or replaced
+        self._dimensions = {}
+        return sheets
+
+    def _build_tables(
+        self, wb: CDispatch, extents: bool = False
+    ) -> tuple[dict[str, tuple[CDispatch, CDispatch]], dict[str, tuple[str, Rect]]]:
+        tables: dict[str, tuple[CDispatch, CDispatch]] = {}
+        table_extents: dict[str, tuple[str, Rect]] = {}
+        for ws in wb.Worksheets:
+            try:
+                sheet = ws.Name.lower() if extents else ""
+                for table in ws.ListObjects:
+                    try:
+                        name = table.Name
+                        tables.setdefault(name, (ws, table))
+                        if extents:
+                            rect = parse_address(table.Range.Address)[0]
+                            table_extents.setdefault(name, (sheet, rect))
+                    except Exception:
+                        continue
+            except Exception:
+                continue
+        self._tables = tables
+        self._extents = table_extents if extents else None
+        return tables, table_extents
+
+    def find_worksheet(
+        self, wb: CDispatch, name: str, rescan_on_miss: bool = True
+    ) -> CDispatch | None:
+        """Find a worksheet by name, case-insensitively.
+
+        Args:
+            wb: Workbook COM object the metadata belongs to
+            name: Name of the worksheet
+            rescan_on_miss: Rescan the workbook before reporting a name
+                missing from an up-to-date index
+
+        Returns:
+            Worksheet COM object if found, None otherwise
+        """
+        key = name.lower()
+        for _ in range(2):
+            sheets = self._sheets
+            fresh = sheets is None or wb.Worksheets.Count != self._sheet_count
+            if sheets is None or fresh:
+                sheets = self._build_sheets(wb)
+
+            ws = sheets.get(key)
+            if ws is None:
+                if fresh or not rescan_on_miss:
+                    return None
+            else:
+                try:
+                    if ws.Name.lower() == key:
+                        return ws
+                except Exception:
+                    # Deleted outside xlManage: the COM object is disconnected
+                    pass
+            self._sheets = None
+
+        return None
+
+    def find_table(
+        self, wb: CDispatch, name: str, rescan_on_miss: bool = True
+    ) -> tuple[CDispatch, CDispatch] | None:
+        """Find a table by name in every worksheet (case-sensitive).
+
+        Args:
+            wb: Workbook COM object the metadata belongs to
+            name: Name of the table
+            rescan_on_miss: Rescan the workbook before reporting a name
+                missing from the index
+
+        Returns:
+            Tuple of (worksheet, table) if found, None otherwise
+        """
+        for _ in range(2):
+            tables = self._tables
+            fresh = tables is None
+            if tables is None:
+                tables, _extents = self._build_tables(wb)
+
+            entry = tables.get(name)
+            if entry is None:
+                if fresh or not rescan_on_miss:
+                    return None
+            else:
+                try:
+                    if entry[1].Name == name:
+                        return entry
+                except Exception:
+                    pass
+            self.invalidate_tables()
+
+        return None
+
+    def table_extents(
+        self, wb: CDispatch, sheet: str
+    ) -> list[tuple[str, CDispatch, Rect]]:
+        """Return the tables of a worksheet with the cells they cover.
+
+        The extents of every table of the workbook are read in the same
+        pass as the table index (Name, Range.Address), then reused.
+        Tables resized, moved or deleted behind xlManage's back make them
+        stale: callers re-read the extent of a table before relying on
+        an overlap.
+
+        Args:
+            wb: Workbook COM object the metadata belongs to
+            sheet: Name of the worksheet (case-insensitive)
+
+        Returns:
+            List of (table name, ListObject, rectangle)
+        """
+        tables, extents = self._tables, self._extents
+        if tables is None or extents is None:
+            tables, extents = self._build_tables(wb, extents=True)
+        key = sheet.lower()
+        return [
+            (name, tables[name][1], rect)
+            for name, (table_sheet, rect) in extents.items()
+            if table_sheet == key and name in tables
+        ]
+
+    def add_worksheet(self, ws: CDispatch, name: str) -> None:
+        """Record a worksheet just created through xlManage.
+
+        Args:
+            ws: Worksheet COM object
+            name: Its Name
+        """
+        if self._sheets is None or self._sheet_count is None:
+            return
+        self._sheets[name.lower()] = ws
+        self._sheet_count += 1
+
+    def remove_worksheet(self, ws: CDispatch) -> None:
+        """Forget a worksheet just deleted through xlManage.
+
+        Its tables stay indexed until looked up: their disconnected COM
+        objects fail the Name probe, which rebuilds the table index.
+
+        Args:
+            ws: Worksheet COM object, as returned by find_worksheet()
+        """
+        if self._sheets is None or self._sheet_count is None:
+            return
+        keys = [key for key, sheet in self._sheets.items() if sheet is ws]
+        if keys:
+            for key in keys:
+                del self._sheets[key]
+                self._dimensions.pop(key, None)
+            self._sheet_count -= 1
+            if self._extents is not None:
+                self._extents = {
+                    name: extent
+                    for name, extent in self._extents.items()
+                    if extent[0] not in keys
+                }
+        else:
+            self._sheets = None
+            self._extents = None
+            self._dimensions = {}
+
+    def add_table(
+        self,
+        ws: CDispatch,
+        table: CDispatch,
+        name: str,
+        sheet: str | None = None,
+        rect: Rect | None = None,
+    ) -> None:
+        """Record a table just created through xlManage.
+
+        Args:
+            ws: Worksheet holding the table
+            table: ListObject COM object
+            name: Its Name
+            sheet: Name of the worksheet, to record the table extent
+            rect: Cells covered by the table, to record its extent
+        """
+        if self._tables is not None:
+            self._tables[name] = (ws, table)
+        if self._extents is not None:
+            if sheet is not None and rect is not None:
+                self._extents[name] = (sheet.lower(), rect)
+            else:
+                self._extents = None
+
+    def remove_table(self, name: str) -> None:
+        """Forget a table just deleted or unlisted through xlManage.
+
+        Args:
+            name: Name of the table
+        """
+        if self._tables is not None:
+            self._tables.pop(name, None)
+        if self._extents is not None:
+            self._extents.pop(name, None)
+
+    def invalidate_tables(self) -> None:
+        """Forget the tables only, e.g. after copying a worksheet.
+
+        A copied worksheet holds copies of the source tables under names
+        chosen by Excel, so the table index must be rebuilt.
+        """
+        self._tables = None
+        self._extents = None
+
+    def dimensions(self, sheet: str) -> tuple[int, int] | None:
+        """Return the dimensions recorded for a worksheet.
+
+        Args:
+            sheet: Name of the worksheet (case-insensitive)
+
+        Returns:
+            Tuple of (rows, columns), or None if not measured yet
+        """
+        return self._dimensions.get(sheet.lower())
+
+    def record_dimensions(self, sheet: str, dimensions: tuple[int, int]) -> None:
+        """Record the dimensions just measured for a worksheet.
+
+        Args:
+            sheet: Name of the worksheet (case-insensitive)
+            dimensions: Tuple of (rows, columns)
+        """
+        self._dimensions[sheet.lower()] = dimensions
+
+    def forget_dimensions(self) -> None:
+        """Forget the dimensions of every worksheet, after writing cells."""
+        self._dimensions = {}
+
+
+class MetadataIndex:
+    """Worksheet and table metadata of the workbooks of one Excel instance.
+
+    Metadata is keyed by workbook FullName, so that the active workbook
+    (a new COM reference on every call) and a workbook resolved by path
+    share the same entry.  An ExcelManager owns one index, shared by every
+    manager built on it, which makes the metadata last as long as the
+    session (script, batch or daemon).
+
+    Example:
+        >>> index = MetadataIndex()
+        >>> ws = index.get(wb).find_worksheet(wb, "Data")  # builds
+        >>> ws = index.get(wb).find_worksheet(wb, "Data")  # 4 COM calls
+    """
+
+    def __init__(self) -> None:
+        self._workbooks: dict[str, WorkbookMetadata] = {}
+
+    def __len__(self) -> int:
+        return len(self._workbooks)
+
+    def get(self, wb: CDispatch) -> WorkbookMetadata:
+        """Return the metadata of a workbook, created empty on first use.
+
+        Args:
+            wb: Workbook COM object
+
+        Returns:
+            WorkbookMetadata of the workbook
+        """
+        key = os.path.normcase(wb.FullName)
+        metadata = self._workbooks.get(key)
+        if metadata is None:
+            metadata = self._workbooks[key] = WorkbookMetadata()
+        return metadata
+
+    def discard(self, wb: CDispatch) -> None:
+        """Forget a workbook about to be closed or saved under another name.
+
+        Args:
+            wb: Workbook COM object (must still be open)
+        """
+        if not self._workbooks:
+            return
+        try:
+            self._workbooks.pop(os.path.normcase(wb.FullName), None)
+        except Exception:
+            self._workbooks.clear()
+
+    def invalidate(self) -> None:
+        """Forget the metadata of every workbook."""
+        self._workbooks.clear()
+
+    def forget_dimensions(self) -> None:
+        """Forget the worksheet dimensions of every workbook.
+
+        Used after running a macro, which may write to any workbook.
+        """
+        for metadata in self._workbooks.values():
+            metadata.forget_dimensions()
+
+
+def workbook_metadata(excel_manager: Any, wb: CDispatch) -> WorkbookMetadata | None:
+    """Return the metadata of a workbook from an ExcelManager's index.
+
+    Args:
+        excel_manager: ExcelManager, or a stand-in object (e.g. a mock)
+        wb: Workbook COM object
+
+    Returns:
+        WorkbookMetadata of the workbook, or None if the manager has no
+        metadata index, in which case callers fall back to a linear search
+        of the worksheets and tables
+    """
+    index = getattr(excel_manager, "metadata_index", None)
+    if not isinstance(index, MetadataIndex):
+        return None
+    return index.get(wb)
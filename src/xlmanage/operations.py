@@ -0,0 +1,267 @@
+"""
+Operation registry shared by the daemon and batch execution modes.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import inspect
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .exceptions import OperationError
+
+if TYPE_CHECKING:
+    from .excel_manager import ExcelManager
+
+# Operation name -> (manager key, method name)
+# The manager key "excel" targets the ExcelManager itself.
+OPERATIONS: dict[str, tuple[str, str]] = {
+    "excel.get_running_instance": ("excel", "get_running_instance"),
+    "excel.list_running_instances": ("excel", "list_running_instances"),
+    "workbook.open": ("workbook", "open"),
+    "workbook.create": ("workbook", "create"),
+    "workbook.close": ("workbook", "close"),
+    "workbook.save": ("workbook", "save"),
+    "workbook.list": ("workbook", "list"),
+    "worksheet.create": ("worksheet", "create"),
+    "worksheet.delete": ("worksheet", "delete"),
+    "worksheet.list": ("worksheet", "list"),
+    "worksheet.copy": ("worksheet", "copy"),
+    "worksheet.dimensions": ("worksheet", "dimensions"),
+    "table.create": ("table", "create"),
+    "table.delete": ("table", "delete"),
+    "table.list": ("table", "list"),
+    "table.export": ("table", "export"),
+    "table.append_rows": ("table", "append_rows"),
+    "table.upsert": ("table", "upsert"),
+    "range.read": ("range", "read"),
+    "range.write": ("range", "write"),
+    "vba.import_module": ("vba", "import_module"),
+    "vba.export_module": ("vba", "export_module"),
+    "vba.list_modules": ("vba", "list_modules"),
+    "vba.delete_module": ("vba", "delete_module"),
+    "macro.run": ("macro", "run"),
+    "macro.run_many": ("macro", "run_many"),
+}
+
+# Manager class name -> manager key (used by the CLI client mode)
+MANAGER_KEYS: dict[str, str] = {
+    "WorkbookManager": "workbook",
+    "WorksheetManager": "worksheet",
+    "TableManager": "table",
+    "RangeManager": "range",
+    "VBAManager": "vba",
+    "MacroRunner": "macro",
+}
+
+# Keyword arguments converted from str to Path when received as JSON
+PATH_PARAMETERS: frozenset[str] = frozenset(
+    {"path", "workbook", "output", "template", "module_file", "output_file"}
+)
+
+
+def _get_manager_class(key: str) -> type:
+    """Return the manager class registered under a manager key.
+
+    Imports are deferred so that importing this module stays cheap and
+    does not pull pywin32-dependent modules until an operation runs.
+
+    Args:
+        key: Manager key (e.g., "workbook", "vba")
+
+    Returns:
+        Manager class accepting an ExcelManager in its constructor
+    """
+    if key == "workbook":
+        from .workbook_manager import WorkbookManager
+
+        return WorkbookManager
+    if key == "worksheet":
+        from .worksheet_manager import WorksheetManager
+
+        return WorksheetManager
+    if key == "table":
+        from .table_manager import TableManager
+
+        return TableManager
+    if key == "range":
+        from .range_manager import RangeManager
+
+        return RangeManager
+    if key == "vba":
+        from .vba_manager import VBAManager
+
+        return VBAManager
+    if key == "macro":
+        from .macro_runner import MacroRunner
+
+        return MacroRunner
+    raise KeyError(key)
+
+
+def _coerce_params(params: dict[str, Any]) -> dict[str, Any]:
+    """Convert JSON-friendly parameter values to the types managers expect.
+
+    Args:
+        params: Arguments by parameter name, as decoded from JSON
+
+    Returns:
+        New dict where known path parameters are ``Path`` objects
+    """
+    coerced: dict[str, Any] = {}
+    for key, value in params.items():
+        if key in PATH_PARAMETERS and isinstance(value, str):
+            coerced[key] = Path(value)
+        else:
+            coerced[key] = value
+    return coerced
+
+
+def coerce_arguments(
+    operation: str, args: list[Any] | tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[list[Any], dict[str, Any]]:
+    """Convert the path arguments of an operation to ``Path`` objects.
+
+    Used on the client side of the daemon, where arguments decoded from
+    JSON carry paths as plain strings: once they are ``Path`` objects,
+    they can be resolved against the client's working directory.
+    Positional arguments are named after the method parameters; a
+    mismatch with the signature is left to be reported when the
+    operation runs.
+
+    Args:
+        operation: Operation name (see OPERATIONS)
+        args: Positional arguments for the manager method
+        kwargs: Keyword arguments for the manager method
+
+    Returns:
+        Tuple of (positional arguments, keyword arguments)
+    """
+    kwargs = _coerce_params(kwargs)
+    if not args or operation not in OPERATIONS:
+        return list(args), kwargs
+
+    key, method_name = OPERATIONS[operation]
+    if key == "excel":
+        from .excel_manager import ExcelManager
+
+        target: type = ExcelManager
+    else:
+        target = _get_manager_class(key)
+
+    try:
+        parameters = inspect.signature(getattr(target, method_name)).parameters
+    except ValueError:
+        return list(args), kwargs
+
+    # Name the positional arguments, skipping self; extra ones (*args) are
+    # left as they are
+    names = [
+        p.name
+        for p in parameters.values()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ][1:]
+    named = _coerce_params(dict(zip(names, args, strict=False)))
+    return [*named.values(), *args[len(named) :]], kwargs
+
+
+def execute_operation(
+    excel_manager: "ExcelManager",
+    operation: str,
+    args: list[Any] | tuple[Any, ...] = (),
+    kwargs: dict[str, Any] | None = None,
+) -> Any:
+    """Execute a registered operation against an ExcelManager.
+
+    Args:
+        excel_manager: Started ExcelManager used for COM access
+        operation: Operation name (e.g., "worksheet.create")
+        args: Positional arguments forwarded to the manager method
+        kwargs: Keyword arguments forwarded to the manager method.
+            Path parameters given as strings, positionally or by name,
+            are converted to ``Path``.
+
+    Returns:
+        Whatever the manager method returns (dataclass, list, None, ...)
+
+    Raises:
+        OperationError: If the operation is unknown or the arguments do not
+            match the method signature
+        ExcelManageError: Any error raised by the manager itself
+
+    Example:
+        >>> execute_operation(mgr, "worksheet.create", kwargs={"name": "Data"})
+        WorksheetInfo(name='Data', index=2, ...)
+    """
+    if operation not in OPERATIONS:
+        raise OperationError(operation, "unknown operation")
+
+    key, method_name = OPERATIONS[operation]
+    if key == "excel":
+        target: Any = excel_manager
+    else:
+        target = _get_manager_class(key)(excel_manager)
+
+    method = getattr(target, method_name)
+
+    # Validate the arguments up front so that signature mismatches are
+    # reported as OperationError rather than a bare TypeError; binding
+    # also names the positional arguments, so that paths are coerced
+    # however they were passed
+    try:
+        bound = inspect.signature(method).bind(*args, **(kwargs or {}))
+    except TypeError as e:
+        raise OperationError(operation, str(e)) from e
+    except ValueError:
+        # No signature available (builtins): let the call decide
+        return method(*args, **_coerce_params(kwargs or {}))
+
+    coerced = _coerce_params(bound.arguments)
+    for name, parameter in bound.signature.parameters.items():
+        if parameter.kind is inspect.Parameter.VAR_KEYWORD and name in coerced:
+            coerced[name] = _coerce_params(coerced[name])
+    bound.arguments.update(coerced)
+
+    return method(*bound.args, **bound.kwargs)
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert an operation result to plain JSON-compatible values.
+
+    Dataclasses become dicts, paths become strings, dates use ISO 8601
+    and tuples (VBA arrays) become lists.
+
+    Args:
+        value: Result returned by execute_operation()
+
+    Returns:
+        Value made only of dict, list, str, int, float, bool and None
+    """
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        return {k: to_jsonable(v) for k, v in asdict(value).items()}
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, list | tuple | set | frozenset):
+        return [to_jsonable(v) for v in value]
+    return str(value)
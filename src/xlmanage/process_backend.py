@@ -0,0 +1,288 @@
+"""
+Process enumeration and termination backends for Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import ctypes
+import ctypes.wintypes
+import logging
+import os
+import re
+import subprocess
+import threading
+from typing import Protocol
+
+from .exceptions import ExcelInstanceNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Image name of the Excel processes
+EXCEL_IMAGE = "EXCEL.EXE"
+
+# Environment variable forcing a backend: "native" or "subprocess"
+PROCESS_BACKEND_ENV: str = "XLMANAGE_PROCESS_BACKEND"
+
+# Win32 constants
+_TH32CS_SNAPPROCESS = 0x00000002
+_INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+_PROCESS_TERMINATE = 0x0001
+_ERROR_ACCESS_DENIED = 5
+_ERROR_INVALID_PARAMETER = 87
+_MAX_PATH = 260
+
+
+class ProcessBackend(Protocol):
+    """Lists and terminates processes.
+
+    NativeProcessBackend calls the Win32 API in-process; the
+    SubprocessProcessBackend spawns tasklist and taskkill.
+    process_backend() selects one at runtime; xlmanage.testing
+    provides FakeProcessBackend, a simulated process table.
+    """
+
+    name: str
+
+    def list_pids(self, image: str = EXCEL_IMAGE) -> list[int]:
+        """Return the PIDs of the processes running an image.
+
+        Raises:
+            RuntimeError: If the processes cannot be listed
+        """
+        ...
+
+    def terminate(self, pid: int) -> None:
+        """Terminate a process at once, without letting it clean up.
+
+        Raises:
+            ExcelInstanceNotFoundError: If the PID does not exist
+            RuntimeError: If the process cannot be terminated
+        """
+        ...
+
+
+class NativeProcessBackend:
+    """Processes listed with a Toolhelp snapshot and terminated with
+    OpenProcess and TerminateProcess, without spawning any process."""
+
+    name = "native"
+
+    def __init__(self):
+        """Bind kernel32.
+
+        Raises:
+            OSError: If kernel32 is not available (not Windows)
+        """
+        try:
+            self._kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        except AttributeError as e:
+            raise OSError("kernel32 requires Windows") from e
+
+    def list_pids(self, image: str = EXCEL_IMAGE) -> list[int]:
+        """Return the PIDs running an image (CreateToolhelp32Snapshot)."""
+
+        class _ProcessEntry(ctypes.Structure):
+            _fields_ = [
+                ("dwSize", ctypes.wintypes.DWORD),
+                ("cntUsage", ctypes.wintypes.DWORD),
+                ("th32ProcessID", ctypes.wintypes.DWORD),
+                ("th32DefaultHeapID", ctypes.c_size_t),
+                ("th32ModuleID", ctypes.wintypes.DWORD),
+                ("cntThreads", ctypes.wintypes.DWORD),
+                ("th32ParentProcessID", ctypes.wintypes.DWORD),
+                ("pcPriClassBase", ctypes.c_long),
+                ("dwFlags", ctypes.wintypes.DWORD),
+                ("szExeFile", ctypes.c_wchar * _MAX_PATH),
+            ]
+
+        kernel32 = self._kernel32
+        kernel32.CreateToolhelp32Snapshot.restype = ctypes.c_void_p
+        snapshot = kernel32.CreateToolhelp32Snapshot(_TH32CS_SNAPPROCESS, 0)
+        if not snapshot or snapshot == _INVALID_HANDLE_VALUE:
+            error = ctypes.get_last_error()
+            raise RuntimeError(f"Échec de l'énumération des processus (erreur {error})")
+        try:
+            entry = _ProcessEntry()
+            entry.dwSize = ctypes.sizeof(entry)
+            image = image.casefold()
+            pids: list[int] = []
+            more = kernel32.Process32FirstW(
+                ctypes.c_void_p(snapshot), ctypes.byref(entry)
+            )
+            while more:
+                if entry.szExeFile.casefold() == image:
+                    pids.append(int(entry.th32ProcessID))
+                more = kernel32.Process32NextW(
+                    ctypes.c_void_p(snapshot), ctypes.byref(entry)
+                )
+            return pids
+        finally:
+            kernel32.CloseHandle(ctypes.c_void_p(snapshot))
+
+    def terminate(self, pid: int) -> None:
+        """Terminate a process (OpenProcess, TerminateProcess)."""
+        kernel32 = self._kernel32
+        kernel32.OpenProcess.restype = ctypes.c_void_p
+        handle = kernel32.OpenProcess(_PROCESS_TERMINATE, False, pid)
+        if not handle:
+            error = ctypes.get_last_error()
+            if error == _ERROR_INVALID_PARAMETER:
+                raise ExcelInstanceNotFoundError(
+                    str(pid), "Process not found or not running"
+                )
+            if error == _ERROR_ACCESS_DENIED:
+                raise RuntimeError(f"Failed to kill process {pid}: Access denied")
+            raise RuntimeError(f"Failed to kill process {pid}: error {error}")
+        try:
+            if not kernel32.TerminateProcess(ctypes.c_void_p(handle), 1):
+                raise RuntimeError(
+                    f"Failed to kill process {pid}: error {ctypes.get_last_error()}"
+                )
+        finally:
+            kernel32.CloseHandle(ctypes.c_void_p(handle))
+
+
+class SubprocessProcessBackend:
+    """Processes listed with tasklist and terminated with taskkill.
+
+    Each call spawns a process (100-300 ms): used where the Win32 API
+    cannot be called, or when forced with XLMANAGE_PROCESS_BACKEND.
+    """
+
+    name = "subprocess"
+
+    def list_pids(self, image: str = EXCEL_IMAGE) -> list[int]:
+        """Return the PIDs running an image (tasklist)."""
+        try:
+            # Call tasklist with filter for the image
+            result = subprocess.run(
+                ["tasklist", "/fi", f"imagename eq {image}", "/fo", "csv", "/nh"],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=10,
+            )
+
+            pids: list[int] = []
+
+            # Parse CSV output
+            # Format: "EXCEL.EXE","12345","Console","1","123,456 K"
+            pattern = re.compile(rf'"{re.escape(image)}","(\d+)"', re.IGNORECASE)
+            for line in result.stdout.strip().split("\n"):
+                if not line or "INFO:" in line:
+                    continue
+
+                # Extract PID (2nd column)
+                match = pattern.search(line)
+                if match:
+                    pids.append(int(match.group(1)))
+
+            return pids
+
+        except subprocess.TimeoutExpired:
+            raise RuntimeError("Timeout lors de l'énumération des processus Excel")
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Échec de tasklist: {e}")
+        except FileNotFoundError:
+            raise RuntimeError("Commande tasklist introuvable (Windows requis)")
+
+    def terminate(self, pid: int) -> None:
+        """Terminate a process (taskkill /f /pid)."""
+        try:
+            result = subprocess.run(
+                ["taskkill", "/f", "/pid", str(pid)],
+                capture_output=True,
+                text=True,
+                check=True,
+                timeout=10,
+            )
+
+            # Verify success in stdout
+            if "SUCCESS" not in result.stdout:
+                raise RuntimeError(f"taskkill failed: {result.stdout}")
+
+        except subprocess.CalledProcessError as e:
+            # taskkill failed (PID not found, permissions, etc.)
+            if "not found" in e.stdout or "not found" in e.stderr:
+                raise ExcelInstanceNotFoundError(
+                    str(pid), "Process not found or not running"
+                ) from e
+            else:
+                raise RuntimeError(
+                    f"Failed to kill process {pid}: {e.stderr or e.stdout}"
+                ) from e
+
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Timeout while trying to kill process {pid}")
+
+        except FileNotFoundError:
+            raise RuntimeError(
+                "taskkill command not found. This feature requires Windows."
+            )
+
+
+_selected: ProcessBackend | None = None
+_selected_lock = threading.Lock()
+
+
+def process_backend() -> ProcessBackend:
+    """Return the process backend of this process, selecting it once.
+
+    The native backend is used when the Win32 API is available, the
+    subprocess backend otherwise.  XLMANAGE_PROCESS_BACKEND ("native"
+    or "subprocess") forces one.
+
+    Returns:
+        The selected backend
+
+    Raises:
+        ValueError: If XLMANAGE_PROCESS_BACKEND names an unknown backend
+        OSError: If the native backend is forced but not available
+    """
+    global _selected
+    with _selected_lock:
+        if _selected is None:
+            _selected = _select_backend(os.environ.get(PROCESS_BACKEND_ENV, ""))
+            logger.debug("Using the %s process backend", _selected.name)
+        return _selected
+
+
+def set_process_backend(backend: ProcessBackend | None) -> None:
+    """Replace the backend returned by process_backend().
+
+    Args:
+        backend: Backend to use, or None to select one again on next use
+    """
+    global _selected
+    with _selected_lock:
+        _selected = backend
+
+
+def _select_backend(name: str) -> ProcessBackend:
+    """Backend forced by name, or the fastest one available."""
+    name = name.strip().lower()
+    if name == "subprocess":
+        return SubprocessProcessBackend()
+    if name == "native":
+        return NativeProcessBackend()
+    if name:
+        raise ValueError(
+            f"{PROCESS_BACKEND_ENV} must be 'native' or 'subprocess' (got {name!r})"
+        )
+    try:
+        return NativeProcessBackend()
+    except OSError:
+        return SubprocessProcessBackend()
@@ -0,0 +1,361 @@
+"""
+A1/R1C1 address parsing and rectangle algebra, without COM calls.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .exceptions import RangeError
+
+# Worksheet size of Excel 2007 and later
+MAX_ROWS: int = 1_048_576
+MAX_COLUMNS: int = 16_384
+
+# A1 areas: cells (B2, $B$2:D10), whole columns (A:D) and whole rows (1:10)
+_A1_CELLS = re.compile(
+    r"^\$?(?P<c1>[A-Z]{1,3})\$?(?P<r1>\d+)(?::\$?(?P<c2>[A-Z]{1,3})\$?(?P<r2>\d+))?$"
+)
+_A1_COLUMNS = re.compile(r"^\$?(?P<c1>[A-Z]{1,3}):\$?(?P<c2>[A-Z]{1,3})$")
+_A1_ROWS = re.compile(r"^\$?(?P<r1>\d+):\$?(?P<r2>\d+)$")
+# Absolute R1C1 cells and cell ranges: R2C2, R2C2:R10C4.  R1C1 rows and
+# columns (R2, C2:C4) read as A1 cells, which take precedence.
+_R1C1_CELLS = re.compile(r"^R(?P<r1>\d+)C(?P<c1>\d+)(?::R(?P<r2>\d+)C(?P<c2>\d+))?$")
+
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based column number ("AB" -> 28).
+
+    Args:
+        letters: Column letters, case-insensitive
+
+    Returns:
+        Column number
+
+    Raises:
+        RangeError: If the letters are not a column of the worksheet
+    """
+    number = 0
+    for letter in letters.upper():
+        if not "A" <= letter <= "Z":
+            raise RangeError(letters, "invalid column letters")
+        number = number * 26 + ord(letter) - 64
+    if not 1 <= number <= MAX_COLUMNS:
+        raise RangeError(letters, "column out of the worksheet")
+    return number
+
+
+def column_letters(index: int) -> str:
+    """Convert a 1-based column number to letters (28 -> "AB").
+
+    Args:
+        index: Column number
+
+    Returns:
+        Column letters
+
+    Raises:
+        RangeError: If the number is not a column of the worksheet
+    """
+    if not 1 <= index <= MAX_COLUMNS:
+        raise RangeError(str(index), "column out of the worksheet")
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+@dataclass(frozen=True, order=True)
+class Rect:
+    """Rectangle of cells, bounds included (1-based rows and columns).
+
+    Attributes:
+        top: First row
+        left: First column
+        bottom: Last row
+        right: Last column
+    """
+
+    top: int
+    left: int
+    bottom: int
+    right: int
+
+    def __post_init__(self) -> None:
+        if not (
+            1 <= self.top <= self.bottom <= MAX_ROWS
+            and 1 <= self.left <= self.right <= MAX_COLUMNS
+        ):
+            raise RangeError(
+                f"R{self.top}C{self.left}:R{self.bottom}C{self.right}",
+                "rectangle out of the worksheet",
+            )
+
+    @property
+    def rows(self) -> int:
+        """Number of rows."""
+        return self.bottom - self.top + 1
+
+    @property
+    def columns(self) -> int:
+        """Number of columns."""
+        return self.right - self.left + 1
+
+    @property
+    def area(self) -> int:
+        """Number of cells."""
+        return self.rows * self.columns
+
+    @property
+    def address(self) -> str:
+        """Absolute A1 address, as returned by Range.Address ("$A$1:$D$10")."""
+        first = f"${column_letters(self.left)}${self.top}"
+        if self.top == self.bottom and self.left == self.right:
+            return first
+        return f"{first}:${column_letters(self.right)}${self.bottom}"
+
+    def overlaps(self, other: "Rect") -> bool:
+        """Whether the rectangles share at least one cell."""
+        return not (
+            self.bottom < other.top
+            or other.bottom < self.top
+            or self.right < other.left
+            or other.right < self.left
+        )
+
+    def contains(self, other: "Rect") -> bool:
+        """Whether every cell of other is in this rectangle."""
+        return (
+            self.top <= other.top
+            and self.left <= other.left
+            and other.bottom <= self.bottom
+            and other.right <= self.right
+        )
+
+    def intersection(self, other: "Rect") -> "Rect | None":
+        """Cells shared with other, like Application.Intersect.
+
+        Returns:
+            The common rectangle, or None if they do not overlap
+        """
+        if not self.overlaps(other):
+            return None
+        return Rect(
+            max(self.top, other.top),
+            max(self.left, other.left),
+            min(self.bottom, other.bottom),
+            min(self.right, other.right),
+        )
+
+    def bounds(self, other: "Rect") -> "Rect":
+        """Smallest rectangle containing both rectangles."""
+        return Rect(
+            min(self.top, other.top),
+            min(self.left, other.left),
+            max(self.bottom, other.bottom),
+            max(self.right, other.right),
+        )
+
+    def subtract(self, other: "Rect") -> list["Rect"]:
+        """Split this rectangle into the parts outside other.
+
+        Returns:
+            Up to four disjoint rectangles (bands above and below the
+            common part, then the parts on its left and right)
+        """
+        common = self.intersection(other)
+        if common is None:
+            return [self]
+        parts = []
+        if self.top < common.top:
+            parts.append(Rect(self.top, self.left, common.top - 1, self.right))
+        if common.bottom < self.bottom:
+            parts.append(Rect(common.bottom + 1, self.left, self.bottom, self.right))
+        if self.left < common.left:
+            parts.append(Rect(common.top, self.left, common.bottom, common.left - 1))
+        if common.right < self.right:
+            parts.append(Rect(common.top, common.right + 1, common.bottom, self.right))
+        return parts
+
+
+def _split_areas(address: str) -> list[str]:
+    """Split a multi-area address on the commas outside quoted sheet names."""
+    areas: list[str] = []
+    current: list[str] = []
+    quoted = False
+    for char in address:
+        if char == "'":
+            quoted = not quoted
+        if char == "," and not quoted:
+            areas.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    areas.append("".join(current))
+    return areas
+
+
+def _parse_area(area: str) -> Rect | None:
+    """Parse one area (sheet prefix already removed); None if not an area."""
+    area = area.replace(" ", "").upper()
+
+    match = _A1_CELLS.match(area)
+    if match:
+        c1, r1 = column_index(match["c1"]), int(match["r1"])
+        c2 = column_index(match["c2"]) if match["c2"] else c1
+        r2 = int(match["r2"]) if match["r2"] else r1
+        return _rect(r1, c1, r2, c2)
+
+    match = _A1_COLUMNS.match(area)
+    if match:
+        return _rect(1, column_index(match["c1"]), MAX_ROWS, column_index(match["c2"]))
+
+    match = _A1_ROWS.match(area)
+    if match:
+        return _rect(int(match["r1"]), 1, int(match["r2"]), MAX_COLUMNS)
+
+    match = _R1C1_CELLS.match(area)
+    if match:
+        r1, c1 = int(match["r1"]), int(match["c1"])
+        r2 = int(match["r2"]) if match["r2"] else r1
+        c2 = int(match["c2"]) if match["c2"] else c1
+        return _rect(r1, c1, r2, c2)
+
+    return None
+
+
+def _rect(row1: int, column1: int, row2: int, column2: int) -> Rect:
+    """Build a rectangle from two corners given in any order."""
+    return Rect(
+        min(row1, row2), min(column1, column2), max(row1, row2), max(column1, column2)
+    )
+
+
+def parse_address(address: str) -> list[Rect]:
+    """Parse an A1 or absolute R1C1 address into rectangles.
+
+    Accepts what Range.Address returns and what users type: cells and
+    cell ranges with or without ``$``, whole columns and rows, absolute
+    R1C1 cells (``R1C1:R10C5``), a sheet prefix (``Data!A1:B2``,
+    ``'My Sheet'!A1``) and several comma-separated areas.  A1 notation
+    takes precedence: ``R1`` is the cell of column R.
+    Sheet prefixes are ignored; every area is on the same worksheet.
+
+    Args:
+        address: Range address
+
+    Returns:
+        One rectangle per area, in the order of the address
+
+    Raises:
+        RangeError: If the address is empty or an area cannot be parsed
+
+    Examples:
+        >>> parse_address("$A$1:$D$10")
+        [Rect(top=1, left=1, bottom=10, right=4)]
+        >>> [r.address for r in parse_address("Data!A1:B2,R5C3")]
+        ['$A$1:$B$2', '$C$5']
+    """
+    if not address or not address.strip():
+        raise RangeError(address, "range cannot be empty")
+
+    rects = []
+    for area in _split_areas(address):
+        # Sheet names may contain "!": keep what follows the last one
+        reference = area.rpartition("!")[2]
+        try:
+            rect = _parse_area(reference)
+        except RangeError as e:
+            raise RangeError(address, e.reason) from e
+        if rect is None:
+            raise RangeError(address, f"invalid range syntax '{area.strip()}'")
+        rects.append(rect)
+    return rects
+
+
+def format_address(rects: Iterable[Rect]) -> str:
+    """Format rectangles as an absolute multi-area A1 address.
+
+    Args:
+        rects: Rectangles
+
+    Returns:
+        Comma-separated addresses (e.g., "$A$1:$B$2,$D$4")
+    """
+    return ",".join(rect.address for rect in rects)
+
+
+def overlapping(target: Rect, rects: Iterable[Rect]) -> list[Rect]:
+    """Return the rectangles sharing at least one cell with target."""
+    return [rect for rect in rects if target.overlaps(rect)]
+
+
+def union(rects: Iterable[Rect]) -> list[Rect]:
+    """Split overlapping rectangles into disjoint ones covering the same cells.
+
+    Columns are cut at every rectangle edge; within each band of columns
+    the row intervals are merged, then identical neighbouring bands are
+    joined again.  The result is sorted and does not depend on the input
+    order.
+
+    Args:
+        rects: Rectangles, possibly overlapping (e.g., areas of a
+            multi-area address)
+
+    Returns:
+        Disjoint rectangles
+
+    Example:
+        >>> union([Rect(1, 1, 2, 2), Rect(2, 2, 3, 3)])  # 7 distinct cells
+    """
+    rects = list(rects)
+    if not rects:
+        return []
+    edges = sorted({r.left for r in rects} | {r.right + 1 for r in rects})
+
+    bands: list[tuple[int, int, list[tuple[int, int]]]] = []
+    for left, next_left in zip(edges, edges[1:]):
+        intervals = sorted(
+            (r.top, r.bottom)
+            for r in rects
+            if r.left <= left and next_left - 1 <= r.right
+        )
+        merged: list[tuple[int, int]] = []
+        for top, bottom in intervals:
+            if merged and top <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], bottom))
+            else:
+                merged.append((top, bottom))
+        if not merged:
+            continue
+        if bands and bands[-1][1] == left - 1 and bands[-1][2] == merged:
+            bands[-1] = (bands[-1][0], next_left - 1, merged)
+        else:
+            bands.append((left, next_left - 1, merged))
+
+    return sorted(
+        Rect(top, left, bottom, right)
+        for left, right, intervals in bands
+        for top, bottom in intervals
+    )
+
+
+def area(rects: Iterable[Rect]) -> int:
+    """Number of distinct cells covered by rectangles, overlaps counted once."""
+    return sum(rect.area for rect in union(rects))
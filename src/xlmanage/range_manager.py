@@ -0,0 +1,520 @@
+"""
+Range manager for bulk cell data transfer.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import csv
+import json
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+try:
+    from win32com.client import CDispatch
+except ImportError:
+    CDispatch = Any
+
+from ._compat import TimeType
+from .excel_optimizer import ExcelOptimizer
+from .exceptions import RangeError, WorksheetNotFoundError
+from .metadata_index import workbook_metadata
+from .workbook_index import workbook_index
+from .worksheet_manager import _find_worksheet, _resolve_workbook
+
+if TYPE_CHECKING:
+    from .excel_manager import ExcelManager
+
+# Output formats supported by write_rows()
+RANGE_FORMATS: tuple[str, ...] = ("csv", "ndjson")
+
+# Upper bound of cells sent in one Value2 assignment.  The whole SAFEARRAY
+# is marshalled in one piece, so large writes are split into row blocks to
+# keep memory bounded on both sides of the COM boundary.
+WRITE_BLOCK_CELLS: int = 100_000
+
+# CSV fields converted to float by read_csv()
+_NUMBER_PATTERN = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+
+# Excel error values (CVErr codes, low word of the COM error int)
+EXCEL_ERRORS: dict[int, str] = {
+    2000: "#NULL!",
+    2007: "#DIV/0!",
+    2015: "#VALUE!",
+    2023: "#REF!",
+    2029: "#NAME?",
+    2036: "#NUM!",
+    2042: "#N/A",
+    2043: "#GETTING_DATA",
+    2045: "#SPILL!",
+    2046: "#CONNECT!",
+    2047: "#BLOCKED!",
+    2048: "#UNKNOWN!",
+    2049: "#FIELD!",
+    2050: "#CALC!",
+}
+
+# Types Value2 returns that need no conversion at all
+_PLAIN_TYPES: frozenset[type] = frozenset({str, float, bool, type(None)})
+
+
+# Excel error cells come back as VT_ERROR, which pywin32 turns into the
+# int of their HRESULT (0x800A07xx): only that facility is an error code
+_ERROR_FACILITY: int = 0x800A0000
+
+
+def _excel_error(code: int) -> str:
+    """Convert a COM error int (e.g., -2146826281) to its Excel text."""
+    return EXCEL_ERRORS.get(code & 0xFFFF, f"#ERR{code}")
+
+
+def _int_value(value: int) -> int | str:
+    """Convert an int cell: error codes to their Excel text, others as is."""
+    if value & 0xFFFF0000 == _ERROR_FACILITY:
+        return _excel_error(value)
+    return value
+
+
+def _iso_datetime(value: datetime) -> str:
+    """Convert a pywintypes/datetime value to an ISO 8601 string."""
+    return value.isoformat()
+
+
+def _identity(value: Any) -> Any:
+    """Return the value unchanged."""
+    return value
+
+
+# Value2 cell type -> converter.  Value2 returns numbers as float and dates
+# as serial numbers; int carries Excel error codes, but also the integers
+# of other backends, which are kept.
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    int: _int_value,
+    datetime: _iso_datetime,
+    TimeType: _iso_datetime,
+}
+
+
+def _normalize_value2(raw: Any) -> list[list[Any]]:
+    """Convert a Range.Value2 result into a list of row lists.
+
+    Value2 returns a scalar for a single cell and a tuple of row tuples
+    otherwise.  The set of cell types present is computed once over the
+    whole array; when it only contains plain types (the common case) rows
+    are copied as-is, otherwise each distinct type gets its converter
+    applied with map() instead of branching on every cell.
+
+    Args:
+        raw: Value returned by Range.Value2
+
+    Returns:
+        Rows of cell values (str, float, bool or None; errors and dates
+        as strings)
+    """
+    if not isinstance(raw, tuple):
+        raw = ((raw,),)
+
+    kinds = set(map(type, chain.from_iterable(raw)))
+    if kinds <= _PLAIN_TYPES:
+        return [list(row) for row in raw]
+
+    converters = {kind: _CONVERTERS.get(kind, _identity) for kind in kinds}
+
+    def convert(value: Any) -> Any:
+        return converters[type(value)](value)
+
+    return [list(map(convert, row)) for row in raw]
+
+
+@dataclass
+class RangeData:
+    """Cell values read from an Excel range.
+
+    Attributes:
+        address: Absolute address of the range (e.g., "$A$1:$D$100")
+        worksheet_name: Name of the worksheet containing the range
+        rows: Number of rows
+        columns: Number of columns
+        values: Cell values, one list per row
+    """
+
+    address: str
+    worksheet_name: str
+    rows: int
+    columns: int
+    values: list[list[Any]]
+
+
+@dataclass
+class RangeWriteResult:
+    """Outcome of a bulk range write.
+
+    Attributes:
+        address: Absolute address of the written area (e.g., "$A$1:$D$100")
+        worksheet_name: Name of the worksheet written to
+        rows: Number of rows written
+        columns: Number of columns written
+        blocks: Number of Value2 assignments (COM transfers)
+        block_rows: Rows per block
+        elapsed: Duration of the transfer in seconds
+        cells_per_second: Throughput of the transfer
+    """
+
+    address: str
+    worksheet_name: str
+    rows: int
+    columns: int
+    blocks: int
+    block_rows: int
+    elapsed: float
+    cells_per_second: float
+
+
+def _parse_csv_field(field: str) -> str | float | None:
+    """Convert a CSV field: empty -> None, numeric -> float, else str."""
+    if not field:
+        return None
+    if _NUMBER_PATTERN.match(field):
+        return float(field)
+    return field
+
+
+def iter_csv(path: Path, delimiter: str = ",") -> Iterator[list[Any]]:
+    """Stream the rows of a CSV file as cell values.
+
+    Empty fields become None (empty cells) and numeric fields float, so
+    Excel stores numbers rather than text.
+
+    Args:
+        path: CSV file path (UTF-8, optional BOM)
+        delimiter: Field delimiter
+
+    Yields:
+        list[Any]: Cell values of each row
+    """
+    with path.open(encoding="utf-8-sig", newline="") as stream:
+        for row in csv.reader(stream, delimiter=delimiter):
+            yield list(map(_parse_csv_field, row))
+
+
+def count_csv_rows(path: Path, delimiter: str = ",") -> int:
+    """Count the rows of a CSV file without keeping them in memory.
+
+    Args:
+        path: CSV file path
+        delimiter: Field delimiter
+
+    Returns:
+        int: Number of rows (header included)
+    """
+    with path.open(encoding="utf-8-sig", newline="") as stream:
+        return sum(1 for _row in csv.reader(stream, delimiter=delimiter))
+
+
+def read_csv(path: Path, delimiter: str = ",") -> list[list[Any]]:
+    """Read a CSV file into rows suitable for RangeManager.write().
+
+    Args:
+        path: CSV file path (UTF-8, optional BOM)
+        delimiter: Field delimiter
+
+    Returns:
+        Rows of cell values (see iter_csv())
+    """
+    return list(iter_csv(path, delimiter))
+
+
+def _iter_blocks(
+    rows: Iterable[list[Any]], block_rows: int
+) -> Iterator[list[list[Any]]]:
+    """Group rows into lists of at most block_rows rows, lazily."""
+    iterator = iter(rows)
+    while block := list(islice(iterator, block_rows)):
+        yield block
+
+
+def _write_block(
+    start: "CDispatch",
+    row_offset: int,
+    column_offset: int,
+    block: list[list[Any]],
+    columns: int,
+    range_ref: str,
+) -> None:
+    """Write one block of rows with a single Value2 assignment.
+
+    Rows are padded with empty cells (or truncated) to ``columns`` values.
+
+    Args:
+        start: Top-left cell of the destination area
+        row_offset: Row offset of the block from start
+        column_offset: Column offset of the block from start
+        block: Rows to write
+        columns: Width of the block
+        range_ref: Reference reported in errors
+
+    Raises:
+        RangeError: If the COM transfer fails
+    """
+    data = tuple(tuple(row[:columns]) + (None,) * (columns - len(row)) for row in block)
+    try:
+        target = start.Offset(row_offset, column_offset).Resize(len(block), columns)
+        target.Value2 = data
+    except Exception as e:
+        raise RangeError(range_ref, f"write failed at row {row_offset + 1}: {e}") from e
+
+
+def write_rows(
+    rows: Iterable[list[Any]],
+    stream: TextIO,
+    fmt: str = "csv",
+    header: list[str] | None = None,
+) -> int:
+    """Write rows of cell values as CSV or NDJSON.
+
+    Args:
+        rows: Rows of cell values
+        stream: Text stream to write to
+        fmt: "csv" or "ndjson"
+        header: Column names.  CSV writes them as the first line; NDJSON
+            writes one object per row keyed by these names instead of arrays.
+
+    Returns:
+        int: Number of data rows written (header excluded)
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if fmt not in RANGE_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}' (expected: csv, ndjson)")
+
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        if header is not None:
+            writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            record: Any = dict(zip(header, row, strict=False)) if header else row
+            stream.write(json.dumps(record, ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+    return count
+
+
+class RangeManager:
+    """Manager for bulk reads and writes of cell ranges.
+
+    Cell values are transferred with Range.Value2 (one call per range or
+    per block of rows) instead of one COM round trip per cell.
+
+    Note:
+        The ExcelManager instance must be started before using this manager.
+    """
+
+    def __init__(self, excel_manager: "ExcelManager"):
+        """Initialize range manager.
+
+        Args:
+            excel_manager: An ExcelManager instance (must be started)
+
+        Example:
+            >>> with ExcelManager() as excel_mgr:
+            ...     range_mgr = RangeManager(excel_mgr)
+            ...     data = range_mgr.read("A1:D100", worksheet="Data")
+        """
+        self._mgr = excel_manager
+
+    def _get_range(
+        self,
+        range_ref: str | None,
+        worksheet: str | None,
+        workbook: Path | None,
+        writing: bool = False,
+    ) -> "tuple[CDispatch, CDispatch]":
+        """Resolve the worksheet and Range COM objects.
+
+        Args:
+            range_ref: Range reference, or None for the used range
+            worksheet: Worksheet name (if None, uses active worksheet)
+            workbook: Workbook path (if None, uses active workbook)
+            writing: The range is about to be written: forget the
+                worksheet dimensions recorded in the metadata
+
+        Returns:
+            Tuple of (worksheet, range)
+
+        Raises:
+            RangeError: If the reference is invalid
+            WorksheetNotFoundError: If the worksheet doesn't exist
+            WorkbookNotFoundError: If the workbook is not open
+        """
+        wb = _resolve_workbook(self._mgr.app, workbook, workbook_index(self._mgr))
+        metadata = (
+            workbook_metadata(self._mgr, wb)
+            if worksheet is not None or writing
+            else None
+        )
+
+        if worksheet is None:
+            ws = wb.ActiveSheet
+        else:
+            ws = _find_worksheet(wb, worksheet, metadata)
+            if ws is None:
+                raise WorksheetNotFoundError(worksheet, wb.Name)
+
+        if writing and metadata is not None:
+            metadata.forget_dimensions()
+
+        if range_ref is None:
+            return ws, ws.UsedRange
+
+        if not range_ref.strip():
+            raise RangeError(range_ref, "range cannot be empty")
+
+        try:
+            return ws, ws.Range(range_ref)
+        except Exception:
+            raise RangeError(range_ref, "invalid range syntax")
+
+    def read(
+        self,
+        range_ref: str | None = None,
+        worksheet: str | None = None,
+        workbook: Path | None = None,
+    ) -> RangeData:
+        """Read the values of a range in a single COM transfer.
+
+        Numbers are returned as float, dates as Excel serial numbers
+        (Value2 semantics), empty cells as None and error cells as their
+        Excel text (e.g., "#DIV/0!").  For multi-area references only the
+        first area is read.
+
+        Args:
+            range_ref: Range reference (e.g., "A1:D100" or a defined name).
+                If None, reads the used range of the worksheet.
+            worksheet: Worksheet name (if None, uses active worksheet)
+            workbook: Workbook path (if None, uses active workbook)
+
+        Returns:
+            RangeData with the values, one list per row
+
+        Raises:
+            RangeError: If the reference is invalid
+            WorksheetNotFoundError: If the worksheet doesn't exist
+            WorkbookNotFoundError: If the workbook is not open
+
+        Examples:
+            >>> manager = RangeManager(excel_mgr)
+            >>> data = manager.read("A1:C3", worksheet="Data")
+            >>> data.values[0]
+            ['Name', 'Qty', 'Price']
+        """
+        ws, rng = self._get_range(range_ref, worksheet, workbook)
+
+        values = _normalize_value2(rng.Value2)
+
+        return RangeData(
+            address=rng.Address,
+            worksheet_name=ws.Name,
+            rows=len(values),
+            columns=len(values[0]) if values else 0,
+            values=values,
+        )
+
+    def write(
+        self,
+        data: Iterable[Iterable[Any]],
+        anchor: str = "A1",
+        worksheet: str | None = None,
+        workbook: Path | None = None,
+        block_rows: int | None = None,
+        optimize: bool = True,
+    ) -> RangeWriteResult:
+        """Write a 2D block of values starting at an anchor cell.
+
+        Rows are sent through Range.Value2 in as few transfers as
+        possible: one per block of ``block_rows`` rows.  By default blocks
+        hold about WRITE_BLOCK_CELLS cells.  Short rows are padded with
+        empty cells.  The write runs inside an ExcelOptimizer scope
+        (screen updating, events and automatic calculation off).
+
+        Args:
+            data: Rows of values (str, float, int, bool or None)
+            anchor: Top-left cell of the destination (e.g., "B2")
+            worksheet: Worksheet name (if None, uses active worksheet)
+            workbook: Workbook path (if None, uses active workbook)
+            block_rows: Rows per Value2 transfer (default: computed from
+                WRITE_BLOCK_CELLS and the number of columns)
+            optimize: Apply ExcelOptimizer during the write
+
+        Returns:
+            RangeWriteResult with the written area and throughput
+
+        Raises:
+            RangeError: If the anchor is invalid, data is empty or a
+                transfer fails
+            WorksheetNotFoundError: If the worksheet doesn't exist
+            WorkbookNotFoundError: If the workbook is not open
+            ValueError: If block_rows is lower than 1
+
+        Examples:
+            >>> manager = RangeManager(excel_mgr)
+            >>> result = manager.write([["Name", "Qty"], ["Pen", 3]], "A1")
+            >>> print(f"{result.cells_per_second:.0f} cells/s")
+        """
+        rows = [list(row) for row in data]
+        columns = max(map(len, rows), default=0)
+        if columns == 0:
+            raise RangeError(anchor, "no data to write")
+
+        if block_rows is None:
+            block_rows = max(1, WRITE_BLOCK_CELLS // columns)
+        elif block_rows < 1:
+            raise ValueError(f"block_rows must be >= 1 (got {block_rows})")
+
+        ws, start = self._get_range(anchor, worksheet, workbook, writing=True)
+
+        started = time.perf_counter()
+        blocks = 0
+        scope = ExcelOptimizer(self._mgr) if optimize else nullcontext()
+        with scope:
+            for offset in range(0, len(rows), block_rows):
+                chunk = rows[offset : offset + block_rows]
+                _write_block(start, offset, 0, chunk, columns, anchor)
+                blocks += 1
+        elapsed = time.perf_counter() - started
+
+        cells = len(rows) * columns
+        return RangeWriteResult(
+            address=start.Resize(len(rows), columns).Address,
+            worksheet_name=ws.Name,
+            rows=len(rows),
+            columns=columns,
+            blocks=blocks,
+            block_rows=block_rows,
+            elapsed=elapsed,
+            cells_per_second=cells / elapsed if elapsed > 0 else float(cells),
+        )
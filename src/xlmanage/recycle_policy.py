@@ -0,0 +1,213 @@
+"""
+Recycling policy for long-running Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Process-stats provider: PID -> working set in bytes, None if unknown
+WorkingSetProvider = Callable[[int], int | None]
+
+# Access right enough to read the memory counters of another process
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+
+def windows_working_set(pid: int) -> int | None:
+    """Read the working set of a process (GetProcessMemoryInfo).
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        Working set in bytes, or None if the PID is unknown (<= 0), the
+        process is gone or the platform is not Windows
+    """
+    if pid <= 0:
+        return None
+    try:
+        import ctypes
+        import ctypes.wintypes
+
+        class _MemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.wintypes.DWORD),
+                ("PageFaultCount", ctypes.wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            counters = _MemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            if not kernel32.K32GetProcessMemoryInfo(
+                handle, ctypes.byref(counters), counters.cb
+            ):
+                return None
+            return int(counters.WorkingSetSize)
+        finally:
+            kernel32.CloseHandle(handle)
+    except (AttributeError, OSError):
+        # Not Windows
+        return None
+
+
+@dataclass
+class RecycleEvent:
+    """Why and when a policy retired an instance.
+
+    Attributes:
+        reason: Limit reached: "max_jobs", "max_age" or "max_working_set"
+        pid: Process ID of the instance (-1 if unknown)
+        jobs: Jobs run by the instance
+        age: Seconds since the instance was launched
+        working_set: Last sampled working set in bytes, None if not sampled
+        worker: Number of the pool worker owning the instance, if any
+    """
+
+    reason: str
+    pid: int
+    jobs: int
+    age: float
+    working_set: int | None = None
+    worker: int | None = None
+
+
+class RecyclePolicy:
+    """Decides when a long-running Excel instance should be replaced.
+
+    Excel leaks memory and slows down over thousands of operations, and
+    releasing references (ExcelManager.stop() and gc.collect()) does
+    not give the memory back.  A policy retires an instance between two
+    jobs once it has run ``max_jobs`` jobs, lived ``max_age`` seconds or
+    grown past ``max_working_set`` bytes, whichever comes first.
+    ExcelPool applies it to each of its instances; other callers count
+    jobs themselves and call evaluate() between jobs.
+
+    Each retirement is logged at INFO level with the job count, age and
+    working set, and passed to ``on_recycle``; every memory sample is
+    logged at DEBUG level.  Both help tuning the thresholds.
+
+    Example:
+        >>> policy = RecyclePolicy(max_jobs=500, max_working_set=1_500_000_000)
+        >>> with ExcelPool(4, recycle=policy) as pool:
+        ...     pool.map(job, paths)
+    """
+
+    def __init__(
+        self,
+        max_jobs: int | None = None,
+        max_age: float | None = None,
+        max_working_set: int | None = None,
+        *,
+        stats: WorkingSetProvider | None = None,
+        on_recycle: Callable[[RecycleEvent], None] | None = None,
+    ):
+        """Initialize a policy; limits left to None are not checked.
+
+        Args:
+            max_jobs: Jobs an instance runs before being replaced
+            max_age: Seconds an instance lives before being replaced
+            max_working_set: Working set, in bytes, above which an
+                instance is replaced
+            stats: Process-stats provider sampling the working set
+                (default: windows_working_set).  Pass a
+                xlmanage.testing.FakeProcessStats to test without Windows.
+            on_recycle: Called with a RecycleEvent for each retirement
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        for name, value in (
+            ("max_jobs", max_jobs),
+            ("max_age", max_age),
+            ("max_working_set", max_working_set),
+        ):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be > 0 (got {value})")
+        self.max_jobs = max_jobs
+        self.max_age = max_age
+        self.max_working_set = max_working_set
+        self._stats = stats or windows_working_set
+        self._on_recycle = on_recycle
+
+    def evaluate(
+        self, jobs: int, started: float, pid: int, worker: int | None = None
+    ) -> RecycleEvent | None:
+        """Check the limits of an instance after a job.
+
+        Emits the event (log and on_recycle) when a limit is reached.
+
+        Args:
+            jobs: Jobs run by the instance so far
+            started: time.monotonic() when the instance was launched
+            pid: Process ID of the instance (-1 if unknown)
+            worker: Number of the pool worker owning the instance
+
+        Returns:
+            RecycleEvent if the instance should be replaced, else None
+        """
+        age = time.monotonic() - started
+        working_set = None
+        reason = None
+        if self.max_jobs is not None and jobs >= self.max_jobs:
+            reason = "max_jobs"
+        elif self.max_age is not None and age >= self.max_age:
+            reason = "max_age"
+        elif self.max_working_set is not None:
+            working_set = self._stats(pid)
+            logger.debug(
+                "Excel instance %d: %d jobs, %.1f s, working set %s bytes",
+                pid,
+                jobs,
+                age,
+                working_set,
+            )
+            if working_set is not None and working_set >= self.max_working_set:
+                reason = "max_working_set"
+        if reason is None:
+            return None
+
+        event = RecycleEvent(reason, pid, jobs, age, working_set, worker)
+        logger.info(
+            "Recycling Excel instance %d (%s): %d jobs, %.1f s, working set %s bytes",
+            pid,
+            reason,
+            jobs,
+            age,
+            working_set,
+        )
+        if self._on_recycle is not None:
+            try:
+                self._on_recycle(event)
+            except Exception:
+                logger.warning("on_recycle callback failed", exc_info=True)
+        return event
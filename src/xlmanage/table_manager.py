@@ -17,22 +17,42 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import builtins
 import re
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import nullcontext
 from dataclasses import dataclass
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 try:
     from win32com.client import CDispatch
 except ImportError:
     CDispatch = Any
 
+from .excel_optimizer import ExcelOptimizer
 from .exceptions import (
+    RangeError,
     TableAlreadyExistsError,
+    TableColumnError,
     TableNameError,
     TableNotFoundError,
     TableRangeError,
 )
+from .metadata_index import WorkbookMetadata, workbook_metadata
+from .range_algebra import Rect, parse_address
+from .range_manager import (
+    RANGE_FORMATS,
+    WRITE_BLOCK_CELLS,
+    _iter_blocks,
+    _normalize_value2,
+    _write_block,
+    write_rows,
+)
+from .workbook_index import workbook_index
 from .worksheet_manager import _find_worksheet, _resolve_workbook
 
 # Excel table name constraints
@@ -40,6 +60,9 @@ TABLE_NAME_MAX_LENGTH: int = 255
 # Must start with letter or underscore, contains only alphanumeric and underscores
 TABLE_NAME_PATTERN: str = r"^[A-Za-z_][A-Za-z0-9_]*$"
 
+# Rows read per Value2 transfer by export()
+EXPORT_CHUNK_ROWS: int = 10_000
+
 
 @dataclass
 class TableInfo:
@@ -62,6 +85,84 @@ class TableInfo:
     header_row: str
 
 
+@dataclass
+class TableExportResult:
+    """Outcome of a table export.
+
+    Attributes:
+        name: Name of the exported table
+        output: Destination file path ("<stream>" for a text stream)
+        format: Output format ("csv" or "ndjson")
+        rows: Number of data rows exported
+        columns: Number of columns
+        chunks: Number of Value2 transfers
+        elapsed: Duration of the export in seconds
+        rows_per_second: Export throughput
+        peak_memory: Peak Python memory in bytes while exporting
+            (0 unless tracemalloc is tracing)
+    """
+
+    name: str
+    output: str
+    format: str
+    rows: int
+    columns: int
+    chunks: int
+    elapsed: float
+    rows_per_second: float
+    peak_memory: int = 0
+
+
+@dataclass
+class TableLoadResult:
+    """Outcome of a bulk append to a table.
+
+    Attributes:
+        name: Name of the table
+        rows_added: Number of rows written
+        rows_count: Number of data rows in the table after the load
+        columns: Table columns that received data
+        blocks: Number of Value2 blocks written
+        elapsed: Duration of the load in seconds
+        rows_per_second: Load throughput
+    """
+
+    name: str
+    rows_added: int
+    rows_count: int
+    columns: list[str]
+    blocks: int
+    elapsed: float
+    rows_per_second: float
+
+
+@dataclass
+class TableUpsertResult:
+    """Outcome of a keyed upsert into a table.
+
+    Attributes:
+        name: Name of the table
+        rows_updated: Existing rows whose values changed
+        rows_inserted: New rows appended to the table
+        rows_unchanged: Existing rows matched with identical values
+        rows_count: Number of data rows in the table after the upsert
+        key_columns: Table columns used as the key
+        blocks: Number of Value2 blocks written
+        elapsed: Duration of the upsert in seconds
+        rows_per_second: Source rows processed per second
+    """
+
+    name: str
+    rows_updated: int
+    rows_inserted: int
+    rows_unchanged: int
+    rows_count: int
+    key_columns: list[str]
+    blocks: int
+    elapsed: float
+    rows_per_second: float
+
+
 def _validate_table_name(name: str) -> None:
     """Validate an Excel table name.
 
@@ -103,7 +204,12 @@ def _validate_table_name(name: str) -> None:
         raise TableNameError(name, "cannot be a cell reference")
 
 
-def _find_table(wb: "CDispatch", name: str) -> "tuple[CDispatch, CDispatch] | None":
+def _find_table(
+    wb: "CDispatch",
+    name: str,
+    metadata: WorkbookMetadata | None = None,
+    rescan_on_miss: bool = True,
+) -> "tuple[CDispatch, CDispatch] | None":
     """Find a table by name in a workbook (searches all worksheets).
 
     Table names are unique across the entire workbook, not just within sheets.
@@ -112,6 +218,10 @@ def _find_table(wb: "CDispatch", name: str) -> "tuple[CDispatch, CDispatch] | No
     Args:
         wb: Workbook COM object to search in
         name: Name of the table to find
+        metadata: Metadata of the workbook, used instead of scanning
+                  every worksheet when given
+        rescan_on_miss: With metadata, rescan the workbook before
+                  reporting a missing name
 
     Returns:
         Tuple of (worksheet, table) if found, None otherwise
@@ -126,6 +236,9 @@ def _find_table(wb: "CDispatch", name: str) -> "tuple[CDispatch, CDispatch] | No
         Table names are case-SENSITIVE in Excel.
         "tbl_Sales" and "TBL_SALES" are different tables.
     """
+    if metadata is not None:
+        return metadata.find_table(wb, name, rescan_on_miss)
+
     # Iterate through all worksheets in the workbook
     for ws in wb.Worksheets:
         try:
@@ -144,39 +257,25 @@ def _find_table(wb: "CDispatch", name: str) -> "tuple[CDispatch, CDispatch] | No
     return None
 
 
-def _ranges_overlap(range1: "CDispatch", range2: "CDispatch") -> bool:
-    """Check if two COM Range objects overlap using Application.Intersect.
-
-    Uses Excel's built-in Intersect method to determine overlap.
-
-    Args:
-        range1: First Range COM object
-        range2: Second Range COM object
-
-    Returns:
-        True if ranges overlap, False otherwise
-
-    Examples:
-        >>> overlap = _ranges_overlap(ws.Range("A1:D10"), ws.Range("C5:F15"))
-        >>> print(overlap)  # True (overlaps at C5:D10)
-    """
-    try:
-        app = range1.Application
-        intersection = app.Intersect(range1, range2)
-        return intersection is not None
-    except Exception:
-        return False
-
-
-def _validate_range(ws: "CDispatch", range_ref: str) -> "CDispatch":
+def _validate_range(
+    ws: "CDispatch",
+    range_ref: str,
+    extents: "list[tuple[str, CDispatch, Rect]] | None" = None,
+) -> "CDispatch":
     """Validate an Excel range reference and return the COM Range object.
 
     Validates both syntax (via ws.Range) and checks for overlap with
-    existing tables in the worksheet.
+    existing tables in the worksheet.  Overlaps are computed locally
+    with range_algebra from the table addresses, instead of one
+    Application.Intersect call per table.
 
     Args:
         ws: Worksheet COM object
         range_ref: Range reference to validate (e.g., "A1:D10")
+        extents: Cached (name, table, rectangle) of the worksheet's tables,
+            as returned by WorkbookMetadata.table_extents().  If None, the
+            address of every table is read.  The extent of a cached table
+            overlapping the range is re-read before reporting the overlap.
 
     Returns:
         Validated Range COM object
@@ -197,11 +296,39 @@ def _validate_range(ws: "CDispatch", range_ref: str) -> "CDispatch":
     except Exception:
         raise TableRangeError(range_ref, "invalid range syntax")
 
+    try:
+        rects = parse_address(range_ref)
+    except RangeError:
+        # Defined names and other references only Excel can resolve
+        try:
+            rects = parse_address(range_obj.Address)
+        except Exception:
+            # ListObjects.Add() still refuses overlapping tables
+            return range_obj
+
+    def overlaps(rect: Rect) -> bool:
+        return any(rect.overlaps(other) for other in rects)
+
+    if extents is not None:
+        for name, table, rect in extents:
+            if not overlaps(rect):
+                continue
+            try:
+                # The cached extent may be stale: confirm with Excel
+                current = parse_address(table.Range.Address)[0]
+            except Exception:
+                # Deleted outside xlManage
+                continue
+            if overlaps(current):
+                raise TableRangeError(
+                    range_ref, f"range overlaps with existing table '{name}'"
+                )
+        return range_obj
+
     # Check for overlap with existing tables
     for table in ws.ListObjects:
         try:
-            existing_range = table.Range
-            if _ranges_overlap(range_obj, existing_range):
+            if overlaps(parse_address(table.Range.Address)[0]):
                 raise TableRangeError(
                     range_ref, f"range overlaps with existing table '{table.Name}'"
                 )
@@ -214,6 +341,180 @@ def _validate_range(ws: "CDispatch", range_ref: str) -> "CDispatch":
     return range_obj
 
 
+def _map_columns(
+    name: str, table_columns: list[str], source_columns: list[str] | None
+) -> list[int | None]:
+    """Map each table column to the index of its source column.
+
+    Names are matched case-insensitively, like Excel does for table
+    headers.  Table columns absent from the source map to None and are
+    left untouched by the load.
+
+    Args:
+        name: Table name (for error messages)
+        table_columns: Header names of the table, in order
+        source_columns: Header names of the data, or None when the data
+            follows the table column order
+
+    Returns:
+        For each table column, the source index or None
+
+    Raises:
+        TableColumnError: If a source column is unknown or duplicated
+    """
+    if source_columns is None:
+        return list(range(len(table_columns)))
+
+    positions: dict[str, int] = {}
+    duplicates = []
+    for index, column in enumerate(source_columns):
+        key = column.strip().casefold()
+        if key in positions:
+            duplicates.append(column)
+        positions[key] = index
+    if duplicates:
+        raise TableColumnError(name, duplicates, "duplicated columns")
+
+    known = {column.casefold() for column in table_columns}
+    unknown = [c for c in source_columns if c.strip().casefold() not in known]
+    if unknown:
+        raise TableColumnError(name, unknown, "unknown columns")
+
+    return [positions.get(column.casefold()) for column in table_columns]
+
+
+def _column_runs(mapping: list[int | None]) -> list[tuple[int, list[int]]]:
+    """Group mapped table columns into runs of adjacent columns.
+
+    Each run is written with its own Value2 block, so unmapped columns
+    (e.g., calculated columns) between them are never overwritten.
+
+    Args:
+        mapping: Result of _map_columns()
+
+    Returns:
+        List of (first table column offset, source indices of the run)
+    """
+    runs: list[tuple[int, list[int]]] = []
+    for offset, source in enumerate(mapping):
+        if source is None:
+            continue
+        if runs and runs[-1][0] + len(runs[-1][1]) == offset:
+            runs[-1][1].append(source)
+        else:
+            runs.append((offset, [source]))
+    return runs
+
+
+def _iter_body_chunks(
+    table: "CDispatch", chunk_rows: int, starts: Iterable[int] | None = None
+) -> Iterator[list[list[Any]]]:
+    """Yield the data rows of a table, one Value2 transfer per chunk.
+
+    A header-only table still has one empty data row in Excel; like
+    TableManager._data_rows_count(), it is not counted as data and
+    nothing is yielded.
+
+    Args:
+        table: Table (ListObject) COM object
+        chunk_rows: Rows per transfer
+        starts: Row offsets of the chunks to read, in ascending order
+            (multiples of chunk_rows).  If None, every chunk is read.
+
+    Yields:
+        Normalized rows of each chunk
+    """
+    body = table.DataBodyRange
+    if body is None:
+        return
+
+    total = body.Rows.Count
+    columns = body.Columns.Count
+    if starts is None:
+        starts = range(0, total, chunk_rows)
+    for offset in starts:
+        count = min(chunk_rows, total - offset)
+        chunk = body.Offset(offset, 0).Resize(count, columns)
+        rows = _normalize_value2(chunk.Value2)
+        if total == 1 and all(v is None for v in rows[0]):
+            return
+        yield rows
+
+
+def _write_table_rows(
+    start: "CDispatch",
+    row_offset: int,
+    rows: Iterable[list[Any]],
+    runs: list[tuple[int, list[int]]],
+    width: int,
+    block_rows: int,
+    name: str,
+) -> tuple[int, int]:
+    """Write source rows into table cells, block by block.
+
+    Args:
+        start: Top-left cell of the table data area to write from
+        row_offset: Row offset of the first row relative to ``start``
+        rows: Rows of values, in source column order
+        runs: Result of _column_runs()
+        width: Number of table columns
+        block_rows: Rows per Value2 block
+        name: Table name (for error messages)
+
+    Returns:
+        Tuple of (rows written, blocks written)
+
+    Raises:
+        RangeError: If a block transfer fails
+    """
+    identity = len(runs) == 1 and runs[0] == (0, list(range(width)))
+    written = blocks = 0
+    for block in _iter_blocks(rows, block_rows):
+        for column_offset, sources in runs:
+            data = (
+                block
+                if identity
+                else [
+                    [row[i] if i < len(row) else None for i in sources] for row in block
+                ]
+            )
+            _write_block(
+                start, row_offset + written, column_offset, data, len(sources), name
+            )
+        written += len(block)
+        blocks += 1
+    return written, blocks
+
+
+def _key_value(value: Any) -> Any:
+    """Normalize a key cell so that lookups match like Excel's MATCH.
+
+    Strings are compared case-insensitively and without surrounding
+    blanks; numbers compare by value, so 3 and 3.0 are the same key.
+    """
+    if isinstance(value, str):
+        return value.strip().casefold()
+    return value
+
+
+def _contiguous_runs(offsets: list[int]) -> list[tuple[int, int]]:
+    """Group sorted row offsets into (first offset, length) runs.
+
+    Args:
+        offsets: Row offsets in ascending order
+
+    Returns:
+        List of (first offset, number of consecutive rows)
+    """
+    runs: list[tuple[int, int]] = []
+    for offset in offsets:
+        if runs and runs[-1][0] + runs[-1][1] == offset:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((offset, 1))
+    return runs
+
+
 class TableManager:
     """Manager for Excel table (ListObject) CRUD operations.
 
@@ -224,6 +525,9 @@ class TableManager:
         The ExcelManager instance must be started before using this manager.
     """
 
+    # Method annotations are evaluated in the class namespace, where
+    # "list" is the list() method below: they name builtins.list instead.
+
     def __init__(self, excel_manager):
         """Initialize table manager.
 
@@ -293,30 +597,49 @@ class TableManager:
         _validate_table_name(name)
 
         # Resolve workbook and worksheet
-        wb = _resolve_workbook(self._mgr.app, workbook)
+        wb = _resolve_workbook(self._mgr.app, workbook, workbook_index(self._mgr))
+        metadata = workbook_metadata(self._mgr, wb)
 
         if worksheet is None:
             ws = wb.ActiveSheet
         else:
-            ws = _find_worksheet(wb, worksheet)
+            ws = _find_worksheet(wb, worksheet, metadata)
 
         # Check if table name already exists in workbook
         # Use the new _find_table() that searches the entire workbook
-        if _find_table(wb, name) is not None:
+        if _find_table(wb, name, metadata, rescan_on_miss=False) is not None:
             raise TableAlreadyExistsError(name, wb.Name)
 
         # Validate range (checks syntax and overlap with existing tables)
-        range_obj = _validate_range(ws, range_ref)
+        sheet = extents = None
+        if metadata is not None and ws is not None:
+            sheet = worksheet if worksheet is not None else ws.Name
+            extents = metadata.table_extents(wb, sheet)
+        range_obj = _validate_range(ws, range_ref, extents)
 
         # Create the table
-        table = ws.ListObjects.Add(
-            SourceType=1,  # xlSrcRange
-            Source=range_obj,
-            XlListObjectHasHeaders=1,  # xlYes
-        )
+        try:
+            table = ws.ListObjects.Add(
+                SourceType=1,  # xlSrcRange
+                Source=range_obj,
+                XlListObjectHasHeaders=1,  # xlYes
+            )
+        except Exception:
+            if extents is None or metadata is None:
+                raise
+            # Tables added or grown outside xlManage are missing from the
+            # cached extents: report the overlap from the actual tables
+            metadata.invalidate_tables()
+            _validate_range(ws, range_ref)
+            raise
         table.Name = name
 
-        return self._get_table_info(table, ws)
+        info = self._get_table_info(table, ws)
+        if metadata is not None:
+            metadata.add_table(
+                ws, table, name, sheet, parse_address(info.range_address)[0]
+            )
+        return info
 
     def delete(
         self,
@@ -348,17 +671,18 @@ class TableManager:
             >>> manager.delete("tbl_Old", force=True)  # Deletes everything
         """
         # Resolve workbook
-        wb = _resolve_workbook(self._mgr.app, workbook)
+        wb = _resolve_workbook(self._mgr.app, workbook, workbook_index(self._mgr))
+        metadata = workbook_metadata(self._mgr, wb)
 
         # Search for table using new signature that searches entire workbook
         result = None
 
         if worksheet is None:
             # Search all worksheets using new _find_table(wb, name)
-            result = _find_table(wb, name)
+            result = _find_table(wb, name, metadata)
         else:
             # Search specific worksheet
-            ws = _find_worksheet(wb, worksheet)
+            ws = _find_worksheet(wb, worksheet, metadata)
             if ws is not None:
                 # Check if table exists in this specific worksheet
                 for table in ws.ListObjects:
@@ -383,11 +707,17 @@ class TableManager:
             # Remove table structure but keep data
             table_found.Unlist()
 
+        if metadata is not None:
+            metadata.remove_table(name)
+            if force:
+                metadata.forget_dimensions()
+
     def list(
         self,
         worksheet: str | None = None,
         workbook: Path | None = None,
-    ) -> list[TableInfo]:
+        helper: bool | str = False,
+    ) -> builtins.list[TableInfo]:
         """List all tables.
 
         Returns information about all tables in the worksheet(s).
@@ -395,6 +725,10 @@ class TableManager:
         Args:
             worksheet: Worksheet name to search (if None, list all in workbook)
             workbook: Target workbook path (if None, uses active workbook)
+            helper: Read the whole list in one call through the VBA
+                inventory helper (True: injected in the workbook, or the
+                name of the workbook hosting it); falls back to reading
+                table by table when the helper cannot run
 
         Returns:
             List of TableInfo for each table
@@ -411,7 +745,14 @@ class TableManager:
             ...     print(f"{table.name}: {table.rows_count} rows")
         """
         # Resolve workbook
-        wb = _resolve_workbook(self._mgr.app, workbook)
+        wb = _resolve_workbook(self._mgr.app, workbook, workbook_index(self._mgr))
+
+        if helper:
+            from .vba_inventory import inventory_helper
+
+            listed = inventory_helper(self._mgr, helper).tables(wb, worksheet)
+            if listed is not None:
+                return listed
 
         tables = []
 
@@ -430,7 +771,7 @@ class TableManager:
                     continue
         else:
             # List tables in specific worksheet
-            ws = _find_worksheet(wb, worksheet)
+            ws = _find_worksheet(wb, worksheet, workbook_metadata(self._mgr, wb))
             if ws:
                 for table in ws.ListObjects:
                     try:
@@ -440,3 +781,417 @@ class TableManager:
                         continue
 
         return tables
+
+    def _get_table(
+        self, name: str, workbook: Path | None, writing: bool = False
+    ) -> "tuple[CDispatch, CDispatch]":
+        """Find a table in the target workbook.
+
+        Args:
+            name: Name of the table
+            workbook: Target workbook path (if None, uses active workbook)
+            writing: The cells of the table are about to change: forget
+                the worksheet dimensions recorded in the metadata
+
+        Returns:
+            Tuple of (worksheet, table)
+
+        Raises:
+            TableNotFoundError: If the table doesn't exist
+            WorkbookNotFoundError: If the specified workbook is not open
+        """
+        wb = _resolve_workbook(self._mgr.app, workbook, workbook_index(self._mgr))
+        metadata = workbook_metadata(self._mgr, wb)
+        result = _find_table(wb, name, metadata)
+        if result is None:
+            raise TableNotFoundError(name, "any worksheet")
+        if writing and metadata is not None:
+            metadata.forget_dimensions()
+        return result
+
+    def iter_chunks(
+        self,
+        name: str,
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+        workbook: Path | None = None,
+    ) -> Iterator[builtins.list[builtins.list[Any]]]:
+        """Read the data rows of a table in chunks.
+
+        Each chunk is fetched with one DataBodyRange Value2 transfer, so
+        only ``chunk_rows`` rows are held in memory at a time.
+
+        Args:
+            name: Name of the table
+            chunk_rows: Rows per Value2 transfer
+            workbook: Target workbook path (if None, uses active workbook)
+
+        Yields:
+            list[list[Any]]: Rows of the chunk (see RangeManager.read()
+                for the cell value conventions)
+
+        Raises:
+            TableNotFoundError: If the table doesn't exist
+            WorkbookNotFoundError: If the specified workbook is not open
+            ValueError: If chunk_rows is lower than 1
+        """
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be >= 1 (got {chunk_rows})")
+
+        _ws, table = self._get_table(name, workbook)
+        yield from _iter_body_chunks(table, chunk_rows)
+
+    def export(
+        self,
+        name: str,
+        output: Path | TextIO,
+        fmt: str = "csv",
+        chunk_rows: int = EXPORT_CHUNK_ROWS,
+        workbook: Path | None = None,
+    ) -> TableExportResult:
+        """Export the data of a table to CSV or NDJSON.
+
+        Chunks are read and written one after the other through a
+        generator pipeline, so memory use is bounded by ``chunk_rows``
+        whatever the size of the table.  The header row is written first
+        (CSV) or used as keys of each record (NDJSON).
+
+        Args:
+            name: Name of the table
+            output: Destination file path or open text stream
+            fmt: "csv" or "ndjson"
+            chunk_rows: Rows per Value2 transfer
+            workbook: Target workbook path (if None, uses active workbook)
+
+        Returns:
+            TableExportResult with the row count and throughput
+
+        Raises:
+            TableNotFoundError: If the table doesn't exist
+            WorkbookNotFoundError: If the specified workbook is not open
+            ValueError: If the format or chunk_rows is invalid
+
+        Examples:
+            >>> manager = TableManager(excel_mgr)
+            >>> result = manager.export("tbl_Sales", Path("sales.csv"))
+            >>> print(f"{result.rows_per_second:.0f} rows/s")
+        """
+        if fmt not in RANGE_FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}' (expected: csv, ndjson)")
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be >= 1 (got {chunk_rows})")
+
+        started = time.perf_counter()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        _ws, table = self._get_table(name, workbook)
+        header = [str(col.Name) for col in table.ListColumns]
+        chunks = 0
+
+        def counted() -> Iterator[list[list[Any]]]:
+            nonlocal chunks
+            for chunk in _iter_body_chunks(table, chunk_rows):
+                chunks += 1
+                yield chunk
+
+        rows = chain.from_iterable(counted())
+        if isinstance(output, Path):
+            with output.open("w", encoding="utf-8", newline="") as stream:
+                count = write_rows(rows, stream, fmt, header=header)
+            destination = str(output)
+        else:
+            count = write_rows(rows, output, fmt, header=header)
+            destination = "<stream>"
+
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+        return TableExportResult(
+            name=name,
+            output=destination,
+            format=fmt,
+            rows=count,
+            columns=len(header),
+            chunks=chunks,
+            elapsed=elapsed,
+            rows_per_second=count / elapsed if elapsed > 0 else float(count),
+            peak_memory=peak,
+        )
+
+    def append_rows(
+        self,
+        name: str,
+        rows: Iterable[builtins.list[Any]],
+        columns: builtins.list[str] | None = None,
+        workbook: Path | None = None,
+        truncate: bool = False,
+        row_count: int | None = None,
+        block_rows: int | None = None,
+        optimize: bool = True,
+    ) -> TableLoadResult:
+        """Append rows to a table in bulk.
+
+        The table (ListObject) is resized once to its final size, then the
+        rows are written in blocks through Range.Value2, instead of one
+        ListRows.Add() call per row.  Rows are consumed lazily: with
+        ``row_count`` given, an iterator (e.g., a CSV reader) is streamed
+        block by block and never held in memory.
+
+        Args:
+            name: Name of the table
+            rows: Rows of values, in the order of ``columns``
+            columns: Column names of the rows.  Matched case-insensitively
+                against the table headers; table columns not listed are
+                left untouched.  If None, rows follow the table columns.
+            workbook: Target workbook path (if None, uses active workbook)
+            truncate: Delete the existing data rows first
+            row_count: Number of rows, if known in advance.  If None,
+                rows are materialized to count them.
+            block_rows: Rows per Value2 block (default: computed from
+                WRITE_BLOCK_CELLS and the number of columns)
+            optimize: Apply ExcelOptimizer during the load
+
+        Returns:
+            TableLoadResult with the row counts and throughput
+
+        Raises:
+            TableNotFoundError: If the table doesn't exist
+            TableColumnError: If columns do not match the table headers
+            WorkbookNotFoundError: If the specified workbook is not open
+            RangeError: If a block transfer fails
+            ValueError: If block_rows is lower than 1
+
+        Note:
+            Like ListObject.Resize, the load does not shift the cells
+            below the table: they must be empty.
+
+        Examples:
+            >>> manager = TableManager(excel_mgr)
+            >>> result = manager.append_rows(
+            ...     "tbl_Sales", [["Pen", 3.0]], columns=["Product", "Qty"]
+            ... )
+            >>> print(result.rows_count)
+        """
+        _ws, table = self._get_table(name, workbook, writing=True)
+        table_columns = [str(col.Name) for col in table.ListColumns]
+        mapping = _map_columns(name, table_columns, columns)
+        runs = _column_runs(mapping)
+
+        if block_rows is None:
+            block_rows = max(1, WRITE_BLOCK_CELLS // len(table_columns))
+        elif block_rows < 1:
+            raise ValueError(f"block_rows must be >= 1 (got {block_rows})")
+
+        if row_count is None:
+            rows = list(rows)
+            row_count = len(rows)
+
+        started = time.perf_counter()
+        scope = ExcelOptimizer(self._mgr) if optimize else nullcontext()
+        with scope:
+            if truncate and table.DataBodyRange is not None:
+                table.DataBodyRange.Delete()
+
+            existing = self._data_rows_count(table)
+            header = table.HeaderRowRange
+            width = len(table_columns)
+            if row_count:
+                table.Resize(header.Resize(1 + existing + row_count, width))
+
+            written, blocks = _write_table_rows(
+                header.Offset(1 + existing, 0), 0, rows, runs, width, block_rows, name
+            )
+
+            if written != row_count:
+                # Fewer/more rows than announced: fit the table to the data
+                table.Resize(header.Resize(1 + existing + written, width))
+        elapsed = time.perf_counter() - started
+
+        return TableLoadResult(
+            name=name,
+            rows_added=written,
+            rows_count=existing + written,
+            columns=[
+                c for c, source in zip(table_columns, mapping) if source is not None
+            ],
+            blocks=blocks,
+            elapsed=elapsed,
+            rows_per_second=written / elapsed if elapsed > 0 else float(written),
+        )
+
+    def upsert(
+        self,
+        name: str,
+        rows: Iterable[builtins.list[Any]],
+        key_columns: builtins.list[str],
+        columns: builtins.list[str] | None = None,
+        workbook: Path | None = None,
+        block_rows: int | None = None,
+        optimize: bool = True,
+    ) -> TableUpsertResult:
+        """Update or insert rows in a table, matching them on key columns.
+
+        The table body is read in chunks and its keys indexed in a dict,
+        so each source row is matched in constant time instead of a
+        Range.Find() per row, and only the keys are held in memory.  The
+        chunks holding matched rows are read again to skip the rows that
+        did not change; changed rows are written back as contiguous Value2
+        blocks and new rows are appended with a single resize, as in
+        append_rows().
+
+        Key values are matched like Excel's MATCH: strings ignore case and
+        surrounding blanks, numbers compare by value.  If a key appears
+        several times in the source, the last row wins; if it appears
+        several times in the table, the first table row is updated.
+
+        Args:
+            name: Name of the table
+            rows: Rows of values, in the order of ``columns``
+            key_columns: Column names identifying a row (one or more)
+            columns: Column names of the rows, matched like in
+                append_rows().  If None, rows follow the table columns.
+            workbook: Target workbook path (if None, uses active workbook)
+            block_rows: Rows per Value2 block (default: computed from
+                WRITE_BLOCK_CELLS and the number of columns)
+            optimize: Apply ExcelOptimizer during the writes
+
+        Returns:
+            TableUpsertResult with the updated/inserted/unchanged counts
+
+        Raises:
+            TableNotFoundError: If the table doesn't exist
+            TableColumnError: If columns do not match the table headers or
+                a key column is missing from the data
+            WorkbookNotFoundError: If the specified workbook is not open
+            RangeError: If a block transfer fails
+            ValueError: If key_columns is empty or block_rows is lower than 1
+
+        Examples:
+            >>> manager = TableManager(excel_mgr)
+            >>> result = manager.upsert(
+            ...     "tbl_Sales", [["Pen", 5.0]], ["Product"], ["Product", "Qty"]
+            ... )
+            >>> print(result.rows_updated, result.rows_inserted)
+        """
+        if not key_columns:
+            raise ValueError("key_columns must name at least one column")
+
+        _ws, table = self._get_table(name, workbook, writing=True)
+        table_columns = [str(col.Name) for col in table.ListColumns]
+        mapping = _map_columns(name, table_columns, columns)
+        runs = _column_runs(mapping)
+        width = len(table_columns)
+
+        positions = {column.casefold(): i for i, column in enumerate(table_columns)}
+        key_offsets = []
+        key_sources = []
+        missing = []
+        for column in key_columns:
+            offset = positions.get(column.strip().casefold())
+            source = None if offset is None else mapping[offset]
+            if offset is None or source is None:
+                missing.append(column)
+            else:
+                key_offsets.append(offset)
+                key_sources.append(source)
+        if missing:
+            raise TableColumnError(name, missing, "key columns missing from the data")
+
+        if block_rows is None:
+            block_rows = max(1, WRITE_BLOCK_CELLS // width)
+        elif block_rows < 1:
+            raise ValueError(f"block_rows must be >= 1 (got {block_rows})")
+
+        started = time.perf_counter()
+
+        # One chunked pass over the table body builds the key index; only
+        # the keys are kept, not the rows
+        index: dict[tuple[Any, ...], int] = {}
+        existing = 0
+        for chunk in _iter_body_chunks(table, EXPORT_CHUNK_ROWS):
+            for row in chunk:
+                key = tuple(_key_value(row[i]) for i in key_offsets)
+                index.setdefault(key, existing)
+                existing += 1
+
+        source_width = len(columns) if columns is not None else width
+        updates: dict[int, list[Any]] = {}
+        inserts: dict[tuple[Any, ...], list[Any]] = {}
+        processed = 0
+        for row in rows:
+            processed += 1
+            if len(row) < source_width:
+                row = list(row) + [None] * (source_width - len(row))
+            key = tuple(_key_value(row[s]) for s in key_sources)
+            offset = index.get(key)
+            if offset is None:
+                inserts[key] = row
+            else:
+                updates[offset] = row
+        matched = len(updates)
+
+        # Matched rows identical to the table are not written: read back
+        # the chunks holding them, and only those
+        mapped = [(t, s) for t, s in enumerate(mapping) if s is not None]
+        starts = sorted({offset - offset % EXPORT_CHUNK_ROWS for offset in updates})
+        chunks = _iter_body_chunks(table, EXPORT_CHUNK_ROWS, starts)
+        for start, chunk in zip(starts, chunks, strict=True):
+            for offset, current in enumerate(chunk, start):
+                pending = updates.get(offset)
+                if pending is not None and all(
+                    current[t] == pending[s] for t, s in mapped
+                ):
+                    del updates[offset]
+
+        blocks = 0
+        scope = ExcelOptimizer(self._mgr) if optimize else nullcontext()
+        with scope:
+            header = table.HeaderRowRange
+            body_start = header.Offset(1, 0)
+            for first, count in _contiguous_runs(sorted(updates)):
+                block = [updates[offset] for offset in range(first, first + count)]
+                _written, written_blocks = _write_table_rows(
+                    body_start, first, block, runs, width, block_rows, name
+                )
+                blocks += written_blocks
+
+            if inserts:
+                table.Resize(header.Resize(1 + existing + len(inserts), width))
+                _written, written_blocks = _write_table_rows(
+                    header.Offset(1 + existing, 0),
+                    0,
+                    inserts.values(),
+                    runs,
+                    width,
+                    block_rows,
+                    name,
+                )
+                blocks += written_blocks
+        elapsed = time.perf_counter() - started
+
+        return TableUpsertResult(
+            name=name,
+            rows_updated=len(updates),
+            rows_inserted=len(inserts),
+            rows_unchanged=matched - len(updates),
+            rows_count=existing + len(inserts),
+            key_columns=[table_columns[i] for i in key_offsets],
+            blocks=blocks,
+            elapsed=elapsed,
+            rows_per_second=processed / elapsed if elapsed > 0 else float(processed),
+        )
+
+    def _data_rows_count(self, table: "CDispatch") -> int:
+        """Return the number of data rows, ignoring a lone empty row.
+
+        A table created from a header-only range keeps one empty data row;
+        appending after it would leave a blank line in the table.
+        """
+        body = table.DataBodyRange
+        if body is None:
+            return 0
+
+        count: int = body.Rows.Count
+        if count == 1 and all(v is None for v in _normalize_value2(body.Value2)[0]):
+            return 0
+        return count
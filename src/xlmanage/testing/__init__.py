@@ -0,0 +1,32 @@
+"""
+Test and benchmark support for xlManage.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from .fake_excel import CallCounter, FakeExcel, fake_excel_manager
+from .fake_process_stats import FakeProcessStats
+from .fake_processes import FakeProcessBackend
+from .fake_windows import FakeWindowSource
+
+__all__ = [
+    "CallCounter",
+    "FakeExcel",
+    "FakeProcessBackend",
+    "FakeProcessStats",
+    "FakeWindowSource",
+    "fake_excel_manager",
+]
@@ -0,0 +1,370 @@
+"""
+COM call benchmarks of the manager operations on FakeExcel.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ..excel_manager import ExcelManager
+from ..macro_runner import MacroRunner
+from ..table_manager import TableManager
+from ..vba_inventory import HELPER_MODULE_NAME, HELPER_SOURCE
+from ..vba_manager import VBAManager
+from ..workbook_manager import WorkbookManager
+from ..worksheet_manager import WorksheetManager
+from .fake_excel import VBEXT_CT_STD_MODULE, FakeExcel, fake_excel_manager
+
+# Number of workbooks, sheets, tables or modules the scenarios run against
+SCALES: tuple[int, ...] = (10, 100, 1000)
+
+# Setup: (app, scale, workdir) -> argument passed to the measured operation
+Setup = Callable[[FakeExcel, int, Path], Any]
+# Measured operation: (excel_manager, setup argument) -> None
+Operation = Callable[[Any, Any], Any]
+
+
+@dataclass
+class BenchmarkResult:
+    """COM calls and wall time of one scenario at one scale.
+
+    Attributes:
+        name: Scenario name (e.g., "worksheet.list")
+        scale: Number of workbooks, sheets, tables or modules
+        calls: COM calls made by the operation
+        elapsed: Wall time of the operation in seconds
+    """
+
+    name: str
+    scale: int
+    calls: int
+    elapsed: float
+
+    @property
+    def key(self) -> str:
+        """Baseline key of the result (e.g., "worksheet.list[100]")."""
+        return f"{self.name}[{self.scale}]"
+
+
+@dataclass
+class Regression:
+    """Scenario making more COM calls than its baseline.
+
+    Attributes:
+        key: Baseline key (scenario name and scale)
+        baseline: COM calls recorded in the baseline
+        calls: COM calls made now
+    """
+
+    key: str
+    baseline: int
+    calls: int
+
+
+def _open_workbooks(app: FakeExcel, scale: int, workdir: Path) -> list[Path]:
+    """Open `scale` workbooks whose FullName lives in workdir."""
+    paths = []
+    for i in range(1, scale + 1):
+        path = workdir / f"Book{i:04d}.xlsm"
+        app.add_workbook(path.name, ["Sheet1"], path)
+        paths.append(path)
+    return paths
+
+
+def _setup_workbook_open(app: FakeExcel, scale: int, workdir: Path) -> Path:
+    _open_workbooks(app, scale - 1, workdir)
+    path = workdir / "Closed.xlsx"
+    FakeExcel().add_workbook(path.name).SaveAs(str(path))
+    return path
+
+
+def _setup_workbooks(app: FakeExcel, scale: int, workdir: Path) -> Path:
+    return _open_workbooks(app, scale, workdir)[-1]
+
+
+def _setup_sheets(app: FakeExcel, scale: int, workdir: Path) -> str:
+    app.add_workbook("Data.xlsx", [f"Sheet{i}" for i in range(1, scale + 1)])
+    return f"Sheet{scale}"
+
+
+def _setup_tables(app: FakeExcel, scale: int, workdir: Path) -> tuple[str, str]:
+    workbook = app.add_workbook("Data.xlsx", [])
+    for i in range(1, scale + 1):
+        sheet = workbook.add_sheet(f"Sheet{i}")
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]])
+        sheet.add_table(f"tbl_{i}", "A1:B3")
+    return f"Sheet{scale}", f"tbl_{scale}"
+
+
+def _setup_hosted_helper(app: FakeExcel, scale: int, workdir: Path) -> str:
+    """Tables of _setup_tables, listed by the helper kept in PERSONAL.XLSB."""
+    _setup_tables(app, scale, workdir)
+    target = app.ActiveWorkbook
+    host = app.add_workbook("PERSONAL.XLSB")
+    component = host.VBProject.VBComponents.Add(VBEXT_CT_STD_MODULE)
+    component.Name = HELPER_MODULE_NAME
+    component.CodeModule.AddFromString(HELPER_SOURCE)
+    app._active = target
+    return host.Name
+
+
+def _setup_crowded_sheet(app: FakeExcel, scale: int, workdir: Path) -> str:
+    """One worksheet holding `scale` tables stacked in columns A:B."""
+    sheet = app.add_workbook("Data.xlsx", ["Data"]).Worksheets("Data")
+    for i in range(scale):
+        row = 3 * i + 1
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]], row=row)
+        sheet.add_table(f"tbl_{i + 1}", f"A{row}:B{row + 2}")
+    sheet.load([["Id", "Value"], [1, "a"], [2, "b"]], column=4)
+    return "Data"
+
+
+def _setup_modules(app: FakeExcel, scale: int, workdir: Path) -> Path:
+    components = app.add_workbook("Macros.xlsm").VBProject.VBComponents
+    for i in range(1, scale + 1):
+        component = components.Add(VBEXT_CT_STD_MODULE)
+        component.Name = f"Module{i}"
+        component.CodeModule.AddFromString(f"Sub Task{i}()\r\nEnd Sub")
+
+    source = workdir / "Extra.bas"
+    source.write_bytes(b'Attribute VB_Name = "Extra"\r\nSub Extra()\r\nEnd Sub\r\n')
+    return source
+
+
+def _setup_macro(app: FakeExcel, scale: int, workdir: Path) -> Path:
+    path = _open_workbooks(app, scale, workdir)[-1]
+    app.register_macro("Module1.Total", lambda a, b: a * b, workbook=path.name)
+    return path
+
+
+# Scenario name -> (setup, measured operation)
+SCENARIOS: dict[str, tuple[Setup, Operation]] = {
+    "workbook.open": (
+        _setup_workbook_open,
+        lambda mgr, path: WorkbookManager(mgr).open(path),
+    ),
+    "workbook.list": (_setup_workbooks, lambda mgr, _: WorkbookManager(mgr).list()),
+    "workbook.save": (
+        _setup_workbooks,
+        lambda mgr, path: WorkbookManager(mgr).save(path),
+    ),
+    "worksheet.list": (_setup_sheets, lambda mgr, _: WorksheetManager(mgr).list()),
+    "worksheet.list_names": (
+        _setup_sheets,
+        lambda mgr, _: WorksheetManager(mgr).list(fields=["name", "visible"]),
+    ),
+    "worksheet.create": (
+        _setup_sheets,
+        lambda mgr, _: WorksheetManager(mgr).create("Extra"),
+    ),
+    "worksheet.copy": (
+        _setup_sheets,
+        lambda mgr, last: WorksheetManager(mgr).copy(last, "Copy"),
+    ),
+    "table.create": (
+        _setup_tables,
+        lambda mgr, last: TableManager(mgr).create(
+            "tbl_new", "D1:E3", worksheet=last[0]
+        ),
+    ),
+    "table.create_crowded": (
+        _setup_crowded_sheet,
+        lambda mgr, sheet: TableManager(mgr).create(
+            "tbl_new", "D1:E3", worksheet=sheet
+        ),
+    ),
+    "table.list": (_setup_tables, lambda mgr, _: TableManager(mgr).list()),
+    "table.list_helper": (
+        _setup_hosted_helper,
+        lambda mgr, host: TableManager(mgr).list(helper=host),
+    ),
+    "table.delete": (
+        _setup_tables,
+        lambda mgr, last: TableManager(mgr).delete(last[1]),
+    ),
+    "vba.import_module": (
+        _setup_modules,
+        lambda mgr, source: VBAManager(mgr).import_module(source),
+    ),
+    "vba.export_module": (
+        _setup_modules,
+        lambda mgr, source: VBAManager(mgr).export_module(
+            "Module1", source.with_name("Module1.bas")
+        ),
+    ),
+    "vba.list_modules": (
+        _setup_modules,
+        lambda mgr, _: VBAManager(mgr).list_modules(),
+    ),
+    "macro.run": (
+        _setup_macro,
+        lambda mgr, path: MacroRunner(mgr).run(
+            "Module1.Total", workbook=path, args="6,7"
+        ),
+    ),
+    "macro.run_many": (
+        _setup_macro,
+        lambda mgr, path: MacroRunner(mgr).run_many(
+            "Module1.Total", workbook=path, args_list=["6,7", "8,9"], repeat=5
+        ),
+    ),
+}
+
+
+def _prime_session(mgr: ExcelManager) -> None:
+    """Build the caches an earlier operation of the session would have built."""
+    app = mgr.app
+    mgr.workbook_index.rebuild(app)
+    for wb in app.Workbooks:
+        mgr.metadata_index.get(wb).rebuild(wb)
+
+
+def run_scenario(
+    name: str, scale: int, latency: float = 0.0, warm: bool = True
+) -> BenchmarkResult:
+    """Run one scenario on a fresh FakeExcel and measure its operation.
+
+    Only the operation is measured: the COM calls made to set up the
+    workbooks, sheets, tables or modules are not counted.
+
+    Args:
+        name: Scenario name (key of SCENARIOS)
+        scale: Number of workbooks, sheets, tables or modules
+        latency: Delay added to each COM call, in seconds
+        warm: Measure the operation as part of a long-lived session
+            (daemon, batch, script) whose caches are already built.
+            With False, the cost of building them is included.
+
+    Returns:
+        BenchmarkResult with the COM calls and the wall time
+
+    Raises:
+        KeyError: If the scenario does not exist
+    """
+    setup, operation = SCENARIOS[name]
+    app = FakeExcel()
+    with tempfile.TemporaryDirectory(prefix="xlmanage-bench-") as workdir:
+        argument = setup(app, scale, Path(workdir))
+        mgr = fake_excel_manager(app)
+        if warm:
+            _prime_session(mgr)
+        app.counter.reset()
+        app.latency = latency
+
+        started = time.perf_counter()
+        operation(mgr, argument)
+        elapsed = time.perf_counter() - started
+
+    return BenchmarkResult(name, scale, app.counter.total, elapsed)
+
+
+def run_benchmarks(
+    scales: Iterable[int] = SCALES,
+    names: Iterable[str] | None = None,
+    latency: float = 0.0,
+    warm: bool = True,
+) -> list[BenchmarkResult]:
+    """Run scenarios at several scales.
+
+    Args:
+        scales: Scales to run every scenario at
+        names: Scenarios to run (all if None)
+        latency: Delay added to each COM call, in seconds
+        warm: Measure operations within an already primed session
+
+    Returns:
+        One result per scenario and scale, grouped by scenario
+
+    Example:
+        >>> for result in run_benchmarks(scales=(10, 100)):
+        ...     print(result.key, result.calls)
+    """
+    scales = list(scales)
+    return [
+        run_scenario(name, scale, latency, warm)
+        for name in (names if names is not None else SCENARIOS)
+        for scale in scales
+    ]
+
+
+def load_baseline(path: Path) -> dict[str, int]:
+    """Read the COM call counts stored in a baseline file.
+
+    Args:
+        path: Baseline JSON file ({"calls": {"worksheet.list[10]": 52, ...}})
+
+    Returns:
+        COM calls per result key (empty if the file does not exist)
+    """
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {str(key): int(calls) for key, calls in data.get("calls", {}).items()}
+
+
+def _key_order(key: str) -> tuple[str, int]:
+    """Sort baseline keys by scenario name, then numerically by scale."""
+    name, _, scale = key.rpartition("[")
+    return name, int(scale.rstrip("]"))
+
+
+def save_baseline(path: Path, results: Iterable[BenchmarkResult]) -> None:
+    """Store the COM call counts of results as the new baseline.
+
+    Counts already in the file for other scenarios or scales are kept.
+
+    Args:
+        path: Baseline JSON file
+        results: Benchmark results
+    """
+    calls = load_baseline(path)
+    calls.update({result.key: result.calls for result in results})
+    data = {"calls": dict(sorted(calls.items(), key=lambda item: _key_order(item[0])))}
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(
+    results: Iterable[BenchmarkResult],
+    baseline: dict[str, int],
+    tolerance: float = 0.0,
+) -> list[Regression]:
+    """Return the results making more COM calls than the baseline allows.
+
+    Wall times are reported but never compared: they depend on the
+    machine, while COM call counts are deterministic.
+
+    Args:
+        results: Benchmark results
+        baseline: COM calls per result key (see load_baseline())
+        tolerance: Allowed increase as a fraction of the baseline
+            (0.1 accepts 10% more calls)
+
+    Returns:
+        Regressions, empty when every result is within its baseline.
+        Results without a baseline entry are ignored.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is not None and result.calls > expected * (1 + tolerance):
+            regressions.append(Regression(result.key, expected, result.calls))
+    return regressions
@@ -0,0 +1,1742 @@
+"""
+In-memory Excel COM object model for tests and benchmarks.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import itertools
+import json
+import re
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .._compat import com_error
+
+if TYPE_CHECKING:
+    from ..excel_manager import ExcelManager
+
+# Application-defined or object-defined error (0x800A03EC)
+HRESULT_EXCEL_ERROR: int = -2146827284
+# Exception occurred (DISP_E_EXCEPTION, 0x80020009)
+HRESULT_EXCEPTION: int = -2147352567
+# The object invoked has disconnected from its clients (0x80010108)
+RPC_E_DISCONNECTED: int = -2147417848
+# Call was rejected by callee (0x80010001)
+RPC_E_CALL_REJECTED: int = -2147418111
+# Value2 of a cell holding #N/A
+XL_ERROR_NA: int = -2146826246
+
+XL_CALCULATION_AUTOMATIC: int = -4105
+XL_SHEET_MAX_ROWS: int = 1_048_576
+XL_SHEET_MAX_COLUMNS: int = 16_384
+# XlSearchOrder and XlSearchDirection values understood by Range.Find
+XL_BY_ROWS: int = 1
+XL_BY_COLUMNS: int = 2
+XL_NEXT: int = 1
+XL_PREVIOUS: int = 2
+
+VBEXT_CT_STD_MODULE: int = 1
+VBEXT_CT_CLASS_MODULE: int = 2
+VBEXT_CT_MS_FORM: int = 3
+VBEXT_CT_DOCUMENT: int = 100
+
+_DEFAULT_COMPONENT_NAMES: dict[int, str] = {
+    VBEXT_CT_STD_MODULE: "Module",
+    VBEXT_CT_CLASS_MODULE: "Class",
+    VBEXT_CT_MS_FORM: "UserForm",
+}
+_EXTENSION_TYPES: dict[str, int] = {
+    ".bas": VBEXT_CT_STD_MODULE,
+    ".cls": VBEXT_CT_CLASS_MODULE,
+    ".frm": VBEXT_CT_MS_FORM,
+}
+
+_CELL_PATTERN = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+_SHEET_NAME_FORBIDDEN = re.compile(r"[\[\]:*?/\\]")
+_TABLE_NAME_PATTERN = re.compile(r"^[A-Za-z_\\][A-Za-z0-9_.]*$")
+_MACRO_REFERENCE = re.compile(r"^(?:'?(?P<workbook>[^'!]+)'?!)?(?P<macro>[^!]+)$")
+_VB_ATTRIBUTE = re.compile(r'^Attribute\s+(VB_\w+)\s*=\s*"?([^"]*)"?\s*$')
+
+
+def _error(description: str, hresult: int = HRESULT_EXCEL_ERROR) -> com_error:
+    """Build the com_error Excel raises for a failed call."""
+    return com_error(
+        hresult,
+        description,
+        (0, "Microsoft Excel", description, None, 0, hresult),
+        None,
+    )
+
+
+def _column_letters(column: int) -> str:
+    """Convert a 1-based column number to letters (28 -> "AB")."""
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _column_number(letters: str) -> int:
+    """Convert column letters to a 1-based number ("AB" -> 28)."""
+    number = 0
+    for letter in letters.upper():
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def _parse_reference(reference: str) -> tuple[int, int, int, int]:
+    """Parse an A1 reference into (row, column, rows, columns).
+
+    Raises:
+        com_error: If the reference is not a cell or a cell range
+    """
+    parts = reference.replace(" ", "").split(":")
+    if not 1 <= len(parts) <= 2:
+        raise _error(f"Method 'Range' of object '_Worksheet' failed: {reference!r}")
+
+    corners = []
+    for part in parts:
+        match = _CELL_PATTERN.match(part)
+        if match is None:
+            raise _error(f"Method 'Range' of object '_Worksheet' failed: {reference!r}")
+        row, column = int(match.group(2)), _column_number(match.group(1))
+        if not (1 <= row <= XL_SHEET_MAX_ROWS and 1 <= column <= XL_SHEET_MAX_COLUMNS):
+            raise _error(f"Method 'Range' of object '_Worksheet' failed: {reference!r}")
+        corners.append((row, column))
+
+    (row1, column1), (row2, column2) = corners[0], corners[-1]
+    top, left = min(row1, row2), min(column1, column2)
+    return top, left, abs(row2 - row1) + 1, abs(column2 - column1) + 1
+
+
+def _to_cell(value: Any) -> Any:
+    """Store a value like Excel does: numbers as float, "" as empty."""
+    if value == "" or value is None:
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+class CallCounter:
+    """Counts COM round trips and emulates their latency.
+
+    Every property get, property set and method call made on a fake COM
+    object is recorded under "<Object>.<Member>" (e.g., "Range.Value2"),
+    then delayed by ``latency`` seconds to mimic an out-of-process call.
+
+    Attributes:
+        latency: Delay added to each call, in seconds
+        counts: Number of calls per member
+        rejected: Number of calls refused by reject()
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.counts: Counter[str] = Counter()
+        self.rejected = 0
+        self._paused = 0
+        self._rejections = 0
+        self._rejection_hresult = RPC_E_CALL_REJECTED
+
+    @property
+    def total(self) -> int:
+        """Total number of recorded calls."""
+        return sum(self.counts.values())
+
+    def record(self, member: str) -> None:
+        """Record one call and wait for the configured latency."""
+        if self._paused:
+            return
+        if self._rejections:
+            # Refused before running, like a call to a busy Excel
+            self._rejections -= 1
+            self.rejected += 1
+            raise com_error(
+                self._rejection_hresult, "Call was rejected by callee.", None, None
+            )
+        self.counts[member] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def reset(self) -> None:
+        """Forget all recorded calls."""
+        self.counts.clear()
+
+    def reject(self, calls: int, hresult: int = RPC_E_CALL_REJECTED) -> None:
+        """Refuse the next calls, like Excel busy recalculating.
+
+        Args:
+            calls: Number of calls refused
+            hresult: HRESULT of the com_error they raise
+                (RPC_E_CALL_REJECTED by default)
+        """
+        self._rejections = calls
+        self._rejection_hresult = hresult
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Stop recording, e.g. for the calls a macro makes inside Excel."""
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+
+class _ComObject:
+    """Base class recording every access to a COM member.
+
+    COM members are the attributes starting with an uppercase letter;
+    lowercase and underscore attributes are internal state and helpers
+    that never count as round trips.
+    """
+
+    _kind = "Object"
+    # Attribute present on every pywin32 CDispatch, used to spot COM objects
+    _oleobj_ = None
+    # Set once the object is closed or deleted
+    _disconnected = False
+    _counter: CallCounter
+
+    def __init__(self, counter: CallCounter):
+        object.__setattr__(self, "_counter", counter)
+
+    def __getattribute__(self, name: str) -> Any:
+        if name[:1].isupper():
+            object.__getattribute__(self, "_counter").record(
+                f"{type(self)._kind}.{name}"
+            )
+            # Like a real COM reference, a closed or deleted object is
+            # disconnected
+            if object.__getattribute__(self, "_disconnected"):
+                raise com_error(
+                    RPC_E_DISCONNECTED,
+                    "The object invoked has disconnected from its clients.",
+                    None,
+                    None,
+                )
+        return object.__getattribute__(self, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name[:1].isupper():
+            self._counter.record(f"{self._kind}.{name}")
+        object.__setattr__(self, name, value)
+
+
+class _Collection(_ComObject):
+    """COM collection: Count, Item(index or name), call syntax and iteration."""
+
+    def __init__(self, counter: CallCounter, items: list[Any]):
+        super().__init__(counter)
+        self._items = items
+
+    def _name_of(self, item: Any) -> str:
+        name: str = item._name
+        return name
+
+    def _get(self, index: int | str) -> Any:
+        if isinstance(index, str):
+            for item in self._items:
+                if self._name_of(item).lower() == index.lower():
+                    return item
+        elif isinstance(index, int) and 1 <= index <= len(self._items):
+            return self._items[index - 1]
+        raise _error("Subscript out of range", -2147352565)
+
+    @property
+    def Count(self) -> int:
+        return len(self._items)
+
+    def Item(self, index: int | str) -> Any:
+        return self._get(index)
+
+    def __call__(self, index: int | str) -> Any:
+        self._counter.record(f"{self._kind}.Item")
+        return self._get(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._counter.record(f"{self._kind}._NewEnum")
+        for item in list(self._items):
+            self._counter.record(f"{self._kind}.Next")
+            yield item
+
+    def __len__(self) -> int:
+        self._counter.record(f"{self._kind}.Count")
+        return len(self._items)
+
+
+class _Dimension(_ComObject):
+    """Rows or Columns of a range; only Count is modelled."""
+
+    _kind = "Range"
+    _count: int
+
+    def __init__(self, counter: CallCounter, count: int):
+        super().__init__(counter)
+        object.__setattr__(self, "_count", count)
+
+    @property
+    def Count(self) -> int:
+        return self._count
+
+
+# ============================================================================
+# Ranges and tables
+# ============================================================================
+
+
+class Range(_ComObject):
+    """Rectangular block of cells of a worksheet."""
+
+    _kind = "Range"
+
+    def __init__(
+        self, sheet: Worksheet, row: int, column: int, rows: int, columns: int
+    ):
+        super().__init__(sheet._counter)
+        if not (
+            1 <= row
+            and 1 <= column
+            and rows >= 1
+            and columns >= 1
+            and row + rows - 1 <= XL_SHEET_MAX_ROWS
+            and column + columns - 1 <= XL_SHEET_MAX_COLUMNS
+        ):
+            raise _error("Application-defined or object-defined error")
+        self._sheet = sheet
+        self._row, self._column = row, column
+        self._rows, self._columns = rows, columns
+
+    def _cells(self) -> Iterator[tuple[int, int]]:
+        return itertools.product(
+            range(self._row, self._row + self._rows),
+            range(self._column, self._column + self._columns),
+        )
+
+    def _bounds(self) -> tuple[int, int, int, int]:
+        return (
+            self._row,
+            self._column,
+            self._row + self._rows - 1,
+            self._column + self._columns - 1,
+        )
+
+    @property
+    def Address(self) -> str:
+        first = f"${_column_letters(self._column)}${self._row}"
+        if self._rows == 1 and self._columns == 1:
+            return first
+        last_row = self._row + self._rows - 1
+        last_column = self._column + self._columns - 1
+        return f"{first}:${_column_letters(last_column)}${last_row}"
+
+    @property
+    def Row(self) -> int:
+        return self._row
+
+    @property
+    def Column(self) -> int:
+        return self._column
+
+    @property
+    def Rows(self) -> _Dimension:
+        return _Dimension(self._counter, self._rows)
+
+    @property
+    def Columns(self) -> _Dimension:
+        return _Dimension(self._counter, self._columns)
+
+    @property
+    def Count(self) -> int:
+        return self._rows * self._columns
+
+    @property
+    def Worksheet(self) -> Worksheet:
+        return self._sheet
+
+    @property
+    def Parent(self) -> _Worksheet:
+        return self._sheet
+
+    @property
+    def Application(self) -> FakeExcel:
+        return self._sheet._workbook._app
+
+    def Offset(self, RowOffset: int = 0, ColumnOffset: int = 0) -> Range:
+        return Range(
+            self._sheet,
+            self._row + RowOffset,
+            self._column + ColumnOffset,
+            self._rows,
+            self._columns,
+        )
+
+    def Resize(
+        self, RowSize: int | None = None, ColumnSize: int | None = None
+    ) -> Range:
+        return Range(
+            self._sheet,
+            self._row,
+            self._column,
+            self._rows if RowSize is None else RowSize,
+            self._columns if ColumnSize is None else ColumnSize,
+        )
+
+    def Cells(self, RowIndex: int, ColumnIndex: int = 1) -> Range:
+        return self._cell(RowIndex, ColumnIndex)
+
+    def __call__(self, RowIndex: int, ColumnIndex: int = 1) -> Range:
+        # Default member (e.g. ws.Cells(1, 2)), counted with its owner
+        return self._cell(RowIndex, ColumnIndex)
+
+    def _cell(self, row: int, column: int) -> Range:
+        return Range(self._sheet, self._row + row - 1, self._column + column - 1, 1, 1)
+
+    def Find(
+        self,
+        What: Any,
+        After: Range | None = None,
+        LookIn: int | None = None,
+        LookAt: int | None = None,
+        SearchOrder: int = XL_BY_ROWS,
+        SearchDirection: int = XL_NEXT,
+        MatchCase: bool = False,
+    ) -> Range | None:
+        """Find the next cell holding What, wrapping around like Excel.
+
+        Only "*" (any non-empty cell) and whole values are matched; the
+        search starts after the After cell (default: the top-left cell).
+        """
+        top, left, bottom, right = self._bounds()
+
+        def key(cell: tuple[int, int]) -> tuple[int, int]:
+            row, column = cell
+            return (column, row) if SearchOrder == XL_BY_COLUMNS else (row, column)
+
+        found = sorted(
+            key(cell)
+            for cell, value in self._sheet._cells.items()
+            if top <= cell[0] <= bottom
+            and left <= cell[1] <= right
+            and (What == "*" or value == _to_cell(What))
+        )
+        if not found:
+            return None
+        start = key((After._row, After._column) if After else (top, left))
+        if SearchDirection == XL_PREVIOUS:
+            before = [k for k in found if k < start]
+            match = before[-1] if before else found[-1]
+        else:
+            following = [k for k in found if k > start]
+            match = following[0] if following else found[0]
+        row, column = key(match)
+        return Range(self._sheet, row, column, 1, 1)
+
+    def _read(self) -> Any:
+        cells = self._sheet._cells
+        if self._rows == 1 and self._columns == 1:
+            return cells.get((self._row, self._column))
+        columns = range(self._column, self._column + self._columns)
+        return tuple(
+            tuple(cells.get((row, column)) for column in columns)
+            for row in range(self._row, self._row + self._rows)
+        )
+
+    def _write(self, value: Any) -> None:
+        cells = self._sheet._cells
+        if isinstance(value, list | tuple):
+            rows = value if value and isinstance(value[0], list | tuple) else [value]
+            for r in range(self._rows):
+                row = rows[r] if r < len(rows) else ()
+                for c in range(self._columns):
+                    # Cells beyond the array get #N/A, as in Excel
+                    cell = _to_cell(row[c]) if c < len(row) else XL_ERROR_NA
+                    key = (self._row + r, self._column + c)
+                    if cell is None:
+                        cells.pop(key, None)
+                    else:
+                        cells[key] = cell
+        else:
+            cell = _to_cell(value)
+            for key in self._cells():
+                if cell is None:
+                    cells.pop(key, None)
+                else:
+                    cells[key] = cell
+        self._sheet._workbook._saved = False
+
+    @property
+    def Value2(self) -> Any:
+        return self._read()
+
+    @Value2.setter
+    def Value2(self, value: Any) -> None:
+        self._write(value)
+
+    @property
+    def Value(self) -> Any:
+        return self._read()
+
+    @Value.setter
+    def Value(self, value: Any) -> None:
+        self._write(value)
+
+    def ClearContents(self) -> None:
+        self._write(None)
+
+    def Clear(self) -> None:
+        self._write(None)
+
+    def Delete(self, Shift: int | None = None) -> None:
+        """Delete the cells.
+
+        Cells below are not shifted up; the cells are only emptied.  When
+        the range is the body of a table, the table shrinks to its header.
+        """
+        for table in self._sheet._tables:
+            body = table._body_bounds()
+            if body is not None and body == self._bounds():
+                table._last_row = table._row
+        self._write(None)
+
+
+# Names for the annotations of the classes whose COM members hide a class
+# (e.g. ListObject.Range, Range.Worksheet)
+_Range = Range
+
+
+class ListColumn(_ComObject):
+    """Column of a table."""
+
+    _kind = "ListColumn"
+
+    def __init__(self, table: ListObject, index: int):
+        super().__init__(table._counter)
+        self._table = table
+        self._index = index
+        self._name = table._header_names()[index - 1]
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @property
+    def Index(self) -> int:
+        return self._index
+
+    @property
+    def Range(self) -> Range:
+        table = self._table
+        return Range(
+            table._sheet,
+            table._row,
+            table._column + self._index - 1,
+            table._last_row - table._row + 1,
+            1,
+        )
+
+
+class ListColumns(_Collection):
+    _kind = "ListColumns"
+
+
+class ListRows(_Collection):
+    """Data rows of a table; Add() appends one empty row."""
+
+    _kind = "ListRows"
+
+    def __init__(self, table: ListObject):
+        super().__init__(table._counter, [None] * table._body_count())
+        self._table = table
+
+    def Add(self, Position: int | None = None, AlwaysInsert: bool = True) -> None:
+        self._table._last_row += 1
+
+
+class ListObject(_ComObject):
+    """Excel table; its first row is the header row."""
+
+    _kind = "ListObject"
+
+    def __init__(
+        self,
+        sheet: Worksheet,
+        name: str,
+        row: int,
+        column: int,
+        last_row: int,
+        last_column: int,
+    ):
+        super().__init__(sheet._counter)
+        self._sheet = sheet
+        self._name = name
+        self._row, self._column = row, column
+        self._last_row, self._last_column = last_row, last_column
+
+    def _width(self) -> int:
+        return self._last_column - self._column + 1
+
+    def _body_count(self) -> int:
+        return self._last_row - self._row
+
+    def _body_bounds(self) -> tuple[int, int, int, int] | None:
+        if self._body_count() == 0:
+            return None
+        return (self._row + 1, self._column, self._last_row, self._last_column)
+
+    def _bounds(self) -> tuple[int, int, int, int]:
+        return (self._row, self._column, self._last_row, self._last_column)
+
+    def _header_names(self) -> list[str]:
+        cells = self._sheet._cells
+        names = []
+        for offset in range(self._width()):
+            key = (self._row, self._column + offset)
+            value = cells.get(key)
+            if value is None:
+                # Excel fills empty headers with "Column<n>"
+                value = f"Column{offset + 1}"
+                cells[key] = value
+            elif isinstance(value, float) and value.is_integer():
+                value = str(int(value))
+            names.append(str(value))
+        return names
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @Name.setter
+    def Name(self, value: str) -> None:
+        if not _TABLE_NAME_PATTERN.match(value) or len(value) > 255:
+            raise _error(f"The name that you entered is not valid: {value!r}")
+        workbook = self._sheet._workbook
+        for table in workbook._all_tables():
+            if table is not self and table._name.lower() == value.lower():
+                raise _error(f"A table named {value!r} already exists")
+        self._name = value
+
+    @property
+    def Range(self) -> Range:
+        return Range(
+            self._sheet,
+            self._row,
+            self._column,
+            self._last_row - self._row + 1,
+            self._width(),
+        )
+
+    @property
+    def HeaderRowRange(self) -> _Range:
+        return Range(self._sheet, self._row, self._column, 1, self._width())
+
+    @property
+    def DataBodyRange(self) -> _Range | None:
+        if self._body_count() == 0:
+            return None
+        return Range(
+            self._sheet, self._row + 1, self._column, self._body_count(), self._width()
+        )
+
+    @property
+    def ListColumns(self) -> ListColumns:
+        self._header_names()
+        columns = [ListColumn(self, i) for i in range(1, self._width() + 1)]
+        return ListColumns(self._counter, columns)
+
+    @property
+    def ListRows(self) -> ListRows:
+        return ListRows(self)
+
+    @property
+    def Parent(self) -> Worksheet:
+        return self._sheet
+
+    @property
+    def ShowTotals(self) -> bool:
+        return False
+
+    def Resize(self, Range: _Range) -> None:
+        if Range._sheet is not self._sheet or (Range._row, Range._column) != (
+            self._row,
+            self._column,
+        ):
+            raise _error("The header row must stay in the same position")
+        self._last_row = Range._row + Range._rows - 1
+        self._last_column = Range._column + Range._columns - 1
+        self._header_names()
+        self._sheet._workbook._saved = False
+
+    def Delete(self) -> None:
+        self.Range.ClearContents()
+        self._sheet._tables.remove(self)
+        self._disconnected = True
+
+    def Unlist(self) -> None:
+        self._sheet._tables.remove(self)
+        self._disconnected = True
+
+
+class ListObjects(_Collection):
+    """Tables of a worksheet."""
+
+    _kind = "ListObjects"
+
+    def __init__(self, sheet: Worksheet):
+        super().__init__(sheet._counter, sheet._tables)
+        self._sheet = sheet
+
+    def Add(
+        self,
+        SourceType: int = 1,
+        Source: Range | None = None,
+        LinkSource: Any = None,
+        XlListObjectHasHeaders: int = 1,
+        Destination: Any = None,
+    ) -> ListObject:
+        if Source is None or Source._sheet is not self._sheet:
+            raise _error("Method 'Add' of object 'ListObjects' failed")
+        bounds = Source._bounds()
+        for table in self._sheet._tables:
+            if _overlaps(bounds, table._bounds()):
+                raise _error("A table cannot overlap another table")
+
+        row, column, last_row, last_column = bounds
+        if last_row == row:
+            # A header-only range gets one empty data row
+            last_row += 1
+        table = ListObject(
+            self._sheet,
+            self._sheet._workbook._next_table_name(),
+            row,
+            column,
+            last_row,
+            last_column,
+        )
+        table._header_names()
+        self._sheet._tables.append(table)
+        return table
+
+
+def _overlaps(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> bool:
+    """Whether two (top, left, bottom, right) rectangles share a cell."""
+    return not (a[2] < b[0] or b[2] < a[0] or a[3] < b[1] or b[3] < a[1])
+
+
+# ============================================================================
+# Worksheets and workbooks
+# ============================================================================
+
+
+class Worksheet(_ComObject):
+    """Worksheet holding a sparse cell grid and its tables."""
+
+    _kind = "Worksheet"
+
+    def __init__(self, workbook: Workbook, name: str):
+        super().__init__(workbook._counter)
+        self._workbook = workbook
+        self._name = name
+        self._visible = True
+        self._cells: dict[tuple[int, int], Any] = {}
+        self._tables: list[ListObject] = []
+        self._component = workbook._project._add_document(name)
+
+    def load(self, rows: list[list[Any]], row: int = 1, column: int = 1) -> None:
+        """Fill cells from a list of rows without counting COM calls.
+
+        Helper for test and benchmark setup; not part of the COM model.
+        """
+        for r, values in enumerate(rows):
+            for c, value in enumerate(values):
+                cell = _to_cell(value)
+                if cell is not None:
+                    self._cells[(row + r, column + c)] = cell
+
+    def add_table(self, name: str, reference: str) -> ListObject:
+        """Create a table over a reference without counting COM calls.
+
+        Helper for test and benchmark setup; not part of the COM model.
+        """
+        row, column, rows, columns = _parse_reference(reference)
+        table = ListObject(
+            self, name, row, column, row + max(rows, 2) - 1, column + columns - 1
+        )
+        table._header_names()
+        self._tables.append(table)
+        return table
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @Name.setter
+    def Name(self, value: str) -> None:
+        if (
+            not value
+            or len(value) > 31
+            or _SHEET_NAME_FORBIDDEN.search(value)
+            or value.startswith("'")
+            or value.endswith("'")
+        ):
+            raise _error(f"Invalid worksheet name: {value!r}")
+        for sheet in self._workbook._sheets:
+            if sheet is not self and sheet._name.lower() == value.lower():
+                raise _error("That name is already taken. Try a different one.")
+        self._name = value
+        self._workbook._saved = False
+
+    @property
+    def CodeName(self) -> str:
+        return self._component._name
+
+    @property
+    def Index(self) -> int:
+        return self._workbook._sheets.index(self) + 1
+
+    @property
+    def Visible(self) -> bool:
+        return self._visible
+
+    @Visible.setter
+    def Visible(self, value: bool) -> None:
+        if not value and sum(s._visible for s in self._workbook._sheets) == 1:
+            raise _error("A workbook must contain at least one visible worksheet")
+        self._visible = bool(value)
+
+    @property
+    def Parent(self) -> Workbook:
+        return self._workbook
+
+    @property
+    def Application(self) -> FakeExcel:
+        return self._workbook._app
+
+    @property
+    def ListObjects(self) -> ListObjects:
+        return ListObjects(self)
+
+    @property
+    def UsedRange(self) -> Range:
+        if not self._cells:
+            return Range(self, 1, 1, 1, 1)
+        rows = [row for row, _column in self._cells]
+        columns = [column for _row, column in self._cells]
+        top, left = min(rows), min(columns)
+        return Range(self, top, left, max(rows) - top + 1, max(columns) - left + 1)
+
+    def Range(self, Cell1: str, Cell2: str | None = None) -> Range:
+        reference = Cell1 if Cell2 is None else f"{Cell1}:{Cell2}"
+        return Range(self, *_parse_reference(reference))
+
+    @property
+    def Cells(self) -> _Range:
+        # Every cell of the sheet; ws.Cells(row, column) calls its default
+        # member
+        return Range(self, 1, 1, XL_SHEET_MAX_ROWS, XL_SHEET_MAX_COLUMNS)
+
+    def Activate(self) -> None:
+        self._workbook._active_sheet = self
+
+    def Delete(self) -> bool:
+        sheets = self._workbook._sheets
+        if self._visible and sum(s._visible for s in sheets) == 1:
+            raise _error("A workbook must contain at least one visible worksheet")
+        sheets.remove(self)
+        self._workbook._project._components.remove(self._component)
+        if self._workbook._active_sheet is self:
+            self._workbook._active_sheet = sheets[0]
+        self._workbook._saved = False
+        for table in self._tables:
+            table._disconnected = True
+        self._disconnected = True
+        return True
+
+    def Copy(
+        self, Before: Worksheet | None = None, After: Worksheet | None = None
+    ) -> None:
+        target = After or Before
+        if target is None:
+            raise _error("Copying to a new workbook is not supported by the fake")
+        workbook = target._workbook
+        name = workbook._unique_sheet_name(self._name)
+        copy = Worksheet(workbook, name)
+        copy._cells = dict(self._cells)
+        copy._visible = self._visible
+        for table in self._tables:
+            clone = ListObject(
+                copy, workbook._next_table_name(table._name), *table._bounds()
+            )
+            copy._tables.append(clone)
+        position = (
+            workbook._sheets.index(After) + 1
+            if After
+            else workbook._sheets.index(target)
+        )
+        workbook._sheets.insert(position, copy)
+        workbook._active_sheet = copy
+        workbook._saved = False
+
+
+_Worksheet = Worksheet
+
+
+class Worksheets(_Collection):
+    """Worksheets of a workbook."""
+
+    _kind = "Worksheets"
+
+    def __init__(self, workbook: Workbook):
+        super().__init__(workbook._counter, workbook._sheets)
+        self._workbook = workbook
+
+    def Add(
+        self,
+        Before: Worksheet | None = None,
+        After: Worksheet | None = None,
+        Count: int = 1,
+        Type: Any = None,
+    ) -> Worksheet:
+        workbook = self._workbook
+        if After is not None:
+            position = workbook._sheets.index(After) + 1
+        elif Before is not None:
+            position = workbook._sheets.index(Before)
+        elif workbook._active_sheet is not None:
+            position = workbook._sheets.index(workbook._active_sheet)
+        else:
+            position = 0
+        sheet = Worksheet(workbook, workbook._unique_sheet_name())
+        workbook._sheets.insert(position, sheet)
+        for _ in range(Count - 1):
+            sheet = Worksheet(workbook, workbook._unique_sheet_name())
+            workbook._sheets.insert(position, sheet)
+        workbook._active_sheet = sheet
+        workbook._saved = False
+        return sheet
+
+
+_Worksheets = Worksheets
+
+
+class Workbook(_ComObject):
+    """Workbook made of worksheets and a VBA project.
+
+    Saving writes a JSON snapshot of the workbook to disk so that it can be
+    reopened by any FakeExcel instance; it is not a real Excel file.
+    """
+
+    _kind = "Workbook"
+
+    def __init__(self, app: FakeExcel, name: str, full_name: str | None = None):
+        super().__init__(app._counter)
+        self._app = app
+        self._name = name
+        self._full_name = full_name
+        self._read_only = False
+        self._saved = True
+        self._file_format = 51
+        self._sheets: list[Worksheet] = []
+        self._project = VBProject(self)
+        self._active_sheet: Worksheet | None = None
+
+    def _all_tables(self) -> Iterator[ListObject]:
+        for sheet in self._sheets:
+            yield from sheet._tables
+
+    def _next_table_name(self, base: str = "Table") -> str:
+        names = {table._name.lower() for table in self._all_tables()}
+        for number in itertools.count(1 if base == "Table" else 2):
+            candidate = f"{base}{number}"
+            if candidate.lower() not in names:
+                return candidate
+        raise AssertionError("unreachable")
+
+    def _unique_sheet_name(self, base: str | None = None) -> str:
+        names = {sheet._name.lower() for sheet in self._sheets}
+        for number in itertools.count(1 if base is None else 2):
+            candidate = f"Sheet{number}" if base is None else f"{base} ({number})"
+            if candidate.lower() not in names:
+                return candidate
+        raise AssertionError("unreachable")
+
+    def add_sheet(self, name: str | None = None) -> Worksheet:
+        """Append a worksheet without counting COM calls.
+
+        Helper for test and benchmark setup; not part of the COM model.
+        """
+        sheet = Worksheet(self, name or self._unique_sheet_name())
+        self._sheets.append(sheet)
+        if self._active_sheet is None:
+            self._active_sheet = sheet
+        return sheet
+
+    def sheet(self, name: str) -> Worksheet:
+        """Return a worksheet by name without counting COM calls."""
+        for sheet in self._sheets:
+            if sheet._name.lower() == name.lower():
+                return sheet
+        raise KeyError(name)
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """Return the JSON-compatible content of the workbook."""
+        return {
+            "sheets": [
+                {
+                    "name": sheet._name,
+                    "visible": sheet._visible,
+                    "cells": [[r, c, v] for (r, c), v in sorted(sheet._cells.items())],
+                    "tables": [
+                        {"name": table._name, "bounds": list(table._bounds())}
+                        for table in sheet._tables
+                    ],
+                }
+                for sheet in self._sheets
+            ],
+            "modules": [
+                {
+                    "name": component._name,
+                    "type": component._type,
+                    "code": component._code._lines,
+                    "predeclared": component._predeclared,
+                }
+                for component in self._project._components
+                if component._type != VBEXT_CT_DOCUMENT
+            ],
+        }
+
+    def _restore(self, snapshot: dict[str, Any]) -> None:
+        for data in snapshot.get("sheets", []):
+            sheet = self.add_sheet(data["name"])
+            sheet._visible = data.get("visible", True)
+            sheet._cells = {
+                (r, c): (datetime.fromisoformat(v[5:]) if _is_date(v) else v)
+                for r, c, v in data.get("cells", [])
+            }
+            for table in data.get("tables", []):
+                sheet._tables.append(ListObject(sheet, table["name"], *table["bounds"]))
+        for data in snapshot.get("modules", []):
+            component = VBComponent(self._project, data["name"], data["type"])
+            component._code._lines = list(data["code"])
+            component._predeclared = data.get("predeclared", False)
+            self._project._components.append(component)
+
+    def _write(self, path: Path) -> None:
+        snapshot = self.to_snapshot()
+        path.write_text(json.dumps(snapshot, default=_json_default), encoding="utf-8")
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @property
+    def FullName(self) -> str:
+        return self._full_name or self._name
+
+    @property
+    def Path(self) -> str:
+        return str(Path(self._full_name).parent) if self._full_name else ""
+
+    @property
+    def ReadOnly(self) -> bool:
+        return self._read_only
+
+    @property
+    def Saved(self) -> bool:
+        return self._saved
+
+    @Saved.setter
+    def Saved(self, value: bool) -> None:
+        self._saved = bool(value)
+
+    @property
+    def FileFormat(self) -> int:
+        return self._file_format
+
+    @property
+    def Worksheets(self) -> Worksheets:
+        return Worksheets(self)
+
+    @property
+    def Sheets(self) -> _Worksheets:
+        return Worksheets(self)
+
+    @property
+    def ActiveSheet(self) -> Worksheet | None:
+        return self._active_sheet
+
+    @property
+    def Application(self) -> FakeExcel:
+        return self._app
+
+    @property
+    def VBProject(self) -> VBProject:
+        if not self._app.vba_access:
+            raise _error("Programmatic access to Visual Basic Project is not trusted")
+        return self._project
+
+    def Activate(self) -> None:
+        self._app._active = self
+
+    def Save(self) -> None:
+        if self._read_only or self._full_name is None:
+            raise _error(f"Cannot save '{self._name}'")
+        self._write(Path(self._full_name))
+        self._saved = True
+
+    def SaveAs(
+        self, Filename: str, FileFormat: int | None = None, **kwargs: Any
+    ) -> None:
+        path = Path(Filename)
+        if not path.parent.is_dir():
+            raise _error(f"Cannot access '{path.parent}'")
+        self._write(path)
+        self._full_name = str(path)
+        self._name = path.name
+        self._read_only = False
+        self._saved = True
+        if FileFormat is not None:
+            self._file_format = FileFormat
+
+    def Close(
+        self, SaveChanges: bool | None = None, Filename: str | None = None
+    ) -> None:
+        if SaveChanges:
+            self.Save()
+        self._app._close(self)
+        self._disconnected = True
+
+
+class Workbooks(_Collection):
+    """Open workbooks of the application."""
+
+    _kind = "Workbooks"
+
+    def __init__(self, app: FakeExcel):
+        super().__init__(app._counter, app._workbooks)
+        self._app = app
+
+    def Add(self, Template: str | None = None) -> Workbook:
+        app = self._app
+        workbook = Workbook(app, f"Book{next(app._book_numbers)}")
+        if Template is not None:
+            workbook._restore(_read_snapshot(Path(Template)))
+        if not workbook._sheets:
+            workbook.add_sheet("Sheet1")
+        app._open(workbook)
+        return workbook
+
+    def Open(
+        self,
+        Filename: str,
+        UpdateLinks: Any = None,
+        ReadOnly: bool = False,
+        **kwargs: Any,
+    ) -> Workbook:
+        path = Path(Filename)
+        if not path.is_file():
+            raise _error(f"Sorry, we couldn't find {Filename}.")
+        for workbook in self._app._workbooks:
+            if workbook._full_name and Path(workbook._full_name) == path:
+                return workbook
+        workbook = Workbook(self._app, path.name, str(path))
+        workbook._restore(_read_snapshot(path))
+        if not workbook._sheets:
+            workbook.add_sheet("Sheet1")
+        workbook._read_only = bool(ReadOnly)
+        self._app._open(workbook)
+        return workbook
+
+
+def _is_date(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith("date:")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return f"date:{value.isoformat()}"
+    raise TypeError(f"Cannot store {type(value).__name__} in a fake workbook")
+
+
+def _read_snapshot(path: Path) -> dict[str, Any]:
+    """Read a snapshot written by Workbook.Save; other files are blank."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+# ============================================================================
+# VBA project
+# ============================================================================
+
+
+class CodeModule(_ComObject):
+    """Source code of a VBA component, stored as a list of lines."""
+
+    _kind = "CodeModule"
+
+    def __init__(self, counter: CallCounter):
+        super().__init__(counter)
+        self._lines: list[str] = []
+
+    @property
+    def CountOfLines(self) -> int:
+        return len(self._lines)
+
+    def Lines(self, StartLine: int, Count: int) -> str:
+        return "\r\n".join(self._lines[StartLine - 1 : StartLine - 1 + Count])
+
+    def AddFromString(self, String: str) -> None:
+        self._lines.extend(String.splitlines())
+
+    def InsertLines(self, Line: int, String: str) -> None:
+        self._lines[Line - 1 : Line - 1] = String.splitlines()
+
+    def DeleteLines(self, StartLine: int, Count: int = 1) -> None:
+        del self._lines[StartLine - 1 : StartLine - 1 + Count]
+
+
+class _Property(_ComObject):
+    """Component property returned by VBComponent.Properties(name)."""
+
+    _kind = "Property"
+
+    def __init__(self, component: VBComponent, name: str):
+        super().__init__(component._counter)
+        self._component = component
+        self._name = name
+
+    @property
+    def Value(self) -> Any:
+        if self._name == "PredeclaredId":
+            return self._component._predeclared
+        if self._name == "Name":
+            return self._component._name
+        raise _error(f"Property {self._name!r} not available", -2147352565)
+
+    @Value.setter
+    def Value(self, value: Any) -> None:
+        if self._name != "PredeclaredId":
+            raise _error(f"Property {self._name!r} is read-only")
+        self._component._predeclared = bool(value)
+
+
+class VBComponent(_ComObject):
+    """Module, class, UserForm or document module of a VBA project."""
+
+    _kind = "VBComponent"
+
+    def __init__(self, project: VBProject, name: str, component_type: int):
+        super().__init__(project._counter)
+        self._project = project
+        self._name = name
+        self._type = component_type
+        self._code = CodeModule(project._counter)
+        self._predeclared = component_type == VBEXT_CT_DOCUMENT
+
+    @property
+    def Name(self) -> str:
+        return self._name
+
+    @Name.setter
+    def Name(self, value: str) -> None:
+        if self._project._find(value) not in (None, self):
+            raise _error(f"Name conflicts with existing module: {value!r}")
+        self._name = value
+
+    @property
+    def Type(self) -> int:
+        return self._type
+
+    @property
+    def CodeModule(self) -> CodeModule:
+        return self._code
+
+    def Properties(self, Index: str) -> _Property:
+        if self._type == VBEXT_CT_STD_MODULE:
+            raise _error("Standard modules have no properties", -2147352565)
+        return _Property(self, Index)
+
+    def Export(self, FileName: str) -> None:
+        header = [f'Attribute VB_Name = "{self._name}"']
+        if self._type in (VBEXT_CT_CLASS_MODULE, VBEXT_CT_DOCUMENT):
+            predeclared = "True" if self._predeclared else "False"
+            header = [
+                "VERSION 1.0 CLASS",
+                "BEGIN",
+                "  MultiUse = -1  'True",
+                "END",
+                *header,
+                "Attribute VB_GlobalNameSpace = False",
+                "Attribute VB_Creatable = False",
+                f"Attribute VB_PredeclaredId = {predeclared}",
+                "Attribute VB_Exposed = False",
+            ]
+        elif self._type == VBEXT_CT_MS_FORM:
+            header = [
+                "VERSION 5.00",
+                f"Begin {{C62A69F0}} {self._name}",
+                "End",
+                *header,
+            ]
+            Path(FileName).with_suffix(".frx").write_bytes(b"")
+        text = "\r\n".join(header + self._code._lines) + "\r\n"
+        Path(FileName).write_bytes(text.encode("windows-1252"))
+
+
+class VBComponents(_Collection):
+    """Components of a VBA project."""
+
+    _kind = "VBComponents"
+
+    def __init__(self, project: VBProject):
+        super().__init__(project._counter, project._components)
+        self._project = project
+
+    def Add(self, ComponentType: int) -> VBComponent:
+        if ComponentType not in _DEFAULT_COMPONENT_NAMES:
+            raise _error(f"Invalid component type {ComponentType}")
+        component = VBComponent(
+            self._project,
+            self._project._unique_name(_DEFAULT_COMPONENT_NAMES[ComponentType]),
+            ComponentType,
+        )
+        self._project._components.append(component)
+        return component
+
+    def Import(self, FileName: str) -> VBComponent:
+        path = Path(FileName)
+        component_type = _EXTENSION_TYPES.get(path.suffix.lower())
+        if component_type is None or not path.is_file():
+            raise _error(f"Cannot import {FileName}")
+
+        attributes: dict[str, str] = {}
+        code: list[str] = []
+        in_header = False
+        for line in path.read_bytes().decode("windows-1252").splitlines():
+            stripped = line.strip()
+            match = _VB_ATTRIBUTE.match(stripped)
+            if match:
+                attributes[match.group(1)] = match.group(2)
+            elif stripped.startswith("VERSION "):
+                continue
+            elif stripped in ("BEGIN", "END") or stripped.startswith("Begin {"):
+                in_header = stripped != "END"
+            elif stripped == "End" and in_header:
+                in_header = False
+            elif not in_header:
+                code.append(line)
+
+        name = attributes.get("VB_Name", path.stem)
+        if self._project._find(name) is not None:
+            name = self._project._unique_name(name)
+        component = VBComponent(self._project, name, component_type)
+        component._code._lines = code
+        component._predeclared = attributes.get("VB_PredeclaredId") == "True"
+        self._project._components.append(component)
+        return component
+
+    def Remove(self, Component: VBComponent) -> None:
+        if Component._type == VBEXT_CT_DOCUMENT:
+            raise _error("Document modules cannot be removed", HRESULT_EXCEPTION)
+        self._project._components.remove(Component)
+
+
+class VBProject(_ComObject):
+    """VBA project of a workbook."""
+
+    _kind = "VBProject"
+
+    def __init__(self, workbook: Workbook):
+        super().__init__(workbook._counter)
+        self._workbook = workbook
+        self._components: list[VBComponent] = [
+            VBComponent(self, "ThisWorkbook", VBEXT_CT_DOCUMENT)
+        ]
+
+    def _find(self, name: str) -> VBComponent | None:
+        for component in self._components:
+            if component._name.lower() == name.lower():
+                return component
+        return None
+
+    def _unique_name(self, base: str) -> str:
+        names = {component._name.lower() for component in self._components}
+        for number in itertools.count(1):
+            if f"{base}{number}".lower() not in names:
+                return f"{base}{number}"
+        raise AssertionError("unreachable")
+
+    def _add_document(self, sheet_name: str) -> VBComponent:
+        component = VBComponent(self, self._unique_name("Sheet"), VBEXT_CT_DOCUMENT)
+        self._components.append(component)
+        return component
+
+    @property
+    def Name(self) -> str:
+        return "VBAProject"
+
+    @property
+    def Protection(self) -> int:
+        return 0
+
+    @property
+    def VBComponents(self) -> VBComponents:
+        return VBComponents(self)
+
+
+# ============================================================================
+# Application
+# ============================================================================
+
+
+class FakeExcel(_ComObject):
+    """In-memory stand-in for the Excel.Application COM object.
+
+    Implements the part of the Excel object model used by xlManage
+    (workbooks, worksheets, ranges, tables, VBA projects and
+    Application.Run) with Excel's semantics, so that every manager runs
+    unmodified against it.  Each COM member access is counted by
+    ``counter`` and delayed by ``latency`` to emulate out-of-process
+    round trips, which makes call counts and timings comparable across
+    implementations without Windows.
+
+    Macros are Python callables registered with register_macro(); the
+    functions of xlManage's VBA inventory helper are emulated once its
+    code is loaded in a workbook.
+
+    Attributes:
+        counter: CallCounter recording the COM calls
+        vba_access: Whether "Trust access to the VBA project object
+            model" is enabled (VBProject raises otherwise)
+        pid: Fake process ID reported by ExcelManager helpers
+
+    Example:
+        >>> app = FakeExcel(latency=0.0005)
+        >>> app.add_workbook("data.xlsx", ["Data"])
+        >>> mgr = fake_excel_manager(app)
+        >>> WorksheetManager(mgr).list()
+        >>> print(app.counter.total)
+    """
+
+    _kind = "Application"
+    _hwnds = itertools.count(0x10000, 0x10)
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        visible: bool = False,
+        vba_access: bool = True,
+        counter: CallCounter | None = None,
+    ):
+        super().__init__(counter or CallCounter(latency))
+        self.vba_access = vba_access
+        self.pid = 0
+        self._workbooks: list[Workbook] = []
+        self._active: Workbook | None = None
+        self._book_numbers = itertools.count(1)
+        self._macros: dict[tuple[str | None, str], Callable[..., Any]] = {}
+        self._quit = False
+        self._hwnd = next(self._hwnds)
+        for name, value in {
+            "Visible": visible,
+            "DisplayAlerts": True,
+            "ScreenUpdating": True,
+            "DisplayStatusBar": True,
+            "EnableAnimations": True,
+            "Calculation": XL_CALCULATION_AUTOMATIC,
+            "EnableEvents": True,
+            "AskToUpdateLinks": True,
+            "Iteration": False,
+            "MaxIterations": 100,
+            "MaxChange": 0.001,
+            "Interactive": True,
+            "Version": "16.0",
+            "Name": "Microsoft Excel",
+        }.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def counter(self) -> CallCounter:
+        """CallCounter recording the COM calls made on this application."""
+        return self._counter
+
+    @property
+    def latency(self) -> float:
+        """Delay added to each COM call, in seconds."""
+        return self._counter.latency
+
+    @latency.setter
+    def latency(self, value: float) -> None:
+        self._counter.latency = value
+
+    def add_workbook(
+        self,
+        name: str = "Book1.xlsx",
+        sheets: list[str] | tuple[str, ...] = ("Sheet1",),
+        path: Path | None = None,
+    ) -> Workbook:
+        """Open a new workbook without counting COM calls.
+
+        Helper for test and benchmark setup; not part of the COM model.
+
+        Args:
+            name: Workbook name (e.g., "data.xlsm")
+            sheets: Names of its worksheets
+            path: Full path reported by FullName (default: the name only)
+
+        Returns:
+            The new workbook, which becomes the active workbook
+        """
+        workbook = Workbook(self, name, str(path) if path else None)
+        for sheet in sheets:
+            workbook.add_sheet(sheet)
+        self._open(workbook)
+        return workbook
+
+    def register_macro(
+        self, name: str, func: Callable[..., Any], workbook: str | None = None
+    ) -> None:
+        """Register a Python callable runnable through Application.Run.
+
+        Args:
+            name: Macro name, optionally qualified by its module
+                ("Module1.Compute" also answers to "Compute")
+            func: Callable receiving the macro arguments; its return value
+                is returned by Run, and any exception becomes a VBA
+                runtime error
+            workbook: Name of the workbook holding the macro (None: any)
+        """
+        key = (workbook.lower() if workbook else None, name.lower())
+        self._macros[key] = func
+
+    def busy(self, calls: int, hresult: int = RPC_E_CALL_REJECTED) -> None:
+        """Simulate a busy Excel refusing the next calls.
+
+        Helper for tests; not part of the COM model.  The next ``calls``
+        COM calls fail with ``hresult`` without running, as when Excel
+        recalculates or shows a modal dialog.
+
+        Args:
+            calls: Number of calls refused
+            hresult: HRESULT of the refusal (RPC_E_CALL_REJECTED by default)
+        """
+        self.counter.reject(calls, hresult)
+
+    def crash(self) -> None:
+        """Simulate the death of EXCEL.EXE without counting COM calls.
+
+        Helper for tests; not part of the COM model.  Every later call on
+        the application, its workbooks or their worksheets fails with
+        RPC_E_DISCONNECTED, like on the references to a crashed process.
+        """
+        for workbook in self._workbooks:
+            for sheet in workbook._sheets:
+                sheet._disconnected = True
+            workbook._disconnected = True
+        self._disconnected = True
+
+    def _open(self, workbook: Workbook) -> None:
+        self._workbooks.append(workbook)
+        self._active = workbook
+
+    def _close(self, workbook: Workbook) -> None:
+        self._workbooks.remove(workbook)
+        if self._active is workbook:
+            self._active = self._workbooks[-1] if self._workbooks else None
+
+    def _find_macro(self, reference: str) -> Callable[..., Any]:
+        match = _MACRO_REFERENCE.match(reference.strip())
+        if match is None:
+            raise _error(f"Cannot run the macro '{reference}'.")
+        workbook = match.group("workbook")
+        macro = match.group("macro").lower()
+        if workbook and not any(
+            wb._name.lower() == workbook.lower() for wb in self._workbooks
+        ):
+            raise _error(f"Cannot run the macro '{reference}'.")
+
+        for (owner, name), func in self._macros.items():
+            if owner is not None and workbook and owner != workbook.lower():
+                continue
+            if name == macro or name.rsplit(".", 1)[-1] == macro:
+                return func
+        emulated = self._find_inventory_function(workbook, macro)
+        if emulated is not None:
+            return emulated
+        raise _error(
+            f"Cannot run the macro '{reference}'. The macro may not be available "
+            "in this workbook or all macros may be disabled."
+        )
+
+    def _find_inventory_function(
+        self, workbook: str | None, macro: str
+    ) -> Callable[..., Any] | None:
+        """Emulate the functions of xlManage's VBA inventory helper.
+
+        They run when the VBA code of a component of the workbook defines
+        them, like the macros of a real project, and read the workbook
+        inside Excel: only the Application.Run call is counted.
+        """
+        module, _, function = macro.rpartition(".")
+        functions: dict[str, Callable[..., Any]] = {
+            "xlmsheets": self._inventory_sheets,
+            "xlmtables": self._inventory_tables,
+            "xlmmodules": self._inventory_modules,
+        }
+        emulated = functions.get(function)
+        if emulated is None:
+            return None
+        for wb in self._workbooks:
+            if workbook and wb._name.lower() != workbook.lower():
+                continue
+            for component in wb._project._components:
+                if module and component._name.lower() != module:
+                    continue
+                code = "\n".join(component._code._lines).lower()
+                if f"function {function}(" in code:
+                    return emulated
+        return None
+
+    def _inventory_sheets(
+        self, workbook_name: str
+    ) -> tuple[tuple[Any, ...], ...] | None:
+        with self._counter.paused():
+            wb = self.Workbooks(workbook_name)
+            rows = tuple(
+                (
+                    ws.Name,
+                    ws.Index,
+                    bool(ws.Visible),
+                    ws.UsedRange.Rows.Count,
+                    ws.UsedRange.Columns.Count,
+                )
+                for ws in wb.Worksheets
+            )
+        return rows or None
+
+    def _inventory_tables(
+        self, workbook_name: str, sheet_name: str
+    ) -> tuple[tuple[Any, ...], ...] | None:
+        with self._counter.paused():
+            wb = self.Workbooks(workbook_name)
+            rows = tuple(
+                (
+                    table.Name,
+                    ws.Name,
+                    table.Range.Address,
+                    "\x1f".join(column.Name for column in table.ListColumns),
+                    table.DataBodyRange.Rows.Count if table.DataBodyRange else 0,
+                    table.HeaderRowRange.Address,
+                )
+                for ws in wb.Worksheets
+                if not sheet_name or ws.Name.lower() == sheet_name.lower()
+                for table in ws.ListObjects
+            )
+        return rows or None
+
+    def _inventory_modules(self, workbook_name: str) -> tuple[tuple[Any, ...], ...]:
+        with self._counter.paused():
+            project = self.Workbooks(workbook_name).VBProject
+            return tuple(
+                (
+                    component.Name,
+                    component.Type,
+                    component.CodeModule.CountOfLines,
+                    component.Type == VBEXT_CT_CLASS_MODULE
+                    and component.Properties("PredeclaredId").Value,
+                )
+                for component in project.VBComponents
+            )
+
+    @property
+    def Workbooks(self) -> Workbooks:
+        return Workbooks(self)
+
+    @property
+    def ActiveWorkbook(self) -> Workbook | None:
+        return self._active
+
+    @property
+    def ActiveSheet(self) -> Worksheet | None:
+        return self._active._active_sheet if self._active else None
+
+    @property
+    def Hwnd(self) -> int:
+        return self._hwnd
+
+    def Run(self, Macro: str, *args: Any) -> Any:
+        func = self._find_macro(Macro)
+        try:
+            return func(*args)
+        except Exception as e:
+            description = str(e) or type(e).__name__
+            raise com_error(
+                HRESULT_EXCEPTION,
+                "Exception occurred.",
+                (0, "VBAProject", description, None, 0, HRESULT_EXCEL_ERROR),
+                None,
+            ) from e
+
+    def Intersect(self, Arg1: Range, Arg2: Range) -> Range | None:
+        if Arg1._sheet is not Arg2._sheet:
+            raise _error("Method 'Intersect' of object '_Application' failed")
+        a, b = Arg1._bounds(), Arg2._bounds()
+        if not _overlaps(a, b):
+            return None
+        top, left = max(a[0], b[0]), max(a[1], b[1])
+        bottom, right = min(a[2], b[2]), min(a[3], b[3])
+        return Range(Arg1._sheet, top, left, bottom - top + 1, right - left + 1)
+
+    def Calculate(self) -> None:
+        pass
+
+    def Quit(self) -> None:
+        self._quit = True
+        self._workbooks.clear()
+        self._active = None
+
+
+def fake_excel_manager(app: FakeExcel | None = None, **kwargs: Any) -> ExcelManager:
+    """Return a started ExcelManager connected to a FakeExcel.
+
+    Args:
+        app: Fake application to connect to (default: a new FakeExcel)
+        **kwargs: Extra ExcelManager arguments (e.g., visibility)
+
+    Returns:
+        ExcelManager whose ``app`` is the fake application
+
+    Example:
+        >>> mgr = fake_excel_manager(FakeExcel(latency=0.001))
+        >>> WorkbookManager(mgr).list()
+        []
+    """
+    from ..excel_manager import ExcelManager
+
+    app = app if app is not None else FakeExcel()
+    manager = ExcelManager(app_factory=lambda: app, **kwargs)
+    manager.start()
+    return manager
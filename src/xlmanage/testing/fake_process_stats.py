@@ -0,0 +1,53 @@
+"""
+Process-stats provider with scripted memory readings, for tests.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+
+
+class FakeProcessStats:
+    """Working-set provider simulating a leaking Excel process.
+
+    Stands in for xlmanage.recycle_policy.windows_working_set.  Each
+    sample returns ``baseline`` plus ``growth`` times the number of
+    samples taken since the last reset(), whatever the PID: FakeExcel
+    instances have no process of their own.
+
+    Example:
+        >>> stats = FakeProcessStats(baseline=100_000_000, growth=10_000_000)
+        >>> policy = RecyclePolicy(max_working_set=130_000_000, stats=stats)
+    """
+
+    def __init__(self, baseline: int = 0, growth: int = 0):
+        self.baseline = baseline
+        self.growth = growth
+        self.samples: list[tuple[int, int]] = []
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, pid: int) -> int:
+        with self._lock:
+            self._count += 1
+            working_set = self.baseline + self.growth * self._count
+            self.samples.append((pid, working_set))
+            return working_set
+
+    def reset(self) -> None:
+        """Start again from the baseline, as a fresh process would."""
+        with self._lock:
+            self._count = 0
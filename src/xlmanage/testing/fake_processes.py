@@ -0,0 +1,96 @@
+"""
+Simulated process table for testing process listing and termination.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+
+from ..exceptions import ExcelInstanceNotFoundError
+from ..process_backend import EXCEL_IMAGE
+
+
+class FakeProcessBackend:
+    """Simulated process table for xlmanage.process_backend.
+
+    Stands in for the native and subprocess backends.  ``processes``
+    maps each PID to its image name; terminate() removes the PID.
+    ``calls`` records each call as ("list_pids", image) or
+    ("terminate", pid), and ``latency`` delays each call, e.g. by the
+    cost of spawning tasklist, to compare the backends in benchmarks.
+
+    Example:
+        >>> backend = FakeProcessBackend.excel(100, 200)
+        >>> mgr = ExcelManager(process_backend=backend)
+        >>> mgr.force_kill(100)
+        >>> backend.list_pids()
+        [200]
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        processes: Mapping[int, str] | None = None,
+        *,
+        latency: float = 0.0,
+        protected: Iterable[int] = (),
+    ):
+        """Initialize the process table.
+
+        Args:
+            processes: PID -> image name
+            latency: Delay added to each call, in seconds
+            protected: PIDs whose termination is denied
+        """
+        self.processes = dict(processes or {})
+        self.latency = latency
+        self.protected = set(protected)
+        self.calls: list[tuple[str, object]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def excel(cls, *pids: int, latency: float = 0.0) -> "FakeProcessBackend":
+        """Process table with one EXCEL.EXE process per PID."""
+        return cls(dict.fromkeys(pids, EXCEL_IMAGE), latency=latency)
+
+    def list_pids(self, image: str = EXCEL_IMAGE) -> list[int]:
+        self._call("list_pids", image)
+        with self._lock:
+            return [
+                pid
+                for pid, name in self.processes.items()
+                if name.casefold() == image.casefold()
+            ]
+
+    def terminate(self, pid: int) -> None:
+        self._call("terminate", pid)
+        with self._lock:
+            if pid not in self.processes:
+                raise ExcelInstanceNotFoundError(
+                    str(pid), "Process not found or not running"
+                )
+            if pid in self.protected:
+                raise RuntimeError(f"Failed to kill process {pid}: Access denied")
+            del self.processes[pid]
+
+    def _call(self, name: str, argument: object) -> None:
+        with self._lock:
+            self.calls.append((name, argument))
+        if self.latency:
+            time.sleep(self.latency)
@@ -0,0 +1,74 @@
+"""
+Synthetic top-level windows for testing window enumeration.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from collections.abc import Iterable
+
+from ..window_enum import XLMAIN_CLASS
+
+
+class FakeWindowSource:
+    """Synthetic list of top-level windows for xlmanage.window_enum.
+
+    Stands in for Win32WindowSource.  Each window is a (hwnd, pid,
+    class name) tuple, reported in list order as EnumWindows reports
+    windows in Z-order.  ``calls`` counts the Win32 calls the
+    enumeration would have made (one EnumWindows pass, one class name
+    and one PID query per window looked at).
+
+    Example:
+        >>> source = FakeWindowSource.desktop(excel_pids=[100, 200], others=500)
+        >>> WindowEnumerator(source).xlmain_hwnds()
+        {100: 1, 200: 2}
+    """
+
+    def __init__(self, windows: Iterable[tuple[int, int, str]] = ()):
+        self.windows = list(windows)
+        self.calls = 0
+        self._index = {hwnd: (pid, name) for hwnd, pid, name in self.windows}
+
+    @classmethod
+    def desktop(
+        cls, excel_pids: Iterable[int] = (), others: int = 0
+    ) -> "FakeWindowSource":
+        """Build a desktop with one XLMAIN window per PID, then ``others``
+        windows of other processes.
+
+        Excel windows get handles 1, 2, ...; other windows the following
+        handles, owned by PIDs that are not in ``excel_pids``.
+        """
+        windows = [
+            (hwnd, pid, XLMAIN_CLASS) for hwnd, pid in enumerate(excel_pids, start=1)
+        ]
+        first = len(windows) + 1
+        windows += [
+            (hwnd, -hwnd, "Chrome_WidgetWin_1") for hwnd in range(first, first + others)
+        ]
+        return cls(windows)
+
+    def handles(self) -> list[int]:
+        self.calls += 1
+        return [hwnd for hwnd, _, _ in self.windows]
+
+    def class_name(self, hwnd: int) -> str:
+        self.calls += 1
+        return self._index[hwnd][1]
+
+    def process_id(self, hwnd: int) -> int:
+        self.calls += 1
+        return self._index[hwnd][0]
@@ -0,0 +1,364 @@
+"""
+Workbook inventory in one Application.Run call, through a VBA helper module.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Literal, TypeVar, overload
+
+try:
+    from win32com.client import CDispatch
+except ImportError:
+    CDispatch = Any
+
+from .table_manager import TableInfo
+from .vba_manager import (
+    VBA_TYPE_NAMES,
+    VBEXT_CT_STD_MODULE,
+    VBAModuleInfo,
+    _get_vba_project,
+)
+from .worksheet_manager import WorksheetInfo
+
+if TYPE_CHECKING:
+    from .excel_manager import ExcelManager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Name of the standard module holding the helper functions
+HELPER_MODULE_NAME: str = "xlManageInventory"
+
+# Separator of the column names of a table in one cell (Chr(31), unit
+# separator), which cannot appear in a header typed in Excel
+COLUMN_SEPARATOR: str = "\x1f"
+
+# Each function returns one row per object as a 1-based 2D array, or Empty
+# when there is nothing to list.  Late binding (As Object) keeps the module
+# free of any reference to the VBA extensibility library.
+HELPER_SOURCE: str = """\
+Option Explicit
+
+' Injected by xlManage: one Application.Run call returns a whole inventory
+
+Public Function XlmSheets(ByVal workbookName As String) As Variant
+    Dim wb As Workbook, ws As Worksheet, result() As Variant, i As Long
+    Set wb = Workbooks(workbookName)
+    If wb.Worksheets.Count = 0 Then Exit Function
+    ReDim result(1 To wb.Worksheets.Count, 1 To 5)
+    For Each ws In wb.Worksheets
+        i = i + 1
+        result(i, 1) = ws.Name
+        result(i, 2) = ws.Index
+        result(i, 3) = (ws.Visible = xlSheetVisible)
+        result(i, 4) = ws.UsedRange.Rows.Count
+        result(i, 5) = ws.UsedRange.Columns.Count
+    Next ws
+    XlmSheets = result
+End Function
+
+Public Function XlmTables(ByVal workbookName As String, _
+                          ByVal sheetName As String) As Variant
+    Dim wb As Workbook, ws As Worksheet, lo As ListObject, lc As ListColumn
+    Dim result() As Variant, total As Long, i As Long, headers As String
+    Set wb = Workbooks(workbookName)
+    For Each ws In wb.Worksheets
+        If sheetName = "" Or StrComp(ws.Name, sheetName, vbTextCompare) = 0 Then
+            total = total + ws.ListObjects.Count
+        End If
+    Next ws
+    If total = 0 Then Exit Function
+    ReDim result(1 To total, 1 To 6)
+    For Each ws In wb.Worksheets
+        If sheetName = "" Or StrComp(ws.Name, sheetName, vbTextCompare) = 0 Then
+            For Each lo In ws.ListObjects
+                i = i + 1
+                headers = ""
+                For Each lc In lo.ListColumns
+                    If Len(headers) > 0 Then headers = headers & Chr(31)
+                    headers = headers & lc.Name
+                Next lc
+                result(i, 1) = lo.Name
+                result(i, 2) = ws.Name
+                result(i, 3) = lo.Range.Address
+                result(i, 4) = headers
+                result(i, 5) = 0
+                If Not lo.DataBodyRange Is Nothing Then
+                    result(i, 5) = lo.DataBodyRange.Rows.Count
+                End If
+                result(i, 6) = lo.HeaderRowRange.Address
+            Next lo
+        End If
+    Next ws
+    XlmTables = result
+End Function
+
+Public Function XlmModules(ByVal workbookName As String) As Variant
+    Dim project As Object, component As Object, result() As Variant, i As Long
+    Set project = Workbooks(workbookName).VBProject
+    ReDim result(1 To project.VBComponents.Count, 1 To 4)
+    For Each component In project.VBComponents
+        i = i + 1
+        result(i, 1) = component.Name
+        result(i, 2) = component.Type
+        result(i, 3) = component.CodeModule.CountOfLines
+        result(i, 4) = False
+        If component.Type = 2 Then
+            On Error Resume Next
+            result(i, 4) = component.Properties("PredeclaredId").Value
+            On Error GoTo 0
+        End If
+    Next component
+    XlmModules = result
+End Function
+"""
+
+
+class InventoryHelper:
+    """Lists worksheets, tables and VBA modules in one cross-process call.
+
+    The per-object path of the managers costs several COM calls per
+    worksheet, table or module.  The helper instead runs a VBA function
+    inside Excel that returns the whole inventory as one 2D array, so a
+    listing costs the same whatever the size of the workbook.
+
+    The helper module lives either:
+
+    * in the target workbook, injected for the call then removed
+      (``host=None``): about ten COM calls, needs the VBA project to be
+      trusted and the workbook to accept macros (.xlsm, .xlsb, .xls);
+    * in a host workbook kept open, such as PERSONAL.XLSB or an add-in
+      (``host="PERSONAL.XLSB"``): installed on first use and left there,
+      one Application.Run call per listing, for any target workbook.
+
+    Every method returns None when the helper cannot run (VBA access not
+    trusted, .xlsx workbook, macros disabled...), in which case the
+    caller falls back to the per-object path.
+
+    Example:
+        >>> helper = InventoryHelper(excel_mgr, host="PERSONAL.XLSB")
+        >>> sheets = helper.sheets(wb)
+        >>> if sheets is None:
+        ...     sheets = ...  # per-object path
+    """
+
+    def __init__(self, excel_manager: "ExcelManager", host: str | None = None):
+        self._mgr = excel_manager
+        self._host = host
+
+    @property
+    def host(self) -> str | None:
+        """Name of the workbook hosting the helper, None for injection."""
+        return self._host
+
+    def sheets(self, wb: CDispatch) -> list[WorksheetInfo] | None:
+        """List the worksheets of a workbook.
+
+        Args:
+            wb: Workbook COM object
+
+        Returns:
+            List of WorksheetInfo, or None if the helper cannot run
+        """
+        return self._list(
+            wb,
+            "XlmSheets",
+            (),
+            lambda row: WorksheetInfo(
+                name=row[0],
+                index=int(row[1]),
+                visible=bool(row[2]),
+                rows_used=int(row[3]),
+                columns_used=int(row[4]),
+            ),
+        )
+
+    def tables(
+        self, wb: CDispatch, worksheet: str | None = None
+    ) -> list[TableInfo] | None:
+        """List the tables of a workbook or of one of its worksheets.
+
+        Args:
+            wb: Workbook COM object
+            worksheet: Worksheet name (case-insensitive), None for all
+
+        Returns:
+            List of TableInfo, or None if the helper cannot run
+        """
+        return self._list(
+            wb,
+            "XlmTables",
+            (worksheet or "",),
+            lambda row: TableInfo(
+                name=row[0],
+                worksheet_name=row[1],
+                range_address=row[2],
+                columns=row[3].split(COLUMN_SEPARATOR) if row[3] else [],
+                rows_count=int(row[4]),
+                header_row=row[5],
+            ),
+        )
+
+    def modules(self, wb: CDispatch) -> list[VBAModuleInfo] | None:
+        """List the VBA modules of a workbook, except the helper module.
+
+        Args:
+            wb: Workbook COM object
+
+        Returns:
+            List of VBAModuleInfo, or None if the helper cannot run
+        """
+        modules = self._list(
+            wb,
+            "XlmModules",
+            (),
+            lambda row: VBAModuleInfo(
+                name=row[0],
+                module_type=VBA_TYPE_NAMES.get(int(row[1]), "unknown"),
+                lines_count=int(row[2]),
+                has_predeclared_id=bool(row[3]),
+            ),
+        )
+        if modules is None:
+            return None
+        return [module for module in modules if module.name != HELPER_MODULE_NAME]
+
+    def _list(
+        self,
+        wb: CDispatch,
+        function: str,
+        args: tuple[Any, ...],
+        make: Callable[[tuple[Any, ...]], T],
+    ) -> list[T] | None:
+        try:
+            if self._host is None:
+                rows = self._run_injected(wb, function, args)
+            else:
+                rows = self._run_hosted(wb, function, args)
+            # Empty (nothing to list) comes back as None
+            return [make(row) for row in rows or ()]
+        except Exception:
+            logger.info(
+                "Inventory helper unavailable, listing object by object", exc_info=True
+            )
+            return None
+
+    def _run_injected(self, wb: CDispatch, function: str, args: tuple[Any, ...]) -> Any:
+        """Inject the helper in the target workbook, run it, remove it."""
+        name = wb.Name
+        project = _get_vba_project(wb)
+        saved = wb.Saved
+        components = project.VBComponents
+        component = components.Add(VBEXT_CT_STD_MODULE)
+        added = True
+        try:
+            try:
+                component.Name = HELPER_MODULE_NAME
+            except Exception:
+                # Left over by an interrupted run or installed on purpose:
+                # refresh its code and keep it
+                components.Remove(component)
+                added = False
+                component = components(HELPER_MODULE_NAME)
+                _clear_code(component)
+            component.CodeModule.AddFromString(HELPER_SOURCE)
+            return self._mgr.app.Run(
+                f"'{name}'!{HELPER_MODULE_NAME}.{function}", name, *args
+            )
+        finally:
+            try:
+                if added:
+                    components.Remove(component)
+            finally:
+                # The module was added and removed: nothing to save
+                wb.Saved = saved
+
+    def _run_hosted(self, wb: CDispatch, function: str, args: tuple[Any, ...]) -> Any:
+        """Run the helper of the host workbook, installing it if missing."""
+        app = self._mgr.app
+        macro = f"'{self._host}'!{HELPER_MODULE_NAME}.{function}"
+        name = wb.Name
+        try:
+            return app.Run(macro, name, *args)
+        except Exception:
+            # Missing or out of date: (re)install it, then retry once
+            self.install()
+            return app.Run(macro, name, *args)
+
+    def install(self) -> None:
+        """Install or update the helper module in the host workbook.
+
+        The host is left unsaved: save it (e.g. when closing Excel) to
+        keep the helper for the next sessions.
+
+        Raises:
+            ValueError: If the helper has no host workbook
+            VBAProjectAccessError: If the VBA project is not trusted
+            VBAWorkbookFormatError: If the host is an .xlsx workbook
+        """
+        if self._host is None:
+            raise ValueError("The inventory helper has no host workbook")
+        project = _get_vba_project(self._mgr.app.Workbooks(self._host))
+        components = project.VBComponents
+        try:
+            component = components(HELPER_MODULE_NAME)
+            _clear_code(component)
+        except Exception:
+            component = components.Add(VBEXT_CT_STD_MODULE)
+            component.Name = HELPER_MODULE_NAME
+        component.CodeModule.AddFromString(HELPER_SOURCE)
+
+
+def _clear_code(component: CDispatch) -> None:
+    """Delete every line of a component's code."""
+    code = component.CodeModule
+    count = code.CountOfLines
+    if count:
+        code.DeleteLines(1, count)
+
+
+@overload
+def inventory_helper(excel_manager: "ExcelManager", helper: Literal[False]) -> None: ...
+
+
+@overload
+def inventory_helper(
+    excel_manager: "ExcelManager", helper: Literal[True] | str
+) -> InventoryHelper: ...
+
+
+def inventory_helper(
+    excel_manager: "ExcelManager", helper: bool | str
+) -> InventoryHelper | None:
+    """Build the inventory helper selected by a manager's ``helper`` option.
+
+    Args:
+        excel_manager: ExcelManager the managers run on
+        helper: False for the per-object path, True to inject the helper
+            in the target workbook, or the name of the open workbook or
+            add-in hosting it (e.g. "PERSONAL.XLSB")
+
+    Returns:
+        InventoryHelper, or None for the per-object path
+    """
+    if not helper:
+        return None
+    return InventoryHelper(
+        excel_manager, host=helper if isinstance(helper, str) else None
+    )
@@ -24,9 +24,16 @@ import tempfile
 import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
-import pywintypes
-from win32com.client import CDispatch
+try:
+    import pywintypes
+    from win32com.client import CDispatch
+except ImportError:
+    # Without pywin32 (e.g., Linux CI), use the stand-in COM error type,
+    # also raised by the in-memory backend of xlmanage.testing
+    CDispatch = Any
+    from . import _compat as pywintypes
 
 from .excel_manager import ExcelManager
 from .exceptions import (
@@ -35,6 +42,7 @@ from .exceptions import (
     VBAProjectAccessError,
     VBAWorkbookFormatError,
 )
+from .workbook_index import workbook_index
 
 logger = logging.getLogger(__name__)
 
@@ -641,7 +649,7 @@ class VBAManager:
             # Résoudre le classeur cible
             from .worksheet_manager import _resolve_workbook
 
-            wb = _resolve_workbook(self.app, workbook)
+            wb = _resolve_workbook(self.app, workbook, workbook_index(self._mgr))
 
             # Accéder au VBProject (raise si Trust Center bloque)
             vb_project = _get_vba_project(wb)
@@ -923,7 +931,7 @@ class VBAManager:
         # Résoudre le classeur
         from .worksheet_manager import _resolve_workbook
 
-        wb = _resolve_workbook(self.app, workbook)
+        wb = _resolve_workbook(self.app, workbook, workbook_index(self._mgr))
 
         # Accéder au VBProject
         vb_project = _get_vba_project(wb)
@@ -1032,7 +1040,9 @@ class VBAManager:
 
         return output_file
 
-    def list_modules(self, workbook: Path | None = None) -> list[VBAModuleInfo]:
+    def list_modules(
+        self, workbook: Path | None = None, helper: bool | str = False
+    ) -> list[VBAModuleInfo]:
         """Liste tous les modules VBA du classeur.
 
         Inclut tous les types de modules : standard, classe, UserForms,
@@ -1040,6 +1050,10 @@ class VBAManager:
 
         Args:
             workbook: Classeur à analyser. Si None, utilise le classeur actif
+            helper: Lire la liste en un seul appel via le module VBA
+                d'inventaire (True : injecté dans le classeur, ou nom du
+                classeur qui l'héberge, ex. "PERSONAL.XLSB").  Repli sur
+                la lecture module par module s'il ne peut pas s'exécuter
 
         Returns:
             list[VBAModuleInfo]: Liste des modules avec leurs informations
@@ -1059,7 +1073,14 @@ class VBAManager:
         # Résoudre le classeur
         from .worksheet_manager import _resolve_workbook
 
-        wb = _resolve_workbook(self.app, workbook)
+        wb = _resolve_workbook(self.app, workbook, workbook_index(self._mgr))
+
+        if helper:
+            from .vba_inventory import inventory_helper
+
+            listed = inventory_helper(self._mgr, helper).modules(wb)
+            if listed is not None:
+                return listed
 
         # Accéder au VBProject
         vb_project = _get_vba_project(wb)
@@ -1126,7 +1147,7 @@ class VBAManager:
         # Résoudre le classeur
         from .worksheet_manager import _resolve_workbook
 
-        wb = _resolve_workbook(self.app, workbook)
+        wb = _resolve_workbook(self.app, workbook, workbook_index(self._mgr))
 
         # Accéder au VBProject
         vb_project = _get_vba_project(wb)
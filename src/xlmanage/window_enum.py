@@ -0,0 +1,142 @@
+"""
+Top-level window enumeration mapping Excel processes to their main window.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import ctypes
+import ctypes.wintypes
+from collections.abc import Iterable
+from typing import Protocol
+
+# Window class of Excel's main window
+XLMAIN_CLASS = "XLMAIN"
+
+# Longest class name read by GetClassNameW
+_CLASS_NAME_LENGTH = 256
+
+
+class WindowSource(Protocol):
+    """Access to the top-level windows of the desktop.
+
+    Win32WindowSource reads the real windows; xlmanage.testing provides
+    FakeWindowSource, a synthetic window list, to test and benchmark
+    the enumeration without Windows.
+    """
+
+    def handles(self) -> Iterable[int]:
+        """Return the handles (HWND) of all top-level windows."""
+        ...
+
+    def class_name(self, hwnd: int) -> str:
+        """Return the window class name of a window."""
+        ...
+
+    def process_id(self, hwnd: int) -> int:
+        """Return the PID of the process owning a window."""
+        ...
+
+
+class Win32WindowSource:
+    """Top-level windows read through EnumWindows, GetClassNameW and
+    GetWindowThreadProcessId."""
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+
+    def handles(self) -> list[int]:
+        """Return the handles of all top-level windows (EnumWindows)."""
+        hwnds: list[int] = []
+
+        @ctypes.WINFUNCTYPE(
+            ctypes.wintypes.BOOL,
+            ctypes.wintypes.HWND,
+            ctypes.wintypes.LPARAM,
+        )
+        def _enum_callback(hwnd, _lparam):
+            hwnds.append(hwnd)
+            return True  # Continue enumeration
+
+        self._user32.EnumWindows(_enum_callback, 0)
+        return hwnds
+
+    def class_name(self, hwnd: int) -> str:
+        """Return the window class name (GetClassNameW)."""
+        buffer = ctypes.create_unicode_buffer(_CLASS_NAME_LENGTH)
+        self._user32.GetClassNameW(hwnd, buffer, _CLASS_NAME_LENGTH)
+        return buffer.value
+
+    def process_id(self, hwnd: int) -> int:
+        """Return the owning PID (GetWindowThreadProcessId)."""
+        process_id = ctypes.c_ulong()
+        self._user32.GetWindowThreadProcessId(hwnd, ctypes.byref(process_id))
+        return process_id.value
+
+
+class WindowEnumerator:
+    """Maps Excel PIDs to their main window (class XLMAIN) in one pass.
+
+    Resolving a PID used to walk every top-level window; resolving N
+    PIDs walked them N times.  xlmain_hwnds() walks them once and
+    returns the window of every Excel process, so callers resolving
+    several PIDs build the map once and look each PID up in it.
+
+    The class name is checked before the PID: most windows are not
+    Excel's, and a single call rules them out.
+
+    Example:
+        >>> hwnds = WindowEnumerator().xlmain_hwnds()
+        >>> for pid in enumerate_excel_pids():
+        ...     app = connect_by_pid(pid, hwnd_map=hwnds)
+    """
+
+    def __init__(self, source: WindowSource | None = None):
+        """Initialize an enumerator.
+
+        Args:
+            source: Window source (default: Win32WindowSource).  Pass a
+                xlmanage.testing.FakeWindowSource to run without Windows.
+        """
+        self._source = source
+
+    def xlmain_hwnds(self) -> dict[int, int]:
+        """Map each Excel PID to its main window handle.
+
+        Windows are visited in Z-order; a process owning several XLMAIN
+        windows is mapped to the first one, the one EnumWindows reports
+        first.
+
+        Returns:
+            dict[int, int]: PID -> HWND of its XLMAIN window
+        """
+        source = self._source or Win32WindowSource()
+        hwnds: dict[int, int] = {}
+        for hwnd in source.handles():
+            if source.class_name(hwnd) != XLMAIN_CLASS:
+                continue
+            hwnds.setdefault(source.process_id(hwnd), hwnd)
+        return hwnds
+
+    def find(self, pid: int) -> int | None:
+        """Find the main window of one process.
+
+        Args:
+            pid: Process ID of the target Excel instance
+
+        Returns:
+            int | None: Window handle if found, None otherwise
+        """
+        return self.xlmain_hwnds().get(pid)
@@ -0,0 +1,211 @@
+"""
+Name-indexed lookup of the workbooks open in an Excel instance.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    from win32com.client import CDispatch
+except ImportError:
+    CDispatch = Any
+
+
+def _path_key(path: str | Path) -> str:
+    """Normalise a workbook path the way Windows compares paths."""
+    return os.path.normcase(str(Path(path).resolve()))
+
+
+class WorkbookIndex:
+    """FullName and Name -> Workbook lookup table of one Excel instance.
+
+    The index is built in a single pass over ``app.Workbooks`` and then
+    kept up to date by WorkbookManager (open, create, save as, close), so
+    resolving a workbook no longer reads FullName and Name of every open
+    workbook.  Workbooks opened or closed behind xlManage's back (by the
+    user or another script) are detected by a cheap probe on each lookup:
+
+    * ``Workbooks.Count`` must match the number of indexed workbooks,
+    * the Name of the workbook found must still be readable and unchanged,
+    * a path missing from the index triggers one rebuild before being
+      reported as missing (e.g. after a SaveAs made outside xlManage),
+      unless the caller only checks that the path is free
+      (``rescan_on_miss=False``).
+
+    When a probe fails the index is rebuilt.  An ExcelManager owns one
+    index, shared by every manager built on it.
+
+    Example:
+        >>> index = WorkbookIndex()
+        >>> wb = index.find(app, Path("C:/data/sales.xlsx"))  # builds
+        >>> wb = index.find(app, Path("C:/data/sales.xlsx"))  # 3 COM calls
+    """
+
+    def __init__(self) -> None:
+        self._by_path: dict[str, tuple[CDispatch, str]] = {}
+        self._by_name: dict[str, tuple[CDispatch, str]] = {}
+        self._count: int | None = None
+
+    @property
+    def is_built(self) -> bool:
+        """Whether the index holds the workbooks of the instance."""
+        return self._count is not None
+
+    def __len__(self) -> int:
+        return self._count or 0
+
+    def invalidate(self) -> None:
+        """Forget every workbook; the next lookup rebuilds the index."""
+        self._by_path.clear()
+        self._by_name.clear()
+        self._count = None
+
+    def rebuild(self, app: CDispatch) -> None:
+        """Index the workbooks open in an Excel instance.
+
+        Workbooks whose FullName or Name cannot be read are counted but
+        not indexed, as they were skipped by the linear search.
+
+        Args:
+            app: Excel Application COM object
+        """
+        self.invalidate()
+        count = 0
+        for wb in app.Workbooks:
+            count += 1
+            try:
+                self._store(wb, wb.FullName, wb.Name)
+            except Exception:
+                continue
+        self._count = count
+
+    def _store(self, wb: CDispatch, full_name: str, name: str) -> None:
+        entry = (wb, name)
+        self._by_path.setdefault(_path_key(full_name), entry)
+        self._by_name.setdefault(name.lower(), entry)
+
+    def add(self, wb: CDispatch, full_name: str, name: str) -> None:
+        """Record a workbook just opened or created through xlManage.
+
+        Args:
+            wb: Workbook COM object
+            full_name: Its FullName
+            name: Its Name
+        """
+        if self._count is None:
+            return
+        self._store(wb, full_name, name)
+        self._count += 1
+
+    def remove(self, wb: CDispatch) -> None:
+        """Forget a workbook just closed through xlManage.
+
+        Args:
+            wb: Workbook COM object, as returned by find()
+        """
+        if self._count is None:
+            return
+        if self._discard(wb):
+            self._count -= 1
+        else:
+            self.invalidate()
+
+    def rename(self, wb: CDispatch, full_name: str, name: str) -> None:
+        """Re-index a workbook saved under another path (SaveAs).
+
+        Args:
+            wb: Workbook COM object, as returned by find()
+            full_name: FullName after SaveAs
+            name: Name after SaveAs
+        """
+        if self._count is None:
+            return
+        if self._discard(wb):
+            self._store(wb, full_name, name)
+        else:
+            self.invalidate()
+
+    def _discard(self, wb: CDispatch) -> bool:
+        """Drop the entries of a workbook; return whether it was indexed."""
+        found = False
+        for table in (self._by_path, self._by_name):
+            for key in [key for key, entry in table.items() if entry[0] is wb]:
+                del table[key]
+                found = True
+        return found
+
+    def _get(self, path: Path) -> tuple[CDispatch, str] | None:
+        entry = self._by_path.get(_path_key(path))
+        if entry is None:
+            entry = self._by_name.get(path.name.lower())
+        return entry
+
+    def find(
+        self, app: CDispatch, path: Path, rescan_on_miss: bool = True
+    ) -> CDispatch | None:
+        """Find an open workbook by path, then by file name.
+
+        Same matching rules as workbook_manager._find_open_workbook():
+        resolved FullName first, then case-insensitive Name.
+
+        Args:
+            app: Excel Application COM object
+            path: Path to the workbook to find
+            rescan_on_miss: Rebuild the index before reporting a path
+                missing from an up-to-date index
+
+        Returns:
+            Workbook COM object if found, None otherwise
+        """
+        for _ in range(2):
+            fresh = self._count is None or app.Workbooks.Count != self._count
+            if fresh:
+                self.rebuild(app)
+
+            entry = self._get(path)
+            if entry is None:
+                if fresh or not rescan_on_miss:
+                    return None
+                self.invalidate()
+                continue
+
+            wb, name = entry
+            try:
+                if wb.Name == name:
+                    return wb
+            except Exception:
+                # Closed outside xlManage: the COM object is disconnected
+                pass
+            self.invalidate()
+
+        return None
+
+
+def workbook_index(excel_manager: Any) -> WorkbookIndex | None:
+    """Return the workbook index of an ExcelManager.
+
+    Args:
+        excel_manager: ExcelManager, or a stand-in object (e.g. a mock)
+
+    Returns:
+        The manager's WorkbookIndex, or None if it has none, in which case
+        callers fall back to a linear search of the open workbooks
+    """
+    index = getattr(excel_manager, "workbook_index", None)
+    return index if isinstance(index, WorkbookIndex) else None
@@ -17,6 +17,7 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import builtins
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -33,6 +34,8 @@ from .exceptions import (
     WorkbookNotFoundError,
     WorkbookSaveError,
 )
+from .metadata_index import MetadataIndex
+from .workbook_index import workbook_index
 
 # Excel file format constants
 # See: https://learn.microsoft.com/en-us/office/vba/api/excel.xlfileformat
@@ -165,6 +168,27 @@ class WorkbookManager:
         """
         self._mgr = excel_manager
 
+    def _find(
+        self, app: CDispatch, path: Path, rescan_on_miss: bool = True
+    ) -> CDispatch | None:
+        """Find an open workbook through the ExcelManager's workbook index."""
+        index = workbook_index(self._mgr)
+        if index is not None:
+            return index.find(app, path, rescan_on_miss)
+        return _find_open_workbook(app, path)
+
+    def _index_add(self, wb: CDispatch, info: WorkbookInfo) -> None:
+        """Record a workbook just opened or created in the workbook index."""
+        index = workbook_index(self._mgr)
+        if index is not None:
+            index.add(wb, str(info.full_path), info.name)
+
+    def _forget_metadata(self, wb: CDispatch) -> None:
+        """Drop the cached worksheets and tables of a workbook."""
+        index = getattr(self._mgr, "metadata_index", None)
+        if isinstance(index, MetadataIndex):
+            index.discard(wb)
+
     def open(
         self,
         path: Path,
@@ -206,7 +230,8 @@ class WorkbookManager:
 
         # Step 2: Check if already open
         app = self._mgr.app  # Will raise if Excel not started
-        existing_wb = _find_open_workbook(app, path)
+        # A miss is the expected outcome here: do not rescan for it
+        existing_wb = self._find(app, path, rescan_on_miss=False)
         if existing_wb is not None:
             raise WorkbookAlreadyOpenError(
                 path,
@@ -234,6 +259,7 @@ class WorkbookManager:
                 saved=wb.Saved,
                 sheets_count=wb.Worksheets.Count,
             )
+            self._index_add(wb, info)
 
             return info
 
@@ -321,6 +347,7 @@ class WorkbookManager:
                     saved=wb.Saved,
                     sheets_count=wb.Worksheets.Count,
                 )
+                self._index_add(wb, info)
                 return info
 
             except Exception as e:
@@ -386,7 +413,7 @@ class WorkbookManager:
         app = self._mgr.app
 
         # Step 1: Find the open workbook
-        wb = _find_open_workbook(app, path)
+        wb = self._find(app, path)
         if wb is None:
             raise WorkbookNotFoundError(
                 path,
@@ -399,7 +426,11 @@ class WorkbookManager:
 
         try:
             # Step 3: Close the workbook
+            self._forget_metadata(wb)
             wb.Close(SaveChanges=save)
+            index = workbook_index(self._mgr)
+            if index is not None:
+                index.remove(wb)
 
             # Step 4: Clean up COM reference
             del wb
@@ -442,7 +473,7 @@ class WorkbookManager:
         app = self._mgr.app
 
         # Step 1: Find the open workbook
-        wb = _find_open_workbook(app, path)
+        wb = self._find(app, path)
         if wb is None:
             raise WorkbookNotFoundError(
                 path,
@@ -468,8 +499,12 @@ class WorkbookManager:
                 # Convert to absolute path
                 abs_path = str(output.resolve())
 
-                # Save with format
+                # Save with format (metadata is keyed by FullName)
+                self._forget_metadata(wb)
                 wb.SaveAs(abs_path, FileFormat=file_format)
+                index = workbook_index(self._mgr)
+                if index is not None:
+                    index.rename(wb, abs_path, output.name)
 
         except WorkbookSaveError:
             # Re-raise our exceptions
@@ -488,7 +523,7 @@ class WorkbookManager:
                     message=f"Failed to save workbook: {str(e)}",
                 ) from e
 
-    def list(self) -> list[WorkbookInfo]:
+    def list(self) -> builtins.list[WorkbookInfo]:
         """List all open workbooks.
 
         Returns information about all workbooks currently open
@@ -17,8 +17,10 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import builtins
 import re
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -29,8 +31,12 @@ except ImportError:
 
 try:
     from .exceptions import WorksheetNameError
+    from .metadata_index import WorkbookMetadata, workbook_metadata
+    from .workbook_index import WorkbookIndex, workbook_index
 except ImportError:
     from xlmanage.exceptions import WorksheetNameError
+    from xlmanage.metadata_index import WorkbookMetadata, workbook_metadata
+    from xlmanage.workbook_index import WorkbookIndex, workbook_index
 
 if TYPE_CHECKING:
     from .excel_manager import ExcelManager
@@ -40,10 +46,30 @@ SHEET_NAME_MAX_LENGTH: int = 31
 SHEET_NAME_FORBIDDEN_CHARS: str = r"\\/*?:\[\]"
 
 
+# Attributes of WorksheetInfo that WorksheetManager.list() can select
+WORKSHEET_FIELDS: tuple[str, ...] = (
+    "name",
+    "index",
+    "visible",
+    "rows_used",
+    "columns_used",
+)
+
+# Range.Find() arguments of the last-cell probe
+_XL_FORMULAS = -4123  # xlFormulas: cells holding a value or a formula
+_XL_PART = 2  # xlPart
+_XL_BY_ROWS = 1  # xlByRows
+_XL_BY_COLUMNS = 2  # xlByColumns
+_XL_NEXT = 1  # xlNext
+_XL_PREVIOUS = 2  # xlPrevious
+
+
 @dataclass
 class WorksheetInfo:
     """Information about an Excel worksheet.
 
+    Attributes left out by WorksheetManager.list(fields=...) are None.
+
     Attributes:
         name: Name of the worksheet (e.g., "Sheet1")
         index: Position in the workbook (1-based as in Excel)
@@ -53,10 +79,34 @@ class WorksheetInfo:
     """
 
     name: str
-    index: int
-    visible: bool
-    rows_used: int
-    columns_used: int
+    index: int | None
+    visible: bool | None
+    rows_used: int | None
+    columns_used: int | None
+
+
+def _select_fields(fields: Iterable[str] | None) -> frozenset[str]:
+    """Validate a selection of WorksheetInfo attributes.
+
+    Args:
+        fields: Names from WORKSHEET_FIELDS, or None for all of them
+
+    Returns:
+        Selected names, always including "name"
+
+    Raises:
+        ValueError: If a name is not in WORKSHEET_FIELDS
+    """
+    if fields is None:
+        return frozenset(WORKSHEET_FIELDS)
+    selected = frozenset(fields)
+    unknown = selected.difference(WORKSHEET_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown worksheet field(s): {', '.join(sorted(unknown))} "
+            f"(expected: {', '.join(WORKSHEET_FIELDS)})"
+        )
+    return selected | {"name"}
 
 
 def _validate_sheet_name(name: str) -> None:
@@ -97,7 +147,9 @@ def _validate_sheet_name(name: str) -> None:
         )
 
 
-def _resolve_workbook(app: CDispatch, workbook: Path | None) -> CDispatch:
+def _resolve_workbook(
+    app: CDispatch, workbook: Path | None, index: WorkbookIndex | None = None
+) -> CDispatch:
     """Resolve the target workbook.
 
     If workbook is provided, finds or opens that specific workbook.
@@ -107,6 +159,8 @@ def _resolve_workbook(app: CDispatch, workbook: Path | None) -> CDispatch:
         app: Excel Application COM object
         workbook: Optional path to a specific workbook.
                   If None, uses the active workbook.
+        index: Workbook index of the ExcelManager, used instead of
+               scanning the open workbooks when given.
 
     Returns:
         Workbook COM object
@@ -153,7 +207,10 @@ def _resolve_workbook(app: CDispatch, workbook: Path | None) -> CDispatch:
         from .exceptions import WorkbookNotFoundError
         from .workbook_manager import _find_open_workbook
 
-        wb = _find_open_workbook(app, workbook)
+        if index is not None:
+            wb = index.find(app, workbook)
+        else:
+            wb = _find_open_workbook(app, workbook)
         if wb is None:
             raise WorkbookNotFoundError(
                 workbook, f"Workbook is not open: {workbook.name}"
@@ -161,7 +218,12 @@ def _resolve_workbook(app: CDispatch, workbook: Path | None) -> CDispatch:
         return wb
 
 
-def _find_worksheet(wb: CDispatch, name: str) -> CDispatch | None:
+def _find_worksheet(
+    wb: CDispatch,
+    name: str,
+    metadata: WorkbookMetadata | None = None,
+    rescan_on_miss: bool = True,
+) -> CDispatch | None:
     """Find a worksheet by name in a workbook.
 
     Searches for a worksheet with the given name.
@@ -170,6 +232,11 @@ def _find_worksheet(wb: CDispatch, name: str) -> CDispatch | None:
     Args:
         wb: Workbook COM object to search in
         name: Name of the worksheet to find
+        metadata: Metadata of the workbook, used instead of scanning
+                  the worksheets when given.
+        rescan_on_miss: With metadata, rescan the workbook before
+                  reporting a missing name. False suits checks that a
+                  name is free, which Excel enforces anyway.
 
     Returns:
         Worksheet COM object if found, None otherwise
@@ -186,6 +253,9 @@ def _find_worksheet(wb: CDispatch, name: str) -> CDispatch | None:
         Excel worksheet names are case-insensitive but case-preserving.
         "Sheet1" and "SHEET1" refer to the same worksheet.
     """
+    if metadata is not None:
+        return metadata.find_worksheet(wb, name, rescan_on_miss)
+
     # Normalize search name to lowercase
     search_name = name.lower()
 
@@ -202,6 +272,79 @@ def _find_worksheet(wb: CDispatch, name: str) -> CDispatch | None:
     return None
 
 
+def _used_dimensions(
+    ws: CDispatch, rows: bool = True, columns: bool = True
+) -> tuple[int | None, int | None]:
+    """Count the rows and columns of the used range of a worksheet.
+
+    UsedRange makes Excel scan the worksheet, which is slow on large or
+    heavily formatted sheets: it is read once for both counts, and only
+    when one of them is wanted.
+
+    Args:
+        ws: Worksheet COM object
+        rows: Count the rows
+        columns: Count the columns
+
+    Returns:
+        Tuple of (rows, columns); None for a count not asked for, 0 if
+        UsedRange fails (empty sheet)
+    """
+    try:
+        # Get used range to count rows/columns
+        used_range = ws.UsedRange
+        if used_range is None:
+            return (0 if rows else None, 0 if columns else None)
+        return (
+            used_range.Rows.Count if rows else None,
+            used_range.Columns.Count if columns else None,
+        )
+    except Exception:
+        # If UsedRange fails (empty sheet), default to 0
+        return (0 if rows else None, 0 if columns else None)
+
+
+def _probe_dimensions(ws: CDispatch) -> tuple[int, int]:
+    """Count the rows and columns spanned by the non-empty cells.
+
+    Cheaper alternative to UsedRange: Range.Find("*") only visits the
+    cells holding a value or a formula, whereas UsedRange also covers
+    formatted cells and makes Excel recompute the used range.  Searching
+    backward from A1 wraps around to the last cell by rows (or by
+    columns); searching forward from that cell wraps around to the first.
+
+    Args:
+        ws: Worksheet COM object
+
+    Returns:
+        Tuple of (rows, columns); (0, 0) for a worksheet without values
+    """
+    cells = ws.Cells
+
+    def find(order: int, direction: int, after: CDispatch = None) -> CDispatch:
+        # Without After, the search starts from the top-left cell
+        start = {} if after is None else {"After": after}
+        return cells.Find(
+            "*",
+            **start,
+            LookIn=_XL_FORMULAS,
+            LookAt=_XL_PART,
+            SearchOrder=order,
+            SearchDirection=direction,
+        )
+
+    last_by_rows = find(_XL_BY_ROWS, _XL_PREVIOUS)
+    if last_by_rows is None:
+        return 0, 0
+    last_by_columns = find(_XL_BY_COLUMNS, _XL_PREVIOUS)
+    first_row = find(_XL_BY_ROWS, _XL_NEXT, last_by_rows).Row
+    first_column = find(_XL_BY_COLUMNS, _XL_NEXT, last_by_columns).Column
+    return (
+        last_by_rows.Row - first_row + 1,
+        last_by_columns.Column - first_column + 1,
+    )
+
+
 class WorksheetManager:
     """Manager for Excel worksheet CRUD operations.
 
@@ -225,11 +368,15 @@ class WorksheetManager:
         """
         self._mgr = excel_manager
 
-    def _get_worksheet_info(self, ws: CDispatch) -> WorksheetInfo:
+    def _get_worksheet_info(
+        self, ws: CDispatch, fields: frozenset[str] = frozenset(WORKSHEET_FIELDS)
+    ) -> WorksheetInfo:
         """Extract information from a worksheet COM object.
 
         Args:
             ws: Worksheet COM object
+            fields: Attributes to read (see _select_fields()); the others
+                are None and cost no COM call
 
         Returns:
             WorksheetInfo with worksheet details
@@ -237,24 +384,16 @@ class WorksheetManager:
         Note:
             If UsedRange fails (empty sheet), defaults to 0 rows/columns.
         """
-        try:
-            # Get used range to count rows/columns
-            used_range = ws.UsedRange
-            if used_range is not None:
-                rows_used = used_range.Rows.Count
-                columns_used = used_range.Columns.Count
-            else:
-                rows_used = 0
-                columns_used = 0
-        except Exception:
-            # If UsedRange fails (empty sheet), default to 0
-            rows_used = 0
-            columns_used = 0
+        rows_used = columns_used = None
+        if "rows_used" in fields or "columns_used" in fields:
+            rows_used, columns_used = _used_dimensions(
+                ws, rows="rows_used" in fields, columns="columns_used" in fields
+            )
 
         return WorksheetInfo(
             name=ws.Name,
-            index=ws.Index,
-            visible=ws.Visible,
+            index=ws.Index if "index" in fields else None,
+            visible=ws.Visible if "visible" in fields else None,
             rows_used=rows_used,
             columns_used=columns_used,
         )
@@ -297,10 +436,11 @@ class WorksheetManager:
 
         # Step 2: Get Excel app and resolve target workbook
         app = self._mgr.app
-        wb = _resolve_workbook(app, workbook)
+        wb = _resolve_workbook(app, workbook, workbook_index(self._mgr))
 
         # Step 3: Check if worksheet already exists
-        existing = _find_worksheet(wb, name)
+        metadata = workbook_metadata(self._mgr, wb)
+        existing = _find_worksheet(wb, name, metadata, rescan_on_miss=False)
         if existing is not None:
             from .exceptions import WorksheetAlreadyExistsError
 
@@ -316,6 +456,8 @@ class WorksheetManager:
 
             # Set the name
             ws.Name = name
+            if metadata is not None:
+                metadata.add_worksheet(ws, name)
 
             # Step 5: Return WorksheetInfo
             info = self._get_worksheet_info(ws)
@@ -368,10 +510,11 @@ class WorksheetManager:
         """
         # Step 1: Resolve target workbook
         app = self._mgr.app
-        wb = _resolve_workbook(app, workbook)
+        wb = _resolve_workbook(app, workbook, workbook_index(self._mgr))
 
         # Step 2: Find the worksheet
-        ws = _find_worksheet(wb, name)
+        metadata = workbook_metadata(self._mgr, wb)
+        ws = _find_worksheet(wb, name, metadata)
         if ws is None:
             from .exceptions import WorksheetNotFoundError
 
@@ -399,13 +542,20 @@ class WorksheetManager:
 
         try:
             ws.Delete()
+            if metadata is not None:
+                metadata.remove_worksheet(ws)
             # Clean up COM reference
             del ws
         finally:
             # Always restore DisplayAlerts
             app.DisplayAlerts = True
 
-    def list(self, workbook: Path | None = None) -> list[WorksheetInfo]:
+    def list(
+        self,
+        workbook: Path | None = None,
+        helper: bool | str = False,
+        fields: Iterable[str] | None = None,
+    ) -> builtins.list[WorksheetInfo]:
         """List all worksheets in a workbook.
 
         Returns information about all worksheets in the workbook,
@@ -414,12 +564,24 @@ class WorksheetManager:
         Args:
             workbook: Optional path to the target workbook.
                       If None, uses the active workbook.
+            helper: Read the whole list in one call through the VBA
+                    inventory helper: True to inject it in the workbook,
+                    or the name of the workbook hosting it (e.g.
+                    "PERSONAL.XLSB").  Falls back to reading worksheet
+                    by worksheet when the helper cannot run.
+            fields: Attributes of WorksheetInfo to read, among
+                    WORKSHEET_FIELDS (default: all).  The others are None
+                    and cost nothing: leaving out rows_used and
+                    columns_used skips UsedRange, slow on large or
+                    formatted sheets (see dimensions() to read them later
+                    for some sheets only).
 
         Returns:
             List of WorksheetInfo for each worksheet.
             Returns empty list if workbook has no worksheets.
 
         Raises:
+            ValueError: If fields holds an unknown attribute name
             WorkbookNotFoundError: If the specified workbook is not open
             ExcelConnectionError: If COM connection fails
 
@@ -432,19 +594,33 @@ class WorksheetManager:
             >>> # List from specific workbook
             >>> sheets = manager.list(Path("C:/work/report.xlsx"))
 
+            >>> # Names and visibility only, without UsedRange
+            >>> sheets = manager.list(fields=["name", "visible"])
+
         Note:
             The list includes both visible and hidden worksheets.
             Hidden worksheets have visible=False.
         """
+        selected = _select_fields(fields)
         app = self._mgr.app
-        wb = _resolve_workbook(app, workbook)
+        wb = _resolve_workbook(app, workbook, workbook_index(self._mgr))
+
+        if helper:
+            from .vba_inventory import inventory_helper
+
+            listed = inventory_helper(self._mgr, helper).sheets(wb)
+            if listed is not None:
+                unselected: dict[str, Any] = {
+                    field: None for field in WORKSHEET_FIELDS if field not in selected
+                }
+                return [replace(info, **unselected) for info in listed]
 
         worksheets = []
 
         # Iterate through all worksheets
         for ws in wb.Worksheets:
             try:
-                info = self._get_worksheet_info(ws)
+                info = self._get_worksheet_info(ws, selected)
                 worksheets.append(info)
             except Exception:
                 # Skip worksheets that can't be read
@@ -452,6 +628,58 @@ class WorksheetManager:
 
         return worksheets
 
+    def dimensions(
+        self, name: str, workbook: Path | None = None, refresh: bool = False
+    ) -> tuple[int, int]:
+        """Count the used rows and columns of one worksheet.
+
+        Complements list(fields=...) without rows_used and columns_used,
+        for the worksheets that need them.  The counts come from a
+        last-cell probe (see _probe_dimensions()) rather than UsedRange:
+        they span the cells holding a value or a formula, and ignore cells
+        that are only formatted.
+
+        The result is kept per worksheet in the metadata of the workbook
+        until cells are written through xlManage (range write, table
+        load, upsert or deletion, macro run).  Cells edited in Excel go
+        unnoticed: pass refresh=True to measure again.
+
+        Args:
+            name: Name of the worksheet (case-insensitive)
+            workbook: Optional path to the target workbook.
+                      If None, uses the active workbook.
+            refresh: Measure again instead of reusing the recorded counts
+
+        Returns:
+            Tuple of (rows_used, columns_used); (0, 0) for an empty sheet
+
+        Raises:
+            WorksheetNotFoundError: If the worksheet doesn't exist
+            WorkbookNotFoundError: If the specified workbook is not open
+
+        Example:
+            >>> sheets = manager.list(fields=["name", "visible"])
+            >>> rows, columns = manager.dimensions(sheets[0].name)
+        """
+        app = self._mgr.app
+        wb = _resolve_workbook(app, workbook, workbook_index(self._mgr))
+        metadata = workbook_metadata(self._mgr, wb)
+        ws = _find_worksheet(wb, name, metadata)
+        if ws is None:
+            from .exceptions import WorksheetNotFoundError
+
+            raise WorksheetNotFoundError(name, wb.Name)
+
+        if metadata is not None and not refresh:
+            recorded = metadata.dimensions(name)
+            if recorded is not None:
+                return recorded
+
+        measured = _probe_dimensions(ws)
+        if metadata is not None:
+            metadata.record_dimensions(name, measured)
+        return measured
+
     def copy(
         self, source: str, destination: str, workbook: Path | None = None
     ) -> WorksheetInfo:
@@ -494,10 +722,11 @@ class WorksheetManager:
 
         # Step 2: Resolve target workbook
         app = self._mgr.app
-        wb = _resolve_workbook(app, workbook)
+        wb = _resolve_workbook(app, workbook, workbook_index(self._mgr))
 
         # Step 3: Find source worksheet
-        ws_source = _find_worksheet(wb, source)
+        metadata = workbook_metadata(self._mgr, wb)
+        ws_source = _find_worksheet(wb, source, metadata)
         if ws_source is None:
             from .exceptions import WorksheetNotFoundError
 
@@ -506,7 +735,7 @@ class WorksheetManager:
         # Step 4: Check destination name doesn't exist
         from .exceptions import WorksheetAlreadyExistsError
 
-        ws_existing = _find_worksheet(wb, destination)
+        ws_existing = _find_worksheet(wb, destination, metadata, rescan_on_miss=False)
         if ws_existing is not None:
             raise WorksheetAlreadyExistsError(destination, wb.Name)
 
@@ -520,6 +749,10 @@ class WorksheetManager:
 
             # Rename the copy
             ws_copy.Name = destination
+            if metadata is not None:
+                # The copy holds copies of the source tables, renamed by Excel
+                metadata.add_worksheet(ws_copy, destination)
+                metadata.invalidate_tables()
 
             # Step 6: Get worksheet information
             info = self._get_worksheet_info(ws_copy)
@@ -7,6 +7,8 @@ from unittest.mock import Mock
 
 import pytest
 
+from xlmanage.process_backend import SubprocessProcessBackend, set_process_backend
+
 
 @pytest.fixture(scope="session")
 def mock_excel_app() -> Generator[Mock]:
@@ -36,6 +38,17 @@ def mock_worksheet() -> Generator[Mock]:
     # Cleanup would go here if needed
 
 
+@pytest.fixture(autouse=True)
+def subprocess_process_backend() -> Generator[None]:
+    """Use the tasklist/taskkill backend the tests mock through subprocess.run.
+
+    The native backend would list and kill real processes on Windows.
+    """
+    set_process_backend(SubprocessProcessBackend())
+    yield
+    set_process_backend(None)
+
+
 @pytest.fixture(autouse=True)
 def setup_timeout(request):
     """Automatically apply timeout to all tests."""
@@ -0,0 +1,103 @@
+"""
+Tests for batch execution.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from xlmanage.batch import BatchResult, parse_step, run_batch
+from xlmanage.exceptions import OperationError, WorksheetAlreadyExistsError
+
+
+def test_parse_step_skips_blank_and_comments():
+    """Blank lines and comments are not operations."""
+    assert parse_step(1, "   \n") is None
+    assert parse_step(2, "# comment") is None
+
+
+def test_parse_step():
+    """A JSON line becomes a BatchStep."""
+    step = parse_step(3, '{"op": "worksheet.create", "kwargs": {"name": "A"}, "id": 7}')
+
+    assert step.line == 3
+    assert step.op == "worksheet.create"
+    assert step.args == []
+    assert step.kwargs == {"name": "A"}
+    assert step.id == 7
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["not json", "[1, 2]", '{"args": []}', '{"op": "x", "args": {}}'],
+)
+def test_parse_step_invalid(text):
+    """Malformed lines raise OperationError."""
+    with pytest.raises(OperationError):
+        parse_step(1, text)
+
+
+def test_run_batch_streams_results():
+    """Each operation yields a result with its timing, in order."""
+    execute = Mock(side_effect=["first", WorksheetAlreadyExistsError("A", "b.xlsx"), 3])
+    lines = [
+        '{"op": "workbook.open", "args": ["C:/b.xlsx"]}',
+        "",
+        '{"op": "worksheet.create", "kwargs": {"name": "A"}, "id": "s1"}',
+        '{"op": "table.list"}',
+    ]
+
+    results = list(run_batch(lines, execute))
+
+    assert [r.line for r in results] == [1, 3, 4]
+    assert [r.success for r in results] == [True, False, True]
+    assert results[0].result == "first"
+    assert results[1].error_type == "WorksheetAlreadyExistsError"
+    assert results[1].id == "s1"
+    assert all(r.elapsed_ms >= 0 for r in results)
+    execute.assert_any_call("workbook.open", ["C:/b.xlsx"], {})
+
+
+def test_run_batch_stop_on_error():
+    """stop_on_error ends the batch after the first failure."""
+    execute = Mock(return_value=None)
+    lines = ["garbage", '{"op": "workbook.list"}']
+
+    results = list(run_batch(lines, execute, stop_on_error=True))
+
+    assert len(results) == 1
+    assert results[0].error_type == "OperationError"
+    execute.assert_not_called()
+
+
+def test_result_to_dict():
+    """NDJSON records include the error only for failed steps."""
+    ok = BatchResult(line=1, op="workbook.list", success=True, result=[])
+    ko = BatchResult(
+        line=2, op="x", success=False, error_type="E", error_message="m", id=4
+    )
+
+    assert ok.to_dict() == {
+        "line": 1,
+        "op": "workbook.list",
+        "ok": True,
+        "result": [],
+        "elapsed_ms": 0.0,
+    }
+    assert ko.to_dict()["error"] == {"type": "E", "message": "m"}
+    assert ko.to_dict()["id"] == 4
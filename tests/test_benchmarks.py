@@ -0,0 +1,98 @@
+"""
+Tests for the benchmark scenarios and their COM call baseline.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from xlmanage.testing.benchmarks import (
+    SCENARIOS,
+    BenchmarkResult,
+    find_regressions,
+    load_baseline,
+    run_benchmarks,
+    run_scenario,
+    save_baseline,
+)
+
+BASELINE = Path(__file__).parents[1] / "benchmarks" / "baseline.json"
+
+
+def test_scenarios_match_baseline():
+    """No manager operation makes more COM calls than the stored baseline.
+
+    After an intentional change, refresh the counts with
+    ``python benchmarks/run.py --scales 10,100,1000 --update-baseline``.
+    """
+    baseline = load_baseline(BASELINE)
+    results = run_benchmarks(scales=(10,))
+
+    assert {r.key for r in results} <= set(baseline)
+    assert find_regressions(results, baseline) == []
+
+
+@pytest.mark.slow
+def test_scenarios_match_baseline_at_scale():
+    baseline = load_baseline(BASELINE)
+
+    assert find_regressions(run_benchmarks(scales=(100,)), baseline) == []
+
+
+def test_run_scenario_counts_only_the_operation():
+    small = run_scenario("worksheet.list", 10)
+    large = run_scenario("worksheet.list", 20)
+
+    assert small.key == "worksheet.list[10]"
+    assert small.calls > 0
+    assert large.calls > small.calls
+    assert set(SCENARIOS) >= {"workbook.open", "table.delete", "macro.run"}
+
+
+def test_latency_is_reflected_in_wall_time():
+    result = run_scenario("macro.run", 10, latency=0.001)
+
+    assert result.elapsed >= result.calls * 0.001
+
+
+def test_find_regressions_with_tolerance():
+    results = [BenchmarkResult("table.list", 10, 110, 0.1)]
+
+    [regression] = find_regressions(results, {"table.list[10]": 100})
+    assert (regression.key, regression.baseline, regression.calls) == (
+        "table.list[10]",
+        100,
+        110,
+    )
+    assert find_regressions(results, {"table.list[10]": 100}, tolerance=0.1) == []
+    assert find_regressions(results, {}) == []
+
+
+def test_save_baseline_merges_and_sorts(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) == {}
+
+    save_baseline(path, [BenchmarkResult("b.op", 100, 7, 0.0)])
+    save_baseline(
+        path, [BenchmarkResult("b.op", 10, 3, 0.0), BenchmarkResult("a.op", 10, 1, 0.0)]
+    )
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert list(data["calls"]) == ["a.op[10]", "b.op[10]", "b.op[100]"]
+    assert load_baseline(path)["b.op[100]"] == 7
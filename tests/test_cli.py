@@ -1064,7 +1064,90 @@ class TestWorksheetCommands:
 
         assert result.exit_code == 0
         assert "test.xlsx" in result.stdout
-        mock_ws_mgr.list.assert_called_once_with(workbook=test_file)
+        mock_ws_mgr.list.assert_called_once_with(
+            workbook=test_file, helper=False, fields=None
+        )
+
+    @patch("xlmanage.cli.ExcelManager")
+    @patch("xlmanage.cli.WorksheetManager")
+    def test_worksheet_list_with_fields(self, mock_ws_class, mock_mgr_class):
+        """Test worksheet list command with --fields option."""
+        mock_mgr = Mock()
+        mock_mgr_class.return_value.__enter__.return_value = mock_mgr
+
+        mock_ws_mgr = Mock()
+        mock_ws_class.return_value = mock_ws_mgr
+        mock_ws_mgr.list.return_value = [
+            WorksheetInfo(
+                name="Sheet1",
+                index=None,
+                visible=True,
+                rows_used=None,
+                columns_used=None,
+            ),
+        ]
+
+        result = runner.invoke(
+            app, ["worksheet", "list", "--fields", "name, visible"]
+        )
+
+        assert result.exit_code == 0
+        assert "Visible" in result.stdout
+        assert "Lignes" not in result.stdout
+        mock_ws_mgr.list.assert_called_once_with(
+            workbook=None, helper=False, fields=["name", "visible"]
+        )
+
+    @patch("xlmanage.cli.ExcelManager")
+    @patch("xlmanage.cli.WorksheetManager")
+    def test_worksheet_list_unknown_field(self, mock_ws_class, mock_mgr_class):
+        """Test worksheet list command with an unknown field."""
+        result = runner.invoke(app, ["worksheet", "list", "--fields", "name,rows"])
+
+        assert result.exit_code == 1
+        assert "rows" in result.stdout
+        mock_ws_class.assert_not_called()
+
+    @patch("xlmanage.cli.ExcelManager")
+    @patch("xlmanage.cli.WorksheetManager")
+    def test_worksheet_dimensions_command(self, mock_ws_class, mock_mgr_class):
+        """Test worksheet dimensions command."""
+        mock_mgr = Mock()
+        mock_mgr_class.return_value.__enter__.return_value = mock_mgr
+
+        mock_ws_mgr = Mock()
+        mock_ws_class.return_value = mock_ws_mgr
+        mock_ws_mgr.dimensions.return_value = (120, 7)
+
+        result = runner.invoke(app, ["worksheet", "dimensions", "Data", "--refresh"])
+
+        assert result.exit_code == 0
+        assert "Lignes :" in result.stdout
+        assert "120" in result.stdout
+        assert "7" in result.stdout
+        mock_ws_mgr.dimensions.assert_called_once_with(
+            "Data", workbook=None, refresh=True
+        )
+
+    @patch("xlmanage.cli.ExcelManager")
+    @patch("xlmanage.cli.WorksheetManager")
+    def test_worksheet_dimensions_not_found(self, mock_ws_class, mock_mgr_class):
+        """Test worksheet dimensions command when the sheet is missing."""
+        from xlmanage.exceptions import WorksheetNotFoundError
+
+        mock_mgr = Mock()
+        mock_mgr_class.return_value.__enter__.return_value = mock_mgr
+
+        mock_ws_mgr = Mock()
+        mock_ws_class.return_value = mock_ws_mgr
+        mock_ws_mgr.dimensions.side_effect = WorksheetNotFoundError(
+            "Missing", "test.xlsx"
+        )
+
+        result = runner.invoke(app, ["worksheet", "dimensions", "Missing"])
+
+        assert result.exit_code == 1
+        assert "Feuille introuvable" in result.stdout
 
     @patch("xlmanage.cli.ExcelManager")
     @patch("xlmanage.cli.WorksheetManager")
@@ -1499,7 +1582,9 @@ class TestTableCommands:
         assert "tbl_Products" in result.stdout
         assert "2 trouvée(s)" in result.stdout
         assert "Tables" in result.stdout
-        mock_table_mgr.list.assert_called_once_with(worksheet=None, workbook=None)
+        mock_table_mgr.list.assert_called_once_with(
+            worksheet=None, workbook=None, helper=False
+        )
 
     @patch("xlmanage.cli.ExcelManager")
     @patch("xlmanage.cli.TableManager")
@@ -1527,7 +1612,9 @@ class TestTableCommands:
         assert result.exit_code == 0
         assert "tbl_Data" in result.stdout
         assert "Sheet1" in result.stdout
-        mock_table_mgr.list.assert_called_once_with(worksheet="Sheet1", workbook=None)
+        mock_table_mgr.list.assert_called_once_with(
+            worksheet="Sheet1", workbook=None, helper=False
+        )
 
     @patch("xlmanage.cli.ExcelManager")
     @patch("xlmanage.cli.TableManager")
@@ -1556,7 +1643,9 @@ class TestTableCommands:
         assert result.exit_code == 0
         assert "test.xlsx" in result.stdout
         assert "tbl_Test" in result.stdout
-        mock_table_mgr.list.assert_called_once_with(worksheet=None, workbook=test_file)
+        mock_table_mgr.list.assert_called_once_with(
+            worksheet=None, workbook=test_file, helper=False
+        )
 
     @patch("xlmanage.cli.ExcelManager")
     @patch("xlmanage.cli.TableManager")
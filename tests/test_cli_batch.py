@@ -0,0 +1,105 @@
+"""
+Tests for CLI batch command.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app
+from xlmanage.worksheet_manager import WorksheetInfo
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def mock_manager():
+    """Mock ExcelManager used as context manager by the batch command."""
+    with patch("xlmanage.cli.ExcelManager") as mock_cls:
+        mock_instance = MagicMock()
+        mock_cls.return_value.__enter__.return_value = mock_instance
+        yield mock_instance
+
+
+def _records(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines() if line.strip()]
+
+
+@patch("xlmanage.worksheet_manager.WorksheetManager")
+def test_batch_from_file(mock_ws_cls, mock_manager, tmp_path):
+    """Operations run on the same ExcelManager and stream NDJSON."""
+    mock_ws_cls.return_value.create.side_effect = lambda name, workbook=None: (
+        WorksheetInfo(name=name, index=2, visible=True, rows_used=0, columns_used=0)
+    )
+    ops = tmp_path / "ops.jsonl"
+    ops.write_text(
+        "\n".join(
+            json.dumps({"op": "worksheet.create", "kwargs": {"name": f"S{i}"}})
+            for i in range(3)
+        ),
+        encoding="utf-8",
+    )
+
+    result = runner.invoke(app, ["batch", str(ops)])
+
+    assert result.exit_code == 0
+    records = _records(result.stdout)
+    assert [r["result"]["name"] for r in records[:3]] == ["S0", "S1", "S2"]
+    assert all("elapsed_ms" in r for r in records[:3])
+    assert records[3]["summary"]["succeeded"] == 3
+    assert {c.args for c in mock_ws_cls.call_args_list} == {(mock_manager,)}
+
+
+def test_batch_from_stdin_with_failure(mock_manager):
+    """Failures are reported per line and set the exit code."""
+    result = runner.invoke(
+        app,
+        ["batch", "-"],
+        input='{"op": "nope"}\n{"op": "excel.get_running_instance"}\n',
+    )
+
+    assert result.exit_code == 1
+    records = _records(result.stdout)
+    assert records[0]["ok"] is False
+    assert records[0]["error"]["type"] == "OperationError"
+    assert records[1]["ok"] is True
+    assert records[2]["summary"]["failed"] == 1
+
+
+@patch("xlmanage.excel_optimizer.ExcelOptimizer")
+def test_batch_optimize_scope(mock_opt_cls, mock_manager, tmp_path):
+    """--optimize wraps the whole batch in one ExcelOptimizer scope."""
+    ops = tmp_path / "ops.jsonl"
+    ops.write_text('{"op": "excel.get_running_instance"}\n', encoding="utf-8")
+
+    result = runner.invoke(app, ["batch", str(ops), "--optimize"])
+
+    assert result.exit_code == 0
+    mock_opt_cls.assert_called_once_with(mock_manager)
+    mock_opt_cls.return_value.__enter__.assert_called_once()
+    mock_opt_cls.return_value.__exit__.assert_called_once()
+
+
+def test_batch_missing_file(mock_manager):
+    """A missing batch file is reported on stderr."""
+    result = runner.invoke(app, ["batch", "missing.jsonl"])
+
+    assert result.exit_code == 1
+    assert result.stdout == ""
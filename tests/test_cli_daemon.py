@@ -0,0 +1,107 @@
+"""
+Tests for CLI serve command and daemon client mode.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from xlmanage.cli import app
+from xlmanage.exceptions import DaemonAlreadyRunningError, DaemonConnectionError
+
+runner = CliRunner()
+
+
+@patch("xlmanage.cli.DaemonClient")
+def test_serve_stop(mock_client_cls):
+    """serve --stop sends the shutdown request to the daemon."""
+    client = mock_client_cls.return_value.__enter__.return_value
+
+    result = runner.invoke(app, ["serve", "--stop", "--address", "/tmp/xlm.sock"])
+
+    assert result.exit_code == 0
+    mock_client_cls.assert_called_once_with("/tmp/xlm.sock")
+    client.shutdown.assert_called_once_with()
+    assert "Démon arrêté" in result.stdout
+
+
+@patch("xlmanage.cli.DaemonClient")
+def test_serve_ping_unreachable(mock_client_cls):
+    """serve --ping reports an unreachable daemon."""
+    mock_client_cls.return_value.__enter__.side_effect = DaemonConnectionError(
+        "/tmp/xlm.sock"
+    )
+
+    result = runner.invoke(app, ["serve", "--ping", "--address", "/tmp/xlm.sock"])
+
+    assert result.exit_code == 1
+    assert "Démon injoignable" in result.stdout
+
+
+@patch("xlmanage.cli.DaemonServer")
+def test_serve_runs_server(mock_server_cls):
+    """serve starts the daemon on the requested address."""
+    result = runner.invoke(app, ["serve", "--address", "/tmp/xlm.sock"])
+
+    assert result.exit_code == 0
+    assert mock_server_cls.call_args.args == ("/tmp/xlm.sock",)
+    mock_server_cls.return_value.serve_forever.assert_called_once_with()
+    assert "en écoute" in result.stdout
+
+
+@patch("xlmanage.cli.DaemonServer")
+def test_serve_refuses_second_daemon(mock_server_cls):
+    """serve exits with an error when a daemon already answers."""
+    mock_server_cls.return_value.serve_forever.side_effect = DaemonAlreadyRunningError(
+        "/tmp/xlm.sock"
+    )
+
+    result = runner.invoke(app, ["serve", "--address", "/tmp/xlm.sock"])
+
+    assert result.exit_code == 1
+    assert "déjà actif" in result.stdout
+
+
+@patch("xlmanage.cli.ExcelManager")
+@patch("xlmanage.daemon.DaemonClient")
+def test_daemon_mode_forwards_commands(mock_client_cls, mock_mgr_cls):
+    """With --daemon, manager commands are sent to the daemon."""
+    client = mock_client_cls.return_value
+    client.call.return_value = []
+
+    result = runner.invoke(
+        app, ["--daemon", "--daemon-address", "/tmp/xlm.sock", "workbook", "list"]
+    )
+
+    assert result.exit_code == 0
+    mock_client_cls.assert_called_once_with("/tmp/xlm.sock", None)
+    client.call.assert_called_once_with("workbook.list", (), {})
+    mock_mgr_cls.assert_not_called()
+
+
+@patch("xlmanage.daemon.DaemonClient")
+@patch("xlmanage.cli.ExcelManager")
+def test_local_mode_by_default(mock_mgr_cls, mock_client_cls):
+    """Without --daemon, commands use a local ExcelManager."""
+    with patch("xlmanage.cli.WorkbookManager") as mock_wb_cls:
+        mock_wb_cls.return_value.list.return_value = []
+        result = runner.invoke(app, ["workbook", "list"])
+
+    assert result.exit_code == 0
+    mock_mgr_cls.assert_called_once()
+    mock_client_cls.assert_not_called()
@@ -0,0 +1,137 @@
+"""
+Tests for CLI range commands.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app
+from xlmanage.exceptions import RangeError
+from xlmanage.range_manager import RangeData, RangeWriteResult
+
+runner = CliRunner()
+
+DATA = RangeData(
+    address="$A$1:$B$3",
+    worksheet_name="Data",
+    rows=3,
+    columns=2,
+    values=[["Name", "Qty"], ["Pen", 3.0], ["Ink", None]],
+)
+
+
+@pytest.fixture
+def mock_range_mgr():
+    """Patch ExcelManager and RangeManager in the CLI module."""
+    with (
+        patch("xlmanage.cli.ExcelManager") as mock_excel_cls,
+        patch("xlmanage.cli.RangeManager") as mock_range_cls,
+    ):
+        mock_excel_cls.return_value = MagicMock()
+        yield mock_range_cls.return_value
+
+
+def test_range_read_csv_stdout(mock_range_mgr):
+    """CSV is written to stdout."""
+    mock_range_mgr.read.return_value = DATA
+
+    result = runner.invoke(app, ["range", "read", "A1:B3", "-ws", "Data"])
+
+    assert result.exit_code == 0
+    assert result.stdout == "Name,Qty\nPen,3.0\nInk,\n"
+    mock_range_mgr.read.assert_called_once_with(
+        "A1:B3", worksheet="Data", workbook=None
+    )
+
+
+def test_range_read_ndjson_header_file(mock_range_mgr, tmp_path):
+    """NDJSON with --header writes one object per data row to a file."""
+    mock_range_mgr.read.return_value = DATA
+    output = tmp_path / "out.ndjson"
+
+    result = runner.invoke(
+        app, ["range", "read", "--format", "ndjson", "--header", "-o", str(output)]
+    )
+
+    assert result.exit_code == 0
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"Name": "Pen", "Qty": 3.0},
+        {"Name": "Ink", "Qty": None},
+    ]
+    assert "Plage exportée" in result.stdout
+
+
+def test_range_read_invalid_format(mock_range_mgr):
+    """Unknown formats are rejected before touching Excel."""
+    result = runner.invoke(app, ["range", "read", "A1", "--format", "xml"])
+
+    assert result.exit_code == 1
+    mock_range_mgr.read.assert_not_called()
+
+
+def test_range_read_range_error(mock_range_mgr):
+    """RangeError is displayed with its reason."""
+    mock_range_mgr.read.side_effect = RangeError("ZZ", "invalid range syntax")
+
+    result = runner.invoke(app, ["range", "read", "ZZ"])
+
+    assert result.exit_code == 1
+    assert "Plage invalide" in result.stdout
+
+
+def test_range_write_from_csv(mock_range_mgr, tmp_path):
+    """range write parses the CSV and reports the throughput."""
+    source = tmp_path / "data.csv"
+    source.write_text("Name,Qty\nPen,3\n", encoding="utf-8")
+    mock_range_mgr.write.return_value = RangeWriteResult(
+        address="$B$2:$C$3",
+        worksheet_name="Data",
+        rows=2,
+        columns=2,
+        blocks=1,
+        block_rows=50000,
+        elapsed=0.01,
+        cells_per_second=400.0,
+    )
+
+    result = runner.invoke(
+        app, ["range", "write", "B2", "--from", str(source), "--block-rows", "100"]
+    )
+
+    assert result.exit_code == 0
+    mock_range_mgr.write.assert_called_once_with(
+        [["Name", "Qty"], ["Pen", 3.0]],
+        "B2",
+        worksheet=None,
+        workbook=None,
+        block_rows=100,
+        optimize=True,
+    )
+    assert "cellules/s" in result.stdout
+
+
+def test_range_write_missing_file(mock_range_mgr):
+    """A missing CSV file is reported without touching Excel."""
+    result = runner.invoke(app, ["range", "write", "--from", "missing.csv"])
+
+    assert result.exit_code == 1
+    mock_range_mgr.write.assert_not_called()
@@ -22,7 +22,7 @@ from typer.testing import CliRunner
 from unittest.mock import Mock, patch
 
 from xlmanage.cli import app
-from xlmanage.excel_manager import InstanceInfo
+from xlmanage.excel_manager import InstanceInfo, StopReport
 from xlmanage.exceptions import ExcelInstanceNotFoundError, ExcelRPCError
 
 runner = CliRunner()
@@ -269,3 +269,45 @@ def test_stop_generic_error(mock_manager):
     assert result.exit_code == 1
     assert "Erreur" in result.stdout
     assert "Something went wrong" in result.stdout
+
+
+def test_stop_all_with_deadline(mock_manager):
+    """Test concurrent stop of all instances with a deadline."""
+    # Setup
+    mock_manager.stop_all.return_value = [
+        StopReport(pid=111, status="stopped", elapsed_ms=850.0),
+        StopReport(pid=222, status="killed", elapsed_ms=30012.0),
+    ]
+
+    # Execute
+    result = runner.invoke(app, ["stop", "--all", "--deadline", "30"])
+
+    # Assert
+    assert result.exit_code == 0
+    mock_manager.stop_all.assert_called_once_with(
+        save=True, parallel=True, deadline=30.0
+    )
+    assert "111" in result.stdout
+    assert "délai dépassé" in result.stdout
+    assert "1 instance(s) terminée(s) de force" in result.stdout
+
+
+def test_stop_deadline_requires_all(mock_manager):
+    """Test error when --deadline is given without --all."""
+    # Execute
+    result = runner.invoke(app, ["stop", "12345", "--deadline", "30"])
+
+    # Assert
+    assert result.exit_code == 1
+    assert "--all" in result.stdout
+    mock_manager.stop_instance.assert_not_called()
+
+
+def test_stop_negative_deadline_rejected(mock_manager):
+    """Test that a negative --deadline is refused before stopping anything."""
+    # Execute
+    result = runner.invoke(app, ["stop", "--all", "--deadline", "-1"])
+
+    # Assert
+    assert result.exit_code == 2
+    mock_manager.stop_all.assert_not_called()
@@ -0,0 +1,215 @@
+"""
+Tests for CLI table export and load commands.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app
+from xlmanage.exceptions import TableColumnError, TableNotFoundError
+from xlmanage.table_manager import (
+    TableExportResult,
+    TableLoadResult,
+    TableUpsertResult,
+)
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def mock_table_mgr():
+    """Patch ExcelManager and TableManager in the CLI module."""
+    with (
+        patch("xlmanage.cli.ExcelManager") as mock_excel_cls,
+        patch("xlmanage.cli.TableManager") as mock_table_cls,
+    ):
+        mock_excel_cls.return_value = MagicMock()
+        yield mock_table_cls.return_value
+
+
+def _result(output: str) -> TableExportResult:
+    return TableExportResult(
+        name="tbl_Sales",
+        output=output,
+        format="csv",
+        rows=1000,
+        columns=4,
+        chunks=1,
+        elapsed=0.5,
+        rows_per_second=2000.0,
+        peak_memory=3 * 1_048_576,
+    )
+
+
+def test_table_export_to_file(mock_table_mgr, tmp_path):
+    """The export report shows rows/s and peak memory."""
+    output = tmp_path / "sales.csv"
+    mock_table_mgr.export.return_value = _result(str(output))
+
+    result = runner.invoke(
+        app, ["table", "export", "tbl_Sales", "-o", str(output), "--chunk-rows", "500"]
+    )
+
+    assert result.exit_code == 0
+    mock_table_mgr.export.assert_called_once_with(
+        "tbl_Sales", output, fmt="csv", chunk_rows=500, workbook=None
+    )
+    assert "2,000 lignes/s" in result.stdout
+    assert "3.0 Mo" in result.stdout
+
+
+def test_table_export_to_stdout(mock_table_mgr):
+    """Without --output, data goes to stdout and the report to stderr."""
+
+    def fake_export(name, stream, **kwargs):
+        stream.write("Name\nPen\n")
+        return _result("<stream>")
+
+    mock_table_mgr.export.side_effect = fake_export
+
+    result = runner.invoke(app, ["table", "export", "tbl_Sales"])
+
+    assert result.exit_code == 0
+    assert result.stdout == "Name\nPen\n"
+
+
+def test_table_export_not_found(mock_table_mgr, tmp_path):
+    """A missing table is reported."""
+    mock_table_mgr.export.side_effect = TableNotFoundError("tbl_X", "any worksheet")
+
+    result = runner.invoke(
+        app, ["table", "export", "tbl_X", "-o", str(tmp_path / "x.csv")]
+    )
+
+    assert result.exit_code == 1
+    assert "Table introuvable" in result.stdout
+
+
+def test_table_export_invalid_format(mock_table_mgr):
+    """Unknown formats are rejected."""
+    result = runner.invoke(app, ["table", "export", "tbl_Sales", "-f", "xml"])
+
+    assert result.exit_code == 1
+    mock_table_mgr.export.assert_not_called()
+
+
+def test_table_load_streams_csv(mock_table_mgr, tmp_path):
+    """table load passes the header, the row count and a row iterator."""
+    source = tmp_path / "sales.csv"
+    source.write_text("Name,Qty\nPen,3\nInk,\n", encoding="utf-8")
+    received = {}
+
+    def fake_append(name, rows, **kwargs):
+        received["rows"] = list(rows)
+        received.update(kwargs)
+        return TableLoadResult(
+            name=name,
+            rows_added=2,
+            rows_count=12,
+            columns=["Name", "Qty"],
+            blocks=1,
+            elapsed=0.1,
+            rows_per_second=20.0,
+        )
+
+    mock_table_mgr.append_rows.side_effect = fake_append
+
+    result = runner.invoke(
+        app, ["table", "load", "tbl_Sales", "--from", str(source), "--truncate"]
+    )
+
+    assert result.exit_code == 0
+    assert received["rows"] == [["Pen", 3.0], ["Ink", None]]
+    assert received["columns"] == ["Name", "Qty"]
+    assert received["row_count"] == 2
+    assert received["truncate"] is True
+    assert "Lignes totales" in result.stdout
+
+
+def test_table_load_column_error(mock_table_mgr, tmp_path):
+    """Column mismatches are reported with the offending names."""
+    source = tmp_path / "sales.csv"
+    source.write_text("Name,Price\n", encoding="utf-8")
+    mock_table_mgr.append_rows.side_effect = TableColumnError(
+        "tbl_Sales", ["Price"], "unknown columns"
+    )
+
+    result = runner.invoke(app, ["table", "load", "tbl_Sales", "--from", str(source)])
+
+    assert result.exit_code == 1
+    assert "Colonnes incompatibles" in result.stdout
+    assert "Price" in result.stdout
+
+
+def test_table_load_empty_file(mock_table_mgr, tmp_path):
+    """A file without header is rejected."""
+    source = tmp_path / "empty.csv"
+    source.write_text("", encoding="utf-8")
+
+    result = runner.invoke(app, ["table", "load", "tbl_Sales", "--from", str(source)])
+
+    assert result.exit_code == 1
+    mock_table_mgr.append_rows.assert_not_called()
+
+
+def test_table_upsert_csv(mock_table_mgr, tmp_path):
+    """table upsert passes the header, the rows and the key columns."""
+    source = tmp_path / "changes.csv"
+    source.write_text("Id,Qty\n1,3\n9,4\n", encoding="utf-8")
+    received = {}
+
+    def fake_upsert(name, rows, key_columns, **kwargs):
+        received["rows"] = list(rows)
+        received["key_columns"] = key_columns
+        received.update(kwargs)
+        return TableUpsertResult(
+            name=name,
+            rows_updated=1,
+            rows_inserted=1,
+            rows_unchanged=0,
+            rows_count=11,
+            key_columns=["Id"],
+            blocks=2,
+            elapsed=0.1,
+            rows_per_second=20.0,
+        )
+
+    mock_table_mgr.upsert.side_effect = fake_upsert
+
+    result = runner.invoke(
+        app, ["table", "upsert", "tbl_Sales", "--from", str(source), "-k", "Id"]
+    )
+
+    assert result.exit_code == 0
+    assert received["rows"] == [[1.0, 3.0], [9.0, 4.0]]
+    assert received["key_columns"] == ["Id"]
+    assert received["columns"] == ["Id", "Qty"]
+    assert "Lignes modifiées" in result.stdout
+
+
+def test_table_upsert_requires_key(mock_table_mgr, tmp_path):
+    """--key is mandatory."""
+    source = tmp_path / "changes.csv"
+    source.write_text("Id,Qty\n", encoding="utf-8")
+
+    result = runner.invoke(app, ["table", "upsert", "tbl_Sales", "--from", str(source)])
+
+    assert result.exit_code != 0
+    mock_table_mgr.upsert.assert_not_called()
@@ -357,7 +357,9 @@ class TestVBAList:
 
             assert result.exit_code == 0
             assert "test.xlsm" in result.stdout
-            mock_vba.list_modules.assert_called_once_with(workbook=Path(str(workbook)))
+            mock_vba.list_modules.assert_called_once_with(
+                workbook=Path(str(workbook)), helper=False
+            )
 
     def test_vba_list_project_access_error(self):
         """Test vba list with VBAProjectAccessError."""
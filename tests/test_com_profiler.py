@@ -0,0 +1,193 @@
+"""
+Tests for the COM call profiler.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+from functools import partial
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app as cli_app
+from xlmanage.com_profiler import (
+    ComProfile,
+    MemberStats,
+    ProfiledDispatch,
+    current_profile,
+    profiling,
+)
+from xlmanage.excel_manager import ExcelManager
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+from xlmanage.worksheet_manager import WorksheetManager
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def app():
+    """FakeExcel with an active workbook "data.xlsx" (three sheets)."""
+    fake = FakeExcel()
+    fake.add_workbook("data.xlsx", ["Data", "Summary", "Notes"])
+    return fake
+
+
+@pytest.fixture
+def mgr(app):
+    """Started ExcelManager connected to the fake application."""
+    return fake_excel_manager(app)
+
+
+class TestMemberStats:
+    """Aggregation of the calls to one member."""
+
+    def test_add_and_histogram(self):
+        stats = MemberStats("Name", "get")
+        stats.add(0.000_005)
+        stats.add(0.002)
+
+        assert stats.count == 2
+        assert stats.max == 0.002
+        assert stats.mean == pytest.approx(0.0010025)
+        assert stats.to_dict()["histogram"] == {"<=10us": 1, "<=5000us": 1}
+
+
+class TestProfiledDispatch:
+    """Recording of gets, sets, calls and iteration."""
+
+    def test_disabled_by_default(self, mgr, app):
+        assert current_profile() is None
+        assert mgr.app is app
+
+    def test_app_wrapped_while_profiling(self, mgr, app):
+        with profiling() as profile:
+            assert isinstance(mgr.app, ProfiledDispatch)
+            assert current_profile() is profile
+        assert mgr.app is app
+
+    def test_records_by_member(self, mgr, app):
+        with profiling() as profile:
+            ws = mgr.app.ActiveWorkbook.Worksheets("Data")
+            ws.Name = "Sales"
+            ws.Range("A1").Value2 = 42
+            assert ws.Range("A1").Value2 == 42.0
+
+        assert app.ActiveWorkbook.Worksheets(1).Name == "Sales"
+        assert profile.count("ActiveWorkbook", "get") == 1
+        assert profile.count("Worksheets", "call") == 1
+        assert profile.count("Name", "set") == 1
+        assert profile.count("Range", "call") == 2
+        assert profile.count("Value2") == 2
+        assert profile.total_calls == 8
+
+    def test_iteration_and_len(self, mgr):
+        with profiling() as profile:
+            sheets = mgr.app.ActiveWorkbook.Worksheets
+            names = [ws.Name for ws in sheets]
+
+        assert names == ["Data", "Summary", "Notes"]
+        # One "next" per sheet plus the one ending the iteration
+        assert profile.count("Worksheets", "next") == 4
+        assert profile.count("Name", "get") == 3
+
+    def test_arguments_unwrapped(self, mgr, app):
+        with profiling():
+            wb = mgr.app.ActiveWorkbook
+            wb.Worksheets.Add(After=wb.Worksheets("Notes"))
+            names = [ws.Name for ws in wb.Worksheets]
+
+        assert names[-1].startswith("Sheet")
+        assert app.ActiveWorkbook.Worksheets.Count == 4
+
+    def test_proxy_semantics(self, mgr, app):
+        with profiling():
+            first = mgr.app.ActiveWorkbook.Worksheets(1)
+            again = mgr.app.ActiveWorkbook.Worksheets("Data")
+
+        assert first == again
+        assert hash(first) == hash(app.ActiveWorkbook.Worksheets(1))
+        assert bool(first)
+
+    def test_nested_profiling_restores_previous(self):
+        with profiling() as outer:
+            with profiling() as inner:
+                assert current_profile() is inner
+            assert current_profile() is outer
+        assert current_profile() is None
+
+
+class TestComProfile:
+    """Reports built from the recorded calls."""
+
+    def test_worksheet_list_calls_per_sheet(self, mgr):
+        """The profile shows how many calls list() makes per sheet."""
+        with profiling() as one:
+            WorksheetManager(mgr).list()
+        WorksheetManager(mgr).create("Extra")
+        with profiling() as two:
+            WorksheetManager(mgr).list()
+
+        assert two.count("Name", "get") == one.count("Name", "get") * 4 // 3
+        assert two.total_calls > one.total_calls
+
+    def test_top(self, mgr, app):
+        app.ActiveWorkbook.sheet("Data").add_table("tbl_A", "A1:B3")
+        with profiling() as profile:
+            TableManager(mgr).list()
+
+        by_count = profile.top(2, by="count")
+        assert len(by_count) == 2
+        assert by_count[0].count >= by_count[1].count
+        assert profile.top(100) == profile.stats()
+        with pytest.raises(ValueError):
+            profile.top(3, by="name")
+
+    def test_trace(self, mgr, tmp_path):
+        profile = ComProfile(max_events=3)
+        with profiling(profile):
+            WorksheetManager(mgr).list()
+
+        output = tmp_path / "trace.json"
+        profile.write(output, command="worksheet list")
+        trace = json.loads(output.read_text(encoding="utf-8"))
+
+        assert trace["command"] == "worksheet list"
+        assert trace["total_calls"] == profile.total_calls
+        assert len(trace["events"]) == 3
+        assert trace["events_dropped"] == profile.total_calls - 3
+        assert sum(m["count"] for m in trace["members"]) == profile.total_calls
+
+
+def test_cli_profile(app, tmp_path, monkeypatch):
+    """--profile prints the top members and writes the JSON trace."""
+    monkeypatch.setattr(
+        "xlmanage.cli.ExcelManager", partial(ExcelManager, app_factory=lambda: app)
+    )
+    output = tmp_path / "profile.json"
+    args = ["--profile", "--profile-output", str(output), "worksheet", "list"]
+    monkeypatch.setattr("sys.argv", ["xlmanage", *args])
+
+    result = runner.invoke(cli_app, args)
+
+    assert result.exit_code == 0
+    assert "Summary" in result.stdout
+    assert "Profil COM" in result.stderr
+    trace = json.loads(output.read_text(encoding="utf-8"))
+    assert trace["command"].endswith("worksheet list")
+    assert trace["total_calls"] > 0
+    assert current_profile() is None
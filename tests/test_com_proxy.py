@@ -0,0 +1,80 @@
+"""
+Tests for the base of the COM proxies.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from xlmanage.com_profiler import ComProfile, ProfiledDispatch
+from xlmanage.com_proxy import DispatchProxy, is_com_object
+from xlmanage.com_retry import RetryingDispatch, RetryPolicy
+from xlmanage.testing import FakeExcel
+
+
+class _Recorder(DispatchProxy):
+    """Proxy listing its round trips."""
+
+    __slots__ = ("_log",)
+
+    def __init__(self, target, log, member="Application"):
+        super().__init__(target, member)
+        object.__setattr__(self, "_log", log)
+
+    def _invoke(self, kind, member, func, *args):
+        self._log.append((kind, member))
+        return func(*args)
+
+    def _wrap(self, value, member):
+        return _Recorder(value, self._log, member)
+
+
+def test_round_trips_go_through_invoke():
+    app = FakeExcel()
+    app.add_workbook("a.xlsx", ["Data"])
+    log = []
+    proxy = _Recorder(app, log)
+
+    proxy.DisplayAlerts = False
+    sheets = proxy.Workbooks(1).Worksheets
+    names = [sheet.Name for sheet in sheets]
+
+    assert names == ["Data"]
+    assert isinstance(sheets, _Recorder)
+    assert log == [
+        ("set", "DisplayAlerts"),
+        ("get", "Workbooks"),
+        ("call", "Workbooks"),
+        ("get", "Worksheets"),
+        ("iter", "Worksheets"),
+        ("next", "Worksheets"),
+        ("get", "Name"),
+        ("next", "Worksheets"),
+    ]
+
+
+def test_stacked_proxies_unwrap_their_own_layer():
+    app = FakeExcel()
+    app.add_workbook("a.xlsx", ["Data"])
+    profile = ComProfile()
+    proxy = profile.wrap(RetryPolicy().wrap(app))
+
+    workbook = proxy.Workbooks(1)
+
+    assert isinstance(workbook, ProfiledDispatch)
+    inner = object.__getattribute__(workbook, "_target")
+    assert isinstance(inner, RetryingDispatch)
+    assert ProfiledDispatch._unwrap(workbook) is inner
+    assert RetryingDispatch._unwrap(workbook) is workbook
+    assert is_com_object(inner)
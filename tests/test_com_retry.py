@@ -0,0 +1,296 @@
+"""
+Tests for the COM retry policy.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import threading
+from functools import partial
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app as cli_app
+from xlmanage.com_profiler import profiling
+from xlmanage.com_retry import (
+    RPC_E_SERVERCALL_RETRYLATER,
+    VBA_E_IGNORE,
+    RetryingDispatch,
+    RetryPolicy,
+    current_retry_policy,
+    is_retryable,
+    retrying,
+)
+from xlmanage.excel_manager import ExcelManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+from xlmanage.testing.fake_excel import HRESULT_EXCEL_ERROR, com_error
+from xlmanage.worksheet_manager import WorksheetManager
+
+runner = CliRunner()
+
+
+class FakeClock:
+    """Clock advanced by the sleeps of the policy."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def policy(clock):
+    return RetryPolicy(
+        initial_delay=0.1,
+        max_delay=1.0,
+        deadline=5.0,
+        jitter=0.0,
+        sleep=clock.sleep,
+        clock=clock,
+    )
+
+
+@pytest.fixture
+def app():
+    fake = FakeExcel()
+    fake.add_workbook("data.xlsx", ["Data", "Summary"])
+    return fake
+
+
+def _refusals(count, hresult=-2147418111):
+    """Function failing count times with a busy error, then returning 42."""
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) <= count:
+            raise com_error(hresult, "busy", None, None)
+        return 42
+
+    return func, calls
+
+
+class TestRetryPolicy:
+    """Backoff, deadline and statistics."""
+
+    def test_backoff_doubles_up_to_max_delay(self, policy, clock):
+        func, calls = _refusals(6)
+
+        assert policy.call(func) == 42
+
+        assert len(calls) == 7
+        assert clock.sleeps == [0.1, 0.2, 0.4, 0.8, 1.0, 1.0]
+        assert policy.stats.retries == 6
+        assert policy.stats.wait_time == pytest.approx(3.5)
+
+    def test_gives_up_at_deadline(self, policy, clock):
+        func, calls = _refusals(100)
+
+        with pytest.raises(com_error):
+            policy.call(func)
+
+        assert clock.now == pytest.approx(5.0)
+        assert policy.stats.gave_up == 1
+
+    def test_other_errors_not_retried(self, policy, clock):
+        func, calls = _refusals(1, HRESULT_EXCEL_ERROR)
+
+        with pytest.raises(com_error):
+            policy.call(func)
+
+        assert len(calls) == 1
+        assert clock.sleeps == []
+
+    @pytest.mark.parametrize(
+        "hresult", [RPC_E_SERVERCALL_RETRYLATER, VBA_E_IGNORE, 0x80010001]
+    )
+    def test_retryable_hresults(self, hresult):
+        assert is_retryable(com_error(hresult, "busy", None, None))
+        assert not is_retryable(com_error(HRESULT_EXCEL_ERROR, "", None, None))
+        assert not is_retryable(ValueError())
+
+    def test_jitter_spreads_delays(self):
+        policy = RetryPolicy(initial_delay=1.0, max_delay=10.0, jitter=0.5)
+
+        delays = {policy.delay(1) for _ in range(20)}
+
+        assert len(delays) > 1
+        assert all(0.5 <= delay <= 1.5 for delay in delays)
+
+    def test_filter_delay(self, policy):
+        assert policy.filter_delay(0) == 100
+        assert policy.filter_delay(800) == 800
+        assert policy.filter_delay(3000) == 1000
+        assert policy.filter_delay(5000) == -1
+        assert policy.stats.filter_retries == 3
+        assert policy.stats.gave_up == 1
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"initial_delay": 0},
+            {"max_delay": -1},
+            {"deadline": 0},
+            {"multiplier": 0.5},
+            {"jitter": 1.0},
+        ],
+    )
+    def test_invalid_settings(self, kwargs):
+        with pytest.raises(ValueError):
+            RetryPolicy(**kwargs)
+
+
+class TestRetryingDispatch:
+    """Calls through ExcelManager.app retried while Excel is busy."""
+
+    def test_disabled_by_default(self, app):
+        mgr = fake_excel_manager(app)
+
+        assert current_retry_policy() is None
+        assert mgr.app is app
+
+    def test_busy_excel_does_not_fail_managers(self, app, policy):
+        mgr = fake_excel_manager(app)
+
+        with retrying(policy):
+            assert isinstance(mgr.app, RetryingDispatch)
+            app.busy(3)
+            names = [info.name for info in WorksheetManager(mgr).list()]
+
+        assert names == ["Data", "Summary"]
+        assert app.counter.rejected == 3
+        assert policy.stats.retries == 3
+        assert current_retry_policy() is None
+
+    def test_busy_excel_fails_without_policy(self, app):
+        mgr = fake_excel_manager(app)
+        app.busy(1)
+
+        with pytest.raises(com_error):
+            mgr.app.ActiveWorkbook.Name
+
+    def test_sets_calls_and_iteration(self, app, policy):
+        mgr = fake_excel_manager(app)
+
+        with retrying(policy):
+            wb = mgr.app.ActiveWorkbook
+            app.busy(1)
+            sheet = wb.Worksheets("Data")
+            app.busy(1)
+            sheet.Name = "Sales"
+            app.busy(1)
+            sheet.Range("A1").Value2 = 7
+            app.busy(1)
+            names = [ws.Name for ws in wb.Worksheets]
+
+        assert names == ["Sales", "Summary"]
+        assert app.ActiveWorkbook.Worksheets(1).Range("A1").Value2 == 7.0
+        assert policy.stats.retries == 4
+
+    def test_arguments_unwrapped(self, app, policy):
+        mgr = fake_excel_manager(app)
+
+        with retrying(policy):
+            wb = mgr.app.ActiveWorkbook
+            wb.Worksheets.Add(After=wb.Worksheets("Summary"))
+
+        assert app.ActiveWorkbook.Worksheets.Count == 3
+
+    def test_retries_in_profile(self, app, policy):
+        mgr = fake_excel_manager(app)
+
+        with retrying(policy), profiling() as profile:
+            app.busy(2)
+            mgr.app.ActiveWorkbook.Name
+
+        assert profile.total_retries == 2
+        assert profile.total_retry_wait == pytest.approx(0.3)
+        assert profile.retries() == {"ActiveWorkbook": (2, pytest.approx(0.3))}
+        trace = profile.to_dict()
+        assert trace["retries"] == 2
+        assert trace["retried_members"]["ActiveWorkbook"]["count"] == 2
+
+    def test_policy_scoped_to_thread(self, app, policy):
+        mgr = fake_excel_manager(app)
+        seen = []
+
+        with retrying(policy):
+            thread = threading.Thread(
+                target=lambda: seen.append((current_retry_policy(), mgr.app))
+            )
+            thread.start()
+            thread.join(5)
+
+        assert seen == [(None, app)]
+
+    def test_nested_retrying_restores_previous(self, policy):
+        with retrying() as outer:
+            with retrying(policy):
+                assert current_retry_policy() is policy
+            assert current_retry_policy() is outer
+        assert current_retry_policy() is None
+
+
+def test_cli_busy_excel_retried(app, tmp_path, monkeypatch):
+    """CLI commands retry the calls refused by a busy Excel."""
+    monkeypatch.setattr(
+        "xlmanage.cli.ExcelManager", partial(ExcelManager, app_factory=lambda: app)
+    )
+    monkeypatch.setattr("time.sleep", lambda seconds: None)
+    output = tmp_path / "profile.json"
+    args = [
+        "--busy-timeout",
+        "30",
+        "--profile",
+        "--profile-output",
+        str(output),
+        "worksheet",
+        "list",
+    ]
+    monkeypatch.setattr("sys.argv", ["xlmanage", *args])
+    app.busy(2)
+
+    result = runner.invoke(cli_app, args)
+
+    assert result.exit_code == 0
+    assert "Summary" in result.stdout
+    assert "Excel occupé" in result.stderr
+    assert json.loads(output.read_text(encoding="utf-8"))["retries"] == 2
+    assert current_retry_policy() is None
+
+
+def test_cli_retries_are_opt_in(app, monkeypatch):
+    monkeypatch.setattr(
+        "xlmanage.cli.ExcelManager", partial(ExcelManager, app_factory=lambda: app)
+    )
+    app.busy(1)
+
+    result = runner.invoke(cli_app, ["worksheet", "list"])
+
+    assert result.exit_code != 0
+    assert app.counter.rejected == 1
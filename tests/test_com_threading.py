@@ -0,0 +1,60 @@
+"""
+Tests for the hand-off of COM references between threads.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+from xlmanage.com_threading import Marshaled, marshal_dispatch, unmarshal_dispatch
+from xlmanage.testing import FakeExcel
+
+
+def test_in_process_objects_pass_through():
+    """Objects without COM reference (FakeExcel) are handed out as is."""
+    app = FakeExcel()
+    received = []
+
+    token = marshal_dispatch(app)
+    thread = threading.Thread(target=lambda: received.append(unmarshal_dispatch(token)))
+    thread.start()
+    thread.join(5)
+
+    assert token is app
+    assert received == [app]
+
+
+def test_com_reference_goes_through_a_stream():
+    """COM references are marshaled into a stream, unmarshaled once."""
+    pythoncom = Mock()
+    app = Mock(_oleobj_="oleobj")
+
+    with (
+        patch("xlmanage.com_threading.pythoncom", pythoncom),
+        patch("xlmanage.com_threading.win32com", create=True) as win32com,
+    ):
+        token = marshal_dispatch(app)
+        proxy = unmarshal_dispatch(token)
+
+    assert isinstance(token, Marshaled)
+    pythoncom.CoMarshalInterThreadInterfaceInStream.assert_called_once_with(
+        pythoncom.IID_IDispatch, "oleobj"
+    )
+    pythoncom.CoGetInterfaceAndReleaseStream.assert_called_once_with(
+        token.stream, pythoncom.IID_IDispatch
+    )
+    assert proxy is win32com.client.Dispatch.return_value
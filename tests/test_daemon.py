@@ -0,0 +1,381 @@
+"""
+Tests for the xlmanage daemon (server, client and wire format).
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import socket
+import stat
+import sys
+import tempfile
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from xlmanage.daemon import (
+    AUTHKEY_FILE,
+    DaemonClient,
+    DaemonServer,
+    DaemonSession,
+    _authkey,
+    _decode_error,
+    _encode_error,
+    _runtime_dir,
+    decode,
+    encode,
+    resolve_paths,
+)
+from xlmanage.excel_manager import InstanceInfo
+from xlmanage.exceptions import (
+    DaemonAlreadyRunningError,
+    DaemonConnectionError,
+    ExcelManageError,
+    OperationError,
+    WorkbookNotFoundError,
+)
+from xlmanage.workbook_manager import WorkbookInfo, WorkbookManager
+
+
+def _unique_address() -> str:
+    """Return a fresh address usable by multiprocessing.connection."""
+    token = uuid.uuid4().hex[:8]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\xlmanage-test-{token}"
+    return str(Path(tempfile.gettempdir()) / f"xlm-test-{token}.sock")
+
+
+@pytest.fixture(autouse=True)
+def private_dir(tmp_path, monkeypatch):
+    """Keep the daemon key of the tests out of the user's directory."""
+    directory = tmp_path / "run"
+    directory.mkdir(mode=0o700)
+    monkeypatch.delenv("XLMANAGE_DAEMON_AUTHKEY", raising=False)
+    monkeypatch.setattr("xlmanage.daemon._runtime_dir", lambda: directory)
+    return directory
+
+
+@pytest.fixture
+def excel_mgr():
+    """Mock ExcelManager created by the daemon session factory."""
+    mgr = Mock()
+    mgr.get_running_instance.return_value = InstanceInfo(
+        pid=1234, hwnd=5678, workbooks_count=1, visible=False
+    )
+    return mgr
+
+
+@pytest.fixture
+def daemon(excel_mgr):
+    """Daemon running in a background thread with a mocked ExcelManager."""
+    server = DaemonServer(_unique_address(), manager_factory=lambda: excel_mgr)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    assert server.wait_ready(5)
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+class TestWireFormat:
+    """Tests for encode()/decode()."""
+
+    def test_roundtrip_preserves_types(self):
+        """Paths, datetimes, tuples and non-string keys survive a roundtrip."""
+        value = {
+            "path": Path("C:/data/a.xlsx"),
+            "when": datetime(2024, 5, 6, 7, 8, 9),
+            "array": (1, "x", None),
+            1: [True, 2.5],
+        }
+
+        assert decode(encode(value)) == value
+
+    def test_roundtrip_dataclass(self):
+        """xlmanage dataclasses are restored with their class."""
+        info = WorkbookInfo(
+            name="a.xlsx",
+            full_path=Path("C:/a.xlsx"),
+            read_only=False,
+            saved=True,
+            sheets_count=3,
+        )
+
+        restored = decode(encode(info))
+
+        assert isinstance(restored, WorkbookInfo)
+        assert restored == info
+
+    def test_foreign_dataclass_decodes_to_dict(self):
+        """Dataclasses outside xlmanage are never imported by decode()."""
+        payload = {"__dataclass__": "os:PathLike", "fields": {"a": 1}}
+
+        assert decode(payload) == {"a": 1}
+
+    def test_error_roundtrip_keeps_attributes(self):
+        """xlmanage exceptions keep their class and attributes."""
+        error = WorkbookNotFoundError(Path("C:/missing.xlsx"), "introuvable")
+
+        restored = _decode_error(_encode_error(error))
+
+        assert isinstance(restored, WorkbookNotFoundError)
+        assert restored.path == Path("C:/missing.xlsx")
+        assert str(restored) == str(error)
+
+    def test_foreign_error_becomes_excel_manage_error(self):
+        """Non-xlmanage exceptions are wrapped in ExcelManageError."""
+        restored = _decode_error(_encode_error(RuntimeError("boom")))
+
+        assert type(restored) is ExcelManageError
+        assert "RuntimeError: boom" in str(restored)
+
+    def test_resolve_paths(self, tmp_path, monkeypatch):
+        """Nested paths are made absolute, other values are kept."""
+        monkeypatch.chdir(tmp_path)
+
+        resolved = resolve_paths([Path("a.xlsx"), ("x", {"out": Path("b")}), 1])
+
+        assert resolved == [
+            tmp_path.resolve() / "a.xlsx",
+            ("x", {"out": tmp_path.resolve() / "b"}),
+            1,
+        ]
+
+
+class TestAuthentication:
+    """Tests for the per-user key and private directory."""
+
+    def test_authkey_generated_once(self, private_dir):
+        """The key is random, stored in the private directory and reused."""
+        key = _authkey()
+
+        assert len(key) == 64
+        assert _authkey() == key
+        assert (private_dir / AUTHKEY_FILE).read_bytes() == key
+        if sys.platform != "win32":
+            mode = (private_dir / AUTHKEY_FILE).stat().st_mode
+            assert stat.S_IMODE(mode) == 0o600
+
+    def test_authkey_env_override(self, monkeypatch, private_dir):
+        """XLMANAGE_DAEMON_AUTHKEY takes precedence over the key file."""
+        monkeypatch.setenv("XLMANAGE_DAEMON_AUTHKEY", "secret")
+
+        assert _authkey() == b"secret"
+        assert not (private_dir / AUTHKEY_FILE).exists()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_runtime_dir_private(self, tmp_path, monkeypatch):
+        """The directory is restricted to its owner."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        (tmp_path / "xlmanage").mkdir(mode=0o755)
+
+        directory = _runtime_dir()
+
+        assert directory == tmp_path / "xlmanage"
+        assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+    def test_runtime_dir_refuses_symlink(self, tmp_path, monkeypatch):
+        """A directory planted as a symlink is not trusted."""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        (tmp_path / "elsewhere").mkdir()
+        (tmp_path / "xlmanage").symlink_to(tmp_path / "elsewhere")
+
+        with pytest.raises(PermissionError):
+            _runtime_dir()
+
+    def test_wrong_key_rejected(self, daemon, monkeypatch):
+        """A client with another key gets a DaemonConnectionError."""
+        monkeypatch.setenv("XLMANAGE_DAEMON_AUTHKEY", "wrong")
+
+        with pytest.raises(DaemonConnectionError) as exc_info:
+            DaemonClient(daemon.address).connect()
+
+        assert "authentication" in exc_info.value.message
+        # The daemon keeps serving the clients with the right key
+        monkeypatch.delenv("XLMANAGE_DAEMON_AUTHKEY")
+        with DaemonClient(daemon.address) as client:
+            assert client.call("daemon.ping") == "pong"
+
+
+class TestDaemonServer:
+    """Tests for DaemonServer.handle() without any transport."""
+
+    def test_handle_ping(self):
+        """daemon.ping answers without creating a session."""
+        factory = Mock()
+        server = DaemonServer("unused", manager_factory=factory)
+
+        response = server.handle({"op": "daemon.ping"})
+
+        assert response["ok"] is True
+        assert response["result"] == "pong"
+        assert response["elapsed"] >= 0
+        factory.assert_not_called()
+
+    def test_session_started_once(self, excel_mgr):
+        """The session ExcelManager is created and started only once."""
+        factory = Mock(return_value=excel_mgr)
+        server = DaemonServer("unused", manager_factory=factory)
+
+        server.handle({"op": "excel.get_running_instance"})
+        server.handle({"op": "excel.get_running_instance"})
+
+        factory.assert_called_once_with()
+        excel_mgr.start.assert_called_once_with()
+        assert server.handle({"op": "daemon.sessions"})["result"] == ["default"]
+
+    def test_handle_error(self, excel_mgr):
+        """Errors are returned in the response instead of being raised."""
+        server = DaemonServer("unused", manager_factory=lambda: excel_mgr)
+
+        response = server.handle({"op": "nope"})
+
+        assert response["ok"] is False
+        assert isinstance(_decode_error(response["error"]), OperationError)
+
+
+class TestDaemonClient:
+    """End-to-end tests over a real local connection."""
+
+    def test_call_returns_typed_result(self, daemon):
+        """Results keep their dataclass type on the client side."""
+        with DaemonClient(daemon.address) as client:
+            info = client.call("excel.get_running_instance")
+
+        assert isinstance(info, InstanceInfo)
+        assert info.pid == 1234
+
+    def test_ping(self, daemon):
+        """ping() returns a positive round-trip time."""
+        with DaemonClient(daemon.address) as client:
+            assert client.ping() > 0
+
+    def test_error_reraised_on_client(self, daemon, excel_mgr):
+        """Manager errors are re-raised with their original class."""
+        excel_mgr.get_running_instance.side_effect = WorkbookNotFoundError(
+            Path("C:/x.xlsx")
+        )
+
+        with DaemonClient(daemon.address) as client:
+            with pytest.raises(WorkbookNotFoundError) as exc_info:
+                client.call("excel.get_running_instance")
+
+        assert exc_info.value.path == Path("C:/x.xlsx")
+
+    def test_relative_paths_resolved_by_client(
+        self, daemon, excel_mgr, monkeypatch, tmp_path
+    ):
+        """Relative paths reach the daemon resolved against the client cwd."""
+        received = {}
+        monkeypatch.setattr(
+            WorkbookManager,
+            "open",
+            lambda self, path, read_only=False: received.setdefault("path", path),
+        )
+        monkeypatch.chdir(tmp_path)
+
+        with DaemonSession(daemon.address) as session:
+            session.manager(WorkbookManager).open(Path("data.xlsx"), read_only=True)
+
+        assert received["path"] == tmp_path.resolve() / "data.xlsx"
+
+    def test_relative_string_paths_resolved_by_client(
+        self, daemon, monkeypatch, tmp_path
+    ):
+        """Paths given as strings, as in a batch file, are resolved too."""
+        received = []
+        monkeypatch.setattr(
+            WorkbookManager,
+            "open",
+            lambda self, path, read_only=False: received.append(path),
+        )
+        monkeypatch.chdir(tmp_path)
+
+        with DaemonClient(daemon.address) as client:
+            client.call("workbook.open", kwargs={"path": "data.xlsx"})
+            client.call("workbook.open", ["sub/other.xlsx"], {"read_only": True})
+
+        assert received == [
+            tmp_path.resolve() / "data.xlsx",
+            tmp_path.resolve() / "sub" / "other.xlsx",
+        ]
+
+    def test_session_forwards_manager_calls(self, daemon, monkeypatch):
+        """DaemonSession hands out managers whose calls run in the daemon."""
+        remote_list = Mock(return_value=[])
+        monkeypatch.setattr(WorkbookManager, "list", lambda self: remote_list())
+
+        with DaemonSession(daemon.address) as session:
+            session.start()
+            assert session.manager(WorkbookManager).list() == []
+
+        remote_list.assert_called_once_with()
+
+    def test_connect_without_daemon(self):
+        """Connecting to an address without daemon raises DaemonConnectionError."""
+        address = _unique_address()
+
+        with pytest.raises(DaemonConnectionError) as exc_info:
+            DaemonClient(address).connect()
+
+        assert exc_info.value.address == address
+
+    def test_second_daemon_refused(self, daemon, excel_mgr):
+        """A daemon does not take over the address of a running one."""
+        second = DaemonServer(daemon.address, manager_factory=lambda: excel_mgr)
+
+        with pytest.raises(DaemonAlreadyRunningError):
+            second.serve_forever()
+
+        with DaemonClient(daemon.address) as client:
+            assert client.call("daemon.ping") == "pong"
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Unix domain socket")
+    def test_stale_socket_replaced(self, excel_mgr):
+        """The socket left by a killed daemon is removed at startup."""
+        address = _unique_address()
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(address)
+        stale.close()
+
+        server = DaemonServer(address, manager_factory=lambda: excel_mgr)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert server.wait_ready(5)
+
+        with DaemonClient(address) as client:
+            client.shutdown()
+        thread.join(5)
+        assert not thread.is_alive()
+
+    def test_shutdown_stops_server(self, excel_mgr):
+        """daemon.shutdown disconnects the sessions and stops the server."""
+        server = DaemonServer(_unique_address(), manager_factory=lambda: excel_mgr)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert server.wait_ready(5)
+
+        with DaemonClient(server.address) as client:
+            client.call("excel.get_running_instance")
+            client.shutdown()
+
+        thread.join(5)
+        assert not thread.is_alive()
+        excel_mgr.disconnect.assert_called_once_with()
@@ -0,0 +1,218 @@
+"""
+Tests for the pool of isolated Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.batch import parse_step, workbook_job
+from xlmanage.cli import app as cli_app
+from xlmanage.excel_pool import ExcelPool
+from xlmanage.exceptions import OperationError
+from xlmanage.testing import FakeExcel
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def workbooks(tmp_path):
+    """Three workbook files written by FakeExcel, each with one table."""
+    fake = FakeExcel()
+    paths = []
+    for i in range(1, 4):
+        workbook = fake.add_workbook(f"Book{i}.xlsx", ["Data"])
+        sheet = workbook.Worksheets("Data")
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]])
+        sheet.add_table(f"tbl_{i}", "A1:B3")
+        path = tmp_path / f"Book{i}.xlsx"
+        workbook.SaveAs(str(path))
+        paths.append(path)
+    return paths
+
+
+class TestExcelPool:
+    """Jobs spread over isolated instances."""
+
+    def test_instances_run_in_parallel(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def job(mgr, item):
+            # Deadlocks (then breaks) unless three workers run at once
+            barrier.wait()
+            return id(mgr.app)
+
+        with ExcelPool(3, app_factory=FakeExcel) as pool:
+            results = pool.map(job, range(3))
+
+        assert all(result.success for result in results)
+        assert {result.worker for result in results} == {0, 1, 2}
+        # One Application object per worker
+        assert len({result.result for result in results}) == 3
+
+    def test_map_keeps_input_order(self):
+        with ExcelPool(2, app_factory=FakeExcel) as pool:
+            results = pool.map(lambda mgr, item: item * 2, range(20))
+
+        assert [result.index for result in results] == list(range(20))
+        assert [result.result for result in results] == list(range(0, 40, 2))
+
+    def test_job_error_is_not_retried(self):
+        def job(mgr, item):
+            raise KeyError(item)
+
+        with ExcelPool(1, retries=2, app_factory=FakeExcel) as pool:
+            [result] = pool.map(job, ["Book1.xlsx"])
+
+        assert not result.success
+        assert result.error_type == "KeyError"
+        assert result.attempts == 1
+        assert pool.recycled == 0
+
+    def test_crashed_instance_is_recycled_and_job_retried(self):
+        crashed = []
+
+        def job(mgr, item):
+            if not crashed:
+                crashed.append(mgr.app)
+                mgr.app.crash()
+            return mgr.app.Workbooks.Count
+
+        with ExcelPool(1, app_factory=FakeExcel) as pool:
+            [result] = pool.map(job, ["Book1.xlsx"])
+            # The next jobs run on the new instance
+            assert pool.map(job, ["Book2.xlsx"])[0].attempts == 1
+
+        assert result.success
+        assert result.attempts == 2
+        assert pool.recycled == 1
+
+    def test_retries_exhausted(self):
+        def job(mgr, item):
+            mgr.app.crash()
+            return mgr.app.Workbooks.Count
+
+        with ExcelPool(1, retries=2, app_factory=FakeExcel) as pool:
+            [result] = pool.map(job, ["Book1.xlsx"])
+
+        assert not result.success
+        assert result.error_type == "com_error"
+        assert result.attempts == 3
+        assert pool.recycled == 3
+
+    def test_workbooks_closed_between_jobs(self):
+        def job(mgr, item):
+            mgr.app.Workbooks.Add()
+            return mgr.app.Workbooks.Count
+
+        with ExcelPool(1, app_factory=FakeExcel) as pool:
+            results = pool.map(job, range(5))
+
+        assert [result.result for result in results] == [1] * 5
+
+    @pytest.mark.parametrize("size, retries", [(0, 1), (2, -1)])
+    def test_invalid_arguments(self, size, retries):
+        with pytest.raises(ValueError):
+            ExcelPool(size, retries=retries)
+
+
+class TestWorkbookJob:
+    """Batch steps run on each workbook of a pool."""
+
+    STEPS = [
+        '{"op": "table.list", "kwargs": {"workbook": "{workbook}"}}',
+        '{"op": "worksheet.create", "args": ["Summary"], '
+        '"kwargs": {"workbook": "{workbook}"}}',
+    ]
+
+    def test_steps_run_on_each_workbook(self, workbooks):
+        steps = [parse_step(i, text) for i, text in enumerate(self.STEPS, start=1)]
+
+        with ExcelPool(2, app_factory=FakeExcel) as pool:
+            results = pool.map(workbook_job(steps), workbooks)
+
+        assert all(result.success for result in results)
+        assert [result.result[0][0]["name"] for result in results] == [
+            "tbl_1",
+            "tbl_2",
+            "tbl_3",
+        ]
+        # Saved: the new worksheet is in the file
+        snapshot = json.loads(workbooks[0].read_text(encoding="utf-8"))
+        assert [sheet["name"] for sheet in snapshot["sheets"]] == ["Data", "Summary"]
+
+    def test_failing_step_fails_the_workbook(self, workbooks):
+        steps = [parse_step(1, '{"op": "worksheet.delete", "args": ["Missing"]}')]
+
+        with ExcelPool(1, app_factory=FakeExcel) as pool:
+            [result] = pool.map(workbook_job(steps, save=False), workbooks[:1])
+
+        assert not result.success
+        assert result.attempts == 1
+        assert result.error_type == OperationError.__name__
+        assert "line 1: WorksheetNotFoundError" in result.error_message
+
+
+class TestPoolRunCommand:
+    """xlmanage pool run."""
+
+    @patch("xlmanage.excel_pool._dispatch_isolated", FakeExcel)
+    def test_pool_run(self, workbooks, tmp_path):
+        ops = tmp_path / "ops.jsonl"
+        ops.write_text(
+            '{"op": "table.list", "kwargs": {"workbook": "{workbook}"}}\n',
+            encoding="utf-8",
+        )
+
+        result = runner.invoke(
+            cli_app, ["pool", "run", str(ops), *map(str, workbooks), "-n", "2"]
+        )
+
+        assert result.exit_code == 0, result.output
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert sorted(record["workbook"] for record in records[:-1]) == [
+            str(path.resolve()) for path in workbooks
+        ]
+        assert all(record["ok"] for record in records[:-1])
+        assert records[-1]["summary"]["succeeded"] == 3
+
+    def test_invalid_operation_line(self, workbooks, tmp_path):
+        ops = tmp_path / "ops.jsonl"
+        ops.write_text("not json\n", encoding="utf-8")
+
+        result = runner.invoke(cli_app, ["pool", "run", str(ops), str(workbooks[0])])
+
+        assert result.exit_code == 1
+        assert "line 1" in result.output
+
+    @patch("xlmanage.excel_standby._dispatch_isolated", FakeExcel)
+    def test_pool_run_with_standby(self, workbooks, tmp_path):
+        ops = tmp_path / "ops.jsonl"
+        ops.write_text('{"op": "worksheet.list"}\n', encoding="utf-8")
+
+        result = runner.invoke(
+            cli_app, ["pool", "run", str(ops), *map(str, workbooks), "--standby", "1"]
+        )
+
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.stdout.splitlines()[-1])["summary"]
+        assert summary["succeeded"] == 3
+        assert summary["standby"]["launched"] >= 1
@@ -0,0 +1,204 @@
+"""
+Tests for warm standby Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from xlmanage import excel_standby
+from xlmanage.excel_manager import ExcelManager, Visibility
+from xlmanage.excel_pool import ExcelPool
+from xlmanage.excel_standby import StandbyStats, WarmStandby
+from xlmanage.testing import FakeExcel
+
+# Cold start of the fake launcher, in seconds
+STARTUP = 0.2
+
+
+class SlowLauncher:
+    """Launches FakeExcel instances after a simulated cold start."""
+
+    def __init__(self, delay=STARTUP, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.apps = []
+        self.threads = set()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Excel failed to start")
+        app = FakeExcel()
+        self.apps.append(app)
+        return app
+
+
+@pytest.fixture
+def launcher():
+    return SlowLauncher()
+
+
+class TestWarmStandby:
+    """Handoff and background replenishment."""
+
+    def test_hit_is_handed_out_without_cold_start(self, launcher):
+        with WarmStandby(2, launcher=launcher) as standby:
+            assert standby.wait_ready(timeout=5)
+
+            started = time.perf_counter()
+            app = standby.acquire()
+            elapsed = time.perf_counter() - started
+
+            assert elapsed < STARTUP / 2
+            assert app is launcher.apps[0]
+            # Replaced in the background
+            assert standby.wait_ready(timeout=5)
+            stats = standby.stats
+
+        assert (stats.hits, stats.misses, stats.launched) == (1, 0, 3)
+        assert stats.hit_rate == 1.0
+        assert stats.mean_ready_ms >= STARTUP * 1000
+        assert launcher.threads == {"xlmanage-standby"}
+
+    def test_miss_launches_in_the_caller(self, launcher):
+        with WarmStandby(1, launcher=launcher) as standby:
+            app = standby.acquire()
+            stats = standby.stats
+
+        assert app in launcher.apps
+        assert (stats.hits, stats.misses) == (0, 1)
+        assert stats.hit_rate == 0.0
+        assert stats.mean_acquire_ms >= STARTUP * 1000
+        assert "MainThread" in launcher.threads
+
+    def test_instances_are_prepared(self, launcher):
+        with WarmStandby(1, launcher=launcher) as standby:
+            standby.wait_ready(timeout=5)
+            hit = standby.acquire()
+        miss = WarmStandby(1, launcher=launcher).acquire()
+
+        for app in (hit, miss):
+            assert app.Visible is False
+            assert app.ScreenUpdating is False
+            assert app.EnableEvents is False
+            assert app.DisplayAlerts is False
+
+    def test_without_optimizer_profile(self, launcher):
+        app = WarmStandby(1, launcher=launcher, optimize=False).acquire()
+
+        assert app.ScreenUpdating is True
+
+    def test_com_addins_disconnected(self):
+        addins = [SimpleNamespace(Connect=True), SimpleNamespace(Connect=False)]
+
+        class WithAddIns(FakeExcel):
+            COMAddIns = addins
+
+        WarmStandby(1, launcher=WithAddIns, disable_addins=True).acquire()
+
+        assert [addin.Connect for addin in addins] == [False, False]
+
+    def test_dead_instances_are_discarded(self, launcher):
+        with WarmStandby(2, launcher=launcher) as standby:
+            standby.wait_ready(timeout=5)
+            dead = list(launcher.apps)
+            for app in dead:
+                app.crash()
+
+            app = standby.acquire()
+            stats = standby.stats
+
+        assert app not in dead
+        assert app.Workbooks.Count == 0
+        assert stats.discarded == 2
+
+    def test_failed_launch_is_retried(self, monkeypatch):
+        monkeypatch.setattr(excel_standby, "LAUNCH_RETRY_DELAY", 0.01)
+        launcher = SlowLauncher(delay=0, failures=2)
+
+        with WarmStandby(1, launcher=launcher) as standby:
+            assert standby.wait_ready(timeout=5)
+            stats = standby.stats
+
+        assert stats.failed_launches == 2
+        assert stats.launched == 1
+
+    def test_close_releases_standby_instances(self, launcher):
+        standby = WarmStandby(2, launcher=launcher)
+        standby.start()
+        standby.wait_ready(timeout=5)
+
+        standby.close()
+
+        assert standby.ready == 0
+        assert standby.wait_ready(timeout=0) is False
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            WarmStandby(0)
+
+    def test_stats_to_dict(self):
+        stats = StandbyStats(hits=3, misses=1, launched=4, ready_ms_total=1000.0)
+
+        record = stats.to_dict()
+
+        assert record["hit_rate"] == 0.75
+        assert record["mean_ready_ms"] == 250.0
+
+
+class TestStandbyIntegration:
+    """ExcelManager and ExcelPool starting on standby instances."""
+
+    def test_excel_manager_app_factory(self, launcher):
+        with WarmStandby(1, launcher=launcher) as standby:
+            standby.wait_ready(timeout=5)
+            mgr = ExcelManager(Visibility.HIDE, app_factory=standby.acquire)
+
+            mgr.start()
+
+            assert mgr.app is launcher.apps[0]
+            assert standby.stats.hits == 1
+
+    def test_recycled_pool_worker_gets_a_ready_instance(self, launcher):
+        standby = WarmStandby(1, launcher=launcher)
+        standby.start()
+        standby.wait_ready(timeout=5)
+        crashed = []
+
+        def job(mgr, item):
+            if not crashed:
+                crashed.append(mgr.app)
+                mgr.app.crash()
+            return mgr.app.Workbooks.Count
+
+        with ExcelPool(1, standby=standby) as pool:
+            # The worker holds its first instance, wait for the replacement
+            pool.map(lambda mgr, item: None, [0])
+            standby.wait_ready(timeout=5)
+            [result] = pool.map(job, ["Book1.xlsx"])
+            stats = pool.standby_stats
+
+        assert result.success
+        assert result.attempts == 2
+        assert stats.hits == 2
+        assert stats.misses == 0
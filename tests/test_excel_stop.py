@@ -17,6 +17,9 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, MagicMock, patch, PropertyMock
 
@@ -27,6 +30,7 @@ except ImportError:
 
 from xlmanage.excel_manager import ExcelManager, InstanceInfo
 from xlmanage.exceptions import ExcelInstanceNotFoundError, ExcelRPCError
+from xlmanage.testing import FakeExcel, FakeProcessBackend
 
 
 @pytest.mark.skipif(pywintypes is None, reason="pywin32 not available")
@@ -144,14 +148,14 @@ def test_stop_instance_success(mocker):
     mock_app.Workbooks = [mock_wb]
     mock_app.DisplayAlerts = True
 
-    mock_info = InstanceInfo(pid=12345, visible=True, workbooks_count=1, hwnd=9999)
-
-    with patch("xlmanage.excel_manager.enumerate_excel_instances") as mock_enum:
-        mock_enum.return_value = [(mock_app, mock_info)]
-
+    with patch(
+        "xlmanage.excel_manager.find_excel_instance", return_value=mock_app
+    ) as mock_find:
         mgr = ExcelManager()
         mgr.stop_instance(12345, save=True)
 
+        mock_find.assert_called_once_with(12345)
+
         assert mock_app.DisplayAlerts is False
         mock_wb.Close.assert_called_once()
 
@@ -159,7 +163,8 @@ def test_stop_instance_success(mocker):
 @pytest.mark.skipif(pywintypes is None, reason="pywin32 not available")
 def test_stop_instance_not_found(mocker):
     """Test error when PID doesn't exist."""
-    with patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[]), \
+    with patch("xlmanage.excel_manager.find_excel_instance", return_value=None), \
+         patch("xlmanage.excel_manager.connect_by_pid", return_value=None), \
          patch("xlmanage.excel_manager.enumerate_excel_pids", return_value=[]):
 
         mgr = ExcelManager()
@@ -173,7 +178,8 @@ def test_stop_instance_not_found(mocker):
 @pytest.mark.skipif(pywintypes is None, reason="pywin32 not available")
 def test_stop_instance_disconnected(mocker):
     """Test error when instance is disconnected."""
-    with patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[]), \
+    with patch("xlmanage.excel_manager.find_excel_instance", return_value=None), \
+         patch("xlmanage.excel_manager.connect_by_pid", return_value=None), \
          patch("xlmanage.excel_manager.enumerate_excel_pids", return_value=[12345]):
 
         mgr = ExcelManager()
@@ -193,11 +199,7 @@ def test_stop_instance_rpc_error_during_close(mocker):
     # Configurer DisplayAlerts pour lever une exception lors de l'assignment
     type(mock_app).DisplayAlerts = PropertyMock(side_effect=pywintypes.com_error(-2147417848, "RPC error", None, None))
 
-    mock_info = InstanceInfo(pid=12345, visible=True, workbooks_count=0, hwnd=9999)
-
-    with patch("xlmanage.excel_manager.enumerate_excel_instances") as mock_enum:
-        mock_enum.return_value = [(mock_app, mock_info)]
-
+    with patch("xlmanage.excel_manager.find_excel_instance", return_value=mock_app):
         mgr = ExcelManager()
 
         with pytest.raises(ExcelRPCError):
@@ -287,3 +289,126 @@ def test_stop_all_multiple_workbooks_per_instance(mocker):
         assert stopped == [12345]
         mock_wb1.Close.assert_called_once_with(SaveChanges=True)
         mock_wb2.Close.assert_called_once_with(SaveChanges=True)
+
+
+def _instances(*pids):
+    """Mocked ROT enumeration returning one instance per PID."""
+    return [
+        (Mock(), InstanceInfo(pid=pid, visible=True, workbooks_count=1, hwnd=pid))
+        for pid in pids
+    ]
+
+
+def test_stop_all_parallel_runs_concurrently():
+    """Test that instances are stopped at the same time."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def stop_instance(pid, save=True, hwnd_map=None):
+        # Breaks unless the three instances are stopped concurrently
+        barrier.wait()
+
+    with patch(
+        "xlmanage.excel_manager.enumerate_excel_instances",
+        return_value=_instances(111, 222, 333),
+    ), patch.object(ExcelManager, "stop_instance", side_effect=stop_instance):
+        reports = ExcelManager().stop_all(save=False, parallel=True)
+
+    assert [report.pid for report in reports] == [111, 222, 333]
+    assert all(report.status == "stopped" for report in reports)
+    assert all(report.stopped for report in reports)
+
+
+def test_stop_all_parallel_kills_after_deadline():
+    """Test force_kill escalation for an instance stuck past the deadline."""
+    release = threading.Event()
+
+    def stop_instance(pid, save=True, hwnd_map=None):
+        if pid == 222:
+            release.wait(5)
+
+    with patch(
+        "xlmanage.excel_manager.enumerate_excel_instances",
+        return_value=_instances(111, 222),
+    ), patch.object(
+        ExcelManager, "stop_instance", side_effect=stop_instance
+    ), patch.object(ExcelManager, "force_kill") as mock_kill:
+        started = time.perf_counter()
+        reports = ExcelManager().stop_all(parallel=True, deadline=0.2)
+        elapsed = time.perf_counter() - started
+        release.set()
+
+    assert elapsed < 2
+    assert [report.status for report in reports] == ["stopped", "killed"]
+    assert reports[1].elapsed_ms >= 200
+    mock_kill.assert_called_once_with(222)
+
+
+def test_stop_all_parallel_reports_failures():
+    """Test per-PID errors of the shutdown and of the kill."""
+    release = threading.Event()
+
+    def stop_instance(pid, save=True, hwnd_map=None):
+        if pid == 111:
+            raise ExcelRPCError(0x800706BE, "disconnected")
+        release.wait(5)
+
+    with patch(
+        "xlmanage.excel_manager.enumerate_excel_instances",
+        return_value=_instances(111, 222),
+    ), patch.object(
+        ExcelManager, "stop_instance", side_effect=stop_instance
+    ), patch.object(
+        ExcelManager, "force_kill", side_effect=RuntimeError("access denied")
+    ):
+        reports = ExcelManager().stop_all(parallel=True, deadline=0.1)
+        release.set()
+
+    assert [report.status for report in reports] == ["failed", "failed"]
+    assert "disconnected" in reports[0].error
+    assert reports[1].error == "access denied"
+    assert not reports[0].stopped
+
+
+def test_stop_all_parallel_hung_instance_does_not_block_others():
+    """Test that each thread only connects to its own instance."""
+    release = threading.Event()
+    healthy = FakeExcel()
+    healthy.Workbooks.Add()
+    hung = FakeExcel()
+    # Every COM call on this instance blocks, like an Excel stuck in a dialog
+    hung.counter.record = lambda member: release.wait(5)
+    apps = {0x111: healthy, 0x222: hung}
+    backend = FakeProcessBackend.excel(111, 222)
+
+    try:
+        with patch(
+            "xlmanage.excel_manager.enumerate_excel_instances",
+            return_value=_instances(111, 222),
+        ) as mock_enum, patch(
+            "xlmanage.excel_manager._xlmain_hwnds",
+            return_value={111: 0x111, 222: 0x222},
+        ), patch(
+            "xlmanage.excel_manager.connect_by_hwnd", side_effect=apps.get
+        ), patch(
+            "xlmanage.excel_manager.find_excel_instance"
+        ) as mock_find:
+            reports = ExcelManager(process_backend=backend).stop_all(
+                save=False, parallel=True, deadline=0.5
+            )
+    finally:
+        release.set()
+
+    assert [report.status for report in reports] == ["stopped", "killed"]
+    assert healthy.Workbooks.Count == 0
+    # Enumerated once by the main thread, never by the stop threads
+    mock_enum.assert_called_once_with()
+    mock_find.assert_not_called()
+    assert backend.calls == [("terminate", 222)]
+
+
+def test_stop_all_deadline_requires_parallel():
+    """Test that a deadline is refused for a sequential shutdown."""
+    with pytest.raises(ValueError):
+        ExcelManager().stop_all(deadline=10)
+    with pytest.raises(ValueError):
+        ExcelManager().stop_all(parallel=True, deadline=-1)
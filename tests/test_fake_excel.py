@@ -0,0 +1,294 @@
+"""
+Tests for the in-memory Excel COM backend (xlmanage.testing).
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from xlmanage import _compat
+from xlmanage.excel_manager import ExcelManager
+from xlmanage.exceptions import (
+    TableAlreadyExistsError,
+    VBAProjectAccessError,
+    WorkbookNotFoundError,
+    WorksheetAlreadyExistsError,
+)
+from xlmanage.macro_runner import MacroRunner
+from xlmanage.range_manager import RangeManager
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import CallCounter, FakeExcel, fake_excel_manager
+from xlmanage.testing.fake_excel import XL_ERROR_NA, com_error
+from xlmanage.vba_manager import VBAManager
+from xlmanage.workbook_manager import WorkbookManager
+from xlmanage.worksheet_manager import WorksheetManager
+
+
+@pytest.fixture
+def app():
+    """FakeExcel with an active workbook "data.xlsm" (Data, Summary)."""
+    fake = FakeExcel()
+    fake.add_workbook("data.xlsm", ["Data", "Summary"])
+    return fake
+
+
+@pytest.fixture
+def mgr(app):
+    """Started ExcelManager connected to the fake application."""
+    return fake_excel_manager(app)
+
+
+class TestCallCounter:
+    """Tests for call counting and latency."""
+
+    def test_counts_members(self, app):
+        """Gets, sets and method calls are counted by member."""
+        app.counter.reset()
+        wb = app.ActiveWorkbook
+        _ = wb.Worksheets.Count
+        app.DisplayAlerts = False
+
+        assert app.counter.counts["Application.ActiveWorkbook"] == 1
+        assert app.counter.counts["Workbook.Worksheets"] == 1
+        assert app.counter.counts["Worksheets.Count"] == 1
+        assert app.counter.counts["Application.DisplayAlerts"] == 1
+        assert app.counter.total == 4
+
+    def test_iteration_counts_each_item(self, app):
+        """Iterating a collection costs one call per item."""
+        sheets = app.ActiveWorkbook.Worksheets
+        app.counter.reset()
+
+        names = [ws.Name for ws in sheets]
+
+        assert names == ["Data", "Summary"]
+        assert app.counter.counts["Worksheets.Next"] == 2
+        assert app.counter.counts["Worksheet.Name"] == 2
+
+    def test_setup_helpers_not_counted(self):
+        """add_workbook(), load() and add_table() are free."""
+        fake = FakeExcel()
+        wb = fake.add_workbook("a.xlsx", ["S"])
+        wb.sheet("S").load([["Id"], [1]])
+        wb.sheet("S").add_table("tbl", "A1:A2")
+
+        assert fake.counter.total == 0
+
+    def test_latency(self):
+        """Each call waits for the configured latency."""
+        counter = CallCounter(latency=0.002)
+        started = time.perf_counter()
+        for _ in range(5):
+            counter.record("Range.Value2")
+
+        assert time.perf_counter() - started >= 0.01
+        assert counter.counts == {"Range.Value2": 5}
+
+    def test_shared_counter(self):
+        """Several applications can share one counter."""
+        counter = CallCounter()
+        FakeExcel(counter=counter).Visible = True
+        FakeExcel(counter=counter).Visible = True
+
+        assert counter.counts["Application.Visible"] == 2
+
+
+class TestObjectModel:
+    """Excel semantics of the fake objects."""
+
+    def test_range_values(self, app):
+        """Value2 returns scalars or row tuples; ints are stored as floats."""
+        ws = app.ActiveWorkbook.Worksheets("data")
+        ws.Range("B2:C3").Value2 = ((1, "a"), (2, None))
+
+        assert ws.Range("B2").Value2 == 1.0
+        assert ws.Range("b2:c3").Value2 == ((1.0, "a"), (2.0, None))
+        assert ws.UsedRange.Address == "$B$2:$C$3"
+        assert ws.Range("B2").Offset(1, 1).Resize(1, 2).Address == "$C$3:$D$3"
+
+    def test_short_array_fills_na(self, app):
+        """Cells beyond the assigned array get #N/A, as in Excel."""
+        ws = app.ActiveSheet
+        ws.Range("A1:C1").Value2 = (("x",),)
+
+        assert ws.Range("A1:C1").Value2 == (("x", XL_ERROR_NA, XL_ERROR_NA),)
+
+    def test_find_wraps_around(self, app):
+        """Find searches after the After cell and wraps around the range."""
+        ws = app.ActiveSheet
+        ws.Range("B2:C3").Value2 = ((1, None), (None, "a"))
+        ws.Cells(5, 1).Value2 = "z"
+
+        assert ws.Cells.Find("*", SearchDirection=2).Address == "$A$5"
+        last_column = ws.Cells.Find("*", SearchOrder=2, SearchDirection=2)
+        assert last_column.Address == "$C$3"
+        assert ws.Cells.Find("*", After=last_column, SearchOrder=2).Address == "$A$5"
+        assert ws.Range("B2:C3").Find("a").Address == "$C$3"
+        assert ws.Range("D1:D9").Find("*") is None
+
+    def test_invalid_reference(self, app):
+        """Invalid references raise com_error."""
+        with pytest.raises(com_error):
+            app.ActiveSheet.Range("not a range")
+
+    def test_table_model(self, app):
+        """ListObjects.Add builds headers; Resize and Intersect behave."""
+        ws = app.ActiveSheet
+        ws.Range("A1:B1").Value2 = (("Id", None),)
+        table = ws.ListObjects.Add(1, ws.Range("A1:B1"), None, 1)
+
+        assert table.Name == "Table1"
+        assert [c.Name for c in table.ListColumns] == ["Id", "Column2"]
+        assert table.DataBodyRange.Rows.Count == 1
+        table.Resize(table.HeaderRowRange.Resize(4, 2))
+        assert table.Range.Address == "$A$1:$B$4"
+        assert app.Intersect(ws.Range("B4:C9"), table.Range).Address == "$B$4"
+        assert app.Intersect(ws.Range("D1"), table.Range) is None
+
+    def test_run_python_macro(self, app):
+        """Application.Run calls registered Python macros."""
+        app.register_macro("Module1.Add", lambda a, b: a + b)
+
+        assert app.Run("'data.xlsm'!Module1.Add", 2, 3) == 5
+        assert app.Run("Add", 1, 1) == 2
+        with pytest.raises(com_error):
+            app.Run("Missing")
+
+    def test_save_and_reopen(self, app, tmp_path):
+        """Saved workbooks keep their cells, tables and modules."""
+        wb = app.ActiveWorkbook
+        wb.sheet("Data").load([["Id", "Name"], [1, "pen"]])
+        wb.sheet("Data").add_table("tbl_Items", "A1:B2")
+        wb.VBProject.VBComponents.Add(1).CodeModule.AddFromString("Sub A()\nEnd Sub")
+        path = tmp_path / "saved.xlsm"
+        wb.SaveAs(str(path), FileFormat=52)
+        wb.Close()
+
+        reopened = FakeExcel().Workbooks.Open(str(path))
+
+        ws = reopened.Worksheets("Data")
+        assert ws.ListObjects(1).DataBodyRange.Value2 == ((1.0, "pen"),)
+        assert reopened.VBProject.VBComponents("Module1").CodeModule.CountOfLines == 2
+
+
+class TestManagersOnFakeBackend:
+    """Every manager runs unmodified against FakeExcel."""
+
+    def test_excel_manager(self):
+        """ExcelManager connects through its app_factory."""
+        fake = FakeExcel()
+        with ExcelManager(visible=True, app_factory=lambda: fake) as mgr:
+            info = mgr.get_running_instance()
+            assert mgr.app is fake
+
+        assert fake.Visible is True
+        assert info.workbooks_count == 0
+
+    def test_workbook_manager(self, tmp_path):
+        """create, list, save, close and open round-trip through disk."""
+        mgr = fake_excel_manager()
+        manager = WorkbookManager(mgr)
+        path = tmp_path / "report.xlsx"
+
+        info = manager.create(path)
+        assert info.name == "report.xlsx"
+        assert [wb.name for wb in manager.list()] == ["report.xlsx"]
+        manager.save(path)
+        manager.close(path)
+        assert manager.list() == []
+
+        reopened = manager.open(path)
+        assert reopened.sheets_count == 1
+        with pytest.raises(WorkbookNotFoundError):
+            manager.open(tmp_path / "missing.xlsx")
+
+    def test_worksheet_manager(self, mgr):
+        """create, copy, list and delete worksheets."""
+        manager = WorksheetManager(mgr)
+
+        manager.create("Extra")
+        manager.copy("Data", "Data_copy")
+        names = [ws.name for ws in manager.list()]
+        assert names == ["Data", "Data_copy", "Summary", "Extra"]
+        with pytest.raises(WorksheetAlreadyExistsError):
+            manager.create("EXTRA")
+
+        manager.delete("Extra")
+        assert len(manager.list()) == 3
+
+    def test_table_and_range_managers(self, app, mgr):
+        """Tables are created, loaded, upserted, read and deleted."""
+        app.ActiveWorkbook.sheet("Data").load([["Id", "Qty"]])
+        tables = TableManager(mgr)
+
+        tables.create("tbl_Stock", "A1:B1", worksheet="Data")
+        tables.append_rows("tbl_Stock", [[1, 5], [2, 7]])
+        tables.upsert("tbl_Stock", [[2, 8], [3, 1]], ["Id"])
+        with pytest.raises(TableAlreadyExistsError):
+            tables.create("tbl_Stock", "D1:E2", worksheet="Data")
+
+        [info] = tables.list()
+        assert info.rows_count == 3
+        data = RangeManager(mgr).read(info.range_address, worksheet="Data")
+        assert data.values[1:] == [[1.0, 5.0], [2.0, 8.0], [3.0, 1.0]]
+
+        tables.delete("tbl_Stock")
+        assert tables.list() == []
+
+    def test_vba_manager(self, mgr, tmp_path):
+        """Modules are imported, listed, exported and deleted."""
+        source = tmp_path / "Tools.bas"
+        source.write_bytes(b'Attribute VB_Name = "Tools"\r\nSub Hello()\r\nEnd Sub\r\n')
+        manager = VBAManager(mgr)
+
+        info = manager.import_module(source)
+        assert (info.name, info.module_type, info.lines_count) == ("Tools", "standard", 2)
+        modules = {m.name: m.module_type for m in manager.list_modules()}
+        assert modules["Tools"] == "standard"
+        assert modules["ThisWorkbook"] == "document"
+
+        exported = manager.export_module("Tools", tmp_path / "out.bas")
+        assert b"Sub Hello()" in Path(exported).read_bytes()
+
+        manager.delete_module("Tools")
+        assert "Tools" not in {m.name for m in manager.list_modules()}
+
+    def test_vba_access_denied(self, app, mgr):
+        """A blocked VBA project maps to VBAProjectAccessError."""
+        app.vba_access = False
+
+        with pytest.raises(VBAProjectAccessError):
+            VBAManager(mgr).list_modules()
+
+    def test_macro_runner(self, app, mgr):
+        """Macros run with parsed arguments and return values."""
+        app.register_macro("Module1.Total", lambda a, b: a * b)
+
+        result = MacroRunner(mgr).run("Module1.Total", args="6,7")
+
+        assert result.success is True
+        assert result.return_value == 42
+
+    def test_errors_are_the_ones_managers_catch(self):
+        """FakeExcel raises the com_error type the managers catch."""
+        from xlmanage import excel_manager, macro_runner, vba_manager
+
+        assert com_error is _compat.com_error
+        for module in (excel_manager, macro_runner, vba_manager):
+            assert module.pywintypes.com_error is com_error
@@ -0,0 +1,283 @@
+"""
+Tests for the cached listing of running Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import sys
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage.cli import app
+from xlmanage.daemon import DaemonClient, DaemonServer
+from xlmanage.excel_manager import InstanceInfo, ScanTimings, enumerate_excel_instances
+from xlmanage.instance_registry import InstanceRegistry, InstanceSnapshot
+from xlmanage.testing import FakeWindowSource
+
+runner = CliRunner()
+
+INSTANCES = [
+    InstanceInfo(pid=100, visible=True, workbooks_count=2, hwnd=1),
+    InstanceInfo(pid=200, visible=False, workbooks_count=0, hwnd=2),
+]
+
+
+class Clock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def manager():
+    mgr = Mock()
+
+    def list_running_instances(timings=None):
+        timings.source = "rot"
+        timings.rot_ms = 30.0
+        timings.read_ms = 10.0
+        timings.total_ms = 40.0
+        return list(INSTANCES)
+
+    mgr.list_running_instances.side_effect = list_running_instances
+    return mgr
+
+
+class TestInstanceRegistry:
+    """Listings cached for a TTL."""
+
+    def test_listing_served_from_cache_within_ttl(self, manager):
+        clock = Clock()
+        registry = InstanceRegistry(ttl=2, manager=manager, clock=clock)
+
+        first = registry.snapshot()
+        clock.now = 1.5
+        second = registry.snapshot()
+
+        assert first.instances == second.instances == INSTANCES
+        assert (first.cached, second.cached) == (False, True)
+        assert manager.list_running_instances.call_count == 1
+
+    def test_listing_scanned_again_after_ttl(self, manager):
+        clock = Clock()
+        registry = InstanceRegistry(ttl=2, manager=manager, clock=clock)
+
+        registry.snapshot()
+        clock.now = 2.0
+        snapshot = registry.snapshot()
+
+        assert not snapshot.cached
+        assert manager.list_running_instances.call_count == 2
+
+    def test_refresh_and_invalidate(self, manager):
+        registry = InstanceRegistry(ttl=60, manager=manager)
+
+        registry.snapshot()
+        registry.snapshot(refresh=True)
+        registry.invalidate()
+        registry.snapshot()
+
+        assert manager.list_running_instances.call_count == 3
+
+    def test_zero_ttl_disables_the_cache(self, manager):
+        registry = InstanceRegistry(ttl=0, manager=manager)
+
+        registry.snapshot()
+        registry.snapshot()
+
+        assert manager.list_running_instances.call_count == 2
+
+    def test_timings_of_the_full_listing(self, manager):
+        snapshot = InstanceRegistry(manager=manager).snapshot()
+
+        assert snapshot.timings == ScanTimings(
+            source="rot", rot_ms=30.0, read_ms=10.0, total_ms=40.0
+        )
+        assert snapshot.age < 5
+
+    def test_cached_snapshot_is_a_copy(self, manager):
+        registry = InstanceRegistry(ttl=60, manager=manager)
+
+        registry.snapshot().instances.clear()
+
+        assert registry.snapshot().instances == INSTANCES
+
+    def test_fast_listing_reads_the_windows_only(self, manager):
+        source = FakeWindowSource.desktop(excel_pids=[300, 100], others=5)
+        registry = InstanceRegistry(manager=manager, window_source=source)
+
+        snapshot = registry.snapshot(fast=True)
+
+        assert snapshot.fast
+        assert [(info.pid, info.hwnd) for info in snapshot.instances] == [
+            (100, 2),
+            (300, 1),
+        ]
+        assert snapshot.timings.source == "windows"
+        manager.list_running_instances.assert_not_called()
+
+    def test_full_listing_answers_fast_requests(self, manager):
+        source = FakeWindowSource.desktop(excel_pids=[100])
+        registry = InstanceRegistry(ttl=60, manager=manager, window_source=source)
+
+        registry.snapshot()
+        snapshot = registry.snapshot(fast=True)
+
+        assert snapshot.cached
+        assert snapshot.instances == INSTANCES
+        assert source.calls == 0
+
+    def test_fast_listing_does_not_answer_full_requests(self, manager):
+        source = FakeWindowSource.desktop(excel_pids=[100])
+        registry = InstanceRegistry(ttl=60, manager=manager, window_source=source)
+
+        registry.snapshot(fast=True)
+        snapshot = registry.snapshot()
+
+        assert not snapshot.cached
+        assert snapshot.instances == INSTANCES
+
+    def test_fast_listing_without_windows(self, manager):
+        class NoWindows:
+            def handles(self):
+                raise OSError("user32 unavailable")
+
+        registry = InstanceRegistry(manager=manager, window_source=NoWindows())
+
+        assert registry.snapshot(fast=True).instances == []
+
+    def test_invalid_ttl(self):
+        with pytest.raises(ValueError):
+            InstanceRegistry(ttl=-1)
+
+
+class TestScanTimings:
+    """Time of the ROT walk separated from the property reads."""
+
+    @patch("xlmanage.excel_manager._get_instance_info_from_app")
+    @patch("xlmanage.excel_manager.win32com", create=True)
+    @patch("xlmanage.excel_manager.pythoncom")
+    def test_rot_and_reads_timed_separately(self, mock_pythoncom, _, mock_get_info):
+        moniker = Mock()
+        moniker.GetDisplayName.return_value = "!Excel.Application"
+        mock_pythoncom.GetRunningObjectTable.return_value.EnumRunning.return_value = [
+            moniker
+        ]
+        mock_get_info.return_value = INSTANCES[0]
+        timings = ScanTimings()
+
+        instances = enumerate_excel_instances(timings=timings)
+
+        assert len(instances) == 1
+        assert timings.read_ms > 0
+        assert timings.rot_ms >= 0
+
+    @patch("xlmanage.excel_manager.enumerate_excel_pids")
+    @patch("xlmanage.excel_manager.enumerate_excel_instances")
+    def test_fallback_timed(self, mock_enumerate, mock_pids):
+        from xlmanage.excel_manager import ExcelManager
+
+        mock_enumerate.return_value = []
+        mock_pids.return_value = []
+        timings = ScanTimings()
+
+        ExcelManager().list_running_instances(timings=timings)
+
+        assert timings.source == "tasklist"
+        assert timings.total_ms >= timings.fallback_ms >= 0
+
+
+def _unique_address() -> str:
+    """Return a fresh address usable by multiprocessing.connection."""
+    token = uuid.uuid4().hex[:8]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\xlmanage-test-{token}"
+    return str(Path(tempfile.gettempdir()) / f"xlm-test-{token}.sock")
+
+
+class TestSharedRegistry:
+    """The daemon shares one registry between its clients."""
+
+    def test_clients_share_the_cached_listing(self, manager):
+        registry = InstanceRegistry(ttl=60, manager=manager)
+        server = DaemonServer(_unique_address(), Mock, registry=registry)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert server.wait_ready(5)
+        try:
+            with DaemonClient(server.address) as first:
+                scanned = first.call("daemon.instances")
+            with DaemonClient(server.address) as second:
+                cached = second.call("daemon.instances", kwargs={"fast": True})
+        finally:
+            server.shutdown()
+            thread.join(5)
+
+        assert isinstance(cached, InstanceSnapshot)
+        assert cached.instances == scanned.instances == INSTANCES
+        assert (scanned.cached, cached.cached) == (False, True)
+        assert manager.list_running_instances.call_count == 1
+
+
+class TestStatusCommand:
+    """xlmanage status --fast / --timings."""
+
+    @patch("xlmanage.instance_registry.WindowEnumerator")
+    @patch("xlmanage.cli.ExcelManager")
+    def test_fast(self, mock_manager_class, mock_enumerator):
+        mock_enumerator.return_value.xlmain_hwnds.return_value = {4321: 8765}
+
+        result = runner.invoke(app, ["status", "--fast"])
+
+        assert result.exit_code == 0, result.output
+        assert "4321" in result.stdout
+        assert "8765" in result.stdout
+        mock_manager_class.return_value.list_running_instances.assert_not_called()
+
+    @patch("xlmanage.cli.ExcelManager")
+    def test_timings(self, mock_manager_class, manager):
+        mock_manager_class.return_value = manager
+
+        result = runner.invoke(app, ["status", "--timings"])
+
+        assert result.exit_code == 0, result.output
+        assert "ROT 30.0 ms" in result.stdout
+        assert "property reads 10.0 ms" in result.stdout
+
+    @patch("xlmanage.cli.DaemonClient")
+    def test_daemon_mode_uses_the_shared_registry(self, mock_client_cls):
+        client = mock_client_cls.return_value.__enter__.return_value
+        client.call.return_value = InstanceSnapshot(
+            list(INSTANCES), False, ScanTimings(source="rot"), cached=True
+        )
+
+        result = runner.invoke(app, ["--daemon", "status", "--timings", "--refresh"])
+
+        assert result.exit_code == 0, result.output
+        client.call.assert_called_once_with(
+            "daemon.instances", kwargs={"fast": False, "refresh": True}
+        )
+        assert "cached" in result.stdout
@@ -0,0 +1,309 @@
+"""
+Tests des séries d'exécutions de macros (run_many).
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage import macro_runner
+from xlmanage.cli import app as cli_app
+from xlmanage.excel_manager import InstanceInfo
+from xlmanage.exceptions import VBAMacroError
+from xlmanage.macro_runner import (
+    MacroBatchResult,
+    MacroResult,
+    MacroRunner,
+    read_args_file,
+)
+from xlmanage.operations import execute_operation
+from xlmanage.testing import FakeExcel, fake_excel_manager
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def app():
+    fake = FakeExcel()
+    fake.add_workbook("report.xlsm", ["Data"])
+    return fake
+
+
+@pytest.fixture
+def calls(app):
+    """Arguments reçus par la macro Module1.Total, dans l'ordre."""
+    received = []
+
+    def total(a, b):
+        received.append((a, b))
+        if b == 0:
+            raise ZeroDivisionError("division by zero")
+        return a / b
+
+    app.register_macro("Module1.Total", total)
+    return received
+
+
+def _result(elapsed_ms, success=True):
+    return MacroResult("M", None, "NoneType", success, None, elapsed_ms=elapsed_ms)
+
+
+class TestMacroBatchResult:
+    """Statistiques d'une série."""
+
+    def test_latency_statistics(self):
+        batch = MacroBatchResult(
+            "M", [_result(float(ms)) for ms in range(20, 0, -1)], total_ms=500
+        )
+
+        assert (batch.min_ms, batch.median_ms, batch.p95_ms, batch.max_ms) == (
+            1.0,
+            10.5,
+            19.0,
+            20.0,
+        )
+        assert batch.throughput == pytest.approx(40.0)
+        assert (batch.succeeded, batch.failed) == (20, 0)
+        assert batch.success
+
+    def test_failures_counted(self):
+        batch = MacroBatchResult("M", [_result(1), _result(2, False)], total_ms=3)
+
+        assert (batch.succeeded, batch.failed) == (1, 1)
+        assert not batch.success
+
+    def test_empty(self):
+        batch = MacroBatchResult("M", [], total_ms=0)
+
+        assert (batch.min_ms, batch.p95_ms, batch.throughput) == (0.0, 0.0, 0.0)
+
+
+class TestRunMany:
+    """MacroRunner.run_many()."""
+
+    def test_each_call_repeated(self, app, calls):
+        batch = MacroRunner(fake_excel_manager(app)).run_many(
+            "Module1.Total", args_list=["6,3", "8,2"], repeat=3
+        )
+
+        assert calls == [(6, 3)] * 3 + [(8, 2)] * 3
+        assert [r.return_value for r in batch.results] == [2.0] * 3 + [4.0] * 3
+        assert batch.succeeded == 6
+        assert batch.min_ms <= batch.median_ms <= batch.p95_ms <= batch.max_ms
+        assert batch.throughput > 0
+
+    def test_reference_resolved_once(self, app, calls, tmp_path):
+        runner = MacroRunner(fake_excel_manager(app))
+
+        with patch.object(
+            macro_runner,
+            "_build_macro_reference",
+            wraps=macro_runner._build_macro_reference,
+        ) as build:
+            batch = runner.run_many(
+                "Module1.Total",
+                workbook=tmp_path / "report.xlsm",
+                args_list=["1,1"],
+                repeat=10,
+            )
+
+        build.assert_called_once()
+        assert batch.macro_name == "'report.xlsm'!Module1.Total"
+        assert len(batch.results) == 10
+
+    def test_without_arguments(self, app):
+        app.register_macro("Module1.Ping", lambda: "pong")
+
+        batch = MacroRunner(fake_excel_manager(app)).run_many("Module1.Ping", repeat=2)
+
+        assert [r.return_value for r in batch.results] == ["pong", "pong"]
+
+    def test_arguments_parsed_before_running(self, app, calls):
+        too_many = ",".join(["1"] * 31)
+
+        with pytest.raises(VBAMacroError):
+            MacroRunner(fake_excel_manager(app)).run_many(
+                "Module1.Total", args_list=["1,1", too_many]
+            )
+
+        assert calls == []
+
+    def test_errors_do_not_stop_by_default(self, app, calls):
+        batch = MacroRunner(fake_excel_manager(app)).run_many(
+            "Module1.Total", args_list=["1,0", "4,2"]
+        )
+
+        assert [r.status for r in batch.results] == ["error", "ok"]
+        assert batch.failed == 1
+
+    def test_stop_on_error(self, app, calls):
+        batch = MacroRunner(fake_excel_manager(app)).run_many(
+            "Module1.Total", args_list=["1,0", "4,2"], stop_on_error=True
+        )
+
+        assert len(batch.results) == 1
+        assert calls == [(1, 0)]
+
+    def test_one_watchdog_per_series(self, app):
+        mgr = fake_excel_manager(app)
+        macro_threads = set()
+        app.register_macro(
+            "Module1.Where", lambda: macro_threads.add(threading.get_ident())
+        )
+
+        with (
+            patch.object(
+                mgr, "get_instance_info", wraps=mgr.get_instance_info
+            ) as get_info,
+            patch.object(
+                macro_runner, "marshal_dispatch", wraps=macro_runner.marshal_dispatch
+            ) as marshal,
+        ):
+            batch = MacroRunner(mgr).run_many("Module1.Where", repeat=5, timeout=5)
+
+        assert batch.succeeded == 5
+        assert (get_info.call_count, marshal.call_count) == (1, 1)
+        # Toutes les exécutions dans le même thread, pas dans l'appelant
+        assert len(macro_threads) == 1
+        assert threading.get_ident() not in macro_threads
+
+    def test_killed_instance_stops_series(self, app, monkeypatch):
+        monkeypatch.setattr(macro_runner, "INTERRUPT_GRACE", 0.01)
+        release = threading.Event()
+        app.register_macro("Module1.Slow", lambda: release.wait(10))
+        mgr = fake_excel_manager(app)
+        info = InstanceInfo(pid=4242, visible=False, workbooks_count=0, hwnd=-1)
+
+        try:
+            with (
+                patch.object(mgr, "get_instance_info", return_value=info),
+                patch.object(mgr, "force_kill"),
+            ):
+                batch = MacroRunner(mgr).run_many(
+                    "Module1.Slow", repeat=3, timeout=0.02
+                )
+        finally:
+            release.set()
+
+        assert [r.timeout_action for r in batch.results] == ["killed"]
+
+    @pytest.mark.parametrize("kwargs", [{"repeat": 0}, {"timeout": 0}])
+    def test_invalid_arguments(self, app, kwargs):
+        with pytest.raises(ValueError):
+            MacroRunner(fake_excel_manager(app)).run_many("Module1.Total", **kwargs)
+
+    def test_operation(self, app, calls):
+        batch = execute_operation(
+            fake_excel_manager(app),
+            "macro.run_many",
+            kwargs={"macro_name": "Module1.Total", "args_list": ["9,3"], "repeat": 2},
+        )
+
+        assert [r.return_value for r in batch.results] == [3.0, 3.0]
+
+
+def test_read_args_file(tmp_path):
+    path = tmp_path / "calls.csv"
+    path.write_text(
+        '"Nord",2024\n\n# commentaire\n  "Sud",2025  \n', encoding="utf-8-sig"
+    )
+
+    assert read_args_file(path) == ['"Nord",2024', '"Sud",2025']
+
+
+@pytest.fixture
+def mock_runner():
+    """MacroRunner de la CLI, connecté à un ExcelManager simulé."""
+    with (
+        patch("xlmanage.cli.ExcelManager") as mgr_class,
+        patch("xlmanage.cli.MacroRunner") as runner_class,
+    ):
+        mgr = Mock()
+        mgr_class.return_value.__enter__ = Mock(return_value=mgr)
+        mgr_class.return_value.__exit__ = Mock(return_value=False)
+        mgr.get_running_instance.return_value = None
+        yield runner_class.return_value
+
+
+def _batch(*results, total_ms=10.0):
+    return MacroBatchResult("Module1.Total", list(results), total_ms=total_ms)
+
+
+def test_cli_repeat(mock_runner):
+    mock_runner.run_many.return_value = _batch(_result(1.0), _result(3.0))
+
+    result = runner.invoke(
+        cli_app, ["run-macro", "Module1.Total", "--args", "1,2", "--repeat", "2"]
+    )
+
+    assert result.exit_code == 0
+    mock_runner.run_many.assert_called_once_with(
+        macro_name="Module1.Total",
+        workbook=None,
+        args_list=["1,2"],
+        repeat=2,
+    )
+    mock_runner.run.assert_not_called()
+    assert "médiane 2.00" in result.stdout
+    assert "p95 3.00" in result.stdout
+
+
+def test_cli_args_file(mock_runner, tmp_path):
+    path = tmp_path / "calls.csv"
+    path.write_text("1,2\n3,4\n", encoding="utf-8")
+    failed = MacroResult(
+        "Module1.Total", None, "NoneType", False, "Overflow", elapsed_ms=2.0
+    )
+    mock_runner.run_many.return_value = _batch(_result(1.0), failed)
+
+    result = runner.invoke(
+        cli_app, ["run-macro", "Module1.Total", "--args-file", str(path)]
+    )
+
+    assert result.exit_code == 1
+    assert mock_runner.run_many.call_args.kwargs["args_list"] == ["1,2", "3,4"]
+    assert "3,4" in result.stdout
+    assert "Overflow" in result.stdout
+
+
+def test_cli_args_and_args_file_exclusive(mock_runner, tmp_path):
+    path = tmp_path / "calls.csv"
+    path.write_text("1,2\n", encoding="utf-8")
+
+    result = runner.invoke(
+        cli_app,
+        ["run-macro", "Module1.Total", "--args", "1", "--args-file", str(path)],
+    )
+
+    assert result.exit_code == 1
+    assert "incompatibles" in result.stdout
+    mock_runner.run_many.assert_not_called()
+
+
+def test_cli_empty_args_file(mock_runner, tmp_path):
+    path = tmp_path / "calls.csv"
+    path.write_text("# rien\n", encoding="utf-8")
+
+    result = runner.invoke(
+        cli_app, ["run-macro", "Module1.Total", "--args-file", str(path)]
+    )
+
+    assert result.exit_code == 1
+    assert "Aucun appel" in result.stdout
@@ -0,0 +1,222 @@
+"""
+Tests de l'exécution des macros sous surveillance (timeout).
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from xlmanage import macro_runner
+from xlmanage.cli import app as cli_app
+from xlmanage.excel_manager import InstanceInfo
+from xlmanage.macro_runner import MacroResult, MacroRunner
+from xlmanage.testing import FakeExcel, fake_excel_manager
+
+
+@pytest.fixture
+def release():
+    """Événement débloquant la macro lente, levé en fin de test."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def slow_app(release):
+    app = FakeExcel()
+    app.register_macro("Module1.Slow", lambda: release.wait(10))
+    app.register_macro("Module1.Add", lambda a, b: a + b)
+    return app
+
+
+@pytest.fixture
+def short_grace(monkeypatch):
+    monkeypatch.setattr(macro_runner, "INTERRUPT_GRACE", 0.05)
+
+
+class TestWatchedRun:
+    """MacroRunner.run() avec un timeout."""
+
+    def test_fast_macro_returns_value(self, slow_app):
+        runner = MacroRunner(fake_excel_manager(slow_app))
+
+        result = runner.run("Module1.Add", args="2,3", timeout=5)
+
+        assert result.status == "ok"
+        assert result.success
+        assert result.return_value == 5
+        assert result.timeout_action is None
+        assert result.elapsed_ms >= 0
+
+    def test_macro_runs_in_watched_thread(self):
+        app = FakeExcel()
+        app.register_macro("Where", lambda: threading.current_thread().name)
+        runner = MacroRunner(fake_excel_manager(app))
+
+        assert runner.run("Where", timeout=5).return_value == "xlmanage-macro"
+        assert runner.run("Where").return_value == threading.current_thread().name
+
+    def test_vba_error_within_timeout(self):
+        app = FakeExcel()
+        app.register_macro("Module1.Fail", lambda: 1 / 0)
+        runner = MacroRunner(fake_excel_manager(app))
+
+        result = runner.run("Module1.Fail", timeout=5)
+
+        assert result.status == "error"
+        assert not result.success
+        assert result.error_message
+
+    def test_interrupted_macro(self, slow_app, release, short_grace, monkeypatch):
+        breaks = []
+
+        def send_break(hwnd):
+            breaks.append(hwnd)
+            release.set()
+
+        monkeypatch.setattr(macro_runner, "_send_break", send_break)
+        runner = MacroRunner(fake_excel_manager(slow_app))
+
+        result = runner.run("Module1.Slow", timeout=0.1)
+
+        assert result.status == "timeout"
+        assert result.timeout_action == "interrupted"
+        assert not result.success
+        assert result.elapsed_ms >= 100
+        assert len(breaks) == 1
+
+    def test_stuck_macro_kills_excel(self, slow_app, short_grace):
+        mgr = fake_excel_manager(slow_app)
+        info = InstanceInfo(pid=4242, visible=False, workbooks_count=0, hwnd=-1)
+        runner = MacroRunner(mgr)
+
+        with (
+            patch.object(mgr, "get_instance_info", return_value=info),
+            patch.object(mgr, "force_kill") as force_kill,
+        ):
+            result = runner.run("Module1.Slow", timeout=0.05)
+
+        force_kill.assert_called_once_with(4242)
+        assert result.status == "timeout"
+        assert result.timeout_action == "killed"
+        assert "4242" in result.error_message
+
+    def test_stuck_macro_without_pid_is_abandoned(self, slow_app, short_grace):
+        mgr = fake_excel_manager(slow_app)
+        runner = MacroRunner(mgr)
+
+        with patch.object(mgr, "force_kill") as force_kill:
+            result = runner.run("Module1.Slow", timeout=0.05)
+
+        force_kill.assert_not_called()
+        assert result.timeout_action == "abandoned"
+
+    def test_failed_kill_is_abandoned(self, slow_app, short_grace):
+        mgr = fake_excel_manager(slow_app)
+        info = InstanceInfo(pid=4242, visible=False, workbooks_count=0, hwnd=-1)
+        runner = MacroRunner(mgr)
+
+        with (
+            patch.object(mgr, "get_instance_info", return_value=info),
+            patch.object(mgr, "force_kill", side_effect=RuntimeError("denied")),
+        ):
+            result = runner.run("Module1.Slow", timeout=0.05)
+
+        assert result.timeout_action == "abandoned"
+
+    @pytest.mark.parametrize("timeout", [0, -1])
+    def test_invalid_timeout(self, timeout):
+        runner = MacroRunner(fake_excel_manager(FakeExcel()))
+
+        with pytest.raises(ValueError):
+            runner.run("Module1.Add", timeout=timeout)
+
+
+class TestMacroResultStatus:
+    def test_status_from_success(self):
+        ok = MacroResult("M", 1, "int", True, None)
+        error = MacroResult("M", None, "NoneType", False, "boom")
+
+        assert (ok.status, error.status) == ("ok", "error")
+
+
+@patch("xlmanage.cli.ExcelManager")
+@patch("xlmanage.cli.MacroRunner")
+def test_cli_displays_timeout(mock_runner_class, mock_mgr_class):
+    mock_mgr = Mock()
+    mock_mgr_class.return_value.__enter__ = Mock(return_value=mock_mgr)
+    mock_mgr_class.return_value.__exit__ = Mock(return_value=False)
+    mock_mgr.get_running_instance.return_value = None
+    mock_runner_class.return_value.run.return_value = MacroResult(
+        macro_name="Module1.Slow",
+        return_value=None,
+        return_type="NoneType",
+        success=False,
+        error_message="Délai de 1 s dépassé : macro interrompue",
+        status="timeout",
+        elapsed_ms=1200,
+        timeout_action="interrupted",
+    )
+
+    result = CliRunner().invoke(
+        cli_app, ["run-macro", "Module1.Slow", "--timeout", "1"]
+    )
+
+    assert result.exit_code == 1
+    assert "Délai dépassé" in result.stdout
+    assert "macro interrompue" in result.stdout
+
+
+@patch("xlmanage.cli.ExcelManager")
+@patch("xlmanage.cli.MacroRunner")
+def test_cli_timeout_zero_means_no_limit(mock_runner_class, mock_mgr_class):
+    mock_mgr = Mock()
+    mock_mgr_class.return_value.__enter__ = Mock(return_value=mock_mgr)
+    mock_mgr_class.return_value.__exit__ = Mock(return_value=False)
+    mock_mgr.get_running_instance.return_value = None
+    run = mock_runner_class.return_value.run
+    run.return_value = MacroResult("Module1.Test", None, "NoneType", True, None)
+
+    result = CliRunner().invoke(
+        cli_app, ["run-macro", "Module1.Test", "--timeout", "0"]
+    )
+
+    assert result.exit_code == 0
+    assert "timeout" not in run.call_args.kwargs
+
+
+@patch("xlmanage.cli.ExcelManager")
+@patch("xlmanage.cli.MacroRunner")
+def test_cli_timeout_is_opt_in(mock_runner_class, mock_mgr_class):
+    mock_mgr = Mock()
+    mock_mgr_class.return_value.__enter__ = Mock(return_value=mock_mgr)
+    mock_mgr_class.return_value.__exit__ = Mock(return_value=False)
+    mock_mgr.get_running_instance.return_value = None
+    run = mock_runner_class.return_value.run
+    run.return_value = MacroResult("Module1.Test", None, "NoneType", True, None)
+
+    without = CliRunner().invoke(cli_app, ["run-macro", "Module1.Test"])
+    with_timeout = CliRunner().invoke(
+        cli_app, ["run-macro", "Module1.Test", "--timeout", "120"]
+    )
+
+    assert (without.exit_code, with_timeout.exit_code) == (0, 0)
+    assert "timeout" not in run.call_args_list[0].kwargs
+    assert run.call_args_list[1].kwargs["timeout"] == 120
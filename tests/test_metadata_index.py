@@ -0,0 +1,215 @@
+"""
+Tests for the worksheet and table metadata index.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from xlmanage.exceptions import TableNotFoundError, WorksheetAlreadyExistsError
+from xlmanage.metadata_index import MetadataIndex, WorkbookMetadata, workbook_metadata
+from xlmanage.range_manager import RangeManager
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+from xlmanage.workbook_manager import WorkbookManager
+from xlmanage.worksheet_manager import WorksheetManager
+
+
+@pytest.fixture
+def app(tmp_path):
+    """FakeExcel with one workbook of 50 sheets holding one table each."""
+    fake = FakeExcel()
+    workbook = fake.add_workbook("Data.xlsx", [], tmp_path / "Data.xlsx")
+    for i in range(1, 51):
+        sheet = workbook.add_sheet(f"Sheet{i}")
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]])
+        sheet.add_table(f"tbl_{i}", "A1:B3")
+    return fake
+
+
+@pytest.fixture
+def mgr(app):
+    """Started ExcelManager connected to the fake application."""
+    return fake_excel_manager(app)
+
+
+def _calls(app, func):
+    app.counter.reset()
+    result = func()
+    return result, app.counter.total
+
+
+class TestWorkbookMetadata:
+    """Lookups, probes and explicit updates."""
+
+    def test_worksheet_built_once_then_constant_cost(self, app):
+        wb = app.ActiveWorkbook
+        metadata = WorkbookMetadata()
+
+        ws, first = _calls(app, lambda: metadata.find_worksheet(wb, "SHEET42"))
+        again, second = _calls(app, lambda: metadata.find_worksheet(wb, "sheet42"))
+
+        assert ws.Name == "Sheet42"
+        assert again is ws
+        assert first > 50
+        # Worksheets + Count + Name of the worksheet found
+        assert second == 3
+
+    def test_table_built_once_then_constant_cost(self, app):
+        wb = app.ActiveWorkbook
+        metadata = WorkbookMetadata()
+
+        (ws, table), first = _calls(app, lambda: metadata.find_table(wb, "tbl_42"))
+        _, second = _calls(app, lambda: metadata.find_table(wb, "tbl_42"))
+
+        assert (ws.Name, table.Name) == ("Sheet42", "tbl_42")
+        assert first > 100
+        assert second == 1
+        # Table names are case-sensitive
+        assert metadata.find_table(wb, "TBL_42") is None
+
+    def test_trusted_miss_skips_the_rescan(self, app):
+        wb = app.ActiveWorkbook
+        metadata = WorkbookMetadata()
+        metadata.rebuild(wb)
+
+        _, trusted = _calls(
+            app, lambda: metadata.find_table(wb, "tbl_new", rescan_on_miss=False)
+        )
+        _, rescanned = _calls(app, lambda: metadata.find_table(wb, "tbl_new"))
+
+        assert trusted == 0
+        assert rescanned > 100
+
+    def test_changes_made_outside_are_detected(self, app):
+        wb = app.ActiveWorkbook
+        metadata = WorkbookMetadata()
+        metadata.rebuild(wb)
+
+        # Renaming keeps Worksheets.Count: found by the rescan on miss
+        wb.Worksheets("Sheet3").Name = "Renamed"
+        wb.Worksheets("Sheet4").ListObjects("tbl_4").Name = "tbl_renamed"
+        # Deleting changes Worksheets.Count and disconnects the tables
+        wb.Worksheets("Sheet5").Delete()
+        # Tables added to a sheet are found by the rescan on miss
+        wb.Worksheets("Sheet6").ListObjects.Add(
+            SourceType=1, Source=wb.Worksheets("Sheet6").Range("D1:E3")
+        ).Name = "tbl_late"
+
+        assert metadata.find_worksheet(wb, "Sheet3") is None
+        assert metadata.find_worksheet(wb, "Renamed").Name == "Renamed"
+        assert metadata.find_worksheet(wb, "Sheet5") is None
+        assert metadata.find_table(wb, "tbl_4") is None
+        assert metadata.find_table(wb, "tbl_renamed")[0].Name == "Sheet4"
+        assert metadata.find_table(wb, "tbl_5") is None
+        assert metadata.find_table(wb, "tbl_late")[0].Name == "Sheet6"
+
+    def test_updates_ignored_until_built(self, app):
+        wb = app.ActiveWorkbook
+        metadata = WorkbookMetadata()
+        ws = wb.Worksheets("Sheet1")
+
+        metadata.add_worksheet(ws, "Extra")
+        metadata.add_table(ws, Mock(), "tbl_extra")
+        metadata.remove_worksheet(ws)
+        metadata.remove_table("tbl_1")
+
+        assert metadata.find_worksheet(wb, "Extra") is None
+        assert metadata.find_table(wb, "tbl_extra") is None
+
+
+class TestMetadataIndex:
+    """One metadata entry per workbook FullName."""
+
+    def test_active_workbook_and_path_share_metadata(self, app, mgr):
+        index = mgr.metadata_index
+
+        assert index.get(app.ActiveWorkbook) is index.get(app.Workbooks(1))
+        assert len(index) == 1
+        assert workbook_metadata(mgr, app.ActiveWorkbook) is index.get(
+            app.ActiveWorkbook
+        )
+        assert workbook_metadata(Mock(), app.ActiveWorkbook) is None
+
+    def test_discard_and_reset(self, app, mgr):
+        index = MetadataIndex()
+        index.get(app.ActiveWorkbook)
+
+        index.discard(app.ActiveWorkbook)
+        assert len(index) == 0
+
+        mgr.metadata_index.get(app.ActiveWorkbook)
+        mgr.disconnect()
+        assert len(mgr.metadata_index) == 0
+
+
+class TestManagersUseMetadata:
+    """Managers keep the metadata up to date across operations."""
+
+    def test_worksheet_operations(self, app, mgr):
+        manager = WorksheetManager(mgr)
+        mgr.metadata_index.get(app.ActiveWorkbook).rebuild(app.ActiveWorkbook)
+
+        _, calls = _calls(app, lambda: manager.create("Extra"))
+        manager.copy("Sheet1", "Sheet1_copy")
+        manager.delete("Sheet2")
+
+        # A scan alone reads the Name of the 50 worksheets
+        assert calls < 50
+        with pytest.raises(WorksheetAlreadyExistsError):
+            manager.create("EXTRA")
+        names = [ws.name for ws in manager.list()]
+        assert "Sheet1_copy" in names and "Sheet2" not in names
+        # The copy of tbl_1 is found after the table index was rebuilt
+        tables = {table.name for table in TableManager(mgr).list()}
+        copied = (tables - {f"tbl_{i}" for i in range(1, 51)}).pop()
+        assert TableManager(mgr)._get_table(copied, None)[0].Name == "Sheet1_copy"
+
+    def test_table_operations(self, app, mgr):
+        manager = TableManager(mgr)
+        mgr.metadata_index.get(app.ActiveWorkbook).rebuild(app.ActiveWorkbook)
+
+        _, created = _calls(
+            app, lambda: manager.create("tbl_new", "D1:E3", worksheet="Sheet50")
+        )
+        _, deleted = _calls(app, lambda: manager.delete("tbl_new"))
+
+        assert created < 50
+        assert deleted < 10
+        with pytest.raises(TableNotFoundError):
+            manager.delete("tbl_new")
+
+    def test_range_worksheet_lookup(self, app, mgr):
+        manager = RangeManager(mgr)
+        manager.read("A1", worksheet="Sheet50")
+
+        _, calls = _calls(app, lambda: manager.read("A1:B3", worksheet="Sheet50"))
+
+        assert calls < 20
+
+    def test_save_as_and_close_forget_the_workbook(self, app, mgr, tmp_path):
+        manager = WorkbookManager(mgr)
+        WorksheetManager(mgr).list()
+        TableManager(mgr)._get_table("tbl_1", None)
+
+        manager.save(tmp_path / "Data.xlsx", output=tmp_path / "Copy.xlsx")
+        assert len(mgr.metadata_index) == 0
+
+        TableManager(mgr)._get_table("tbl_1", None)
+        manager.close(tmp_path / "Copy.xlsx", save=False)
+        assert len(mgr.metadata_index) == 0
@@ -0,0 +1,173 @@
+"""
+Tests for the operation registry.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import typing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from xlmanage.exceptions import OperationError
+from xlmanage.operations import (
+    OPERATIONS,
+    coerce_arguments,
+    execute_operation,
+    to_jsonable,
+)
+
+
+@dataclass
+class _Info:
+    name: str
+    path: Path
+    created: datetime
+
+
+def test_unknown_operation():
+    """An unregistered operation raises OperationError."""
+    with pytest.raises(OperationError) as exc_info:
+        execute_operation(Mock(), "workbook.explode")
+
+    assert exc_info.value.operation == "workbook.explode"
+    assert "unknown operation" in str(exc_info.value)
+
+
+def test_excel_operation_targets_manager():
+    """Operations under the "excel" key call the ExcelManager itself."""
+    mgr = Mock()
+    mgr.get_running_instance.return_value = "info"
+
+    assert execute_operation(mgr, "excel.get_running_instance") == "info"
+    mgr.get_running_instance.assert_called_once_with()
+
+
+@patch("xlmanage.worksheet_manager.WorksheetManager")
+def test_manager_operation_dispatch(mock_ws_cls):
+    """Manager operations instantiate the manager and call the method."""
+    mgr = Mock()
+    mock_ws_cls.return_value.create.return_value = "created"
+
+    result = execute_operation(
+        mgr, "worksheet.create", kwargs={"name": "Data", "workbook": "C:/a.xlsx"}
+    )
+
+    assert result == "created"
+    mock_ws_cls.assert_called_once_with(mgr)
+    mock_ws_cls.return_value.create.assert_called_once_with(
+        name="Data", workbook=Path("C:/a.xlsx")
+    )
+
+
+def test_positional_path_coerced():
+    """Path parameters passed positionally are converted like keywords."""
+    calls = []
+
+    class _Manager:
+        def open(self, path, read_only=False):
+            calls.append((path, read_only))
+
+    with patch(
+        "xlmanage.operations._get_manager_class", return_value=lambda m: _Manager()
+    ):
+        execute_operation(Mock(), "workbook.open", ["C:/x.xlsx"], {"read_only": True})
+
+    assert calls == [(Path("C:/x.xlsx"), True)]
+
+
+def test_coerce_arguments():
+    """Path strings become Path objects, positional or keyword."""
+    args, kwargs = coerce_arguments("workbook.open", ["a.xlsx"], {"read_only": True})
+    assert (args, kwargs) == ([Path("a.xlsx")], {"read_only": True})
+
+    args, kwargs = coerce_arguments("table.export", [], {"name": "t", "output": "o"})
+    assert (args, kwargs) == ([], {"name": "t", "output": Path("o")})
+
+    # Unknown operations and extra arguments are left to the call
+    assert coerce_arguments("daemon.ping", ["x"], {}) == (["x"], {})
+    assert coerce_arguments("workbook.open", ["a", 1, 2, 3], {})[0][3] == 3
+
+
+def test_signature_mismatch_raises_operation_error():
+    """Arguments not accepted by the method raise OperationError."""
+    with pytest.raises(OperationError) as exc_info:
+        execute_operation(Mock(), "worksheet.create", kwargs={"bogus": 1})
+
+    assert exc_info.value.operation == "worksheet.create"
+
+
+def test_registered_methods_exist():
+    """Every registered operation maps to an existing manager method."""
+    from xlmanage.excel_manager import ExcelManager
+    from xlmanage.operations import _get_manager_class
+
+    for key, method in OPERATIONS.values():
+        cls = ExcelManager if key == "excel" else _get_manager_class(key)
+        assert callable(getattr(cls, method)), f"{key}.{method}"
+
+
+def test_to_jsonable():
+    """Results are converted to plain JSON values."""
+    info = _Info("a.xlsx", Path("C:/a.xlsx"), datetime(2024, 1, 2, 3, 4, 5))
+
+    assert to_jsonable([info, (1, 2), None]) == [
+        {
+            "name": "a.xlsx",
+            "path": str(Path("C:/a.xlsx")),
+            "created": "2024-01-02T03:04:05",
+        },
+        [1, 2],
+        None,
+    ]
+    assert to_jsonable({1: object}) == {"1": str(object)}
+
+
+def test_operation_annotations_resolve():
+    """Annotations resolve with the class namespace in scope.
+
+    Python 3.14 evaluates them in that scope when inspect.signature() is
+    called, where a method named "list" hides the builtin.
+    """
+    from xlmanage.excel_manager import ExcelManager
+    from xlmanage.operations import _get_manager_class
+
+    for key, method in OPERATIONS.values():
+        cls = ExcelManager if key == "excel" else _get_manager_class(key)
+        typing.get_type_hints(getattr(cls, method), localns=dict(vars(cls)))
+
+
+def test_table_append_rows_operation():
+    """table.append_rows runs through execute_operation, as in batch mode."""
+    from xlmanage.testing import FakeExcel, fake_excel_manager
+
+    app = FakeExcel()
+    ws = app.add_workbook("data.xlsx", ["Data"]).sheet("Data")
+    ws.load([["Name", "Qty"], ["pen", 1.0]])
+    ws.add_table("tbl_Data", "A1:B2")
+
+    result = execute_operation(
+        fake_excel_manager(app),
+        "table.append_rows",
+        kwargs={"name": "tbl_Data", "rows": [["ink", 2.0]], "optimize": False},
+    )
+
+    assert (result.rows_added, result.rows_count) == (1, 2)
+    body = ws.ListObjects("tbl_Data").DataBodyRange.Value2
+    assert [list(row) for row in body] == [["pen", 1.0], ["ink", 2.0]]
@@ -0,0 +1,160 @@
+"""
+Tests for the process listing and termination backends.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from xlmanage import process_backend as backends
+from xlmanage.excel_manager import ExcelManager, enumerate_excel_pids
+from xlmanage.exceptions import ExcelInstanceNotFoundError
+from xlmanage.process_backend import (
+    NativeProcessBackend,
+    SubprocessProcessBackend,
+    process_backend,
+    set_process_backend,
+)
+from xlmanage.testing import FakeProcessBackend
+
+
+class TestSelection:
+    """Backend selected at runtime."""
+
+    @pytest.fixture(autouse=True)
+    def reselect(self):
+        set_process_backend(None)
+        yield
+        set_process_backend(None)
+
+    def test_fastest_available_backend(self, monkeypatch):
+        monkeypatch.delenv(backends.PROCESS_BACKEND_ENV, raising=False)
+
+        backend = process_backend()
+
+        expected = "native" if sys.platform == "win32" else "subprocess"
+        assert backend.name == expected
+        # Selected once per process
+        assert process_backend() is backend
+
+    def test_forced_by_environment(self, monkeypatch):
+        monkeypatch.setenv(backends.PROCESS_BACKEND_ENV, "subprocess")
+
+        assert isinstance(process_backend(), SubprocessProcessBackend)
+
+    def test_unknown_backend_name(self, monkeypatch):
+        monkeypatch.setenv(backends.PROCESS_BACKEND_ENV, "psutil")
+
+        with pytest.raises(ValueError):
+            process_backend()
+
+    def test_replaced_backend(self):
+        fake = FakeProcessBackend.excel(100)
+        set_process_backend(fake)
+
+        assert enumerate_excel_pids() == [100]
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="kernel32 is available")
+    def test_native_backend_requires_windows(self):
+        with pytest.raises(OSError):
+            NativeProcessBackend()
+
+
+class TestSubprocessBackend:
+    """tasklist and taskkill."""
+
+    def test_list_pids_ignores_case_and_other_lines(self):
+        result = Mock(
+            stdout='"EXCEL.EXE","100","Console","1","1 K"\n'
+            '"excel.exe","200","Console","1","1 K"\n'
+            '"WINWORD.EXE","300","Console","1","1 K"\n'
+        )
+
+        with patch("subprocess.run", return_value=result) as mock_run:
+            pids = SubprocessProcessBackend().list_pids()
+
+        assert pids == [100, 200]
+        assert mock_run.call_args.args[0][2] == "imagename eq EXCEL.EXE"
+
+    def test_terminate_not_found(self):
+        error = subprocess.CalledProcessError(128, ["taskkill"])
+        error.stdout = ""
+        error.stderr = "ERROR: The process '99999' not found."
+
+        with patch("subprocess.run", side_effect=error):
+            with pytest.raises(ExcelInstanceNotFoundError):
+                SubprocessProcessBackend().terminate(99999)
+
+
+class TestExcelManagerBackend:
+    """ExcelManager lists and kills through its backend."""
+
+    def test_force_kill(self):
+        backend = FakeProcessBackend.excel(100, 200)
+
+        ExcelManager(process_backend=backend).force_kill(100)
+
+        assert backend.list_pids() == [200]
+        assert ("terminate", 100) in backend.calls
+
+    def test_force_kill_unknown_pid(self):
+        mgr = ExcelManager(process_backend=FakeProcessBackend.excel(100))
+
+        with pytest.raises(ExcelInstanceNotFoundError):
+            mgr.force_kill(999)
+
+    def test_force_kill_access_denied(self):
+        backend = FakeProcessBackend.excel(100)
+        backend.protected.add(100)
+
+        with pytest.raises(RuntimeError, match="Access denied"):
+            ExcelManager(process_backend=backend).force_kill(100)
+
+    def test_only_excel_processes_listed(self):
+        backend = FakeProcessBackend({100: "EXCEL.EXE", 200: "WINWORD.EXE"})
+
+        assert enumerate_excel_pids(backend) == [100]
+
+    @patch("xlmanage.excel_manager._xlmain_hwnds", return_value={})
+    @patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[])
+    def test_list_running_instances_fallback(self, _, __):
+        backend = FakeProcessBackend.excel(100, 200)
+
+        instances = ExcelManager(process_backend=backend).list_running_instances()
+
+        assert [info.pid for info in instances] == [100, 200]
+        assert backend.calls == [("list_pids", "EXCEL.EXE")]
+
+    @patch("xlmanage.excel_manager.connect_by_pid", return_value=None)
+    @patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[])
+    def test_stop_instance_checks_the_pid_through_the_backend(self, _, __):
+        mgr = ExcelManager(process_backend=FakeProcessBackend.excel(100))
+
+        with pytest.raises(ExcelInstanceNotFoundError):
+            mgr.stop_instance(999)
+
+    def test_latency_simulates_spawn_cost(self):
+        backend = FakeProcessBackend.excel(100, latency=0.05)
+
+        with patch("xlmanage.testing.fake_processes.time.sleep") as mock_sleep:
+            backend.list_pids()
+            backend.terminate(100)
+
+        assert mock_sleep.call_count == 2
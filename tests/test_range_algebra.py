@@ -0,0 +1,242 @@
+"""
+Tests for A1/R1C1 address parsing and rectangle algebra.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import random
+
+import pytest
+
+from xlmanage.exceptions import RangeError, TableRangeError
+from xlmanage.range_algebra import (
+    MAX_COLUMNS,
+    MAX_ROWS,
+    Rect,
+    area,
+    column_index,
+    column_letters,
+    format_address,
+    overlapping,
+    parse_address,
+    union,
+)
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+
+
+def _cells(rects):
+    """Brute-force set of the cells covered by rectangles."""
+    return {
+        (row, column)
+        for rect in rects
+        for row in range(rect.top, rect.bottom + 1)
+        for column in range(rect.left, rect.right + 1)
+    }
+
+
+def _random_rects(count, seed, rows=200, columns=40, size=8):
+    rng = random.Random(seed)
+    rects = []
+    for _ in range(count):
+        top, left = rng.randint(1, rows), rng.randint(1, columns)
+        rects.append(
+            Rect(top, left, top + rng.randint(0, size), left + rng.randint(0, size))
+        )
+    return rects
+
+
+class TestColumns:
+    """Column letters <-> numbers."""
+
+    @pytest.mark.parametrize(
+        "letters, index", [("A", 1), ("Z", 26), ("AA", 27), ("AB", 28), ("XFD", 16384)]
+    )
+    def test_round_trip(self, letters, index):
+        assert column_index(letters) == index
+        assert column_index(letters.lower()) == index
+        assert column_letters(index) == letters
+
+    @pytest.mark.parametrize("letters", ["XFE", "A1", ""])
+    def test_invalid_letters(self, letters):
+        with pytest.raises(RangeError):
+            column_index(letters)
+
+    def test_invalid_index(self):
+        with pytest.raises(RangeError):
+            column_letters(MAX_COLUMNS + 1)
+
+
+class TestParseAddress:
+    """A1 and R1C1 addresses, as typed or returned by Range.Address."""
+
+    @pytest.mark.parametrize(
+        "address, expected",
+        [
+            ("A1", Rect(1, 1, 1, 1)),
+            ("$A$1:$D$10", Rect(1, 1, 10, 4)),
+            ("A$1:D$10", Rect(1, 1, 10, 4)),
+            ("d10:a1", Rect(1, 1, 10, 4)),
+            ("Sheet1!B5:Z100", Rect(5, 2, 100, 26)),
+            ("'My Sheet'!B5", Rect(5, 2, 5, 2)),
+            ("A:D", Rect(1, 1, MAX_ROWS, 4)),
+            ("$3:$5", Rect(3, 1, 5, MAX_COLUMNS)),
+            ("R1C1:R10C5", Rect(1, 1, 10, 5)),
+            ("r2c3", Rect(2, 3, 2, 3)),
+            # A1 first: column R, row 2
+            ("R2:R4", Rect(2, 18, 4, 18)),
+        ],
+    )
+    def test_single_area(self, address, expected):
+        assert parse_address(address) == [expected]
+
+    def test_multi_area(self):
+        rects = parse_address("'Q1, Q2'!A1:B2,$D$4,Data!F1:F3")
+
+        assert rects == [Rect(1, 1, 2, 2), Rect(4, 4, 4, 4), Rect(1, 6, 3, 6)]
+        assert format_address(rects) == "$A$1:$B$2,$D$4,$F$1:$F$3"
+
+    @pytest.mark.parametrize(
+        "address", ["", "  ", "A1:D", "1:D10", "A:D10", "A1:10", "ABC", "A0", "XFE1"]
+    )
+    def test_invalid(self, address):
+        with pytest.raises(RangeError) as exc_info:
+            parse_address(address)
+
+        assert exc_info.value.range_ref == address
+
+    def test_address_round_trip(self):
+        for rect in _random_rects(200, seed=1, columns=MAX_COLUMNS - 10):
+            assert parse_address(rect.address) == [rect]
+
+
+class TestRect:
+    """Intersection, union, containment and splitting."""
+
+    def test_dimensions(self):
+        rect = Rect(2, 3, 11, 6)
+
+        assert (rect.rows, rect.columns, rect.area) == (10, 4, 40)
+
+    def test_out_of_sheet(self):
+        with pytest.raises(RangeError):
+            Rect(0, 1, 1, 1)
+        with pytest.raises(RangeError):
+            Rect(5, 1, 4, 1)
+
+    def test_intersection(self):
+        a = Rect(1, 1, 10, 4)
+
+        assert a.intersection(Rect(5, 3, 15, 6)) == Rect(5, 3, 10, 4)
+        assert a.intersection(Rect(11, 1, 12, 4)) is None
+        # Adjacent tables do not overlap
+        assert not a.overlaps(Rect(1, 5, 10, 6))
+
+    def test_contains_and_bounds(self):
+        a = Rect(1, 1, 10, 10)
+
+        assert a.contains(Rect(2, 2, 3, 3))
+        assert a.contains(a)
+        assert not a.contains(Rect(2, 2, 11, 3))
+        assert Rect(1, 1, 2, 2).bounds(Rect(5, 5, 6, 6)) == Rect(1, 1, 6, 6)
+
+    def test_subtract(self):
+        outer, hole = Rect(1, 1, 10, 10), Rect(3, 3, 5, 5)
+
+        parts = outer.subtract(hole)
+
+        assert len(parts) == 4
+        assert _cells(parts) == _cells([outer]) - _cells([hole])
+        assert area(parts) == sum(part.area for part in parts)
+        assert outer.subtract(Rect(20, 20, 21, 21)) == [outer]
+        assert hole.subtract(outer) == []
+
+    def test_overlapping(self):
+        rects = [Rect(1, 1, 2, 2), Rect(5, 5, 6, 6), Rect(2, 2, 5, 5)]
+
+        assert overlapping(Rect(6, 6, 7, 7), rects) == [Rect(5, 5, 6, 6)]
+
+
+class TestUnion:
+    """Disjoint decomposition checked against brute force."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        rects = _random_rects(150, seed)
+
+        parts = union(rects)
+
+        assert _cells(parts) == _cells(rects)
+        assert area(rects) == len(_cells(rects))
+        for i, part in enumerate(parts):
+            assert not overlapping(part, parts[i + 1 :])
+
+    def test_identical_bands_are_joined(self):
+        assert union([Rect(1, 1, 5, 2), Rect(1, 3, 5, 4)]) == [Rect(1, 1, 5, 4)]
+        assert union([]) == []
+
+    def test_thousands_of_rectangles(self):
+        rects = _random_rects(5000, seed=42, rows=20000, columns=200, size=20)
+
+        parts = union(rects)
+
+        assert area(parts) == area(rects)
+        assert sum(part.area for part in parts) == area(rects)
+
+
+class TestTableOverlap:
+    """TableManager.create checks overlaps locally on cached extents."""
+
+    @pytest.fixture
+    def app(self):
+        fake = FakeExcel()
+        sheet = fake.add_workbook("Data.xlsx", ["Data"]).Worksheets("Data")
+        for i in range(100):
+            row = 3 * i + 1
+            sheet.load([["Id", "Value"], [1, "a"], [2, "b"]], row=row)
+            sheet.add_table(f"tbl_{i + 1}", f"A{row}:B{row + 2}")
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]], column=4)
+        return fake
+
+    def test_validation_without_intersect(self, app):
+        manager = TableManager(fake_excel_manager(app))
+        manager.list(worksheet="Data")
+
+        with pytest.raises(TableRangeError, match="tbl_34"):
+            manager.create("tbl_bad", "B100:D101", worksheet="Data")
+        app.counter.reset()
+        manager.create("tbl_new", "D1:E3", worksheet="Data")
+
+        assert app.counter.counts["Application.Intersect"] == 0
+        assert app.counter.total < 40
+        with pytest.raises(TableRangeError, match="tbl_new"):
+            manager.create("tbl_other", "E2:F2", worksheet="Data")
+
+    def test_stale_extents(self, app):
+        manager = TableManager(fake_excel_manager(app))
+        sheet = app.ActiveWorkbook.Worksheets("Data")
+        manager.create("tbl_new", "D1:E3", worksheet="Data")
+
+        # Deleted outside xlManage: its cells are free again
+        sheet.ListObjects("tbl_new").Delete()
+        sheet.load([["Id", "Value"], [1, "a"]], column=4)
+        manager.create("tbl_again", "D1:E2", worksheet="Data")
+
+        # Added outside xlManage: ListObjects.Add refuses, reported as overlap
+        sheet.load([["Id", "Value"], [1, "a"]], row=1, column=8)
+        sheet.add_table("tbl_outside", "H1:I2")
+        with pytest.raises(TableRangeError, match="tbl_outside"):
+            manager.create("tbl_late", "I2:J3", worksheet="Data")
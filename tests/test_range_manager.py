@@ -0,0 +1,308 @@
+"""
+Tests for RangeManager.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import io
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from xlmanage.exceptions import (
+    RangeError,
+    WorkbookNotFoundError,
+    WorksheetNotFoundError,
+)
+from xlmanage.range_manager import (
+    RangeManager,
+    _normalize_value2,
+    read_csv,
+    write_rows,
+)
+
+# Value2 of a #DIV/0! cell as returned by pywin32
+DIV0 = -2146826281
+
+
+@pytest.fixture
+def range_setup():
+    """ExcelManager mock with an active workbook and worksheet."""
+    mgr = Mock()
+    wb = mgr.app.ActiveWorkbook
+    ws = Mock()
+    ws.Name = "Data"
+    wb.Name = "book.xlsx"
+    wb.ActiveSheet = ws
+    wb.Worksheets = [ws]
+    return mgr, ws
+
+
+class TestNormalizeValue2:
+    """Tests for _normalize_value2()."""
+
+    def test_scalar(self):
+        """A single cell becomes a 1x1 grid."""
+        assert _normalize_value2(42.0) == [[42.0]]
+        assert _normalize_value2(None) == [[None]]
+
+    def test_plain_values_copied(self):
+        """Plain values are returned unchanged, rows as lists."""
+        raw = (("a", 1.0, True), (None, 2.5, False))
+
+        assert _normalize_value2(raw) == [["a", 1.0, True], [None, 2.5, False]]
+
+    def test_errors_and_dates_converted(self):
+        """Error codes and date objects are converted to text."""
+        raw = (("x", DIV0), (datetime(2024, 1, 2), -2146826246))
+
+        assert _normalize_value2(raw) == [
+            ["x", "#DIV/0!"],
+            ["2024-01-02T00:00:00", "#N/A"],
+        ]
+
+    def test_unknown_error_code(self):
+        """Unknown error codes keep their numeric value."""
+        code = 0x800A0005 - 2**32
+
+        assert _normalize_value2(((code,),)) == [[f"#ERR{code}"]]
+
+    def test_integers_kept(self):
+        """Integers outside the error facility are cell values, not errors."""
+        raw = ((5, 0, -1), (2**31 - 1, -(2**31), DIV0))
+
+        assert _normalize_value2(raw) == [
+            [5, 0, -1],
+            [2**31 - 1, -(2**31), "#DIV/0!"],
+        ]
+
+
+class TestWriteRows:
+    """Tests for write_rows()."""
+
+    def test_csv(self):
+        """CSV output writes the header first and empty cells as blanks."""
+        stream = io.StringIO()
+
+        count = write_rows([["a", None], ["b,c", 1.5]], stream, "csv", ["k", "v"])
+
+        assert count == 2
+        assert stream.getvalue() == 'k,v\na,\n"b,c",1.5\n'
+
+    def test_ndjson_with_header(self):
+        """NDJSON with a header writes one object per row."""
+        stream = io.StringIO()
+
+        write_rows([["a", None]], stream, "ndjson", ["k", "v"])
+
+        assert stream.getvalue() == '{"k": "a", "v": null}\n'
+
+    def test_ndjson_arrays(self):
+        """NDJSON without header writes arrays."""
+        stream = io.StringIO()
+
+        write_rows([["é", 1.0]], stream, "ndjson")
+
+        assert stream.getvalue() == '["é", 1.0]\n'
+
+    def test_unknown_format(self):
+        """Unsupported formats raise ValueError."""
+        with pytest.raises(ValueError):
+            write_rows([], io.StringIO(), "xml")
+
+
+class TestRangeManagerRead:
+    """Tests for RangeManager.read()."""
+
+    def test_read_single_transfer(self, range_setup):
+        """The range values are fetched with one Value2 access."""
+        mgr, ws = range_setup
+        rng = ws.Range.return_value
+        rng.Address = "$A$1:$B$2"
+        rng.Value2 = (("Name", "Qty"), ("Pen", 3.0))
+
+        data = RangeManager(mgr).read("A1:B2")
+
+        ws.Range.assert_called_once_with("A1:B2")
+        assert data.address == "$A$1:$B$2"
+        assert data.worksheet_name == "Data"
+        assert (data.rows, data.columns) == (2, 2)
+        assert data.values == [["Name", "Qty"], ["Pen", 3.0]]
+
+    def test_read_integer_cells(self, range_setup):
+        """Integer cells are read as numbers."""
+        mgr, ws = range_setup
+        rng = ws.Range.return_value
+        rng.Address = "$A$1:$B$1"
+        rng.Value2 = ((42, 7),)
+
+        data = RangeManager(mgr).read("A1:B1")
+
+        assert data.values == [[42, 7]]
+
+    def test_read_used_range(self, range_setup):
+        """Without reference, the used range is read."""
+        mgr, ws = range_setup
+        ws.UsedRange.Value2 = "only"
+        ws.UsedRange.Address = "$A$1"
+
+        data = RangeManager(mgr).read()
+
+        assert data.values == [["only"]]
+        ws.Range.assert_not_called()
+
+    def test_read_named_worksheet(self, range_setup):
+        """The worksheet is looked up by name."""
+        mgr, ws = range_setup
+        ws.Range.return_value.Value2 = 1.0
+
+        RangeManager(mgr).read("A1", worksheet="DATA")
+
+        ws.Range.assert_called_once_with("A1")
+
+    def test_read_worksheet_not_found(self, range_setup):
+        """An unknown worksheet raises WorksheetNotFoundError."""
+        mgr, _ws = range_setup
+
+        with pytest.raises(WorksheetNotFoundError):
+            RangeManager(mgr).read("A1", worksheet="Missing")
+
+    def test_read_invalid_range(self, range_setup):
+        """An invalid reference raises RangeError."""
+        mgr, ws = range_setup
+        ws.Range.side_effect = Exception("bad")
+
+        with pytest.raises(RangeError) as exc_info:
+            RangeManager(mgr).read("ZZZ")
+
+        assert exc_info.value.range_ref == "ZZZ"
+
+    def test_read_empty_reference(self, range_setup):
+        """An empty reference raises RangeError."""
+        mgr, _ws = range_setup
+
+        with pytest.raises(RangeError):
+            RangeManager(mgr).read("  ")
+
+    def test_read_workbook_path(self, range_setup):
+        """A workbook that is not open raises WorkbookNotFoundError."""
+        mgr, _ws = range_setup
+        mgr.app.Workbooks = []
+
+        with pytest.raises(WorkbookNotFoundError):
+            RangeManager(mgr).read("A1", workbook=Path("C:/missing.xlsx"))
+
+
+class TestReadCsv:
+    """Tests for read_csv()."""
+
+    def test_types(self, tmp_path):
+        """Numbers become float, empty fields None, the rest stays text."""
+        path = tmp_path / "data.csv"
+        path.write_text("\ufeffName;Qty;Ref\nPen;3;007x\nInk;;-1.5e2\n", "utf-8")
+
+        assert read_csv(path, delimiter=";") == [
+            ["Name", "Qty", "Ref"],
+            ["Pen", 3.0, "007x"],
+            ["Ink", None, -150.0],
+        ]
+
+
+class TestRangeManagerWrite:
+    """Tests for RangeManager.write()."""
+
+    def test_write_single_block(self, range_setup):
+        """Small data is written with a single Value2 assignment."""
+        mgr, ws = range_setup
+        start = ws.Range.return_value
+        target = start.Offset.return_value.Resize.return_value
+        start.Resize.return_value.Address = "$B$2:$C$3"
+
+        result = RangeManager(mgr).write([["a", 1], ["b"]], "B2")
+
+        ws.Range.assert_called_once_with("B2")
+        start.Offset.assert_called_once_with(0, 0)
+        start.Offset.return_value.Resize.assert_called_once_with(2, 2)
+        assert target.Value2 == (("a", 1), ("b", None))
+        assert result.address == "$B$2:$C$3"
+        assert (result.rows, result.columns, result.blocks) == (2, 2, 1)
+        assert result.cells_per_second > 0
+
+    def test_write_blocks(self, range_setup):
+        """block_rows splits the rows into several transfers."""
+        mgr, ws = range_setup
+        start = ws.Range.return_value
+        rows = [[i, i * 2] for i in range(5)]
+
+        result = RangeManager(mgr).write(rows, block_rows=2, optimize=False)
+
+        assert result.blocks == 3
+        assert [c.args for c in start.Offset.call_args_list] == [
+            (0, 0),
+            (2, 0),
+            (4, 0),
+        ]
+        resizes = start.Offset.return_value.Resize.call_args_list
+        assert [c.args for c in resizes] == [(2, 2), (2, 2), (1, 2)]
+
+    def test_write_default_block_size(self, range_setup, monkeypatch):
+        """The default block size follows WRITE_BLOCK_CELLS."""
+        mgr, _ws = range_setup
+        monkeypatch.setattr("xlmanage.range_manager.WRITE_BLOCK_CELLS", 10)
+
+        result = RangeManager(mgr).write([[1, 2, 3]] * 7, optimize=False)
+
+        assert result.block_rows == 3
+        assert result.blocks == 3
+
+    def test_write_uses_optimizer(self, range_setup, monkeypatch):
+        """The write is wrapped in an ExcelOptimizer scope."""
+        mgr, _ws = range_setup
+        optimizer_cls = MagicMock()
+        monkeypatch.setattr("xlmanage.range_manager.ExcelOptimizer", optimizer_cls)
+
+        RangeManager(mgr).write([[1]])
+
+        optimizer_cls.assert_called_once_with(mgr)
+        optimizer_cls.return_value.__enter__.assert_called_once()
+        optimizer_cls.return_value.__exit__.assert_called_once()
+
+    def test_write_empty_data(self, range_setup):
+        """Empty data raises RangeError."""
+        mgr, _ws = range_setup
+
+        with pytest.raises(RangeError):
+            RangeManager(mgr).write([[]])
+
+    def test_write_invalid_block_rows(self, range_setup):
+        """block_rows must be positive."""
+        mgr, _ws = range_setup
+
+        with pytest.raises(ValueError):
+            RangeManager(mgr).write([[1]], block_rows=0)
+
+    def test_write_failure(self, range_setup):
+        """A failing transfer raises RangeError with the row number."""
+        mgr, ws = range_setup
+        resize = ws.Range.return_value.Offset.return_value.Resize
+        resize.side_effect = Exception("COM error")
+
+        with pytest.raises(RangeError) as exc_info:
+            RangeManager(mgr).write([[1]], optimize=False)
+
+        assert "row 1" in exc_info.value.reason
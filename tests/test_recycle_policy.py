@@ -0,0 +1,155 @@
+"""
+Tests for the recycling policy of Excel instances.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import logging
+import time
+
+import pytest
+
+from xlmanage.excel_pool import ExcelPool
+from xlmanage.recycle_policy import RecyclePolicy, windows_working_set
+from xlmanage.testing import FakeExcel, FakeProcessStats
+
+MB = 1024 * 1024
+
+
+class TestRecyclePolicy:
+    """Limits checked between jobs."""
+
+    def test_no_limit_reached(self):
+        stats = FakeProcessStats(baseline=100 * MB)
+        policy = RecyclePolicy(
+            max_jobs=10, max_age=60, max_working_set=200 * MB, stats=stats
+        )
+
+        assert policy.evaluate(9, time.monotonic(), 1234) is None
+
+    def test_max_jobs(self):
+        policy = RecyclePolicy(max_jobs=10)
+
+        event = policy.evaluate(10, time.monotonic(), 1234, worker=2)
+
+        assert (event.reason, event.pid, event.jobs, event.worker) == (
+            "max_jobs",
+            1234,
+            10,
+            2,
+        )
+        assert event.working_set is None
+
+    def test_max_age(self):
+        policy = RecyclePolicy(max_age=30)
+
+        event = policy.evaluate(1, time.monotonic() - 31, 1234)
+
+        assert event.reason == "max_age"
+        assert event.age >= 31
+
+    def test_max_working_set_sampled_through_provider(self):
+        stats = FakeProcessStats(baseline=100 * MB, growth=40 * MB)
+        policy = RecyclePolicy(max_working_set=200 * MB, stats=stats)
+
+        assert policy.evaluate(1, time.monotonic(), 1234) is None
+        assert policy.evaluate(2, time.monotonic(), 1234) is None
+        event = policy.evaluate(3, time.monotonic(), 1234)
+
+        assert event.reason == "max_working_set"
+        assert event.working_set == 220 * MB
+        assert stats.samples[0] == (1234, 140 * MB)
+
+    def test_unknown_working_set_never_recycles(self):
+        policy = RecyclePolicy(max_working_set=1, stats=lambda pid: None)
+
+        assert policy.evaluate(1, time.monotonic(), -1) is None
+
+    def test_events_logged_and_passed_to_callback(self, caplog):
+        events = []
+        policy = RecyclePolicy(max_jobs=1, on_recycle=events.append)
+
+        with caplog.at_level(logging.INFO, logger="xlmanage.recycle_policy"):
+            event = policy.evaluate(1, time.monotonic(), 1234)
+
+        assert events == [event]
+        assert "max_jobs" in caplog.text
+
+    def test_failing_callback_is_ignored(self):
+        def callback(event):
+            raise RuntimeError("boom")
+
+        policy = RecyclePolicy(max_jobs=1, on_recycle=callback)
+
+        assert policy.evaluate(1, time.monotonic(), 1234) is not None
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_jobs": 0}, {"max_age": -1}, {"max_working_set": 0}]
+    )
+    def test_invalid_limits(self, kwargs):
+        with pytest.raises(ValueError):
+            RecyclePolicy(**kwargs)
+
+    def test_windows_working_set_unknown_pid(self):
+        assert windows_working_set(-1) is None
+        assert windows_working_set(0) is None
+
+
+class TestPoolRecycling:
+    """ExcelPool retires instances between jobs."""
+
+    def test_instance_replaced_every_n_jobs(self):
+        events = []
+        policy = RecyclePolicy(max_jobs=3, on_recycle=events.append)
+
+        with ExcelPool(1, app_factory=FakeExcel, recycle=policy) as pool:
+            results = pool.map(lambda mgr, item: id(mgr.app), range(7))
+
+        instances = [result.result for result in results]
+        assert len(set(instances[:3])) == len(set(instances[3:6])) == 1
+        assert len(set(instances)) == 3
+        assert pool.retired == len(events) == 2
+        # Retiring is not a failure
+        assert pool.recycled == 0
+        assert all(result.attempts == 1 for result in results)
+
+    def test_leaking_instance_replaced(self):
+        stats = FakeProcessStats(baseline=500 * MB, growth=100 * MB)
+        # A new process starts again from the baseline
+        policy = RecyclePolicy(
+            max_working_set=800 * MB,
+            stats=stats,
+            on_recycle=lambda event: stats.reset(),
+        )
+
+        with ExcelPool(1, app_factory=FakeExcel, recycle=policy) as pool:
+            results = pool.map(lambda mgr, item: id(mgr.app), range(6))
+
+        instances = [result.result for result in results]
+        assert len(set(instances[:3])) == 1
+        assert instances[3] != instances[2]
+        assert pool.retired == 2
+
+    def test_failed_jobs_count(self):
+        def job(mgr, item):
+            raise ValueError(item)
+
+        with ExcelPool(
+            1, app_factory=FakeExcel, recycle=RecyclePolicy(max_jobs=2)
+        ) as pool:
+            pool.map(job, range(4))
+
+        assert pool.retired == 2
@@ -17,21 +17,29 @@ You should have received a copy of the GNU General Public License
 along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import io
+import json
+import tracemalloc
+
 import pytest
 from unittest.mock import MagicMock, Mock
 
 from xlmanage.exceptions import (
     TableAlreadyExistsError,
+    TableColumnError,
     TableNameError,
     TableNotFoundError,
     TableRangeError,
 )
 from xlmanage.table_manager import (
+    EXPORT_CHUNK_ROWS,
     TABLE_NAME_MAX_LENGTH,
     TABLE_NAME_PATTERN,
     TableInfo,
     TableManager,
+    _column_runs,
     _find_table,
+    _map_columns,
     _validate_range,
     _validate_table_name,
 )
@@ -1087,51 +1095,11 @@ class TestFindTableEdgeCases:
         assert table.Name == "tbl_Target"
 
 
-class TestRangesOverlap:
-    """Tests for _ranges_overlap function."""
-
-    def test_ranges_overlap_true(self):
-        """Test overlapping ranges return True."""
-        from xlmanage.table_manager import _ranges_overlap
-
-        mock_range1 = Mock()
-        mock_range2 = Mock()
-        mock_app = Mock()
-        mock_range1.Application = mock_app
-        mock_app.Intersect.return_value = Mock()  # non-None = overlap
-
-        assert _ranges_overlap(mock_range1, mock_range2) is True
-
-    def test_ranges_overlap_false(self):
-        """Test non-overlapping ranges return False."""
-        from xlmanage.table_manager import _ranges_overlap
-
-        mock_range1 = Mock()
-        mock_range2 = Mock()
-        mock_app = Mock()
-        mock_range1.Application = mock_app
-        mock_app.Intersect.return_value = None
-
-        assert _ranges_overlap(mock_range1, mock_range2) is False
-
-    def test_ranges_overlap_exception(self):
-        """Test exception returns False."""
-        from xlmanage.table_manager import _ranges_overlap
-
-        mock_range1 = Mock()
-        mock_range2 = Mock()
-        mock_range1.Application.Intersect.side_effect = Exception("COM error")
-
-        assert _ranges_overlap(mock_range1, mock_range2) is False
-
-
 class TestValidateRangeOverlap:
     """Tests for _validate_range overlap detection."""
 
     def test_validate_range_overlap_raises(self):
         """Test _validate_range raises when range overlaps existing table."""
-        from unittest.mock import patch
-
         from xlmanage.table_manager import _validate_range
 
         mock_ws = Mock()
@@ -1140,18 +1108,29 @@ class TestValidateRangeOverlap:
 
         mock_table = Mock()
         mock_table.Name = "tbl_Existing"
-        mock_table.Range = Mock()
+        mock_table.Range.Address = "$C$5:$F$15"
         mock_ws.ListObjects = [mock_table]
 
-        with patch("xlmanage.table_manager._ranges_overlap", return_value=True):
-            with pytest.raises(TableRangeError) as exc_info:
-                _validate_range(mock_ws, "A1:D10")
-            assert "overlaps" in str(exc_info.value)
+        with pytest.raises(TableRangeError) as exc_info:
+            _validate_range(mock_ws, "A1:D10")
+        assert "overlaps" in str(exc_info.value)
+        assert "tbl_Existing" in str(exc_info.value)
+        # Computed locally: no Application.Intersect round trip
+        mock_range.Application.Intersect.assert_not_called()
+
+    def test_validate_range_adjacent_table_is_accepted(self):
+        """Test _validate_range accepts a range touching a table."""
+        from xlmanage.table_manager import _validate_range
+
+        mock_ws = Mock()
+        mock_table = Mock()
+        mock_table.Range.Address = "$E$1:$F$10"
+        mock_ws.ListObjects = [mock_table]
+
+        assert _validate_range(mock_ws, "A1:D10") is mock_ws.Range.return_value
 
     def test_validate_range_overlap_skip_unreadable_table(self):
         """Test _validate_range skips tables that raise on Range access."""
-        from unittest.mock import patch
-
         from xlmanage.table_manager import _validate_range
 
         mock_ws = Mock()
@@ -1165,10 +1144,48 @@ class TestValidateRangeOverlap:
         )
         mock_ws.ListObjects = [mock_bad_table]
 
-        with patch("xlmanage.table_manager._ranges_overlap", return_value=False):
-            result = _validate_range(mock_ws, "A1:D10")
+        result = _validate_range(mock_ws, "A1:D10")
         assert result == mock_range
 
+    def test_validate_range_named_range_uses_address(self):
+        """Test _validate_range resolves names through Range.Address."""
+        from xlmanage.table_manager import _validate_range
+
+        mock_ws = Mock()
+        mock_ws.Range.return_value.Address = "$B$2:$C$3"
+        mock_table = Mock()
+        mock_table.Name = "tbl_Existing"
+        mock_table.Range.Address = "$C$3:$D$4"
+        mock_ws.ListObjects = [mock_table]
+
+        with pytest.raises(TableRangeError):
+            _validate_range(mock_ws, "SalesData")
+
+    def test_validate_range_cached_extents(self):
+        """Test _validate_range confirms cached overlaps with Excel."""
+        from xlmanage.range_algebra import Rect
+        from xlmanage.table_manager import _validate_range
+
+        mock_ws = Mock()
+        moved = Mock()
+        moved.Range.Address = "$K$1:$L$5"
+        current = Mock()
+        current.Range.Address = "$A$1:$B$5"
+        far = Mock()
+        extents = [
+            ("tbl_Moved", moved, Rect(1, 1, 5, 2)),
+            ("tbl_Far", far, Rect(100, 1, 105, 2)),
+            ("tbl_Current", current, Rect(1, 1, 5, 2)),
+        ]
+
+        with pytest.raises(TableRangeError) as exc_info:
+            _validate_range(mock_ws, "B2:C3", extents)
+
+        assert "tbl_Current" in str(exc_info.value)
+        # The worksheet's tables are not enumerated
+        assert not isinstance(mock_ws.ListObjects, list)
+        far.Range.assert_not_called()
+
 
 class TestDeleteWithWorksheet:
     """Tests for delete() with specific worksheet parameter."""
@@ -1222,3 +1239,304 @@ class TestDeleteWithWorksheet:
                 manager.delete("tbl_Target", worksheet="Data")
 
         mock_good.Unlist.assert_called_once()
+
+
+def _table_with_body(rows: list[list], columns: list[str]) -> Mock:
+    """Build a table mock whose DataBodyRange serves Value2 chunks."""
+    table = Mock()
+    table.Name = "tbl_Data"
+    table.ListColumns = [Mock(Name=c) for c in columns]
+    body = table.DataBodyRange
+    body.Rows.Count = len(rows)
+    body.Columns.Count = len(columns)
+
+    def offset(row_offset, _col_offset):
+        def resize(count, _columns):
+            chunk = Mock()
+            chunk.Value2 = tuple(tuple(r) for r in rows[row_offset : row_offset + count])
+            return chunk
+
+        return Mock(Resize=Mock(side_effect=resize))
+
+    body.Offset.side_effect = offset
+    return table
+
+
+@pytest.fixture
+def export_setup():
+    """ExcelManager mock with a 5-row table in the active workbook."""
+    rows = [[f"item{i}", float(i)] for i in range(5)]
+    table = _table_with_body(rows, ["Name", "Qty"])
+    ws = Mock()
+    ws.ListObjects = [table]
+    mgr = Mock()
+    mgr.app.ActiveWorkbook.Worksheets = [ws]
+    return mgr, table, rows
+
+
+class TestTableExport:
+    """Tests for TableManager.iter_chunks() and export()."""
+
+    def test_iter_chunks(self, export_setup):
+        """Rows are read in chunks of chunk_rows."""
+        mgr, table, rows = export_setup
+
+        chunks = list(TableManager(mgr).iter_chunks("tbl_Data", chunk_rows=2))
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert [r for c in chunks for r in c] == rows
+        assert table.DataBodyRange.Offset.call_count == 3
+
+    def test_iter_chunks_empty_table(self, export_setup):
+        """A table without data rows yields nothing."""
+        mgr, table, _rows = export_setup
+        table.DataBodyRange = None
+
+        assert list(TableManager(mgr).iter_chunks("tbl_Data")) == []
+
+    def test_export_header_only_table(self, tmp_path):
+        """The empty data row of a header-only table is not exported."""
+        table = _table_with_body([[None, None]], ["Name", "Qty"])
+        ws = Mock()
+        ws.ListObjects = [table]
+        mgr = Mock()
+        mgr.app.ActiveWorkbook.Worksheets = [ws]
+        output = tmp_path / "out.csv"
+
+        result = TableManager(mgr).export("tbl_Data", output)
+
+        assert output.read_text(encoding="utf-8").splitlines() == ["Name,Qty"]
+        assert (result.rows, result.chunks) == (0, 0)
+        assert list(TableManager(mgr).iter_chunks("tbl_Data")) == []
+
+    def test_iter_chunks_not_found(self, export_setup):
+        """An unknown table raises TableNotFoundError."""
+        mgr, _table, _rows = export_setup
+
+        with pytest.raises(TableNotFoundError):
+            list(TableManager(mgr).iter_chunks("tbl_Missing"))
+
+    def test_export_csv_file(self, export_setup, tmp_path):
+        """CSV export writes the header then every row."""
+        mgr, _table, _rows = export_setup
+        output = tmp_path / "out.csv"
+
+        result = TableManager(mgr).export("tbl_Data", output, chunk_rows=2)
+
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "Name,Qty"
+        assert lines[1:] == [f"item{i},{float(i)}" for i in range(5)]
+        assert (result.rows, result.columns, result.chunks) == (5, 2, 3)
+        assert result.output == str(output)
+        assert result.rows_per_second > 0
+
+    def test_export_ndjson_stream(self, export_setup):
+        """NDJSON export writes one object per row to a stream."""
+        mgr, _table, _rows = export_setup
+        stream = io.StringIO()
+
+        result = TableManager(mgr).export("tbl_Data", stream, fmt="ndjson")
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert records[0] == {"Name": "item0", "Qty": 0.0}
+        assert len(records) == 5
+        assert result.output == "<stream>"
+        assert result.chunks == 1
+
+    def test_export_peak_memory(self, export_setup):
+        """Peak memory is reported while tracemalloc is tracing."""
+        mgr, _table, _rows = export_setup
+
+        tracemalloc.start()
+        try:
+            result = TableManager(mgr).export("tbl_Data", io.StringIO())
+        finally:
+            tracemalloc.stop()
+
+        assert result.peak_memory > 0
+
+    def test_export_invalid_format(self, export_setup, tmp_path):
+        """Unknown formats are rejected before creating the file."""
+        mgr, _table, _rows = export_setup
+        output = tmp_path / "out.xml"
+
+        with pytest.raises(ValueError):
+            TableManager(mgr).export("tbl_Data", output, fmt="xml")
+
+        assert not output.exists()
+
+    def test_export_default_chunk_rows(self):
+        """The default chunk size is a sensible bulk size."""
+        assert EXPORT_CHUNK_ROWS >= 1000
+
+
+class TestColumnMapping:
+    """Tests for _map_columns() and _column_runs()."""
+
+    def test_map_columns_default_order(self):
+        """Without source columns, rows follow the table order."""
+        assert _map_columns("t", ["A", "B"], None) == [0, 1]
+
+    def test_map_columns_case_insensitive(self):
+        """Source columns are matched case-insensitively, in any order."""
+        mapping = _map_columns("t", ["Name", "Qty", "Total"], ["qty", "NAME"])
+
+        assert mapping == [1, 0, None]
+
+    def test_map_columns_unknown(self):
+        """Unknown source columns raise TableColumnError."""
+        with pytest.raises(TableColumnError) as exc_info:
+            _map_columns("tbl", ["Name"], ["Name", "Price"])
+
+        assert exc_info.value.columns == ["Price"]
+        assert exc_info.value.reason == "unknown columns"
+
+    def test_map_columns_duplicated(self):
+        """Duplicated source columns raise TableColumnError."""
+        with pytest.raises(TableColumnError):
+            _map_columns("tbl", ["Name"], ["Name", "name"])
+
+    def test_column_runs(self):
+        """Adjacent mapped columns are grouped, gaps split runs."""
+        assert _column_runs([2, 0, None, 1]) == [(0, [2, 0]), (3, [1])]
+        assert _column_runs([None, None]) == []
+
+
+@pytest.fixture
+def load_setup():
+    """ExcelManager mock with a 2-row table "tbl_Data" (Name, Qty, Total)."""
+    table = MagicMock()
+    table.Name = "tbl_Data"
+    table.ListColumns = [Mock(Name=c) for c in ("Name", "Qty", "Total")]
+    table.DataBodyRange.Rows.Count = 2
+    ws = Mock()
+    ws.ListObjects = [table]
+    mgr = Mock()
+    mgr.app.ActiveWorkbook.Worksheets = [ws]
+    return mgr, table
+
+
+def _written_blocks(table):
+    """Return the (row, column) offsets and the sizes of the written blocks."""
+    start = table.HeaderRowRange.Offset.return_value
+    resize = start.Offset.return_value.Resize
+    offsets = [c.args for c in start.Offset.call_args_list]
+    return offsets, [c.args for c in resize.call_args_list]
+
+
+class TestTableAppendRows:
+    """Tests for TableManager.append_rows()."""
+
+    def test_append_resizes_once(self, load_setup):
+        """The table is resized once and rows are written in blocks."""
+        mgr, table = load_setup
+        rows = [[f"p{i}", float(i), float(2 * i)] for i in range(5)]
+
+        result = TableManager(mgr).append_rows(
+            "tbl_Data", rows, block_rows=2, optimize=False
+        )
+
+        header = table.HeaderRowRange
+        header.Resize.assert_called_once_with(1 + 2 + 5, 3)
+        table.Resize.assert_called_once_with(header.Resize.return_value)
+        header.Offset.assert_called_once_with(3, 0)
+        offsets, sizes = _written_blocks(table)
+        assert offsets == [(0, 0), (2, 0), (4, 0)]
+        assert sizes == [(2, 3), (2, 3), (1, 3)]
+        assert (result.rows_added, result.rows_count, result.blocks) == (5, 7, 3)
+        assert result.columns == ["Name", "Qty", "Total"]
+
+    def test_append_mapped_columns(self, load_setup):
+        """Mapped columns are reordered; unmapped ones are not written."""
+        mgr, table = load_setup
+        start = table.HeaderRowRange.Offset.return_value
+        target = start.Offset.return_value.Resize.return_value
+
+        result = TableManager(mgr).append_rows(
+            "tbl_Data", [[3.0, "pen"]], columns=["Qty", "Name"], optimize=False
+        )
+
+        start.Offset.assert_called_once_with(0, 0)
+        start.Offset.return_value.Resize.assert_called_once_with(1, 2)
+        assert target.Value2 == (("pen", 3.0),)
+        assert result.columns == ["Name", "Qty"]
+
+    def test_append_streams_iterator(self, load_setup):
+        """With row_count, rows are consumed block by block."""
+        mgr, table = load_setup
+        consumed = []
+
+        def rows():
+            for i in range(4):
+                consumed.append(i)
+                yield [f"p{i}", float(i), 0.0]
+
+        start = table.HeaderRowRange.Offset.return_value
+        seen_at_write = []
+        start.Offset.side_effect = lambda *a: seen_at_write.append(len(consumed)) or (
+            start.Offset.return_value
+        )
+
+        TableManager(mgr).append_rows(
+            "tbl_Data", rows(), row_count=4, block_rows=2, optimize=False
+        )
+
+        assert seen_at_write == [2, 4]
+
+    def test_append_truncate(self, load_setup):
+        """truncate deletes the existing rows first."""
+        mgr, table = load_setup
+        body = table.DataBodyRange
+
+        def delete():
+            table.DataBodyRange = None
+
+        body.Delete.side_effect = delete
+
+        result = TableManager(mgr).append_rows(
+            "tbl_Data", [["a", 1.0, 2.0]], truncate=True, optimize=False
+        )
+
+        body.Delete.assert_called_once_with()
+        table.HeaderRowRange.Offset.assert_called_once_with(1, 0)
+        assert result.rows_count == 1
+
+    def test_append_after_empty_row(self, load_setup):
+        """A lone empty data row is overwritten rather than kept."""
+        mgr, table = load_setup
+        table.DataBodyRange.Rows.Count = 1
+        table.DataBodyRange.Value2 = ((None, None, None),)
+
+        result = TableManager(mgr).append_rows(
+            "tbl_Data", [["a", 1.0, 2.0]], optimize=False
+        )
+
+        table.HeaderRowRange.Offset.assert_called_once_with(1, 0)
+        assert result.rows_count == 1
+
+    def test_append_fewer_rows_than_announced(self, load_setup):
+        """The table is fitted to the rows actually written."""
+        mgr, table = load_setup
+
+        TableManager(mgr).append_rows(
+            "tbl_Data", iter([["a", 1.0, 2.0]]), row_count=3, optimize=False
+        )
+
+        sizes = [c.args for c in table.HeaderRowRange.Resize.call_args_list]
+        assert sizes == [(6, 3), (4, 3)]
+
+    def test_append_unknown_table(self, load_setup):
+        """An unknown table raises TableNotFoundError."""
+        mgr, _table = load_setup
+
+        with pytest.raises(TableNotFoundError):
+            TableManager(mgr).append_rows("tbl_X", [["a"]])
+
+    def test_append_unknown_column(self, load_setup):
+        """Column validation happens before touching the table."""
+        mgr, table = load_setup
+
+        with pytest.raises(TableColumnError):
+            TableManager(mgr).append_rows("tbl_Data", [["a"]], columns=["Nope"])
+
+        table.Resize.assert_not_called()
@@ -0,0 +1,266 @@
+"""
+Tests for keyed table upsert, run against the in-memory Excel backend.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import time
+
+import pytest
+
+from xlmanage.exceptions import TableColumnError
+from xlmanage.table_manager import TableManager, _contiguous_runs, _key_value
+from xlmanage.testing import FakeExcel, fake_excel_manager
+
+
+def _setup(name, columns, rows):
+    """FakeExcel holding one table (header in A1) and a manager for it."""
+    app = FakeExcel()
+    ws = app.add_workbook("stock.xlsx", ["Stock"]).sheet("Stock")
+    ws.load([columns, *rows])
+    last = f"{chr(64 + len(columns))}{len(rows) + 1}"
+    ws.add_table(name, f"A1:{last}")
+    return app, TableManager(fake_excel_manager(app))
+
+
+def _values(app, name):
+    """Data rows of a table, read after the calls under test were counted."""
+    table = app.ActiveWorkbook.Worksheets(1).ListObjects(name)
+    body = table.DataBodyRange
+    return [] if body is None else [list(row) for row in body.Value2]
+
+
+def _writes(app):
+    """Number of Value2 transfers and table resizes recorded so far."""
+    counts = app.counter.counts
+    return counts["Range.Value2"], counts["ListObject.Resize"]
+
+
+@pytest.fixture
+def stock():
+    """Table "tbl_Stock" (Id, Name, Qty, Note) with three rows."""
+    return _setup(
+        "tbl_Stock",
+        ["Id", "Name", "Qty", "Note"],
+        [[1.0, "pen", 3.0, "a"], [2.0, "ink", 5.0, "b"], [3.0, "pad", 1.0, "c"]],
+    )
+
+
+class TestHelpers:
+    """Tests for the upsert helpers."""
+
+    def test_contiguous_runs(self):
+        """Sorted offsets are grouped into runs."""
+        assert _contiguous_runs([0, 1, 2, 5, 7, 8]) == [(0, 3), (5, 1), (7, 2)]
+        assert _contiguous_runs([]) == []
+
+    def test_key_value(self):
+        """Strings match case-insensitively, numbers by value."""
+        assert _key_value(" Pen ") == _key_value("pen")
+        assert hash(_key_value(3)) == hash(_key_value(3.0))
+        assert _key_value(None) is None
+
+
+class TestTableUpsert:
+    """Tests for TableManager.upsert()."""
+
+    def test_update_and_insert(self, stock):
+        """Changed rows are updated in place and new keys appended."""
+        app, manager = stock
+        rows = [[2.0, "ink", 9.0, "b"], [4.0, "cap", 2.0, "d"]]
+
+        result = manager.upsert("tbl_Stock", rows, ["Id"], optimize=False)
+
+        assert _writes(app)[1] == 1
+        assert _values(app, "tbl_Stock") == [
+            [1.0, "pen", 3.0, "a"],
+            [2.0, "ink", 9.0, "b"],
+            [3.0, "pad", 1.0, "c"],
+            [4.0, "cap", 2.0, "d"],
+        ]
+        assert (result.rows_updated, result.rows_inserted) == (1, 1)
+        assert (result.rows_unchanged, result.rows_count) == (0, 4)
+        assert result.key_columns == ["Id"]
+
+    def test_unchanged_rows_not_written(self, stock):
+        """Rows identical to the table are counted but not written."""
+        app, manager = stock
+
+        result = manager.upsert(
+            "tbl_Stock", [[1, "pen", 3, "a"]], ["id"], optimize=False
+        )
+
+        assert result.rows_unchanged == 1
+        assert (result.rows_updated, result.rows_inserted, result.blocks) == (0, 0, 0)
+        # Both Value2 transfers are reads: the key pass, then the check of
+        # the matched row
+        assert _writes(app) == (2, 0)
+
+    def test_mapped_columns_only(self, stock):
+        """Columns absent from the data keep their values."""
+        app, manager = stock
+
+        result = manager.upsert(
+            "tbl_Stock",
+            [[7.0, "PEN"], [0.0, "ink"], [4.0, "new"]],
+            ["Name"],
+            columns=["Qty", "Name"],
+            optimize=False,
+        )
+
+        assert _values(app, "tbl_Stock") == [
+            [1.0, "PEN", 7.0, "a"],
+            [2.0, "ink", 0.0, "b"],
+            [3.0, "pad", 1.0, "c"],
+            [None, "new", 4.0, None],
+        ]
+        assert (result.rows_updated, result.rows_inserted) == (2, 1)
+
+    def test_contiguous_updates_one_block(self, stock):
+        """Adjacent changed rows are written as a single block."""
+        app, manager = stock
+        rows = [[1.0, "pen", 0.0, "a"], [2.0, "ink", 0.0, "b"], [3.0, "pad", 0.0, "c"]]
+
+        result = manager.upsert("tbl_Stock", rows, ["Id"], optimize=False)
+
+        assert result.rows_updated == 3
+        assert result.blocks == 1
+        # Key pass, check of the matched rows, then the single write
+        assert _writes(app) == (3, 0)
+
+    def test_composite_key_last_row_wins(self, stock):
+        """Several key columns form the key; duplicate source keys keep the last."""
+        app, manager = stock
+        rows = [
+            [3.0, "pad", 8.0, "x"],
+            [3.0, "pad", 9.0, "y"],
+            [3.0, "other", 1.0, "z"],
+        ]
+
+        result = manager.upsert("tbl_Stock", rows, ["Id", "Name"], optimize=False)
+
+        values = _values(app, "tbl_Stock")
+        assert values[2] == [3.0, "pad", 9.0, "y"]
+        assert values[3] == [3.0, "other", 1.0, "z"]
+        assert (result.rows_updated, result.rows_inserted) == (1, 1)
+
+    def test_empty_table(self):
+        """Upserting into an empty table appends every row."""
+        app, manager = _setup("tbl_Empty", ["Id", "Name"], [])
+
+        result = manager.upsert(
+            "tbl_Empty", [[1.0, "a"], [2.0, "b"]], ["Id"], optimize=False
+        )
+
+        assert _values(app, "tbl_Empty") == [[1.0, "a"], [2.0, "b"]]
+        assert result.rows_inserted == 2
+
+    def test_key_not_in_data(self, stock):
+        """A key column missing from the data is rejected."""
+        app, manager = stock
+
+        with pytest.raises(TableColumnError) as exc_info:
+            manager.upsert(
+                "tbl_Stock", [[1.0]], ["Name"], columns=["Id"], optimize=False
+            )
+
+        assert exc_info.value.columns == ["Name"]
+        assert _writes(app) == (0, 0)
+
+    def test_chunked_key_pass(self, stock, monkeypatch):
+        """Keys are indexed chunk by chunk; only chunks with matches are reread."""
+        app, manager = stock
+        monkeypatch.setattr("xlmanage.table_manager.EXPORT_CHUNK_ROWS", 2)
+        app.counter.reset()
+
+        result = manager.upsert(
+            "tbl_Stock", [[3.0, "pad", 4.0, "c"], [1.0, "pen", 3.0, "a"]], ["Id"]
+        )
+
+        # Two reads for the keys, two checks and one write
+        assert _writes(app) == (5, 0)
+        assert (result.rows_updated, result.rows_unchanged) == (1, 1)
+        assert _values(app, "tbl_Stock")[2] == [3.0, "pad", 4.0, "c"]
+
+    def test_chunk_without_match_not_reread(self, stock, monkeypatch):
+        """A chunk holding no matched row is read for its keys only."""
+        app, manager = stock
+        monkeypatch.setattr("xlmanage.table_manager.EXPORT_CHUNK_ROWS", 2)
+        app.counter.reset()
+
+        result = manager.upsert("tbl_Stock", [[3.0, "pad", 1.0, "c"]], ["Id"])
+
+        assert result.rows_unchanged == 1
+        assert _writes(app) == (3, 0)
+
+    def test_no_key_columns(self, stock):
+        """At least one key column is required."""
+        with pytest.raises(ValueError):
+            stock[1].upsert("tbl_Stock", [], [])
+
+    def test_uses_optimizer(self, stock):
+        """Writes run inside ExcelOptimizer by default and settings are restored."""
+        app, manager = stock
+
+        manager.upsert("tbl_Stock", [[5.0, "x", 1.0, ""]], ["Id"])
+
+        assert app.counter.counts["Application.ScreenUpdating"] >= 2
+        assert app.ScreenUpdating is True
+
+
+@pytest.mark.slow
+class TestTableUpsertBenchmark:
+    """Upsert of 100k rows into a 100k-row table on the fake backend."""
+
+    ROWS = 100_000
+
+    def test_upsert_100k_rows(self):
+        """COM transfers stay bounded by blocks, not by the row count."""
+        app, manager = _setup(
+            "tbl_Big",
+            ["Id", "Name", "Qty", "Note"],
+            [[float(i), f"item{i}", 1.0, "n"] for i in range(self.ROWS)],
+        )
+        # Every tenth existing row changes, then as many new keys follow
+        half = self.ROWS // 2
+        rows = [
+            [float(i), f"item{i}", 2.0 if i % 10 == 0 else 1.0, "n"]
+            for i in range(half, self.ROWS)
+        ]
+        rows += [
+            [float(i), f"item{i}", 1.0, "n"] for i in range(self.ROWS, 2 * self.ROWS)
+        ]
+        app.counter.reset()
+
+        started = time.perf_counter()
+        result = manager.upsert("tbl_Big", rows, ["Id"], optimize=False)
+        elapsed = time.perf_counter() - started
+
+        assert result.rows_updated == half // 10
+        assert result.rows_inserted == self.ROWS
+        assert result.rows_unchanged == half - half // 10
+        assert result.rows_count == 2 * self.ROWS
+        # 10 reads for the keys, 5 to check the chunks holding matched
+        # rows, plus one write per block: one per changed row run and the
+        # append blocks, where a Find() loop would need one call per
+        # source row
+        transfers, resizes = _writes(app)
+        assert transfers == 10 + 5 + result.blocks
+        assert result.blocks <= half // 10 + 5
+        assert resizes == 1
+        assert app.counter.total < 20 * result.blocks
+        assert _values(app, "tbl_Big")[-1] == [199_999.0, "item199999", 1.0, "n"]
+        print(f"\nupsert {len(rows)} rows: {elapsed:.2f}s, {app.counter.total} calls")
@@ -0,0 +1,174 @@
+"""
+Tests for the VBA inventory helper.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+from xlmanage.vba_inventory import (
+    HELPER_MODULE_NAME,
+    HELPER_SOURCE,
+    InventoryHelper,
+    inventory_helper,
+)
+from xlmanage.vba_manager import VBAManager
+from xlmanage.worksheet_manager import WorksheetManager
+
+
+def _fill(workbook, sheets=20):
+    """Add worksheets holding one table each, plus a hidden empty sheet."""
+    for i in range(1, sheets + 1):
+        sheet = workbook.add_sheet(f"Sheet{i}")
+        sheet.load([["Id", "Value"], [1, "a"], [2, "b"]])
+        sheet.add_table(f"tbl_{i}", "A1:B3")
+    workbook.add_sheet("Hidden")._visible = False
+    return workbook
+
+
+def _components(workbook):
+    return [component._name for component in workbook._project._components]
+
+
+@pytest.fixture
+def app():
+    """FakeExcel whose active workbook is a macro-enabled workbook."""
+    fake = FakeExcel()
+    _fill(fake.add_workbook("Macros.xlsm", []))
+    return fake
+
+
+@pytest.fixture
+def mgr(app):
+    return fake_excel_manager(app)
+
+
+class TestInjectedHelper:
+    """Helper injected in the target workbook for one call."""
+
+    def test_same_results_as_per_object_path(self, mgr):
+        worksheets, tables = WorksheetManager(mgr), TableManager(mgr)
+        vba = VBAManager(mgr)
+
+        assert worksheets.list(helper=True) == worksheets.list()
+        assert tables.list(helper=True) == tables.list()
+        assert tables.list("SHEET3", helper=True) == tables.list("Sheet3")
+        assert tables.list("Missing", helper=True) == []
+        assert vba.list_modules(helper=True) == vba.list_modules()
+
+    def test_constant_number_of_calls(self, app, mgr):
+        manager = WorksheetManager(mgr)
+
+        app.counter.reset()
+        manager.list()
+        per_object = app.counter.total
+        app.counter.reset()
+        manager.list(helper=True)
+        helper = app.counter.total
+
+        assert app.counter.counts["Application.Run"] == 1
+        assert helper < 20 < per_object
+        # Ten times more worksheets: same number of calls
+        _fill(app.ActiveWorkbook, sheets=200)
+        app.counter.reset()
+        manager.list(helper=True)
+        assert app.counter.total == helper
+
+    def test_module_removed_and_saved_state_kept(self, app, mgr):
+        workbook = app.ActiveWorkbook
+        workbook.Saved = True
+
+        WorksheetManager(mgr).list(helper=True)
+
+        assert HELPER_MODULE_NAME not in _components(workbook)
+        assert workbook.Saved is True
+
+    def test_existing_module_is_refreshed_and_kept(self, app, mgr):
+        workbook = app.ActiveWorkbook
+        component = workbook.VBProject.VBComponents.Add(1)
+        component.Name = HELPER_MODULE_NAME
+        component.CodeModule.AddFromString("' outdated version")
+
+        sheets = WorksheetManager(mgr).list(helper=True)
+        modules = VBAManager(mgr).list_modules(helper=True)
+
+        assert len(sheets) == 21
+        assert _components(workbook).count(HELPER_MODULE_NAME) == 1
+        assert component.CodeModule.CountOfLines == len(HELPER_SOURCE.splitlines())
+        # The helper module is not listed
+        assert HELPER_MODULE_NAME not in [module.name for module in modules]
+
+    def test_fallback_when_vba_is_blocked(self, app, mgr):
+        app.vba_access = False
+
+        assert InventoryHelper(mgr).sheets(app.ActiveWorkbook) is None
+        assert len(WorksheetManager(mgr).list(helper=True)) == 21
+
+    def test_fallback_for_xlsx_workbooks(self, app, mgr):
+        _fill(app.add_workbook("Data.xlsx", []), sheets=3)
+
+        assert InventoryHelper(mgr).tables(app.ActiveWorkbook) is None
+        assert len(TableManager(mgr).list(helper=True)) == 3
+
+
+class TestHostedHelper:
+    """Helper kept in an open host workbook, such as PERSONAL.XLSB."""
+
+    @pytest.fixture
+    def host(self, app):
+        host = app.add_workbook("PERSONAL.XLSB", ["Sheet1"])
+        # The host is hidden: the target stays the active workbook
+        app._active = app.Workbooks("Macros.xlsm")
+        return host
+
+    def test_installed_once_then_one_call(self, app, mgr, host):
+        manager = TableManager(mgr)
+
+        first = manager.list(helper="PERSONAL.XLSB")
+        app.counter.reset()
+        second = manager.list(helper="PERSONAL.XLSB")
+
+        assert app.counter.counts["Application.Run"] == 1
+        assert app.counter.total < 5
+        assert first == second == manager.list()
+        assert HELPER_MODULE_NAME in _components(host)
+
+    def test_lists_xlsx_workbooks(self, app, mgr, host):
+        _fill(app.add_workbook("Data.xlsx", []), sheets=3)
+
+        sheets = WorksheetManager(mgr).list(helper="PERSONAL.XLSB")
+
+        assert [sheet.name for sheet in sheets][:3] == ["Sheet1", "Sheet2", "Sheet3"]
+        assert sheets[-1].visible is False
+
+    def test_outdated_helper_is_reinstalled(self, app, mgr, host):
+        component = host.VBProject.VBComponents.Add(1)
+        component.Name = HELPER_MODULE_NAME
+        component.CodeModule.AddFromString("Public Function XlmSheets(x)")
+
+        tables = TableManager(mgr).list(helper="PERSONAL.XLSB")
+
+        assert len(tables) == 20
+        assert _components(host).count(HELPER_MODULE_NAME) == 1
+
+    def test_missing_host_falls_back(self, mgr):
+        helper = inventory_helper(mgr, "Missing.xlam")
+
+        assert helper.host == "Missing.xlam"
+        assert len(WorksheetManager(mgr).list(helper="Missing.xlam")) == 21
+        assert inventory_helper(mgr, False) is None
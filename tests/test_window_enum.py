@@ -0,0 +1,143 @@
+"""
+Tests for the PID to main window enumeration.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from unittest.mock import Mock, patch
+
+from xlmanage.excel_manager import ExcelManager, connect_by_pid
+from xlmanage.testing import FakeWindowSource
+from xlmanage.window_enum import WindowEnumerator
+
+
+class TestWindowEnumerator:
+    """PID -> XLMAIN window map built in one pass."""
+
+    def test_maps_each_excel_pid(self):
+        source = FakeWindowSource.desktop(excel_pids=[100, 200, 300], others=10)
+
+        hwnds = WindowEnumerator(source).xlmain_hwnds()
+
+        assert hwnds == {100: 1, 200: 2, 300: 3}
+
+    def test_other_window_classes_of_excel_ignored(self):
+        source = FakeWindowSource(
+            [(1, 100, "EXCEL7"), (2, 100, "XLMAIN"), (3, 200, "Notepad")]
+        )
+
+        assert WindowEnumerator(source).xlmain_hwnds() == {100: 2}
+
+    def test_first_xlmain_window_wins(self):
+        source = FakeWindowSource([(5, 100, "XLMAIN"), (9, 100, "XLMAIN")])
+
+        assert WindowEnumerator(source).find(100) == 5
+
+    def test_find_unknown_pid(self):
+        source = FakeWindowSource.desktop(excel_pids=[100], others=3)
+
+        assert WindowEnumerator(source).find(999) is None
+
+    def test_single_pass_over_the_windows(self):
+        pids = list(range(1000, 1050))
+        source = FakeWindowSource.desktop(excel_pids=pids, others=500)
+
+        hwnds = WindowEnumerator(source).xlmain_hwnds()
+
+        assert len(hwnds) == 50
+        # One EnumWindows, one class name per window, one PID per Excel window
+        assert source.calls == 1 + 550 + 50
+
+    def test_per_pid_lookups_grow_with_the_pids(self):
+        pids = list(range(1000, 1050))
+        source = FakeWindowSource.desktop(excel_pids=pids, others=500)
+
+        for pid in pids:
+            WindowEnumerator(source).find(pid)
+
+        assert source.calls == 50 * (1 + 550 + 50)
+
+
+class TestHwndMapReuse:
+    """Callers resolving several PIDs share one enumeration."""
+
+    @patch("xlmanage.excel_manager.connect_by_hwnd")
+    @patch("xlmanage.excel_manager._find_hwnd_for_pid")
+    def test_connect_by_pid_uses_the_map(self, mock_find_hwnd, mock_connect_hwnd):
+        mock_connect_hwnd.return_value = Mock()
+
+        assert connect_by_pid(100, hwnd_map={100: 7}) is not None
+        assert connect_by_pid(200, hwnd_map={100: 7}) is None
+
+        mock_find_hwnd.assert_not_called()
+        mock_connect_hwnd.assert_called_once_with(7)
+
+    def test_list_running_instances_enumerates_windows_once(self):
+        source = FakeWindowSource.desktop(excel_pids=[100, 200, 300], others=20)
+
+        with (
+            patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[]),
+            patch(
+                "xlmanage.excel_manager.enumerate_excel_pids",
+                return_value=[100, 200, 300],
+            ),
+            patch(
+                "xlmanage.excel_manager.WindowEnumerator",
+                side_effect=lambda: WindowEnumerator(source),
+            ),
+            patch(
+                "xlmanage.excel_manager.connect_by_hwnd", return_value=None
+            ) as mock_connect_hwnd,
+        ):
+            instances = ExcelManager().list_running_instances()
+
+        assert [info.pid for info in instances] == [100, 200, 300]
+        assert source.calls == 1 + 23 + 3
+        assert [call.args for call in mock_connect_hwnd.call_args_list] == [
+            (1,),
+            (2,),
+            (3,),
+        ]
+
+    def test_list_running_instances_without_windows(self):
+        with (
+            patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[]),
+            patch("xlmanage.excel_manager.enumerate_excel_pids", return_value=[100]),
+            patch(
+                "xlmanage.excel_manager.WindowEnumerator",
+                side_effect=OSError("user32 unavailable"),
+            ),
+        ):
+            [info] = ExcelManager().list_running_instances()
+
+        # Degraded info, as when the connection fails
+        assert (info.pid, info.hwnd) == (100, 0)
+
+    def test_stop_instance_uses_the_map(self):
+        app = Mock()
+        app.Workbooks = []
+
+        with (
+            patch("xlmanage.excel_manager.enumerate_excel_instances", return_value=[]),
+            patch("xlmanage.excel_manager._find_hwnd_for_pid") as mock_find_hwnd,
+            patch(
+                "xlmanage.excel_manager.connect_by_hwnd", return_value=app
+            ) as mock_connect_hwnd,
+        ):
+            ExcelManager().stop_instance(100, save=False, hwnd_map={100: 7})
+
+        mock_find_hwnd.assert_not_called()
+        mock_connect_hwnd.assert_called_once_with(7)
@@ -0,0 +1,211 @@
+"""
+Tests for the workbook lookup index.
+
+This file is part of xlManage.
+
+xlManage is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+xlManage is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with xlManage.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from xlmanage.exceptions import WorkbookNotFoundError
+from xlmanage.macro_runner import MacroRunner
+from xlmanage.testing import FakeExcel, fake_excel_manager
+from xlmanage.workbook_index import WorkbookIndex, workbook_index
+from xlmanage.workbook_manager import WorkbookManager
+from xlmanage.worksheet_manager import WorksheetManager
+
+
+@pytest.fixture
+def app(tmp_path):
+    """FakeExcel with 20 workbooks open from tmp_path."""
+    fake = FakeExcel()
+    for i in range(20):
+        fake.add_workbook(f"Book{i}.xlsx", ["Sheet1"], tmp_path / f"Book{i}.xlsx")
+    return fake
+
+
+@pytest.fixture
+def mgr(app):
+    """Started ExcelManager connected to the fake application."""
+    return fake_excel_manager(app)
+
+
+def _calls(app, func):
+    app.counter.reset()
+    result = func()
+    return result, app.counter.total
+
+
+class TestWorkbookIndex:
+    """Lookups, probes and explicit updates."""
+
+    def test_built_once_then_constant_cost(self, app, tmp_path):
+        index = WorkbookIndex()
+        target = tmp_path / "Book17.xlsx"
+
+        wb, first = _calls(app, lambda: index.find(app, target))
+        again, second = _calls(app, lambda: index.find(app, target))
+
+        assert wb.Name == "Book17.xlsx"
+        assert again is wb
+        assert first > 40
+        # Workbooks + Count + Name of the workbook found
+        assert second == 3
+        assert len(index) == 20
+
+    def test_matches_by_name_when_path_differs(self, app, tmp_path):
+        index = WorkbookIndex()
+
+        wb = index.find(app, tmp_path / "elsewhere" / "BOOK3.XLSX")
+
+        assert wb is app.ActiveWorkbook.Application.Workbooks("Book3.xlsx")
+
+    def test_miss_costs_only_the_count_probe(self, app, tmp_path):
+        index = WorkbookIndex()
+        index.rebuild(app)
+
+        wb, calls = _calls(
+            app,
+            lambda: index.find(app, tmp_path / "Other.xlsx", rescan_on_miss=False),
+        )
+
+        assert wb is None
+        assert calls == 2
+
+    def test_miss_rebuilds_once(self, app, tmp_path):
+        index = WorkbookIndex()
+        index.rebuild(app)
+
+        wb, calls = _calls(app, lambda: index.find(app, tmp_path / "Other.xlsx"))
+
+        assert wb is None
+        # Count probe, one rebuild, then the Count probe of the rebuilt index
+        assert 40 < calls < 80
+        assert index.is_built
+
+    def test_save_as_outside_is_detected(self, app, tmp_path):
+        index = WorkbookIndex()
+        index.rebuild(app)
+        # SaveAs made outside xlManage: Workbooks.Count is unchanged
+        app.Workbooks("Book5.xlsx").SaveAs(str(tmp_path / "Renamed.xlsx"))
+
+        wb = index.find(app, tmp_path / "Renamed.xlsx")
+
+        assert wb is not None
+        assert wb.Name == "Renamed.xlsx"
+
+    def test_workbook_closed_outside_is_detected(self, app, tmp_path):
+        index = WorkbookIndex()
+        index.rebuild(app)
+        # Close one workbook and open another: Workbooks.Count is unchanged
+        app.Workbooks("Book5.xlsx").Close()
+        app.add_workbook("New.xlsx", ["Sheet1"], tmp_path / "New.xlsx")
+
+        assert index.find(app, tmp_path / "Book5.xlsx") is None
+        assert index.find(app, tmp_path / "New.xlsx").Name == "New.xlsx"
+
+    def test_workbook_opened_outside_is_detected(self, app, tmp_path):
+        index = WorkbookIndex()
+        index.rebuild(app)
+        app.add_workbook("Late.xlsx", ["Sheet1"], tmp_path / "Late.xlsx")
+
+        assert index.find(app, tmp_path / "Late.xlsx").Name == "Late.xlsx"
+
+    def test_updates_ignored_until_built(self, app):
+        index = WorkbookIndex()
+        wb = app.ActiveWorkbook
+
+        index.add(wb, wb.FullName, wb.Name)
+        index.remove(wb)
+        index.rename(wb, "C:/x.xlsx", "x.xlsx")
+
+        assert not index.is_built
+        assert len(index) == 0
+
+    def test_remove_unknown_workbook_invalidates(self, app):
+        index = WorkbookIndex()
+        index.rebuild(app)
+
+        index.remove(Mock())
+
+        assert not index.is_built
+
+
+class TestManagersUseIndex:
+    """Managers resolve workbooks through their ExcelManager's index."""
+
+    def test_excel_manager_owns_one_index(self, mgr):
+        assert workbook_index(mgr) is mgr.workbook_index
+        assert workbook_index(Mock()) is None
+
+        mgr.disconnect()
+        assert not mgr.workbook_index.is_built
+
+    def test_worksheet_operations_stop_scanning(self, app, mgr, tmp_path):
+        manager = WorksheetManager(mgr)
+        target = tmp_path / "Book19.xlsx"
+        manager.list(workbook=target)
+
+        _, calls = _calls(app, lambda: manager.create("Extra", workbook=target))
+        names = [ws.name for ws in manager.list(workbook=target)]
+
+        assert names == ["Sheet1", "Extra"]
+        # A scan alone reads FullName and Name of the 20 open workbooks
+        assert calls < 2 * 20
+
+    def test_open_create_save_as_and_close(self, app, mgr, tmp_path):
+        manager = WorkbookManager(mgr)
+        manager.list()
+        mgr.workbook_index.rebuild(mgr.app)
+
+        created = tmp_path / "Created.xlsx"
+        manager.create(created)
+        manager.save(created, output=tmp_path / "Renamed.xlsx")
+        assert len(mgr.workbook_index) == 21
+
+        _, calls = _calls(app, lambda: manager.close(tmp_path / "Renamed.xlsx"))
+        assert calls < 10
+        assert len(mgr.workbook_index) == 20
+        with pytest.raises(WorkbookNotFoundError):
+            manager.close(tmp_path / "Renamed.xlsx")
+
+        manager.open(created)
+        assert mgr.workbook_index.find(mgr.app, created).Name == "Created.xlsx"
+
+    def test_save_as_outside_then_lookup(self, app, mgr, tmp_path):
+        """A workbook renamed behind xlManage's back is still found."""
+        manager = WorksheetManager(mgr)
+        manager.list(tmp_path / "Book2.xlsx")
+        app.Workbooks("Book2.xlsx").SaveAs(str(tmp_path / "Moved.xlsx"))
+
+        sheets = manager.list(tmp_path / "Moved.xlsx")
+
+        assert [s.name for s in sheets] == ["Sheet1"]
+
+    def test_macro_reference_uses_index(self, app, mgr, tmp_path):
+        app.register_macro("Module1.Answer", lambda: 42, workbook="Book0.xlsx")
+        mgr.workbook_index.rebuild(mgr.app)
+
+        result, calls = _calls(
+            app,
+            lambda: MacroRunner(mgr).run("Module1.Answer", workbook=Path("book0.xlsx")),
+        )
+
+        assert result.return_value == 42
+        assert result.macro_name == "'Book0.xlsx'!Module1.Answer"
+        assert calls < 10
@@ -53,6 +53,10 @@ from xlmanage.exceptions import (
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch, PropertyMock
 
+from xlmanage.range_manager import RangeManager
+from xlmanage.table_manager import TableManager
+from xlmanage.testing import FakeExcel, fake_excel_manager
+
 
 class TestWorksheetInfo:
     """Tests for WorksheetInfo dataclass."""
@@ -708,8 +712,10 @@ class TestWorksheetManagerCreate:
                 assert info.columns_used == 0
 
                 # Verify calls
-                mock_resolve.assert_called_once_with(mock_app, None)
-                mock_find.assert_called_once_with(mock_wb, "NewSheet")
+                mock_resolve.assert_called_once_with(mock_app, None, None)
+                mock_find.assert_called_once_with(
+                    mock_wb, "NewSheet", None, rescan_on_miss=False
+                )
                 mock_wb.Worksheets.Add.assert_called_once_with(
                     After=mock_last_ws
                 )
@@ -756,7 +762,7 @@ class TestWorksheetManagerCreate:
 
                 assert info.name == "DataSheet"
                 assert info.index == 2
-                mock_resolve.assert_called_once_with(mock_app, workbook_path)
+                mock_resolve.assert_called_once_with(mock_app, workbook_path, None)
 
     def test_create_invalid_name(self):
         """Test creating worksheet with invalid name."""
@@ -1039,7 +1045,7 @@ class TestWorksheetManagerDelete:
 
                 manager.delete("OldSheet", workbook_path)
 
-                mock_resolve.assert_called_once_with(mock_app, workbook_path)
+                mock_resolve.assert_called_once_with(mock_app, workbook_path, None)
                 mock_ws.Delete.assert_called_once()
 
     def test_delete_worksheet_not_found(self):
@@ -1319,7 +1325,7 @@ class TestWorksheetManagerList:
 
             assert len(sheets) == 1
             assert sheets[0].name == "Data"
-            mock_resolve.assert_called_once_with(mock_app, workbook_path)
+            mock_resolve.assert_called_once_with(mock_app, workbook_path, None)
 
     def test_list_empty_workbook(self):
         """Test listing worksheets in empty workbook."""
@@ -1412,6 +1418,142 @@ class TestWorksheetManagerList:
             assert len(visible_sheets) == 1
             assert len(hidden_sheets) == 1
 
+    def test_list_selected_fields_skip_used_range(self):
+        """Test that fields without dimensions never read UsedRange."""
+        mock_excel_mgr = Mock()
+        mock_excel_mgr.app = Mock()
+
+        mock_ws = Mock()
+        mock_ws.Name = "Data"
+        mock_ws.Index = 1
+        mock_ws.Visible = True
+        used_range = PropertyMock(side_effect=AssertionError("UsedRange read"))
+        type(mock_ws).UsedRange = used_range
+
+        mock_wb = Mock()
+        mock_wb.Worksheets = [mock_ws]
+
+        manager = WorksheetManager(mock_excel_mgr)
+
+        with patch("xlmanage.worksheet_manager._resolve_workbook") as mock_resolve:
+            mock_resolve.return_value = mock_wb
+
+            sheets = manager.list(fields=["visible"])
+
+            assert sheets == [WorksheetInfo("Data", None, True, None, None)]
+            used_range.assert_not_called()
+
+    def test_list_single_dimension(self):
+        """Test that one dimension reads UsedRange once, without the other."""
+        mock_excel_mgr = Mock()
+        mock_excel_mgr.app = Mock()
+
+        mock_ws = Mock()
+        mock_ws.Name = "Data"
+        mock_ws.UsedRange.Rows.Count = 50
+        mock_ws.UsedRange.Columns.Count = 4
+
+        mock_wb = Mock()
+        mock_wb.Worksheets = [mock_ws]
+
+        manager = WorksheetManager(mock_excel_mgr)
+
+        with patch("xlmanage.worksheet_manager._resolve_workbook") as mock_resolve:
+            mock_resolve.return_value = mock_wb
+
+            sheets = manager.list(fields=["name", "rows_used"])
+
+            assert sheets == [WorksheetInfo("Data", None, None, 50, None)]
+
+    def test_list_unknown_field(self):
+        """Test that an unknown field is rejected before any COM call."""
+        mock_excel_mgr = Mock()
+        manager = WorksheetManager(mock_excel_mgr)
+
+        with pytest.raises(ValueError, match="rows"):
+            manager.list(fields=["name", "rows"])
+
+
+class TestWorksheetManagerDimensions:
+    """Tests for WorksheetManager.dimensions() method."""
+
+    @pytest.fixture
+    def app(self):
+        """FakeExcel whose "Data" sheet holds values in B3:H122."""
+        fake = FakeExcel()
+        workbook = fake.add_workbook("Data.xlsx", ["Data", "Empty"])
+        sheet = workbook.sheet("Data")
+        sheet.load([["Id"] + [f"c{c}" for c in range(6)]], row=3, column=2)
+        sheet.load([[r] * 7 for r in range(119)], row=4, column=2)
+        return fake
+
+    def test_dimensions_success(self, app):
+        """Test counting the used rows and columns of one worksheet."""
+        manager = WorksheetManager(fake_excel_manager(app))
+
+        assert manager.dimensions("data") == (120, 7)
+        assert manager.dimensions("Empty") == (0, 0)
+
+    def test_probe_skips_used_range(self, app):
+        """Test that the last-cell probe spans values, not UsedRange."""
+        manager = WorksheetManager(fake_excel_manager(app))
+        # A lone value far from the others widens the span
+        app.ActiveWorkbook.sheet("Data").load([["x"]], row=200, column=1)
+
+        app.counter.reset()
+        assert manager.dimensions("Data") == (198, 8)
+        assert app.counter.counts["Worksheet.UsedRange"] == 0
+        assert app.counter.counts["Range.Find"] == 4
+
+    def test_dimensions_cached_per_sheet(self, app):
+        """Test that a second call reuses the counts without any Find."""
+        manager = WorksheetManager(fake_excel_manager(app))
+        manager.dimensions("Data")
+
+        app.counter.reset()
+        assert manager.dimensions("DATA") == (120, 7)
+        assert app.counter.counts["Range.Find"] == 0
+
+        # Cells edited in Excel go unnoticed until refresh=True
+        app.ActiveWorkbook.sheet("Data").load([["x"]], row=130, column=2)
+        assert manager.dimensions("Data") == (120, 7)
+        assert manager.dimensions("Data", refresh=True) == (128, 7)
+
+    def test_writes_forget_dimensions(self, app):
+        """Test that writing cells through xlManage measures again."""
+        mgr = fake_excel_manager(app)
+        manager = WorksheetManager(mgr)
+        sheet = app.ActiveWorkbook.sheet("Empty")
+        sheet.load([["Key", "Value"]])
+        sheet.add_table("tbl_Keys", "A1:B2")
+        assert manager.dimensions("Data") == (120, 7)
+        assert manager.dimensions("Empty") == (1, 2)
+
+        RangeManager(mgr).write([["x"]], "B130", worksheet="Data")
+        assert manager.dimensions("Data") == (128, 7)
+
+        TableManager(mgr).append_rows("tbl_Keys", [[1, 2], [3, 4]])
+        assert manager.dimensions("Empty") == (3, 2)
+
+    def test_dimensions_not_found(self):
+        """Test dimensions of a missing worksheet."""
+        mock_excel_mgr = Mock()
+        mock_excel_mgr.app = Mock()
+
+        mock_wb = Mock()
+        mock_wb.Name = "Test.xlsx"
+
+        manager = WorksheetManager(mock_excel_mgr)
+
+        with (
+            patch(
+                "xlmanage.worksheet_manager._resolve_workbook", return_value=mock_wb
+            ),
+            patch("xlmanage.worksheet_manager._find_worksheet", return_value=None),
+        ):
+            with pytest.raises(WorksheetNotFoundError):
+                manager.dimensions("Missing")
+
 
 class TestWorksheetManagerCopy:
     """Tests for WorksheetManager.copy() method."""
@@ -1493,7 +1635,7 @@ class TestWorksheetManagerCopy:
                 info = manager.copy("Original", "Duplicate", workbook_path)
 
                 assert info.name == "Duplicate"
-                mock_resolve.assert_called_once_with(mock_app, workbook_path)
+                mock_resolve.assert_called_once_with(mock_app, workbook_path, None)
 
     def test_copy_invalid_destination_name(self):
         """Test copying with invalid destination name."""